@@ -270,7 +270,8 @@ CATALOG = {
 
 
 def main():
-    from src.services.supabase_client import get_supabase_client
+    from src.services.data.catalog_cache import publish_catalog_invalidation
+    from src.services.infra.supabase_client import get_supabase_client
 
     client = get_supabase_client()
     if not client:
@@ -328,6 +329,9 @@ def main():
 
     print(f"\n✅ Done! Updated: {updated}, Created: {created}")
 
+    receivers = publish_catalog_invalidation()
+    print(f"🔄 Cache invalidation sent to {receivers} subscriber(s)")
+
 
 if __name__ == "__main__":
     main()
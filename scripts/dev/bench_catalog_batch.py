@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+Benchmark ``CatalogService.get_products_by_ids`` cache round trips.
+===================================================================
+
+Runs the product batch lookup against an in-memory Redis stand-in (every
+command or pipeline flush is one round trip, with optional simulated latency)
+and a fake ``products`` table, and compares:
+
+- "per-key": one GET per id, then one SETEX per id fetched from the DB
+  (the previous implementation);
+- "batched": one MGET for every id not in L1, one pipelined SETEX flush.
+
+Each is measured cold (empty caches), with a warm Redis (L1 cleared) and with
+a warm L1. The catalog snapshot is disabled so the cache path is exercised.
+
+Usage:
+    python scripts/dev/bench_catalog_batch.py
+    python scripts/dev/bench_catalog_batch.py --products 5 --rtt-ms 1.0 --calls 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+class _Redis:
+    """Dict-backed Redis stand-in that counts round trips."""
+
+    def __init__(self, rtt_seconds: float) -> None:
+        self.data: dict[str, Any] = {}
+        self.round_trips = 0
+        self._rtt = rtt_seconds
+
+    def _trip(self) -> None:
+        self.round_trips += 1
+        if self._rtt:
+            time.sleep(self._rtt)
+
+    def get(self, key):
+        self._trip()
+        return self.data.get(key)
+
+    def mget(self, keys):
+        self._trip()
+        return [self.data.get(k) for k in keys]
+
+    def setex(self, key, _ttl, value):
+        self._trip()
+        self.data[key] = value
+
+    def pipeline(self, transaction: bool = True):
+        redis = self
+        queued: list[tuple[str, Any]] = []
+
+        class _Pipe:
+            def setex(self, key, _ttl, value):
+                queued.append((key, value))
+
+            def execute(self):
+                redis._trip()
+                redis.data.update(queued)
+
+        return _Pipe()
+
+
+class _Products:
+    """``products`` table query chain."""
+
+    def __init__(self, rows: dict[int, dict[str, Any]]) -> None:
+        self.rows = rows
+        self.queries = 0
+        self._ids: list[int] = []
+
+    def table(self, _name):
+        return self
+
+    def select(self, _columns):
+        return self
+
+    def in_(self, _column, ids):
+        self._ids = list(ids)
+        return self
+
+    def execute(self):
+        self.queries += 1
+        return SimpleNamespace(data=[dict(self.rows[i]) for i in self._ids if i in self.rows])
+
+
+async def _per_key(service, ids: list[int]) -> list[dict[str, Any]]:
+    from src.services.data import catalog_service as cs
+
+    items, missing = [], []
+    for pid in ids:
+        key = cs._safe_cache_key("product", [str(pid)])
+        cached = cs._catalog_cache.peek(key)
+        if cached is None:
+            cached = cs._cache_get_json(key)
+            if isinstance(cached, dict) and cached.get("id"):
+                cs._catalog_cache.put(key, cached, ttl_seconds=cs.CACHE_TTL_SECONDS)
+        if isinstance(cached, dict) and cached.get("id"):
+            items.append(cached)
+        else:
+            missing.append(pid)
+    if missing:
+        response = await cs.execute_async(service.client.table("products").select("*").in_("id", missing))
+        for item in response.data or []:
+            key = cs._safe_cache_key("product", [str(item["id"])])
+            cs._catalog_cache.put(key, item, ttl_seconds=cs.CACHE_TTL_SECONDS)
+            cs._cache_set_json(key, item)
+            items.append(item)
+    return items
+
+
+async def _run(args: argparse.Namespace) -> None:
+    from src.services.data import catalog_service as cs
+
+    rows = {i: {"id": i, "name": f"Product {i}", "price": 1000 + i} for i in range(1, 501)}
+    products = _Products(rows)
+    redis = _Redis(args.rtt_ms / 1000)
+    cs.settings.CATALOG_SNAPSHOT_ENABLED = False
+    cs._get_redis_client = lambda: redis
+    cs.get_supabase_client = lambda: products
+    cs._invalidation_listener.ensure_started = lambda: False
+    service = cs.CatalogService()
+    ids = list(range(1, args.products + 1))
+
+    print(f"{args.products} products per call, {args.calls} calls, rtt {args.rtt_ms} ms")
+    print(f"{'mode':>8} {'cache':>9} {'ms/call':>9} {'redis rt/call':>14} {'db q/call':>10}")
+    for label, fetch in (("per-key", lambda: _per_key(service, ids)), ("batched", lambda: service.get_products_by_ids(ids))):
+        for state in ("cold", "redis", "l1"):
+            trips = queries = 0
+            elapsed = 0.0
+            for _ in range(args.calls):
+                if state == "cold":
+                    redis.data.clear()
+                if state != "l1":
+                    cs._catalog_cache.invalidate_local()
+                redis.round_trips, products.queries = 0, 0
+                start = time.perf_counter()
+                await fetch()
+                elapsed += time.perf_counter() - start
+                trips += redis.round_trips
+                queries += products.queries
+            print(
+                f"{label:>8} {state:>9} {elapsed / args.calls * 1000:>9.2f} "
+                f"{trips / args.calls:>14.1f} {queries / args.calls:>10.1f}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--products", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="simulated Redis round-trip time")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmark checkpoint compaction per aput (full pass vs incremental).
+====================================================================
+
+Replays a conversation through ``InstrumentedAsyncPostgresSaver._process_payload``
+the way LangGraph writes checkpoints: every turn appends one message to the
+same history and the whole checkpoint is passed again. "full" has no thread id
+in the config, so every write recompacts and re-measures the history;
+"incremental" reuses the per-thread compaction state.
+
+Usage:
+    python scripts/dev/bench_checkpoint_compaction.py
+    python scripts/dev/bench_checkpoint_compaction.py --sizes 50 200 1000 --turns 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+
+def _message(i: int) -> Any:
+    if i % 2 == 0:
+        return HumanMessage(content=f"Є сукня Анна 128 у голубому? ({i})")
+    return AIMessage(
+        content="Так, є! Сукня Анна голубого кольору, розмір 128. " * (1 + i % 8),
+        additional_kwargs={"metadata": {"intent": "PRODUCT", "turn": i}},
+    )
+
+
+def _checkpoint(messages: list[Any]) -> dict[str, Any]:
+    return {
+        "v": 1,
+        "id": f"cp-{len(messages)}",
+        "channel_values": {
+            "messages": list(messages),
+            "current_state": "STATE_3_SIZE_COLOR",
+            "metadata": {"session_id": "bench", "step_history": list(range(30))},
+            "selected_products": [{"name": "Сукня Анна", "price": 1850}],
+        },
+        "channel_versions": {"messages": str(len(messages)), "current_state": "1", "metadata": "1"},
+    }
+
+
+def _bench(saver: Any, config: Any, history: list[Any], turns: int) -> float:
+    """Mean milliseconds per write over ``turns`` appended messages."""
+    saver._process_payload(_checkpoint(history), config)
+    elapsed = 0.0
+    for i in range(turns):
+        history.append(_message(len(history) + i))
+        checkpoint = _checkpoint(history)
+        start = time.perf_counter()
+        saver._process_payload(checkpoint, config)
+        elapsed += time.perf_counter() - start
+    return elapsed * 1000 / turns
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--max-messages", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    from src.agents.langgraph.checkpointer import (
+        CheckpointCompactor,
+        InstrumentedAsyncPostgresSaver,
+    )
+
+    print(f"{'messages':>8} {'full ms':>10} {'incr ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        results = {}
+        for label, config in (("full", None), ("incremental", {"configurable": {"thread_id": "bench"}})):
+            saver = InstrumentedAsyncPostgresSaver(
+                base=MagicMock(),
+                pool=MagicMock(),
+                slow_threshold_s=1.0,
+                max_messages=args.max_messages,
+                max_chars=4000,
+                drop_base64=True,
+                compactor=CheckpointCompactor(),
+            )
+            history = [_message(i) for i in range(size)]
+            results[label] = _bench(saver, config, history, args.turns)
+        full, incr = results["full"], results["incremental"]
+        print(f"{size:>8} {full:>10.3f} {incr:>10.3f} {full / incr:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
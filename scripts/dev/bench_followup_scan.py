@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Benchmark the periodic follow-up check (messages scan vs last-activity index).
+==============================================================================
+
+Builds a synthetic SQLite database shaped like ``messages`` and
+``agent_sessions`` (with the index from
+``src/db/migrations/20261016_followup_due_index.sql``) and runs one beat tick
+both ways:
+
+- "scan": select session_id over all messages, then load each session's
+  history and compute ``next_followup_due_at`` (the previous task body);
+- "index": page through ``agent_sessions`` with the due-time filter.
+
+Usage:
+    python scripts/dev/bench_followup_scan.py
+    python scripts/dev/bench_followup_scan.py --sessions 100000 --messages 8 --due-fraction 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sqlite3
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+def _build(sessions: int, per_session: int, due_fraction: float, now: datetime) -> sqlite3.Connection:
+    db = sqlite3.connect(":memory:")
+    db.executescript(
+        """
+        create table messages (session_id text, user_id integer, role text, content text, created_at text);
+        create index idx_messages_session on messages(session_id, created_at);
+        create table agent_sessions (session_id text primary key, last_activity_at text,
+                                     followups_sent integer not null default 0);
+        create index idx_agent_sessions_followup_due on agent_sessions(followups_sent, last_activity_at);
+        """
+    )
+    rng = random.Random(7)
+    messages, index = [], []
+    for s in range(sessions):
+        sid = f"session-{s}"
+        # Most sessions were active within the first follow-up delay
+        if rng.random() < due_fraction:
+            last = now - timedelta(hours=rng.uniform(5, 20))
+        else:
+            last = now - timedelta(minutes=rng.uniform(1, 230))
+        for m in range(per_session):
+            created = (last - timedelta(minutes=per_session - 1 - m)).isoformat()
+            messages.append((sid, s, "user" if m % 2 == 0 else "assistant", f"msg {m}", created))
+        index.append((sid, last.isoformat(), 0))
+    db.executemany("insert into messages values (?, ?, ?, ?, ?)", messages)
+    db.executemany("insert into agent_sessions values (?, ?, ?)", index)
+    db.commit()
+    return db
+
+
+def _scan(db: sqlite3.Connection, now: datetime) -> tuple[int, int, int]:
+    from src.services.domain.engagement.followups import next_followup_due_at
+    from src.services.infra.message_store import StoredMessage
+
+    queries, rows_read, due = 1, 0, 0
+    sessions: dict[str, int] = {}
+    for sid, user_id in db.execute("select session_id, user_id from messages"):
+        rows_read += 1
+        sessions.setdefault(sid, user_id)
+    for sid in sessions:
+        rows = db.execute(
+            "select user_id, session_id, role, content, created_at from messages "
+            "where session_id = ? order by created_at",
+            (sid,),
+        ).fetchall()
+        queries += 1
+        rows_read += len(rows)
+        history = [
+            StoredMessage(session_id=r[1], role=r[2], content=r[3], user_id=r[0],
+                          created_at=datetime.fromisoformat(r[4]))
+            for r in rows
+        ]
+        due_at = next_followup_due_at(history)
+        if due_at and now >= due_at:
+            due += 1
+    return due, queries, rows_read
+
+
+def _indexed(db: sqlite3.Connection, now: datetime, schedule: list[int], page_size: int) -> tuple[int, int, int]:
+    clauses = " or ".join("(followups_sent = ? and last_activity_at <= ?)" for _ in schedule)
+    params: list = []
+    for sent, hours in enumerate(schedule):
+        params += [sent, (now - timedelta(hours=hours)).isoformat()]
+    queries, due, offset = 0, 0, 0
+    while True:
+        rows = db.execute(
+            f"select session_id, last_activity_at, followups_sent from agent_sessions where {clauses} "
+            "order by last_activity_at, session_id limit ? offset ?",
+            (*params, page_size, offset),
+        ).fetchall()
+        queries += 1
+        due += len(rows)
+        if len(rows) < page_size:
+            return due, queries, due
+        offset += page_size
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--messages", type=int, default=8, help="messages per session")
+    parser.add_argument("--due-fraction", type=float, default=0.02)
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    from src.conf.config import settings
+
+    schedule = settings.followup_schedule_hours
+    now = datetime.now(UTC)
+    db = _build(args.sessions, args.messages, args.due_fraction, now)
+
+    print(f"{args.sessions} sessions x {args.messages} messages, schedule {schedule}h")
+    print(f"{'mode':>6} {'seconds':>9} {'queries':>9} {'rows read':>10} {'due':>6}")
+    for label, run in (
+        ("scan", lambda: _scan(db, now)),
+        ("index", lambda: _indexed(db, now, schedule, args.page_size)),
+    ):
+        start = time.perf_counter()
+        due, queries, rows_read = run()
+        elapsed = time.perf_counter() - start
+        print(f"{label:>6} {elapsed:>9.2f} {queries:>9} {rows_read:>10} {due:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Benchmark keyword intent detection throughput.
+==============================================
+
+Classifies a corpus of messages (golden dataset inputs, every registry keyword
+embedded in short and long filler text) and compares:
+
+- "scan": reload every keyword list from the registry per message, then test
+  ``keyword in text`` group by group (the previous implementation);
+- "scan-cached": the same scan over patterns loaded once;
+- "compiled": ``detect_intent_from_text`` (one automaton pass per message).
+
+Results of the compiled classifier are checked against the scan.
+
+Usage:
+    python scripts/dev/bench_intent_classifier.py
+    python scripts/dev/bench_intent_classifier.py --rounds 20 --filler 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+STATES = ("STATE_0_INIT", "STATE_4_OFFER", "STATE_5_PAYMENT_DELIVERY")
+
+
+def _corpus(patterns: dict[str, list[str]], filler_len: int) -> list[str]:
+    import yaml
+
+    data = yaml.safe_load((ROOT / "tests" / "golden_data.yaml").read_text(encoding="utf-8")) or {}
+    texts = [
+        case.get("input") or ""
+        for suite in data.get("suites", [])
+        for case in suite.get("cases", [])
+    ]
+    filler = ("скажіть будь ласка а що у вас є " * (filler_len // 30 + 1))[:filler_len]
+    for keywords in patterns.values():
+        for kw in keywords:
+            texts.append(kw)
+            texts.append(f"{filler} {kw}")
+    texts.append(filler)
+    return texts
+
+
+def _scan(
+    patterns: Mapping[str, Sequence[str]],
+    text: str,
+    has_image: bool,
+    current_state: str,
+) -> str:
+    """The previous implementation: test every keyword list in priority order."""
+    from src.agents.langgraph.nodes.intent_classifier import GREETING_MAX_LEN, PRIORITY_INTENTS
+
+    text_lower = text.lower().strip()
+
+    def _any(group: str) -> bool:
+        return any(keyword in text_lower for keyword in patterns.get(group, []))
+
+    if not text_lower and has_image:
+        return "PHOTO_IDENT"
+    in_payment = current_state == "STATE_5_PAYMENT_DELIVERY"
+    if (
+        current_state == "STATE_4_OFFER"
+        and (_any("PAYMENT_DELIVERY") or _any("CONFIRMATION") or _any("PRODUCT_NAMES"))
+    ) or (in_payment and not _any("COMPLAINT")):
+        return "PAYMENT_DELIVERY"
+    if has_image and not in_payment and not _any("PAYMENT_DELIVERY"):
+        return "PHOTO_IDENT"
+    for intent in PRIORITY_INTENTS:
+        if _any(intent):
+            return intent
+    if len(text) < GREETING_MAX_LEN and _any("GREETING_ONLY"):
+        return "GREETING_ONLY"
+    return "DISCOVERY_OR_QUESTION"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--filler", type=int, default=120, help="length of filler text around keywords")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    from src.agents.langgraph.nodes.intent import detect_intent_from_text, get_intent_patterns
+    from src.agents.langgraph.nodes.intent_classifier import get_intent_classifier
+
+    patterns = get_intent_patterns()
+    texts = _corpus(patterns, args.filler)
+    calls = [(t, s) for t in texts for s in STATES]
+    get_intent_classifier()  # build outside the timed loop
+
+    mismatches = sum(
+        detect_intent_from_text(t, False, s) != _scan(patterns, t, False, s) for t, s in calls
+    )
+
+    runners = {
+        "scan": lambda t, s: _scan(get_intent_patterns(), t, False, s),
+        "scan-cached": lambda t, s: _scan(patterns, t, False, s),
+        "compiled": lambda t, s: detect_intent_from_text(t, False, s),
+    }
+
+    total = len(calls) * args.rounds
+    print(f"{len(texts)} messages x {len(STATES)} states x {args.rounds} rounds, mismatches: {mismatches}")
+    print(f"{'mode':>12} {'total s':>9} {'us/msg':>9} {'msg/s':>11}")
+    for label, run in runners.items():
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for text, state in calls:
+                run(text, state)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>12} {elapsed:>9.3f} {elapsed / total * 1e6:>9.1f} {total / elapsed:>11.0f}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
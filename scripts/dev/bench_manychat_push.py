@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Benchmark ManyChat push delivery (client per request vs persistent pool).
+=========================================================================
+
+Starts a local stub of the ManyChat ``sendContent`` endpoint and pushes a
+multi-bubble Instagram reply (split-send, one request per bubble) to N
+subscribers concurrently. "per-request" opens and closes an
+``httpx.AsyncClient`` around every request, as the push client used to;
+"pooled" uses the push client's long-lived keep-alive pool.
+
+Typing and inter-bubble delays are set to zero so only HTTP cost is measured.
+The stub is HTTP/1.1 (uvicorn), so HTTP/2 multiplexing is not exercised here.
+
+Usage:
+    python scripts/dev/bench_manychat_push.py
+    python scripts/dev/bench_manychat_push.py --subscribers 500 --bubbles 3 --server-latency-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_stub(port: int, latency_s: float) -> None:
+    import uvicorn
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        while (await receive()).get("more_body"):
+            pass
+        if latency_s:
+            await asyncio.sleep(latency_s)
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": b'{"status":"success"}'})
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error", backlog=4096)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+
+async def _run(client, subscribers: int, bubbles: int, concurrency: int) -> float:
+    messages = [{"type": "text", "text": f"Бульбашка {i}: сукня Анна, 1850 грн"} for i in range(bubbles)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def push(i: int) -> bool:
+        async with semaphore:
+            return await client.send_content(f"sub-{i}", messages, channel="instagram")
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(push(i) for i in range(subscribers)))
+    elapsed = time.perf_counter() - start
+    if not all(results):
+        raise RuntimeError(f"{results.count(False)} pushes failed")
+    await client.aclose()
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--bubbles", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--server-latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    import httpx
+
+    from src.integrations.manychat import push_client as push_module
+    from src.integrations.manychat.push_client import ManyChatPushClient
+
+    real_settings = push_module.settings
+
+    class BenchSettings:
+        """Real settings with split-send on and typing/bubble delays off."""
+
+        overrides = {
+            "MANYCHAT_INSTAGRAM_SPLIT_SEND": True,
+            "MANYCHAT_INSTAGRAM_BUBBLE_DELAY_SECONDS": 0.0,
+            "MANYCHAT_INSTAGRAM_MAX_TYPING_DELAY_SECONDS": 0.0,
+            "MANYCHAT_INSTAGRAM_MAX_INTERBUBBLE_DELAY_SECONDS": 0.0,
+        }
+
+        def __getattr__(self, name):
+            if name in self.overrides:
+                return self.overrides[name]
+            return getattr(real_settings, name)
+
+    push_module.settings = BenchSettings()
+
+    class PerRequestClient(ManyChatPushClient):
+        async def _do_send(self, subscriber_id, payload, headers):
+            loop = asyncio.get_running_loop()
+            async with httpx.AsyncClient(timeout=15.0) as client:
+                self._http_clients[loop] = client
+                return await super()._do_send(subscriber_id, payload, headers)
+
+    port = _free_port()
+    _start_stub(port, args.server_latency_ms / 1000)
+    url = f"http://127.0.0.1:{port}"
+
+    requests = args.subscribers * args.bubbles
+    print(f"{args.subscribers} subscribers x {args.bubbles} bubbles = {requests} requests, "
+          f"concurrency {args.concurrency}, stub latency {args.server_latency_ms:.0f}ms")
+    print(f"{'mode':>12} {'total s':>9} {'req/s':>9}")
+    for label, cls in (("per-request", PerRequestClient), ("pooled", ManyChatPushClient)):
+        elapsed = asyncio.run(
+            _run(cls(api_url=url, api_key="bench"), args.subscribers, args.bubbles, args.concurrency)
+        )
+        print(f"{label:>12} {elapsed:>9.2f} {requests / elapsed:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
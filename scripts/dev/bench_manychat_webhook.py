@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Benchmark /webhooks/manychat throughput (Supabase inline vs offloaded).
+=======================================================================
+
+Runs the real FastAPI app in-process (httpx ASGITransport) in push mode with
+a fake Supabase client whose ``execute()`` blocks for ``--db-latency-ms`` -
+the same shape as the real sync postgrest client. Background AI processing
+is stubbed out so only the webhook request path is measured.
+
+Usage:
+    python scripts/dev/bench_manychat_webhook.py
+    python scripts/dev/bench_manychat_webhook.py --requests 400 --concurrency 64 --db-latency-ms 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import httpx
+
+
+class _BlockingQuery:
+    """Chainable stand-in for a postgrest request builder."""
+
+    def __init__(self, latency_s: float) -> None:
+        self._latency_s = latency_s
+
+    def __getattr__(self, name: str) -> Any:
+        return lambda *_args, **_kwargs: self
+
+    def execute(self) -> Any:
+        time.sleep(self._latency_s)
+        return type("Response", (), {"data": [{}]})()
+
+
+class _FakeSupabase:
+    def __init__(self, latency_s: float) -> None:
+        self._latency_s = latency_s
+
+    def table(self, name: str) -> _BlockingQuery:
+        return _BlockingQuery(self._latency_s)
+
+
+class _NoopAsyncService:
+    async def process_message_async(self, **kwargs: Any) -> None:
+        return None
+
+
+async def _run(app: Any, *, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def _one(i: int) -> None:
+            payload = {
+                "subscriber": {"id": f"bench-{i % 50}"},
+                "message": {"id": f"m-{i}", "text": "Привіт, є сукня 128?"},
+            }
+            async with sem:
+                resp = await client.post("/webhooks/manychat", json=payload)
+                resp.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(_one(i) for i in range(total)))
+        return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--db-latency-ms", type=float, default=30.0)
+    args = parser.parse_args()
+    # Per-request INFO/WARNING logging would dominate the measurement
+    logging.disable(logging.CRITICAL)
+
+    from src.conf.config import settings
+    from src.server.main import app
+    from src.services.infra.session_store import InMemorySessionStore
+
+    fake_db = _FakeSupabase(args.db_latency_ms / 1000)
+    results: dict[str, float] = {}
+
+    with (
+        patch.object(settings, "MANYCHAT_PUSH_MODE", True),
+        patch.object(settings, "MANYCHAT_VERIFY_TOKEN", ""),
+        patch.object(settings, "CELERY_ENABLED", False),
+        patch("src.services.infra.supabase_client.get_supabase_client", return_value=fake_db),
+        patch("src.server.dependencies.get_session_store", return_value=InMemorySessionStore()),
+        patch(
+            "src.integrations.manychat.async_service.get_manychat_async_service",
+            return_value=_NoopAsyncService(),
+        ),
+    ):
+        for label, enabled in (("inline", False), ("offloaded", True)):
+            with patch.object(settings, "SUPABASE_OFFLOAD_ENABLED", enabled):
+                elapsed = asyncio.run(_run(app, total=args.requests, concurrency=args.concurrency))
+            results[label] = args.requests / elapsed
+            print(f"{label:>10}: {results[label]:8.1f} req/s  ({elapsed:.2f}s for {args.requests})")
+
+    print(f"   speedup: {results['offloaded'] / results['inline']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""
+Benchmark ``extract_quick_facts`` on Ukrainian customer messages.
+=================================================================
+
+Compares, per message:
+
+- "previous": parse the memory parser YAML for each pattern/template/label
+  lookup (8 parses), then ``re.search`` with pattern strings and substring
+  loops (the previous implementation; run on a sample, it is slow);
+- "compiled": ``QuickFactExtractor.extract`` (config compiled once).
+
+Messages come from ``--messages FILE`` (one per line, e.g. exported chat
+logs) or are generated from typical customer phrases (sizes, ages, gender,
+cities, delivery/payment questions). Both paths are checked to agree.
+
+The shipped ``memory_parser.yaml`` is double-encoded (UTF-8 read as cp1251),
+so its Cyrillic patterns never match; the benchmark repairs the text before
+compiling so the hit rate is realistic. ``--raw-config`` uses it as is.
+
+Usage:
+    python scripts/dev/bench_quick_facts.py
+    python scripts/dev/bench_quick_facts.py --count 5000 --previous-sample 500
+    python scripts/dev/bench_quick_facts.py --messages chats.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+_OPENERS = ["Добрий день!", "Привіт", "Доброго вечора.", "Вітаю,", "", "Скажіть будь ласка,"]
+_CHILD = [
+    "доньці {age} років",
+    "синові {age} рочки",
+    "дитині {age} років",
+    "у мене хлопчик, зріст {height} см",
+    "дівчинка {height}см",
+    "зріст {height}",
+    "ріст {height} см, вага 30 кг",
+    "на донечку {age} років",
+]
+_ASKS = [
+    "який розмір брати?",
+    "чи є костюм у рожевому кольорі?",
+    "скільки коштує доставка?",
+    "можна оплату при отриманні?",
+    "відправте новою поштою в {city}",
+    "живемо у {city}, коли буде доставка?",
+    "хочу замовити сукню Анна",
+    "а є фото на дитині?",
+    "дякую, беру",
+]
+_CITIES = ["Києві", "Харкова", "Одесу", "Дніпро", "Львові", "Сумах", "Полтаву", "Житомир", "Ужгороді"]
+
+
+def _generate(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        parts = [rng.choice(_OPENERS)]
+        if rng.random() < 0.6:
+            parts.append(rng.choice(_CHILD))
+        parts.extend(rng.sample(_ASKS, rng.randint(1, 2)))
+        text = " ".join(p for p in parts if p)
+        messages.append(
+            text.format(age=rng.randint(1, 16), height=rng.randint(80, 170), city=rng.choice(_CITIES))
+        )
+    return messages
+
+
+def _previous(source: str, message: str) -> list[dict[str, Any]]:
+    from src.services.domain.memory.memory_config import parse_memory_parser_config
+
+    def section(name: str) -> dict[str, Any]:
+        value = parse_memory_parser_config(source).get(name, {})
+        return value if isinstance(value, dict) else {}
+
+    def text(name: str, key: str, default: str) -> str:
+        value = section(name).get(key)
+        return value if isinstance(value, str) and value else default
+
+    patterns = section("patterns")
+    templates = {
+        key: text("templates", key, default)
+        for key, default in (
+            ("height", "Child height: {height} cm"),
+            ("age", "Child age: {age}"),
+            ("gender_girl", "Gender: girl"),
+            ("gender_boy", "Gender: boy"),
+            ("city", "City: {city}"),
+        )
+    }
+    labels = {key: text("labels", f"gender_{key}", key) for key in ("girl", "boy")}
+
+    facts: list[dict[str, Any]] = []
+    msg_lower = message.lower()
+    for kind, field, low, high in (("height", "height_cm", 70, 180), ("age", "age", 0, 18)):
+        for pattern in patterns.get(kind, []):
+            match = re.search(pattern, msg_lower)
+            if match and low <= int(match.group(1)) <= high:
+                value = int(match.group(1))
+                facts.append(
+                    {
+                        "content": templates[kind].format(**{kind: value}),
+                        "fact_type": "child_info",
+                        "category": "child",
+                        "extracted_value": value,
+                        "field": field,
+                    }
+                )
+                break
+    gender = patterns.get("gender", {})
+    for key in ("girl", "boy"):
+        if any(word in msg_lower for word in gender.get(key, [])):
+            facts.append(
+                {
+                    "content": templates[f"gender_{key}"],
+                    "fact_type": "child_info",
+                    "category": "child",
+                    "extracted_value": labels[key],
+                    "field": "gender",
+                }
+            )
+            break
+    for item in patterns.get("cities", []):
+        if any(var in msg_lower for var in item.get("variations", [])):
+            facts.append(
+                {
+                    "content": templates["city"].format(city=item["canonical"]),
+                    "fact_type": "logistics",
+                    "category": "delivery",
+                    "extracted_value": item["canonical"],
+                    "field": "city",
+                }
+            )
+            break
+    return facts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=3000, help="generated messages")
+    parser.add_argument("--messages", type=Path, help="file with one message per line")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--previous-sample", type=int, default=200, help="messages run through the (slow) previous path"
+    )
+    parser.add_argument("--raw-config", action="store_true", help="don't repair the config encoding")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    from src.services.domain.memory.memory_config import (
+        memory_parser_source,
+        parse_memory_parser_config,
+    )
+    from src.services.domain.memory.quick_facts import QuickFactExtractor
+
+    source = memory_parser_source()
+    if not args.raw_config:
+        # Raises if the config is already proper UTF-8 text
+        with contextlib.suppress(UnicodeEncodeError, UnicodeDecodeError):
+            source = source.encode("cp1251").decode("utf-8")
+
+    if args.messages:
+        messages = [m for m in args.messages.read_text(encoding="utf-8").splitlines() if m.strip()]
+    else:
+        messages = _generate(args.count, args.seed)
+
+    start = time.perf_counter()
+    extractor = QuickFactExtractor(parse_memory_parser_config(source))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    results = {}
+    timings = {}
+    for label, run, batch in (
+        ("previous", lambda m: _previous(source, m), messages[: args.previous_sample]),
+        ("compiled", extractor.extract, messages),
+    ):
+        start = time.perf_counter()
+        results[label] = [run(m) for m in batch]
+        timings[label] = (len(batch), time.perf_counter() - start)
+
+    sampled = results["compiled"][: len(results["previous"])]
+    mismatches = sum(a != b for a, b in zip(results["previous"], sampled, strict=True))
+    with_facts = sum(bool(r) for r in results["compiled"])
+    print(
+        f"{len(messages)} messages, {with_facts} with facts, "
+        f"mismatches on first {len(results['previous'])}: {mismatches}, compile {build_ms:.2f} ms"
+    )
+    print(f"{'mode':>9} {'messages':>9} {'total s':>9} {'us/msg':>10} {'msg/s':>10}")
+    for label, (count, elapsed) in timings.items():
+        print(
+            f"{label:>9} {count:>9} {elapsed:>9.3f} {elapsed / max(count, 1) * 1e6:>10.1f} "
+            f"{count / elapsed if elapsed else 0:>10.0f}"
+        )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
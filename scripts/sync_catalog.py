@@ -10,7 +10,8 @@ import logging
 from pathlib import Path
 import yaml
 
-from src.services.supabase_client import get_supabase_client
+from src.services.data.catalog_cache import publish_catalog_invalidation
+from src.services.infra.supabase_client import get_supabase_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -129,6 +130,10 @@ async def sync_catalog():
     print(f"   ✅ Inserted: {inserted}")
     print(f"   ❌ Errors: {errors}")
 
+    # Drop shared cache keys and tell running servers to clear their L1 cache
+    receivers = publish_catalog_invalidation()
+    print(f"   🔄 Cache invalidation sent to {receivers} subscriber(s)")
+
 
 if __name__ == "__main__":
     asyncio.run(sync_catalog())
@@ -0,0 +1,269 @@
+"""
+Delta storage for the checkpoint ``messages`` channel.
+=======================================================
+LangGraph's Postgres saver already writes a channel blob only when the
+channel version changes, but ``messages`` changes on every step, so the whole
+history is written again each time.
+
+In delta mode the stored ``messages`` value is either the full list (a
+snapshot) or a delta against an earlier stored version::
+
+    {DELTA_MARKER: 1, "chain": [snapshot_v, ..., base_v], "start": s, "stop": e, "append": [...]}
+
+meaning ``resolve(base_v)[s:e] + append``. ``chain`` lists every version
+back to the last snapshot so a read fetches them in one query. A full
+snapshot is written every ``snapshot_every`` versions, which bounds the
+chain length.
+
+Stored blobs are immutable (``ON CONFLICT DO NOTHING``), so resolved lists
+are cached per ``(thread_id, checkpoint_ns, version)``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+DELTA_MARKER = "__mirt_messages_delta__"
+MESSAGES_CHANNEL = "messages"
+
+ThreadKey = tuple[str, str]
+FetchVersions = Callable[[list[str]], Awaitable[dict[str, Any]]]
+
+
+def is_delta(value: Any) -> bool:
+    return isinstance(value, dict) and DELTA_MARKER in value
+
+
+def _apply(base: list[Any] | None, stored: Any) -> list[Any]:
+    """Materialize one stored value on top of its base version."""
+    if not is_delta(stored):
+        return list(stored or [])
+    if base is None:
+        raise LookupError("delta base is missing")
+    return base[stored["start"]:stored["stop"]] + list(stored["append"])
+
+
+def _shared_span(previous: list[Any], messages: list[Any]) -> tuple[int, int] | None:
+    """``(start, stop)`` such that ``previous[start:stop]`` prefixes ``messages``."""
+    if not previous or not messages:
+        return None
+    first = messages[0]
+    start = next((i for i, m in enumerate(previous) if m is first), None)
+    if start is None:
+        start = next((i for i, m in enumerate(previous) if m == first), None)
+    if start is None:
+        return None
+    stop = start
+    for old, new in zip(previous[start:], messages, strict=False):
+        if old is not new and old != new:
+            break
+        stop += 1
+    return start, stop
+
+
+@dataclass
+class PendingWrite:
+    """A stored messages version, committed once the checkpoint write succeeds."""
+
+    thread_key: ThreadKey
+    version: str
+    messages: list[Any]
+    chain: list[str] = field(default_factory=list)
+
+
+class MessageDeltaCodec:
+    """Encode ``messages`` as deltas on write and resolve them on read."""
+
+    def __init__(self, snapshot_every: int = 20, max_threads: int = 256) -> None:
+        self._snapshot_every = max(1, snapshot_every)
+        self._max_threads = max(1, max_threads)
+        self._written: OrderedDict[ThreadKey, PendingWrite] = OrderedDict()
+        self._resolved: OrderedDict[tuple[str, str, str], list[Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    def encode(
+        self,
+        thread_key: ThreadKey | None,
+        checkpoint: Any,
+        new_versions: Any,
+    ) -> tuple[Any, PendingWrite | None]:
+        """Replace ``messages`` with a delta against the last stored version.
+
+        Returns the checkpoint to store and a ``PendingWrite`` to ``commit``
+        after the write succeeds (None when ``messages`` is not written).
+        """
+        if thread_key is None or not isinstance(checkpoint, dict) or not isinstance(new_versions, dict):
+            return checkpoint, None
+        cv = checkpoint.get("channel_values")
+        version = new_versions.get(MESSAGES_CHANNEL)
+        if not isinstance(cv, dict) or version is None or not isinstance(cv.get(MESSAGES_CHANNEL), list):
+            return checkpoint, None
+
+        messages = cv[MESSAGES_CHANNEL]
+        with self._lock:
+            previous = self._written.get(thread_key)
+
+        pending = PendingWrite(thread_key, str(version), list(messages))
+        if previous is None or len(previous.chain) + 1 >= self._snapshot_every:
+            return checkpoint, pending
+        span = _shared_span(previous.messages, messages)
+        if span is None:
+            return checkpoint, pending
+
+        start, stop = span
+        pending.chain = [*previous.chain, previous.version]
+        delta = {
+            DELTA_MARKER: 1,
+            "chain": pending.chain,
+            "start": start,
+            "stop": stop,
+            "append": messages[stop - start:],
+        }
+        return {**checkpoint, "channel_values": {**cv, MESSAGES_CHANNEL: delta}}, pending
+
+    def commit(self, pending: PendingWrite | None) -> None:
+        if pending is None:
+            return
+        with self._lock:
+            self._written[pending.thread_key] = pending
+            self._written.move_to_end(pending.thread_key)
+            while len(self._written) > self._max_threads:
+                self._written.popitem(last=False)
+            self._cache(pending.thread_key, pending.version, pending.messages)
+
+    def forget(self, thread_id: str | None = None) -> None:
+        """Drop cached versions for a thread (all namespaces) or for all threads."""
+        with self._lock:
+            if thread_id is None:
+                self._written.clear()
+                self._resolved.clear()
+                return
+            for key in [k for k in self._written if k[0] == thread_id]:
+                del self._written[key]
+            for key in [k for k in self._resolved if k[0] == thread_id]:
+                del self._resolved[key]
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+
+    def _cache(self, thread_key: ThreadKey, version: str, messages: list[Any]) -> None:
+        key = (*thread_key, version)
+        self._resolved[key] = messages
+        self._resolved.move_to_end(key)
+        while len(self._resolved) > self._max_threads * 4:
+            self._resolved.popitem(last=False)
+
+    def _cached(self, thread_key: ThreadKey, version: str) -> list[Any] | None:
+        with self._lock:
+            return self._resolved.get((*thread_key, version))
+
+    async def resolve(
+        self,
+        thread_key: ThreadKey,
+        checkpoint: Any,
+        fetch: FetchVersions,
+        *,
+        remember: bool = False,
+    ) -> Any:
+        """Return ``checkpoint`` with a delta-encoded ``messages`` materialized.
+
+        ``fetch`` loads stored values for a list of versions. With
+        ``remember`` the resolved version becomes the base for the next
+        delta written to this thread.
+        """
+        if not isinstance(checkpoint, dict):
+            return checkpoint
+        cv = checkpoint.get("channel_values")
+        versions = checkpoint.get("channel_versions") or {}
+        stored = cv.get(MESSAGES_CHANNEL) if isinstance(cv, dict) else None
+        version = versions.get(MESSAGES_CHANNEL)
+        if stored is None or version is None:
+            return checkpoint
+
+        version = str(version)
+        if not is_delta(stored):
+            if remember and isinstance(stored, list):
+                self.commit(PendingWrite(thread_key, version, list(stored)))
+            return checkpoint
+
+        messages = self._cached(thread_key, version)
+        if messages is None:
+            try:
+                messages = await self._materialize(thread_key, version, stored, fetch)
+            except LookupError as exc:
+                # Fall back to the newest version the chain still reaches and
+                # make the next write a full snapshot, so a missing blob never
+                # gets persisted as a truncated history.
+                messages = await self._recover(stored, fetch)
+                logger.error(
+                    "[CHECKPOINTER:DELTA] Cannot resolve messages for thread %s version %s: %s "
+                    "(recovered %d messages from the last snapshot)",
+                    thread_key[0],
+                    version,
+                    exc,
+                    len(messages),
+                )
+                with self._lock:
+                    self._written.pop(thread_key, None)
+                return {**checkpoint, "channel_values": {**cv, MESSAGES_CHANNEL: list(messages)}}
+
+        if remember:
+            self.commit(PendingWrite(thread_key, version, messages, list(stored["chain"])))
+        return {**checkpoint, "channel_values": {**cv, MESSAGES_CHANNEL: list(messages)}}
+
+    async def _recover(self, stored: dict[str, Any], fetch: FetchVersions) -> list[Any]:
+        """Newest version reachable from the chain's snapshot; raises if it is gone."""
+        chain = [str(v) for v in stored["chain"]]
+        loaded = await fetch(chain)
+        base: list[Any] | None = None
+        for v in chain:
+            if v not in loaded:
+                break
+            try:
+                base = _apply(base, loaded[v])
+            except LookupError:
+                break
+        if base is None:
+            raise LookupError(f"no stored snapshot for delta chain {chain}")
+        return base
+
+    async def _materialize(
+        self,
+        thread_key: ThreadKey,
+        version: str,
+        stored: dict[str, Any],
+        fetch: FetchVersions,
+    ) -> list[Any]:
+        chain = [str(v) for v in stored["chain"]]
+        base: list[Any] | None = None
+        first_missing = 0
+        for i in range(len(chain) - 1, -1, -1):
+            base = self._cached(thread_key, chain[i])
+            if base is not None:
+                first_missing = i + 1
+                break
+
+        missing = chain[first_missing:]
+        loaded = await fetch(missing) if missing else {}
+        with self._lock:
+            for v in missing:
+                if v not in loaded:
+                    raise LookupError(f"stored version {v} not found")
+                base = _apply(base, loaded[v])
+                self._cache(thread_key, v, base)
+            messages = _apply(base, stored)
+            self._cache(thread_key, version, messages)
+        return messages
@@ -18,6 +18,9 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING
 
@@ -31,8 +34,16 @@ if TYPE_CHECKING:
 import time
 from typing import Any
 
+from .checkpoint_delta import MESSAGES_CHANNEL, MessageDeltaCodec, is_delta
+
+
 logger = logging.getLogger(__name__)
 
+SELECT_MESSAGE_VERSIONS_SQL = """
+    SELECT version, type, blob FROM checkpoint_blobs
+    WHERE thread_id = %s AND checkpoint_ns = %s AND channel = %s AND version = ANY(%s)
+"""
+
 
 def _serialize_base_message(msg: BaseMessage) -> dict[str, Any]:
     """Convert BaseMessage to dict format for JSON serialization."""
@@ -60,6 +71,18 @@ def _serialize_for_json(value: Any) -> Any:
         return value
 
 
+def _message_to_dict(msg: Any) -> dict[str, Any]:
+    """Convert a single checkpoint message to its JSON-friendly dict form."""
+    if isinstance(msg, BaseMessage):
+        return _serialize_base_message(msg)
+    if isinstance(msg, dict):
+        return msg
+    try:
+        return dict(msg) if hasattr(msg, "__dict__") else {"role": "assistant", "content": str(msg)}
+    except Exception:
+        return {"role": "assistant", "content": str(msg)}
+
+
 def _serialize_checkpoint_messages(checkpoint: dict[str, Any]) -> dict[str, Any]:
     """Serialize BaseMessage objects in checkpoint before storage."""
     if not isinstance(checkpoint, dict):
@@ -73,24 +96,409 @@ def _serialize_checkpoint_messages(checkpoint: dict[str, Any]) -> dict[str, Any]
         return checkpoint
     
     # Convert BaseMessage objects to dicts
-    serialized_messages = []
-    for msg in cv["messages"]:
-        if isinstance(msg, BaseMessage):
-            serialized_messages.append(_serialize_base_message(msg))
-        elif isinstance(msg, dict):
-            serialized_messages.append(msg)
-        else:
-            try:
-                serialized_messages.append(dict(msg) if hasattr(msg, "__dict__") else {"role": "assistant", "content": str(msg)})
-            except Exception:
-                serialized_messages.append({"role": "assistant", "content": str(msg)})
-    
-    cv["messages"] = serialized_messages
+    cv["messages"] = [_message_to_dict(msg) for msg in cv["messages"]]
     if "channel_values" in checkpoint:
         return {**checkpoint, "channel_values": cv}
     return cv
 
 
+# =============================================================================
+# PAYLOAD COMPACTION
+# =============================================================================
+
+_IMAGE_PLACEHOLDER = "[IMAGE DATA REMOVED]"
+_TRUNCATED_SUFFIX = "... [TRUNCATED]"
+
+# Adaptive compaction: payloads above this size get more aggressive limits
+_ADAPTIVE_THRESHOLD_BYTES = 100 * 1024
+_ADAPTIVE_MAX_MESSAGES = 100
+_ADAPTIVE_MAX_CHARS = 2000
+_MAX_STEP_HISTORY = 10
+
+# SAFEGUARD_1: Whitelist critical fields - they are stored verbatim
+_CRITICAL_FIELDS = frozenset({
+    "selected_products",
+    "customer_name",
+    "customer_phone",
+    "customer_city",
+    "customer_nova_poshta",
+})
+_LARGE_METADATA_KEYS = ("debug_info", "trace_id", "trace_details")
+_LARGE_AGENT_RESPONSE_KEYS = ("deliberation", "debug_info", "raw_response")
+
+try:
+    import orjson  # type: ignore[reportMissingImports]
+
+    def _json_size(value: Any) -> int:
+        """Size in bytes of ``value`` serialized the way the checkpoint is stored."""
+        return len(orjson.dumps(_serialize_for_json(value), default=str, option=orjson.OPT_NON_STR_KEYS))
+except ImportError:  # pragma: no cover - orjson is a hard dependency in production
+    import json
+
+    def _json_size(value: Any) -> int:
+        """Size in bytes of ``value`` serialized the way the checkpoint is stored."""
+        return len(json.dumps(_serialize_for_json(value), default=str, ensure_ascii=False).encode("utf-8"))
+
+
+def _json_object_size(member_sizes: dict[str, int]) -> int:
+    """Size of a JSON object whose members serialize to ``member_sizes`` bytes."""
+    if not member_sizes:
+        return 2
+    keys = sum(_json_size(key) + 1 for key in member_sizes)
+    return 2 + keys + sum(member_sizes.values()) + len(member_sizes) - 1
+
+
+def _json_array_size(item_sizes: list[int]) -> int:
+    """Size of a JSON array whose items serialize to ``item_sizes`` bytes."""
+    return 2 + sum(item_sizes) + max(len(item_sizes) - 1, 0)
+
+
+def _strip_base64(obj: Any) -> Any:
+    """Recursively replace base64/data URLs with a stable placeholder."""
+    if isinstance(obj, str):
+        if "data:image" in obj or "base64" in obj:
+            return _IMAGE_PLACEHOLDER
+        return obj
+    if isinstance(obj, dict):
+        return {k: _strip_base64(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_strip_base64(v) for v in obj]
+    return obj
+
+
+def _message_content(msg: Any) -> Any:
+    if isinstance(msg, dict):
+        return msg.get("content")
+    return getattr(msg, "content", None)
+
+
+def _compact_message(data: dict[str, Any], max_chars: int, drop_base64: bool) -> dict[str, Any]:
+    """Compact one serialized message without touching the input dict."""
+    out = dict(data)
+    content = out.get("content")
+    if isinstance(content, str):
+        if drop_base64 and ("base64" in content or "data:image" in content):
+            content = _IMAGE_PLACEHOLDER
+        if len(content) > max_chars:
+            content = content[:max_chars] + _TRUNCATED_SUFFIX
+        out["content"] = content
+    return _strip_base64(out) if drop_base64 else out
+
+
+def _compact_channel(name: str, value: Any, max_chars: int, drop_base64: bool, adaptive: bool) -> Any:
+    """Compact one non-message channel value without touching the input."""
+    if name == "metadata" and isinstance(value, dict):
+        value = dict(value)
+        history = value.get("step_history")
+        if isinstance(history, list) and len(history) > _MAX_STEP_HISTORY:
+            value["step_history"] = history[-_MAX_STEP_HISTORY:]
+        if adaptive:
+            for key in _LARGE_METADATA_KEYS:
+                value.pop(key, None)
+    elif name == "agent_response" and isinstance(value, dict):
+        value = dict(value)
+        if adaptive:
+            for key in _LARGE_AGENT_RESPONSE_KEYS:
+                value.pop(key, None)
+        for key in ("response_text", "reasoning"):
+            text = value.get(key)
+            if isinstance(text, str) and len(text) > max_chars:
+                value[key] = text[:max_chars] + _TRUNCATED_SUFFIX
+    return _strip_base64(value) if drop_base64 else value
+
+
+class _MessageEntry:
+    """A message together with its cached serialized and compacted forms."""
+
+    __slots__ = ("content", "limits", "out", "out_size", "raw", "raw_size", "src")
+
+    def __init__(self, src: Any, raw: dict[str, Any], raw_size: int | None = None) -> None:
+        self.src = src
+        self.content = _message_content(src)
+        self.raw = raw
+        self.raw_size = _json_size(raw) if raw_size is None else raw_size
+        self.out: dict[str, Any] | None = None
+        self.out_size = 0
+        self.limits: tuple[int, bool] | None = None
+
+    @classmethod
+    def build(cls, msg: Any) -> _MessageEntry:
+        raw = _message_to_dict(msg)
+        # Snapshot caller-owned dicts so later in-place edits are detected
+        return cls(msg, dict(raw) if raw is msg else raw)
+
+    def reuse_for(self, msg: Any) -> _MessageEntry | None:
+        """Return an entry valid for ``msg`` if it is the message compacted before."""
+        if msg is self.src:
+            return self if _message_content(msg) is self.content else None
+        data = _message_to_dict(msg)
+        if data == self.raw:
+            entry = _MessageEntry(msg, self.raw, self.raw_size)
+        elif self.out is not None and data == self.out:
+            # Reloaded from storage in compacted form; compaction is idempotent
+            entry = _MessageEntry(msg, self.out, self.out_size)
+        else:
+            return None
+        entry.out, entry.out_size, entry.limits = self.out, self.out_size, self.limits
+        return entry
+
+    def compacted(self, limits: tuple[int, bool]) -> dict[str, Any]:
+        if self.out is None or self.limits != limits:
+            self.out = _compact_message(self.raw, *limits)
+            self.out_size = _json_size(self.out)
+            self.limits = limits
+        return self.out
+
+
+class _ChannelEntry:
+    """A channel value cached by its LangGraph channel version."""
+
+    __slots__ = ("limits", "out", "out_size", "raw_size", "value", "version")
+
+    def __init__(self, version: Any, value: Any) -> None:
+        self.version = version
+        self.value = value
+        self.raw_size = _json_size(value)
+        self.out: Any = None
+        self.out_size = 0
+        self.limits: tuple[int, bool, bool] | None = None
+
+    def compacted(self, name: str, limits: tuple[int, bool, bool]) -> Any:
+        if name in _CRITICAL_FIELDS:
+            self.out, self.out_size = self.value, self.raw_size
+        elif self.limits != limits:
+            self.out = _compact_channel(name, self.value, *limits)
+            self.out_size = _json_size(self.out)
+            self.limits = limits
+        return self.out
+
+
+class _ThreadState:
+    __slots__ = ("channels", "kept_from", "messages")
+
+    def __init__(self) -> None:
+        self.messages: list[_MessageEntry] = []
+        # Index of the first message that was kept (i.e. written to storage)
+        self.kept_from = 0
+        self.channels: dict[str, _ChannelEntry] = {}
+
+
+def _align_messages(state: _ThreadState, messages: list[Any]) -> tuple[list[_MessageEntry], int]:
+    """Reuse entries for the run of ``messages`` that was already compacted.
+
+    Within a graph run the messages channel holds the full history, so it
+    lines up with the previous entries from the start. A new run starts from
+    the stored checkpoint, which begins at the first kept message.
+    """
+    previous = state.messages
+    entries: list[_MessageEntry] = []
+    if previous and messages:
+        for start in dict.fromkeys((0, state.kept_from)):
+            if start >= len(previous):
+                continue
+            entry = previous[start].reuse_for(messages[0])
+            if entry is None:
+                continue
+            entries.append(entry)
+            for msg, candidate in zip(messages[1:], previous[start + 1:], strict=False):
+                entry = candidate.reuse_for(msg)
+                if entry is None:
+                    break
+                entries.append(entry)
+            break
+    reused = len(entries)
+    entries.extend(_MessageEntry.build(msg) for msg in messages[reused:])
+    return entries, reused
+
+
+@dataclass(frozen=True)
+class CompactionStats:
+    """Outcome of one compaction pass (sizes are estimated JSON bytes)."""
+
+    size_before: int
+    size_after: int
+    messages_before: int
+    messages_after: int
+    reused_messages: int
+    adaptive: bool
+
+
+class CheckpointCompactor:
+    """Incremental checkpoint compaction.
+
+    Keeps, per ``(thread_id, checkpoint_ns)``, the compacted form and JSON byte
+    count of every message seen in the last write and of every channel value
+    by its ``channel_versions`` entry. Each ``aput`` then only serializes and
+    compacts messages appended since the previous one and channels whose
+    version changed; payload sizes are summed from the cached byte counts
+    instead of dumping the whole checkpoint.
+
+    The output is identical to a full pass: a cached message is reused only
+    when it is the same object with the same ``content`` or serializes equal
+    to the previously compacted message.
+    """
+
+    def __init__(self, max_threads: int = 256) -> None:
+        self._max_threads = max(1, max_threads)
+        self._states: OrderedDict[tuple[str, str], _ThreadState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _state_for(self, thread_key: tuple[str, str] | None) -> _ThreadState:
+        if thread_key is None:
+            return _ThreadState()
+        with self._lock:
+            state = self._states.get(thread_key)
+            if state is None:
+                state = self._states[thread_key] = _ThreadState()
+                while len(self._states) > self._max_threads:
+                    self._states.popitem(last=False)
+            else:
+                self._states.move_to_end(thread_key)
+            return state
+
+    def forget(self, thread_key: tuple[str, str] | None = None) -> None:
+        """Drop cached state for one thread (or all threads)."""
+        with self._lock:
+            if thread_key is None:
+                self._states.clear()
+            else:
+                self._states.pop(thread_key, None)
+
+    def compact(
+        self,
+        checkpoint: Any,
+        *,
+        thread_key: tuple[str, str] | None = None,
+        max_messages: int = 200,
+        max_chars: int = 4000,
+        drop_base64: bool = True,
+    ) -> tuple[Any, CompactionStats | None]:
+        """Compact ``checkpoint``; returns ``(checkpoint, stats)``.
+
+        ``stats`` is None when nothing was compacted (disabled or not a
+        checkpoint). Input values are never mutated.
+        """
+        from src.conf.config import get_settings
+
+        settings = get_settings()
+
+        # SAFEGUARD_4: Optional disable for debugging
+        if not settings.COMPACTION_ENABLED:
+            logger.debug("[COMPACTION] Disabled via COMPACTION_ENABLED=false")
+            return checkpoint, None
+
+        if not isinstance(checkpoint, dict) or not isinstance(checkpoint.get("channel_values"), dict):
+            return checkpoint, None
+
+        state = self._state_for(thread_key)
+        cv = checkpoint["channel_values"]
+        versions = checkpoint.get("channel_versions")
+        if not isinstance(versions, dict):
+            versions = {}
+
+        messages = cv.get("messages") if isinstance(cv.get("messages"), list) else None
+        entries, reused = _align_messages(state, messages or [])
+
+        channels: dict[str, _ChannelEntry] = {}
+        for name, value in cv.items():
+            if name == "messages" and messages is not None:
+                continue
+            version = versions.get(name)
+            entry = state.channels.get(name)
+            if entry is None or version is None or entry.version != version:
+                entry = _ChannelEntry(version, value)
+            channels[name] = entry
+
+        envelope = {k: _json_size(v) for k, v in checkpoint.items() if k != "channel_values"}
+
+        def _total(message_sizes: list[int], channel_sizes: dict[str, int]) -> int:
+            cv_sizes = dict(channel_sizes)
+            if messages is not None:
+                cv_sizes["messages"] = _json_array_size(message_sizes)
+            return _json_object_size({**envelope, "channel_values": _json_object_size(cv_sizes)})
+
+        # SAFEGUARD_2: Size before compaction
+        size_before = _total(
+            [e.raw_size for e in entries],
+            {name: e.raw_size for name, e in channels.items()},
+        )
+
+        adaptive = size_before > _ADAPTIVE_THRESHOLD_BYTES
+        if adaptive:
+            # More aggressive compaction for large payloads
+            max_messages = min(max_messages, _ADAPTIVE_MAX_MESSAGES)
+            max_chars = min(max_chars, _ADAPTIVE_MAX_CHARS)
+            logger.debug(
+                "[COMPACTION] Large payload detected (%d bytes), using aggressive compaction: max_messages=%d max_chars=%d",
+                size_before,
+                max_messages,
+                max_chars,
+            )
+
+        # Limit message count (keep tail)
+        kept = entries[-max_messages:] if len(entries) > max_messages else entries
+
+        new_cv: dict[str, Any] = {}
+        for name in cv:
+            if name == "messages" and messages is not None:
+                new_cv[name] = [e.compacted((max_chars, drop_base64)) for e in kept]
+            else:
+                new_cv[name] = channels[name].compacted(name, (max_chars, drop_base64, adaptive))
+
+        # SAFEGUARD_2: Size after compaction
+        size_after = _total(
+            [e.out_size for e in kept],
+            {name: e.out_size for name, e in channels.items()},
+        )
+
+        if thread_key is not None:
+            state.messages = entries
+            state.kept_from = len(entries) - len(kept)
+            state.channels = channels
+
+        stats = CompactionStats(
+            size_before=size_before,
+            size_after=size_after,
+            messages_before=len(entries),
+            messages_after=len(kept),
+            reused_messages=reused,
+            adaptive=adaptive,
+        )
+        _log_compaction(stats)
+        return {**checkpoint, "channel_values": new_cv}, stats
+
+
+def _log_compaction(stats: CompactionStats) -> None:
+    ratio = stats.size_after / stats.size_before if stats.size_before > 0 else 1.0
+    # Only log at INFO if compaction actually reduced size significantly or is adaptive
+    if stats.adaptive or ratio < 0.8:
+        logger.info(
+            "[COMPACTION] Payload compacted: size_before=%d size_after=%d ratio=%.2f messages_before=%d messages_after=%d adaptive=%s",
+            stats.size_before,
+            stats.size_after,
+            ratio,
+            stats.messages_before,
+            stats.messages_after,
+            stats.adaptive,
+        )
+    else:
+        logger.debug(
+            "[COMPACTION] Payload compacted: size_before=%d size_after=%d ratio=%.2f messages_before=%d messages_after=%d reused=%d",
+            stats.size_before,
+            stats.size_after,
+            ratio,
+            stats.messages_before,
+            stats.messages_after,
+            stats.reused_messages,
+        )
+
+
+_stateless_compactor = CheckpointCompactor(max_threads=1)
+
+
 def _compact_payload(
     checkpoint: dict[str, Any],
     max_messages: int = 200,
@@ -109,204 +517,25 @@ def _compact_payload(
     - Whitelist critical fields (selected_products, customer_*)
     - Logging size before/after compaction
     - Optional disable via COMPACTION_ENABLED env var
-    """
-    from src.conf.config import get_settings
-
-    settings = get_settings()
-    
-    # SAFEGUARD_4: Optional disable for debugging
-    if not settings.COMPACTION_ENABLED:
-        logger.debug("[COMPACTION] Disabled via COMPACTION_ENABLED=false")
-        return checkpoint
 
-    if not isinstance(checkpoint, dict) or "channel_values" not in checkpoint:
-        return checkpoint
+    Stateless full pass; ``InstrumentedAsyncPostgresSaver`` uses a shared
+    ``CheckpointCompactor`` so repeated writes of a thread are incremental.
+    """
+    compacted, _ = _stateless_compactor.compact(
+        checkpoint,
+        max_messages=max_messages,
+        max_chars=max_chars,
+        drop_base64=drop_base64,
+    )
+    return compacted
 
-    cv = checkpoint["channel_values"]
-
-    def _strip_base64(obj: Any) -> Any:
-        """Recursively replace base64/data URLs with a stable placeholder."""
-        if isinstance(obj, str):
-            if drop_base64 and ("data:image" in obj or "base64" in obj):
-                return "[IMAGE DATA REMOVED]"
-            return obj
-        if isinstance(obj, dict):
-            return {k: _strip_base64(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [_strip_base64(v) for v in obj]
-        return obj
-    
-    # SAFEGUARD_1: Whitelist critical fields - preserve them
-    CRITICAL_FIELDS = {
-        "selected_products",
-        "customer_name",
-        "customer_phone",
-        "customer_city",
-        "customer_nova_poshta",
-    }
-    
-    # Store critical fields before compaction
-    critical_data = {}
-    for field in CRITICAL_FIELDS:
-        if field in cv:
-            critical_data[field] = cv[field]
-    
-    # SAFEGUARD_2: Log size before compaction
-    try:
-        import orjson  # type: ignore[reportMissingImports]
-        json_dumps = lambda obj: orjson.dumps(_serialize_for_json(obj)).decode("utf-8")
-    except ImportError:
-        import json
-        json_dumps = lambda obj: json.dumps(_serialize_for_json(obj), default=str)
-    
-    payload_before = json_dumps(checkpoint)
-    payload_size_before = len(payload_before)
-    messages_before = len(cv.get("messages", [])) if "messages" in cv else 0
-    
-    # Adaptive compaction: if payload is large, use more aggressive settings
-    ADAPTIVE_THRESHOLD_KB = 100  # 100KB
-    is_large_payload = payload_size_before > (ADAPTIVE_THRESHOLD_KB * 1024)
-    
-    if is_large_payload:
-        # More aggressive compaction for large payloads
-        max_messages = min(max_messages, 100)  # Reduce to 100 if > 200
-        max_chars = min(max_chars, 2000)  # Reduce to 2000 if > 4000
-        logger.debug(
-            "[COMPACTION] Large payload detected (%d bytes), using aggressive compaction: max_messages=%d max_chars=%d",
-            payload_size_before,
-            max_messages,
-            max_chars,
-        )
-    
-    if "messages" not in cv or not isinstance(cv["messages"], list):
-        # Even without messages, we can compact other fields
-        pass
-    else:
-        messages = cv["messages"]
-        
-        # 1. Limit message count (keep tail)
-        if len(messages) > max_messages:
-            messages = messages[-max_messages:]
-
-        compacted = []
-        for msg in messages:
-            # For LangChain messages or dicts
-            content = getattr(msg, "content", None)
-            is_obj = True
-            if content is None and isinstance(msg, dict):
-                content = msg.get("content")
-                is_obj = False
-            
-            if isinstance(content, str):
-                # 2. Drop base64
-                if drop_base64 and ("base64" in content or "data:image" in content):
-                    content = "[IMAGE DATA REMOVED]"
-                
-                # 3. Truncate chars
-                if len(content) > max_chars:
-                    content = content[:max_chars] + "... [TRUNCATED]"
-                
-                if is_obj:
-                    msg.content = content
-                else:
-                    msg["content"] = content
-            
-            compacted.append(msg)
-        
-        cv["messages"] = compacted
-
-    # 4. Compact metadata (keep only last N entries if it's a history)
-    if "metadata" in cv and isinstance(cv["metadata"], dict):
-        metadata = cv["metadata"]
-        # Compact step_history if it exists
-        if "step_history" in metadata and isinstance(metadata["step_history"], list):
-            max_history_entries = 10
-            if len(metadata["step_history"]) > max_history_entries:
-                metadata["step_history"] = metadata["step_history"][-max_history_entries:]
-                logger.debug("[COMPACTION] Truncated step_history to last %d entries", max_history_entries)
-        
-        # Remove debug info for large payloads
-        if is_large_payload:
-            for key in list(metadata.keys()):
-                if key in ("debug_info", "trace_id", "trace_details"):
-                    del metadata[key]
-                    logger.debug("[COMPACTION] Removed %s from metadata", key)
-    
-    # 5. Compact agent_response (remove large fields)
-    if "agent_response" in cv and isinstance(cv["agent_response"], dict):
-        agent_response = cv["agent_response"]
-        # Remove deliberation and debug info for large payloads
-        if is_large_payload:
-            for key in list(agent_response.keys()):
-                if key in ("deliberation", "debug_info", "raw_response"):
-                    del agent_response[key]
-                    logger.debug("[COMPACTION] Removed %s from agent_response", key)
-        # Truncate long text fields
-        for key in ("response_text", "reasoning"):
-            if key in agent_response and isinstance(agent_response[key], str):
-                if len(agent_response[key]) > max_chars:
-                    agent_response[key] = agent_response[key][:max_chars] + "... [TRUNCATED]"
-    
-    # 6. Compact selected_products (keep only essential fields)
-    if "selected_products" in cv and isinstance(cv["selected_products"], list) and is_large_payload:
-        # Only compact if payload is large and field is not critical
-        # But we preserve it in critical_data, so we can safely compact here
-        compacted_products = []
-        for product in cv["selected_products"]:
-            if isinstance(product, dict):
-                # Keep only essential fields
-                compacted_product = {
-                    "name": product.get("name"),
-                    "sku": product.get("sku"),
-                    "price": product.get("price"),
-                    "quantity": product.get("quantity"),
-                }
-                # Remove large fields like images, descriptions, etc.
-                compacted_products.append(compacted_product)
-            else:
-                compacted_products.append(product)
-        cv["selected_products"] = compacted_products
-        logger.debug("[COMPACTION] Compacted selected_products to essential fields only")
-    
-    # 7. Strip base64/data URLs from the rest of channel_values (e.g. image_url)
-    # This keeps checkpoints small and makes tests deterministic.
-    cv = _strip_base64(cv)
-    checkpoint["channel_values"] = cv
-    
-    # SAFEGUARD_1: Restore critical fields (they should never be compacted)
-    for field, value in critical_data.items():
-        cv[field] = value
-    
-    # SAFEGUARD_2: Log size after compaction
-    payload_after = json_dumps(checkpoint)
-    payload_size_after = len(payload_after)
-    messages_after = len(cv.get("messages", []))
 
-    compaction_ratio = payload_size_after / payload_size_before if payload_size_before > 0 else 1.0
-    
-    # Log compaction details at DEBUG level to reduce log noise
-    # Only log at INFO if compaction actually reduced size significantly or is adaptive
-    if is_large_payload or compaction_ratio < 0.8:
-        logger.info(
-            "[COMPACTION] Payload compacted: size_before=%d size_after=%d ratio=%.2f messages_before=%d messages_after=%d adaptive=%s",
-            payload_size_before,
-            payload_size_after,
-            compaction_ratio,
-            messages_before,
-            messages_after,
-            is_large_payload,
-        )
-    else:
-        logger.debug(
-            "[COMPACTION] Payload compacted: size_before=%d size_after=%d ratio=%.2f messages_before=%d messages_after=%d",
-            payload_size_before,
-            payload_size_after,
-            compaction_ratio,
-            messages_before,
-            messages_after,
-        )
-    
-    return checkpoint
+def _thread_key(config: Any) -> tuple[str, str] | None:
+    """``(thread_id, checkpoint_ns)`` from a LangGraph config, if present."""
+    configurable = config.get("configurable") if isinstance(config, dict) else None
+    if not isinstance(configurable, dict) or configurable.get("thread_id") is None:
+        return None
+    return str(configurable["thread_id"]), str(configurable.get("checkpoint_ns") or "")
 
 
 def _log_if_slow(
@@ -376,6 +605,7 @@ class InstrumentedAsyncPostgresSaver:
     - Payload compaction (reduce DB size)
     - Performance logging (slow operation detection)
     - On-demand pool opening (lazy initialization)
+    - Optional delta storage of the messages channel (CHECKPOINTER_DELTA_MODE)
     """
     
     def __init__(
@@ -386,6 +616,8 @@ class InstrumentedAsyncPostgresSaver:
         max_messages: int,
         max_chars: int,
         drop_base64: bool,
+        compactor: CheckpointCompactor | None = None,
+        delta_codec: MessageDeltaCodec | None = None,
     ):
         self._base = base
         self._pool = pool
@@ -393,34 +625,87 @@ class InstrumentedAsyncPostgresSaver:
         self._max_messages = max_messages
         self._max_chars = max_chars
         self._drop_base64 = drop_base64
+        self._compactor = compactor or CheckpointCompactor()
+        self._delta = delta_codec
     
     async def _ensure_pool_open(self) -> None:
         """Ensure pool is open before use (on-demand opening)."""
         await _open_pool_on_demand(self._pool)
+
+    async def _fetch_message_versions(self, thread_key: tuple[str, str], versions: list[str]) -> dict[str, Any]:
+        """Load stored ``messages`` blobs for ``versions`` of one thread."""
+        async with self._pool.connection() as conn:
+            async with conn.cursor(binary=True) as cur:
+                await cur.execute(
+                    SELECT_MESSAGE_VERSIONS_SQL,
+                    (thread_key[0], thread_key[1], MESSAGES_CHANNEL, versions),
+                )
+                rows = await cur.fetchall()
+        serde = self._base.serde
+        return {
+            version: serde.loads_typed((type_, bytes(blob)))
+            for version, type_, blob in rows
+            if type_ != "empty"
+        }
+
+    async def _resolve_tuple(self, result: Any, *, remember: bool = False) -> Any:
+        """Materialize delta-encoded messages in a ``CheckpointTuple``.
+
+        With ``remember`` the loaded messages become the base for the next
+        delta of this thread.
+        """
+        if self._delta is None or result is None:
+            return result
+        thread_key = _thread_key(result.config)
+        if thread_key is None:
+            return result
+        checkpoint = await self._delta.resolve(
+            thread_key,
+            result.checkpoint,
+            lambda versions: self._fetch_message_versions(thread_key, versions),
+            remember=remember,
+        )
+        return result if checkpoint is result.checkpoint else result._replace(checkpoint=checkpoint)
+
+    def _resolve_tuple_sync(self, result: Any) -> Any:
+        if self._delta is None or result is None:
+            return result
+        if not is_delta(result.checkpoint.get("channel_values", {}).get(MESSAGES_CHANNEL)):
+            return result
+        import asyncio
+
+        loop = getattr(self._base, "loop", None)
+        if loop is None:
+            return asyncio.run(self._resolve_tuple(result))
+        return asyncio.run_coroutine_threadsafe(self._resolve_tuple(result), loop).result()
     
-    def _process_payload(self, payload: Any) -> Any:
-        """Serialize and compact payload before storage."""
+    def _process_payload(self, payload: Any, config: Any = None) -> Any:
+        """Serialize and compact payload before storage.
+
+        ``config`` identifies the thread so compaction can reuse the work done
+        for its previous checkpoint.
+        """
         if payload is None:
             return None
-        serialized = _serialize_checkpoint_messages(payload)
-        compacted = _compact_payload(
-            serialized,
+        compacted, stats = self._compactor.compact(
+            payload,
+            thread_key=_thread_key(config),
             max_messages=self._max_messages,
             max_chars=self._max_chars,
             drop_base64=self._drop_base64,
         )
+        if stats is None:
+            compacted = _serialize_checkpoint_messages(compacted)
         
         # Hard limit check: log warning if payload is too large (but don't block write)
         try:
             from src.conf.config import get_settings
-            import orjson  # type: ignore[reportMissingImports]
             
             settings = get_settings()
             max_size_bytes = getattr(settings, "CHECKPOINTER_MAX_PAYLOAD_SIZE_BYTES", 512 * 1024)
             
-            # Calculate payload size after compaction
-            payload_json = orjson.dumps(_serialize_for_json(compacted)).decode("utf-8")
-            payload_size = len(payload_json)
+            # Payload size after compaction (summed from cached sizes when compacted)
+            payload_size = stats.size_after if stats is not None else _json_size(compacted)
             
             if payload_size > max_size_bytes:
                 session_id = "unknown"
@@ -461,10 +746,14 @@ class InstrumentedAsyncPostgresSaver:
                     if isinstance(cv, dict) and "metadata" in cv:
                         metadata = cv["metadata"]
                         if isinstance(metadata, dict):
-                            metadata["escalation_reason"] = (
-                                metadata.get("escalation_reason") or 
-                                f"Payload size {payload_size} bytes exceeds limit {max_size_bytes} bytes"
-                            )
+                            # Copy: the compacted value may be cached by the compactor
+                            cv["metadata"] = {
+                                **metadata,
+                                "escalation_reason": (
+                                    metadata.get("escalation_reason") or
+                                    f"Payload size {payload_size} bytes exceeds limit {max_size_bytes} bytes"
+                                ),
+                            }
         except Exception as e:
             # Don't fail if limit check fails - just log and continue
             logger.debug("[CHECKPOINTER] Failed to check payload size limit: %s", e)
@@ -477,6 +766,7 @@ class InstrumentedAsyncPostgresSaver:
         try:
             await self._ensure_pool_open()
             result = await self._base.aget_tuple(*args, **kwargs)
+            result = await self._resolve_tuple(result, remember=True)
             return result
         finally:
             config = args[0] if args else None
@@ -492,10 +782,17 @@ class InstrumentedAsyncPostgresSaver:
         _t0 = time.perf_counter()
         try:
             await self._ensure_pool_open()
+            pending = None
             if len(args) > 1:
-                payload = self._process_payload(args[1])
+                payload = self._process_payload(args[1], args[0])
+                if self._delta is not None and len(args) > 3:
+                    payload, pending = self._delta.encode(_thread_key(args[0]), payload, args[3])
                 args = (args[0], payload, *args[2:])
-            return await self._base.aput(*args, **kwargs)
+            result = await self._base.aput(*args, **kwargs)
+            if self._delta is not None:
+                # Only a stored version may become the base of the next delta
+                self._delta.commit(pending)
+            return result
         finally:
             config = args[0] if args else None
             payload = args[1] if len(args) > 1 else None
@@ -514,13 +811,28 @@ class InstrumentedAsyncPostgresSaver:
             payload = args[1] if len(args) > 1 else None
             _log_if_slow("aput_writes", _t0, config, payload=payload, slow_threshold_s=self._slow_threshold_s)
     
+    async def alist(self, *args: Any, **kwargs: Any):
+        await self._ensure_pool_open()
+        async for item in self._base.alist(*args, **kwargs):
+            yield await self._resolve_tuple(item)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self._ensure_pool_open()
+        await self._base.adelete_thread(thread_id)
+        if self._delta is not None:
+            self._delta.forget(str(thread_id))
+
     def get_tuple(self, *args: Any, **kwargs: Any):
         _t0 = time.perf_counter()
         try:
-            return self._base.get_tuple(*args, **kwargs)
+            return self._resolve_tuple_sync(self._base.get_tuple(*args, **kwargs))
         finally:
             config = args[0] if args else None
             _log_if_slow("get_tuple", _t0, config, payload=None, slow_threshold_s=self._slow_threshold_s)
+
+    def list(self, *args: Any, **kwargs: Any):
+        for item in self._base.list(*args, **kwargs):
+            yield self._resolve_tuple_sync(item)
     
     def put(self, *args: Any, **kwargs: Any):
         _t0 = time.perf_counter()
@@ -758,6 +1070,17 @@ def get_postgres_checkpointer() -> BaseCheckpointSaver:
             max_messages=max_messages,
             max_chars=max_chars,
             drop_base64=drop_base64,
+            compactor=CheckpointCompactor(
+                max_threads=_setting_int(settings, "CHECKPOINTER_COMPACTION_CACHE_THREADS", 256)
+            ),
+            delta_codec=(
+                MessageDeltaCodec(
+                    snapshot_every=_setting_int(settings, "CHECKPOINTER_DELTA_SNAPSHOT_EVERY", 20),
+                    max_threads=_setting_int(settings, "CHECKPOINTER_COMPACTION_CACHE_THREADS", 256),
+                )
+                if getattr(settings, "CHECKPOINTER_DELTA_MODE", False)
+                else None
+            ),
         )
 
         logger.info("AsyncPostgresSaver checkpointer initialized successfully")
@@ -238,13 +238,15 @@ async def agent_node(
     # =========================================================================
     # HISTORY TRIMMER
     # =========================================================================
-    from src.services.core.history_trimmer import trim_message_history
+    from src.services.core.history_trimmer import estimate_token_count, trim_message_history
 
     original_messages = state.get("messages", [])
     trimmed_messages = trim_message_history(original_messages)
     state_for_llm = {**state, "messages": trimmed_messages}
 
     deps = create_deps_from_state(state_for_llm)
+    # Per-message counts are cached, so this reuses the trimmer's tokenization
+    deps.history_tokens = estimate_token_count(trimmed_messages)
 
     # =========================================================================
     # STATE PROMPTS
@@ -0,0 +1,188 @@
+"""
+Compiled keyword intent classifier.
+===================================
+``detect_intent_from_text`` used to rebuild every registry keyword list per
+message and test each keyword with ``keyword in text`` in priority order.
+
+``IntentClassifier`` compiles all keyword lists into one Aho-Corasick
+automaton whose states carry a bitmask of the keyword groups that end there.
+One pass over the message yields every group present; the routing rules then
+pick the intent from that mask. The classifier is rebuilt only when the
+registry snippet index swaps in a new snapshot (a source file changed).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING
+
+from src.core.prompt_registry import get_snippet_by_header, snippet_index
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+
+# Keyword group -> registry header
+INTENT_PATTERN_HEADERS: dict[str, str] = {
+    "PAYMENT_DELIVERY": "INTENT_PATTERN_PAYMENT_DELIVERY",
+    "CONFIRMATION": "INTENT_PATTERN_CONFIRMATION",
+    "PRODUCT_NAMES": "INTENT_PATTERN_PRODUCT_NAMES",
+    "PRODUCT_CATEGORY": "INTENT_PATTERN_PRODUCT_CATEGORY",
+    "SIZE_HELP": "INTENT_PATTERN_SIZE_HELP",
+    "COLOR_HELP": "INTENT_PATTERN_COLOR_HELP",
+    "COMPLAINT": "INTENT_PATTERN_COMPLAINT",
+    "REQUEST_PHOTO": "INTENT_PATTERN_REQUEST_PHOTO",
+    "DISCOVERY_OR_QUESTION": "INTENT_PATTERN_DISCOVERY",
+    "GREETING_ONLY": "INTENT_PATTERN_GREETING",
+    "THANKYOU_SMALLTALK": "INTENT_PATTERN_THANKYOU",
+}
+
+# Checked in this order once the state/image rules did not decide
+PRIORITY_INTENTS: tuple[str, ...] = (
+    "PAYMENT_DELIVERY",
+    "COMPLAINT",
+    "SIZE_HELP",
+    "COLOR_HELP",
+    "REQUEST_PHOTO",
+    "PRODUCT_CATEGORY",
+)
+
+# Greetings only count in short messages
+GREETING_MAX_LEN = 30
+
+_BITS: dict[str, int] = {group: 1 << i for i, group in enumerate(INTENT_PATTERN_HEADERS)}
+_OFFER_ACCEPT = _BITS["PAYMENT_DELIVERY"] | _BITS["CONFIRMATION"] | _BITS["PRODUCT_NAMES"]
+
+
+def load_intent_patterns() -> dict[str, list[str]]:
+    """Keyword lists per group from the registry (one keyword per line/bubble)."""
+    patterns: dict[str, list[str]] = {}
+    for group, header in INTENT_PATTERN_HEADERS.items():
+        keywords: list[str] = []
+        for bubble in get_snippet_by_header(header) or []:
+            keywords.extend(line.strip() for line in bubble.split("\n") if line.strip())
+        patterns[group] = keywords
+    return patterns
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting which keyword groups occur in a text.
+
+    Failure links are folded into the transition table at build time, so the
+    scan is a single dict lookup per character.
+    """
+
+    __slots__ = ("_delta", "_out")
+
+    def __init__(self, keywords: Iterable[tuple[str, int]]) -> None:
+        # State 0 is the root; out[s] is the group mask of keywords ending at s
+        goto: list[dict[str, int]] = [{}]
+        out: list[int] = [0]
+        for keyword, mask in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(0)
+                state = nxt
+            out[state] |= mask
+
+        # Breadth-first: a state's failure target is shallower, so its row is done
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [{} for _ in goto]
+        delta[0] = dict(goto[0])
+        queue: deque[int] = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+                out[child] |= out[fail[child]]
+                queue.append(child)
+        self._delta = delta
+        self._out = out
+
+    def __len__(self) -> int:
+        return len(self._delta)
+
+    def scan(self, text: str) -> int:
+        """Mask of every group with a keyword occurring in ``text``."""
+        delta, out = self._delta, self._out
+        state = 0
+        found = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            found |= out[state]
+        return found
+
+
+def _resolve(found: int, text_lower: str, text_len: int, has_image: bool, current_state: str) -> str:
+    """Routing rules over the set of keyword groups present in the message."""
+    if not text_lower and has_image:
+        return "PHOTO_IDENT"
+
+    in_payment = current_state == "STATE_5_PAYMENT_DELIVERY"
+    if (current_state == "STATE_4_OFFER" and found & _OFFER_ACCEPT) or (
+        in_payment and not found & _BITS["COMPLAINT"]
+    ):
+        return "PAYMENT_DELIVERY"
+
+    if has_image and not in_payment and not found & _BITS["PAYMENT_DELIVERY"]:
+        return "PHOTO_IDENT"
+
+    for intent in PRIORITY_INTENTS:
+        if found & _BITS[intent]:
+            return intent
+
+    if text_len < GREETING_MAX_LEN and found & _BITS["GREETING_ONLY"]:
+        return "GREETING_ONLY"
+
+    return "DISCOVERY_OR_QUESTION"
+
+
+class IntentClassifier:
+    """Keyword intent classifier compiled from one set of registry patterns."""
+
+    def __init__(self, patterns: Mapping[str, Sequence[str]]) -> None:
+        self._automaton = KeywordAutomaton(
+            (keyword, _BITS[group])
+            for group, keywords in patterns.items()
+            if group in _BITS
+            for keyword in keywords
+            if keyword
+        )
+
+    def groups(self, text_lower: str) -> set[str]:
+        """Keyword groups present in an already lower-cased message."""
+        found = self._automaton.scan(text_lower)
+        return {group for group, bit in _BITS.items() if found & bit}
+
+    def classify(self, text: str, has_image: bool, current_state: str) -> str:
+        text_lower = text.lower().strip()
+        found = self._automaton.scan(text_lower)
+        return _resolve(found, text_lower, len(text), has_image, current_state)
+
+
+_classifier: tuple[object, IntentClassifier] | None = None
+_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier() -> IntentClassifier:
+    """Classifier for the current registry snapshot (rebuilt when it changes)."""
+    global _classifier
+    snapshot = snippet_index.snapshot()
+    cached = _classifier
+    if cached is not None and cached[0] is snapshot:
+        return cached[1]
+    with _classifier_lock:
+        cached = _classifier
+        if cached is None or cached[0] is not snapshot:
+            cached = (snapshot, IntentClassifier(load_intent_patterns()))
+            _classifier = cached
+        return cached[1]
+
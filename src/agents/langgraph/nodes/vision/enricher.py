@@ -25,15 +25,6 @@ async def enrich_product_from_db(
     try:
         catalog = CatalogService()
 
-        def _norm(s: str) -> str:
-            return " ".join((s or "").lower().strip().split())
-
-        def _base_name(s: str) -> str:
-            s = (s or "").strip()
-            if "(" in s:
-                return s.split("(")[0].strip()
-            return s
-
         # Avoid duplicating color if already in the name.
         search_query = product_name
         if (
@@ -47,30 +38,7 @@ async def enrich_product_from_db(
         results = await catalog.search_products(query=search_query, limit=5)
 
         if not results:
-            all_rows = await catalog.get_products_for_vision()
-            target = _norm(product_name)
-            target_base = _norm(_base_name(product_name))
-            color_norm = _norm(color or "")
-
-            scored: list[tuple[int, dict[str, Any]]] = []
-            for row in all_rows or []:
-                name = str(row.get("name") or "")
-                n = _norm(name)
-                nb = _norm(_base_name(name))
-                score = 0
-                if n == target or nb == target_base:
-                    score += 50
-                if target and (target in n or n in target):
-                    score += 15
-                if target_base and (target_base in nb or nb in target_base):
-                    score += 10
-                if color_norm and color_norm in n:
-                    score += 5
-                if score > 0:
-                    scored.append((score, row))
-
-            scored.sort(key=lambda x: x[0], reverse=True)
-            results = [row for _score, row in scored[:5]]
+            results = await catalog.match_products(product_name, color, limit=5)
 
         # If no full-name match, try base name without color.
         if not results and "(" in product_name:
@@ -86,6 +54,9 @@ async def enrich_product_from_db(
                 if color.lower() in p_name:
                     product = p
                     break
+            if product is None:
+                in_color = {row.get("id") for row in await catalog.get_products_by_color(color)}
+                product = next((p for p in results if p.get("id") in in_color), None)
 
         def _extract_colors(row: dict[str, Any]) -> list[str]:
             raw = row.get("colors") or row.get("color") or []
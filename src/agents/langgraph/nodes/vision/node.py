@@ -29,6 +29,7 @@ from src.services.domain.vision.vision_ledger import (
     LEDGER_STATUS_PROCESSING,
     get_vision_ledger,
 )
+from src.services.infra.supabase_executor import run_db
 
 from ..utils import extract_user_message, text_msg
 from .builder import (
@@ -112,6 +113,37 @@ def _compute_vision_hash(session_id: str | None, image_url: str | None) -> str |
     return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
+async def _compute_content_vision_hash(session_id: str | None, image_url: str | None) -> str | None:
+    """Session/photo hash from the image bytes, so a re-sent photo matches under a new CDN URL.
+
+    Only private CDN images are fetched here: run_vision has to download them
+    anyway and then gets them from the image cache.
+    """
+    from src.services.infra.image_fetch import get_image_fetch_service, is_private_cdn_url
+
+    if not image_url or not is_private_cdn_url(image_url):
+        return None
+    image = await get_image_fetch_service().fetch(image_url)
+    if image is None:
+        return None
+    return _compute_vision_hash(session_id, f"sha256:{image.content_hash}")
+
+
+async def _prepare_vision_image_url(image_url: str | None) -> str | None:
+    """Downscaled data URL for a private CDN photo (from the image cache), else None."""
+    from src.conf.config import settings
+    from src.services.infra.image_fetch import get_image_fetch_service, is_private_cdn_url
+
+    from .preprocess import prepare_image_url
+
+    if not image_url or not is_private_cdn_url(image_url):
+        return None
+    image = await get_image_fetch_service().fetch(image_url)
+    if image is None:
+        return None
+    return await prepare_image_url(image, settings.LLM_MODEL_GPT)
+
+
 def _build_duplicate_messages(templates: dict[str, Any]) -> list[dict[str, Any]]:
     """Compose friendly duplicate-photo response bubbles."""
     duplicate_snippet = get_snippet_by_header("VISION_DUPLICATE_PHOTO")
@@ -169,7 +201,13 @@ async def vision_node(
     metadata = dict(state.get("metadata") or {})
     vision_hash = _compute_vision_hash(session_id, deps.image_url)
     ledger = get_vision_ledger()
-    ledger_record = ledger.get_by_hash(vision_hash) if vision_hash else None
+    ledger_record = await run_db(ledger.get_by_hash, vision_hash) if vision_hash else None
+    content_hash = None
+    if vision_hash and not (ledger_record and ledger_record.get("status") in LEDGER_FINAL_STATUSES):
+        content_hash = await _compute_content_vision_hash(session_id, deps.image_url)
+        content_record = await run_db(ledger.get_by_hash, content_hash) if content_hash else None
+        if content_record and content_record.get("status") in LEDGER_FINAL_STATUSES:
+            ledger_record = content_record
     ledger_metadata_base = {
         "session_id": session_id,
         "trace_id": trace_id,
@@ -189,7 +227,7 @@ async def vision_node(
         meta_payload = {**ledger_metadata_base}
         if extra_metadata:
             meta_payload.update(extra_metadata)
-        return ledger.record_result(
+        record = ledger.record_result(
             session_id=session_id,
             image_hash=vision_hash,
             status=status,
@@ -198,9 +236,21 @@ async def vision_node(
             metadata=meta_payload,
             error_message=error_message,
         )
+        if content_hash and status in LEDGER_FINAL_STATUSES:
+            # Also findable by photo content for a re-send under a new URL
+            ledger.record_result(
+                session_id=session_id,
+                image_hash=content_hash,
+                status=status,
+                confidence=confidence,
+                identified_product=identified_product,
+                metadata={**meta_payload, "vision_url_hash": vision_hash},
+            )
+        return record
 
     if vision_hash and ledger_record is None:
-        ledger_record = _record_ledger_status(
+        ledger_record = await run_db(
+            _record_ledger_status,
             LEDGER_STATUS_PROCESSING,
             extra_metadata={
                 "stage": "start",
@@ -406,11 +456,21 @@ async def vision_node(
 
     try:
         # Call vision agent (goes through wrapper for test patching)
-        response = await run_vision(message=user_message, deps=deps, message_history=None)
+        prepared_image_url = await _prepare_vision_image_url(deps.image_url)
+        if prepared_image_url:
+            response = await run_vision(
+                message=user_message,
+                deps=deps,
+                message_history=None,
+                prepared_image_url=prepared_image_url,
+            )
+        else:
+            response = await run_vision(message=user_message, deps=deps, message_history=None)
     except Exception as e:
         err = str(e)
         logger.error("Vision agent error: %s", err)
-        _record_ledger_status(
+        await run_db(
+            _record_ledger_status,
             LEDGER_STATUS_FAILED,
             error_message=err[:200],
             extra_metadata={"stage": "vision_agent_error"},
@@ -672,7 +732,8 @@ async def vision_node(
     )
 
     # Record final success status
-    final_record = _record_ledger_status(
+    final_record = await run_db(
+        _record_ledger_status,
         LEDGER_STATUS_PROCESSED,
         confidence=response.confidence,
         identified_product=response.identified_product,
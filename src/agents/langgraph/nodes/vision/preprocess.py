@@ -0,0 +1,127 @@
+"""
+Vision image preprocessing.
+===========================
+Downscales and re-encodes photos before they are inlined into the vision
+LLM request. Customer photos are usually full-resolution phone shots
+(3-5 MB, 4000px) while the model works from a ~1.5k px view, so sending
+them as-is only costs upload time and request size.
+
+For each model target (longest edge, JPEG quality):
+- orientation from EXIF is applied, then all metadata is dropped;
+- the image is shrunk to the target edge (never enlarged);
+- it is re-encoded as an optimized JPEG (alpha flattened onto white).
+
+The original bytes are kept when the image is already small, carries no
+EXIF/XMP metadata and the re-encode would not be smaller. Decoding runs in a worker thread, and the
+result is kept in the image fetch cache (charged to its byte budget) so a
+repeated photo is encoded once.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.conf.config import settings
+from src.services.core.observability import track_metric
+from src.services.infra.image_fetch import get_image_fetch_service, to_data_url
+
+
+if TYPE_CHECKING:
+    from src.services.infra.image_fetch import FetchedImage, ImageFetchService
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow is a hard dependency in production
+    Image = None  # type: ignore[assignment]
+    ImageOps = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+# Image.info keys holding XMP packets (JPEG/WebP, PNG)
+_METADATA_KEYS = ("xmp", "XML:com.adobe.xmp")
+
+
+@dataclass(frozen=True)
+class ImageTarget:
+    """Encoding target for one vision model."""
+
+    max_edge: int
+    quality: int
+
+
+def target_for_model(model: str) -> ImageTarget:
+    """Target from VISION_IMAGE_TARGETS, falling back to the global defaults."""
+    edge, quality = settings.vision_image_targets.get(
+        model, (settings.VISION_IMAGE_MAX_EDGE, settings.VISION_IMAGE_QUALITY)
+    )
+    return ImageTarget(max_edge=edge, quality=quality)
+
+
+def downscale_image(data: bytes, target: ImageTarget) -> tuple[bytes, str] | None:
+    """Re-encode ``data`` for ``target``; None when the original should be sent as-is."""
+    with Image.open(io.BytesIO(data)) as source:
+        resize = max(source.size) > target.max_edge
+        has_metadata = bool(source.getexif()) or any(key in source.info for key in _METADATA_KEYS)
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "L"):
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        if resize:
+            image.thumbnail((target.max_edge, target.max_edge), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        # No exif= argument: metadata (GPS, camera, thumbnails) is not copied
+        image.save(out, format="JPEG", quality=target.quality, optimize=True)
+    encoded = out.getvalue()
+    if not resize and not has_metadata and len(encoded) >= len(data):
+        return None
+    return encoded, "image/jpeg"
+
+
+async def prepare_image_url(
+    image: FetchedImage, model: str, service: ImageFetchService | None = None
+) -> str:
+    """Data URL of ``image`` prepared for ``model`` (the original on any failure)."""
+    service = service or get_image_fetch_service()
+    if not settings.VISION_IMAGE_PREPROCESS_ENABLED or Image is None:
+        return service.data_url(image)
+
+    target = target_for_model(model)
+    cached = service.variant(image, target)
+    if cached is not None:
+        return cached
+
+    start = time.perf_counter()
+    try:
+        result = await asyncio.to_thread(downscale_image, image.data, target)
+    except Exception as e:
+        logger.warning("[VISION:PREPROCESS] Failed to re-encode image %s: %s", image.content_hash[:12], e)
+        result = None
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if result is None:
+        data_url = service.data_url(image)
+        saved = 0
+    else:
+        data, content_type = result
+        data_url = to_data_url(data, content_type)
+        saved = image.size - len(data)
+    data_url = service.put_variant(image, target, data_url)
+
+    track_metric("vision_image_preprocess_ms", elapsed_ms, {"model": model})
+    track_metric("vision_image_bytes_saved", saved, {"model": model})
+    logger.info(
+        "[VISION:PREPROCESS] image=%s %d -> %d bytes (%.1fms, edge=%d, q=%d)",
+        image.content_hash[:12],
+        image.size,
+        image.size - saved,
+        elapsed_ms,
+        target.max_edge,
+        target.quality,
+    )
+    return data_url
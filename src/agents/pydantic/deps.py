@@ -69,6 +69,9 @@ class AgentDeps:
     memory_profile: Any = None
     memory_facts: list[Any] = field(default_factory=list)
 
+    # Tokens of the (trimmed) conversation history, reported with LLM usage
+    history_tokens: int | None = None
+
     env: str = "production"
 
     _db: Any = field(default=None, repr=False)
@@ -116,6 +119,7 @@ class AgentDeps:
         self.memory_context_prompt = memory_context_prompt
         self.memory_profile = memory_profile
         self.memory_facts = memory_facts or []
+        self.history_tokens = None
         self._db = db
         self._catalog = catalog
         self._memory = memory
@@ -628,6 +628,7 @@ async def run_main(
                         model=model,
                         session_id=deps.session_id,
                         cost_usd=float(cost),
+                        tokens_history=getattr(deps, "history_tokens", None),
                     )
                     
                     # Dispatch to background worker for DB recording
@@ -18,11 +18,7 @@ from pydantic_ai.providers.openai import OpenAIProvider
 from src.services.domain.memory.memory_models import Fact, MemoryDecision, UserProfile
 from src.conf.config import settings
 from src.core.prompt_registry import registry
-from src.services.domain.memory.memory_config import (
-    get_memory_label,
-    get_memory_patterns,
-    get_memory_template,
-)
+from src.services.domain.memory.quick_facts import get_quick_fact_extractor
 
 
 logger = logging.getLogger(__name__)
@@ -273,97 +269,4 @@ async def analyze_for_memory(
 
 def extract_quick_facts(message: str) -> list[dict[str, Any]]:
     """Quick regex-based extraction for obvious facts."""
-    import re
-
-    patterns = get_memory_patterns()
-    height_patterns = patterns.get("height", [])
-    age_patterns = patterns.get("age", [])
-    gender_patterns = patterns.get("gender", {})
-    girl_words = gender_patterns.get("girl", [])
-    boy_words = gender_patterns.get("boy", [])
-    city_variations = patterns.get("cities", [])
-
-    height_template = get_memory_template("height", "Child height: {height} cm")
-    age_template = get_memory_template("age", "Child age: {age}")
-    gender_girl_template = get_memory_template("gender_girl", "Gender: girl")
-    gender_boy_template = get_memory_template("gender_boy", "Gender: boy")
-    city_template = get_memory_template("city", "City: {city}")
-    gender_girl_value = get_memory_label("gender_girl", "girl")
-    gender_boy_value = get_memory_label("gender_boy", "boy")
-
-    facts: list[dict[str, Any]] = []
-    msg_lower = message.lower()
-
-    for pattern in height_patterns:
-        match = re.search(pattern, msg_lower)
-        if match:
-            height = int(match.group(1))
-            if 70 <= height <= 180:
-                facts.append(
-                    {
-                        "content": height_template.format(height=height),
-                        "fact_type": "child_info",
-                        "category": "child",
-                        "extracted_value": height,
-                        "field": "height_cm",
-                    }
-                )
-                break
-
-    for pattern in age_patterns:
-        match = re.search(pattern, msg_lower)
-        if match:
-            age = int(match.group(1))
-            if 0 <= age <= 18:
-                facts.append(
-                    {
-                        "content": age_template.format(age=age),
-                        "fact_type": "child_info",
-                        "category": "child",
-                        "extracted_value": age,
-                        "field": "age",
-                    }
-                )
-                break
-
-    if any(word in msg_lower for word in girl_words):
-        facts.append(
-            {
-                "content": gender_girl_template,
-                "fact_type": "child_info",
-                "category": "child",
-                "extracted_value": gender_girl_value,
-                "field": "gender",
-            }
-        )
-    elif any(word in msg_lower for word in boy_words):
-        facts.append(
-            {
-                "content": gender_boy_template,
-                "fact_type": "child_info",
-                "category": "child",
-                "extracted_value": gender_boy_value,
-                "field": "gender",
-            }
-        )
-
-    for item in city_variations:
-        if not isinstance(item, dict):
-            continue
-        canonical = item.get("canonical")
-        variations = item.get("variations", [])
-        if not isinstance(canonical, str) or not isinstance(variations, list):
-            continue
-        if any(var in msg_lower for var in variations if isinstance(var, str)):
-            facts.append(
-                {
-                    "content": city_template.format(city=canonical),
-                    "fact_type": "logistics",
-                    "category": "delivery",
-                    "extracted_value": canonical,
-                    "field": "city",
-                }
-            )
-            break
-
-    return facts
+    return get_quick_fact_extractor().extract(message)
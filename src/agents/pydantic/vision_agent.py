@@ -6,14 +6,12 @@ Handles photo identification and product matching.
 
 from __future__ import annotations
 
-import base64
 import json
 import logging
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
-import httpx
 from openai import AsyncOpenAI
 from pydantic_ai import Agent, ImageUrl, RunContext
 from pydantic_ai.models.openai import OpenAIModel
@@ -30,10 +28,6 @@ from .models import VisionResponse
 
 logger = logging.getLogger(__name__)
 
-# Private CDN hosts that require image download to bypass access restrictions.
-_PRIVATE_CDN_HOSTS: tuple[str, ...] = ("scontent", "fbcdn", "cdninstagram")
-
-
 # Reference logic moved to VisionContextService
 
 
@@ -60,74 +54,17 @@ def _build_reference_parts(
 
 
 async def _download_image_as_base64(url: str, max_retries: int = 2) -> str | None:
-    url = url.rstrip(";").strip()
-
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9,uk;q=0.8",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Referer": "https://www.instagram.com/",
-        "Sec-Ch-Ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-        "Sec-Ch-Ua-Mobile": "?0",
-        "Sec-Ch-Ua-Platform": '"Windows"',
-        "Sec-Fetch-Dest": "image",
-        "Sec-Fetch-Mode": "no-cors",
-        "Sec-Fetch-Site": "cross-site",
-    }
-
-    for attempt in range(max_retries + 1):
-        try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-
-                content_type = response.headers.get("content-type", "image/jpeg")
-                if ";" in content_type:
-                    content_type = content_type.split(";")[0].strip()
-
-                image_data = response.content
-                b64_data = base64.b64encode(image_data).decode("utf-8")
-                data_url = f"data:{content_type};base64,{b64_data}"
-                logger.info(
-                    "Downloaded image from CDN: %d bytes, type=%s",
-                    len(image_data),
-                    content_type,
-                )
-                return data_url
-
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 403 and attempt < max_retries:
-                logger.warning("HTTP 403, retrying (%d/%d)...", attempt + 1, max_retries)
-                import asyncio
-
-                await asyncio.sleep(0.5)
-                continue
-            logger.error("Failed to download image (HTTP %d): %s", e.response.status_code, url[:80])
-            return None
-        except Exception as e:
-            if attempt < max_retries:
-                logger.warning(
-                    "Download error, retrying (%d/%d): %s", attempt + 1, max_retries, str(e)[:50]
-                )
-                import asyncio
-
-                await asyncio.sleep(0.5)
-                continue
-            logger.error("Failed to download image: %s - %s", type(e).__name__, str(e)[:100])
-            return None
-
-    return None
+    from src.services.infra.image_fetch import get_image_fetch_service
+
+    service = get_image_fetch_service()
+    image = await service.fetch(url, max_retries=max_retries)
+    return service.data_url(image) if image else None
 
 
 def _is_private_cdn_url(url: str) -> bool:
-    from urllib.parse import urlparse
+    from src.services.infra.image_fetch import is_private_cdn_url
 
-    try:
-        parsed = urlparse(url)
-        return any(host in parsed.netloc for host in _PRIVATE_CDN_HOSTS)
-    except Exception:
-        return False
+    return is_private_cdn_url(url)
 
 
 # Vision guide logic replaced by prompt registry
@@ -261,6 +198,7 @@ async def run_vision(
     message: str,
     deps: AgentDeps,
     message_history: list[Any] | None = None,
+    prepared_image_url: str | None = None,
 ) -> VisionResponse:
     """
     Run vision agent for photo analysis.
@@ -269,6 +207,8 @@ async def run_vision(
         message: User message with photo context
         deps: Dependencies (must have image_url)
         message_history: Previous messages
+        prepared_image_url: Already downloaded (and downscaled) data URL
+            for deps.image_url; skips the private CDN download
 
     Returns:
         Validated VisionResponse
@@ -339,7 +279,9 @@ async def run_vision(
         )
 
     final_image_url = image_url
-    if _is_private_cdn_url(image_url):
+    if prepared_image_url:
+        final_image_url = prepared_image_url
+    elif _is_private_cdn_url(image_url):
         logger.info("👁️ Private CDN detected, downloading image...")
         base64_url = await _download_image_as_base64(image_url)
         if base64_url:
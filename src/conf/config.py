@@ -66,6 +66,45 @@ class Settings(BaseSettings):
             "When false: waits for AI response (legacy, may timeout on long operations)."
         ),
     )
+    MANYCHAT_HTTP2_ENABLED: bool = Field(
+        default=True,
+        description="Use HTTP/2 for ManyChat push requests (h2 comes with the httpx[http2] dependency).",
+    )
+    MANYCHAT_HTTP_TIMEOUT_SECONDS: float = Field(
+        default=15.0, gt=0, description="Timeout for a single ManyChat push request."
+    )
+    MANYCHAT_HTTP_MAX_CONNECTIONS: int = Field(
+        default=50, gt=0, description="Max open connections in the ManyChat push pool (per event loop)."
+    )
+    MANYCHAT_HTTP_MAX_KEEPALIVE: int = Field(
+        default=20, gt=0, description="Max idle keep-alive connections kept in the ManyChat push pool."
+    )
+    MANYCHAT_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = Field(
+        default=60.0, gt=0, description="Idle time after which a pooled ManyChat connection is closed."
+    )
+    MANYCHAT_API_RATE_PER_SECOND: float = Field(
+        default=10.0, gt=0, description="Max ManyChat API requests started per second by background sweeps."
+    )
+    MANYCHAT_TAG_PROBE_CONCURRENCY: int = Field(
+        default=10, gt=0, description="Concurrent subscriber lookups when checking ManyChat tags."
+    )
+    MANYCHAT_TAG_CACHE_TTL_SECONDS: float = Field(
+        default=300.0, gt=0, description="How long fetched subscriber tags are reused by background sweeps."
+    )
+    MANYCHAT_SUBSCRIBER_CACHE_TTL_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="How long ManyChatClient reuses subscriber lookups (dropped on tag/field changes).",
+    )
+    MANYCHAT_MUTATION_STATE_TTL_SECONDS: float = Field(
+        default=900.0,
+        gt=0,
+        description="How long last known subscriber fields/tags are trusted to skip unchanged writes.",
+    )
+    MANYCHAT_FLUSH_OVERFLOW_MUTATIONS: bool = Field(
+        default=False,
+        description="Write field/tag changes that do not fit into sendContent actions via the subscriber API.",
+    )
 
     SUPABASE_URL: str = Field(
         default="", description="Supabase project URL for session persistence."
@@ -84,12 +123,59 @@ class Settings(BaseSettings):
         default="mirt_users",
         description="Table storing user profiles and summaries.",
     )
+    SUPABASE_OFFLOAD_ENABLED: bool = Field(
+        default=True,
+        description="Run blocking Supabase calls on a bounded thread pool instead of the event loop.",
+    )
+    SUPABASE_EXECUTOR_MAX_WORKERS: int = Field(
+        default=16,
+        gt=0,
+        description="Threads in the Supabase I/O pool (max concurrent DB round trips).",
+    )
+    SUPABASE_EXECUTOR_MAX_PENDING: int = Field(
+        default=64,
+        ge=0,
+        description="Extra Supabase calls allowed to queue before callers wait (back-pressure).",
+    )
+    MEMORY_TOUCH_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=5.0,
+        gt=0,
+        description="How often batched memory access times (facts/profiles) are flushed to Supabase.",
+    )
+    MEMORY_TOUCH_MAX_BATCH: int = Field(
+        default=200,
+        gt=0,
+        description="Pending touched ids that trigger an immediate bulk flush.",
+    )
+    MEMORY_CONTEXT_CACHE_TTL_SECONDS: float = Field(
+        default=30.0,
+        ge=0,
+        description="Per-user MemoryContext cache TTL (0 disables); writes invalidate it immediately.",
+    )
+    MEMORY_CONTEXT_CACHE_MAX_ENTRIES: int = Field(
+        default=1024,
+        gt=0,
+        description="Max cached MemoryContext entries per process before LRU eviction.",
+    )
     # RAG tables removed - using Embedded Catalog in prompt
     # SUPABASE_CATALOG_TABLE, SUPABASE_EMBEDDINGS_TABLE, SUPABASE_MATCH_RPC - DELETED
     SUMMARY_RETENTION_DAYS: int = Field(
         default=3,
         description="Days after which conversations are summarized and pruned.",
     )
+    SUMMARIZATION_SWEEP_BUDGET_SECONDS: float = Field(
+        default=60.0,
+        gt=0,
+        le=75,
+        description=(
+            "Time one summarization sweep task may spend checking ManyChat escalation tags "
+            "before handing the rest to a follow-up task. Must leave room for one more "
+            "ManyChat request inside the task's 110s soft time limit."
+        ),
+    )
+    SUMMARIZATION_SWEEP_PAGE_SIZE: int = Field(
+        default=200, gt=0, description="Sessions read per page by the escalation-tag sweep."
+    )
     FOLLOWUP_DELAYS_HOURS: str = Field(
         default="4,23",
         description=(
@@ -97,6 +183,11 @@ class Settings(BaseSettings):
             "(e.g. '4,23' sends after 4h and 23h of inactivity)."
         ),
     )
+    FOLLOWUP_SCAN_PAGE_SIZE: int = Field(
+        default=500,
+        gt=0,
+        description="Sessions fetched per page by the periodic follow-up check.",
+    )
 
     # Checkpoint compaction safeguards
     COMPACTION_ENABLED: bool = Field(
@@ -107,6 +198,26 @@ class Settings(BaseSettings):
         default=512 * 1024,  # 512KB default
         description="Maximum payload size in bytes before logging warning (does not block write).",
     )
+    CHECKPOINTER_COMPACTION_CACHE_THREADS: int = Field(
+        default=256,
+        gt=0,
+        description=(
+            "Threads whose compacted messages are cached for incremental checkpoint "
+            "compaction (least recently written are evicted)."
+        ),
+    )
+    CHECKPOINTER_DELTA_MODE: bool = Field(
+        default=False,
+        description=(
+            "Store the checkpoint messages channel as append-only deltas against the "
+            "previous version instead of the full history on every step."
+        ),
+    )
+    CHECKPOINTER_DELTA_SNAPSHOT_EVERY: int = Field(
+        default=20,
+        gt=0,
+        description="In delta mode, write a full messages snapshot every N stored versions.",
+    )
 
     # Loop guard thresholds (conversation safety)
     LOOP_GUARD_WARNING_THRESHOLD: int = Field(
@@ -130,12 +241,76 @@ class Settings(BaseSettings):
     # Snitkix CRM integration
     SNITKIX_API_URL: str = Field(default="", description="Snitkix CRM API base URL.")
     SNITKIX_API_KEY: SecretStr = Field(default=SecretStr(""), description="Snitkix CRM API key.")
+    CRM_SYNC_PAGE_SIZE: int = Field(
+        default=100,
+        gt=0,
+        description="Open orders per page (and per bulk CRM status request) in the periodic sync.",
+    )
+    CRM_SYNC_BUDGET_SECONDS: float = Field(
+        default=240.0,
+        gt=0,
+        le=260,
+        description=(
+            "Time per periodic sync run; orders not reached are picked up by the next run. "
+            "Must leave room for one more page inside the task's 300s soft time limit."
+        ),
+    )
+    CRM_SYNC_MIN_INTERVAL_MINUTES: float = Field(
+        default=30.0, gt=0, description="Delay before re-checking a new order's status."
+    )
+    CRM_SYNC_MAX_INTERVAL_HOURS: float = Field(
+        default=24.0, gt=0, description="Longest delay between status checks of an open order."
+    )
 
     # Celery / Redis configuration
     REDIS_URL: str = Field(
         default="redis://localhost:6379/0",
         description="Redis URL for Celery broker and result backend.",
     )
+    REDIS_POOL_MAX_CONNECTIONS: int = Field(
+        default=50,
+        gt=0,
+        description="Max connections in the shared Redis pool (per process).",
+    )
+    REDIS_POOL_TIMEOUT_SECONDS: float = Field(
+        default=2.0,
+        description="Seconds to wait for a free pooled Redis connection before failing.",
+    )
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = Field(
+        default=2.0,
+        description="Socket connect/read timeout for shared Redis connections.",
+    )
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = Field(
+        default=30,
+        description="Idle seconds after which a pooled connection is pinged before reuse.",
+    )
+    REDIS_RECONNECT_BACKOFF_SECONDS: float = Field(
+        default=5.0,
+        description="After a Redis failure, skip Redis for this long before re-probing.",
+    )
+    CATALOG_L1_MAX_ENTRIES: int = Field(
+        default=2048,
+        gt=0,
+        description="Max entries in the in-process (L1) catalog cache before LRU eviction.",
+    )
+    CATALOG_L1_TTL_SECONDS: float = Field(
+        default=60.0,
+        description="TTL of in-process (L1) catalog cache entries; Redis (L2) keeps its own TTL.",
+    )
+    CATALOG_SNAPSHOT_ENABLED: bool = Field(
+        default=True,
+        description="Serve catalog search/lookups from an in-process snapshot of the products table.",
+    )
+    CATALOG_SNAPSHOT_TTL_SECONDS: float = Field(
+        default=300.0,
+        gt=0,
+        description="Reload the catalog snapshot in the background after this long (or on invalidation).",
+    )
+    CATALOG_SNAPSHOT_MAX_ROWS: int = Field(
+        default=5000,
+        gt=0,
+        description="Largest catalog kept as a snapshot; bigger catalogs are queried in Supabase.",
+    )
     CELERY_ENABLED: bool = Field(
         default=False,
         description="Enable Celery background tasks (requires Redis).",
@@ -210,6 +385,18 @@ class Settings(BaseSettings):
         default=2048,
         description="Max tokens for GPT-5.1 response",
     )
+    LLM_HISTORY_TOKEN_BUDGET: int = Field(
+        default=6000,
+        ge=0,
+        description="Token budget for conversation history sent to the LLM (0 = message-count limit only).",
+    )
+    LLM_HISTORY_TOKEN_BUDGETS: str = Field(
+        default="",
+        description=(
+            "Per-model history budgets as 'model=tokens' pairs, comma-separated "
+            "(e.g. 'gpt-5.1=8000,gpt-4o-mini=4000')."
+        ),
+    )
 
     # =========================================================================
     # OBSERVABILITY
@@ -230,6 +417,24 @@ class Settings(BaseSettings):
         default=False,
         description="Enable detailed trace logging for debugging.",
     )
+    TELEMETRY_BATCH_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Buffer llm_usage and llm_traces rows in-process and write them in bulk "
+            "instead of one Celery task / insert per event."
+        ),
+    )
+    TELEMETRY_BATCH_MAX_ROWS: int = Field(
+        default=200, gt=0, description="Buffered telemetry rows that trigger an immediate bulk write."
+    )
+    TELEMETRY_BATCH_FLUSH_MS: int = Field(
+        default=1000, gt=0, description="Maximum time (ms) a telemetry row waits before being written."
+    )
+    TELEMETRY_BATCH_MAX_PENDING: int = Field(
+        default=10_000,
+        gt=0,
+        description="Buffered telemetry rows per table above which new rows are dropped (load shedding).",
+    )
 
     # =========================================================================
     # OFFER DELIBERATION / CONFIDENCE GATING
@@ -243,6 +448,43 @@ class Settings(BaseSettings):
         description="Minimum acceptable offer deliberation confidence (0.0-1.0). Below => fallback.",
     )
 
+    # =========================================================================
+    # VISION IMAGE FETCHING
+    # =========================================================================
+    IMAGE_FETCH_MAX_BYTES: int = Field(
+        default=10 * 1024 * 1024,
+        gt=0,
+        description="Abort downloading a customer photo larger than this many bytes.",
+    )
+    IMAGE_FETCH_TIMEOUT_SECONDS: float = Field(
+        default=30.0, gt=0, description="Timeout for downloading a customer photo from the CDN."
+    )
+    IMAGE_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        gt=0,
+        description="Memory budget of the content-addressed cache of downloaded photos.",
+    )
+    IMAGE_CACHE_MAX_URLS: int = Field(
+        default=4096, gt=0, description="Number of image URLs remembered by the photo cache."
+    )
+    VISION_IMAGE_PREPROCESS_ENABLED: bool = Field(
+        default=True,
+        description="Downscale and re-encode inlined photos before the vision LLM call (needs Pillow).",
+    )
+    VISION_IMAGE_MAX_EDGE: int = Field(
+        default=1536, gt=0, description="Longest edge (px) of photos sent to the vision model."
+    )
+    VISION_IMAGE_QUALITY: int = Field(
+        default=85, gt=0, le=100, description="JPEG quality used when re-encoding photos for vision."
+    )
+    VISION_IMAGE_TARGETS: str = Field(
+        default="",
+        description=(
+            "Per-model overrides as 'model=max_edge:quality' pairs, comma-separated "
+            "(e.g. 'gpt-5.1=1536:85,gpt-4o-mini=1024:80')."
+        ),
+    )
+
     # TOKEN USAGE MONITORING / ALERTS
     TOKEN_ALERT_THRESHOLD_PER_CALL: int = Field(
         default=50000,
@@ -286,6 +528,33 @@ class Settings(BaseSettings):
                 continue
         return [h for h in hours if h > 0]
 
+    @property
+    def vision_image_targets(self) -> dict[str, tuple[int, int]]:
+        """Return parsed VISION_IMAGE_TARGETS as {model: (max_edge, quality)}."""
+
+        targets: dict[str, tuple[int, int]] = {}
+        for segment in self.VISION_IMAGE_TARGETS.split(","):
+            model, _, spec = segment.strip().partition("=")
+            edge, _, quality = spec.partition(":")
+            try:
+                targets[model.strip()] = (int(edge), int(quality or self.VISION_IMAGE_QUALITY))
+            except ValueError:
+                continue
+        return {m: t for m, t in targets.items() if m and t[0] > 0 and 0 < t[1] <= 100}
+
+    @property
+    def llm_history_token_budgets(self) -> dict[str, int]:
+        """Return parsed LLM_HISTORY_TOKEN_BUDGETS as {model: tokens}."""
+
+        budgets: dict[str, int] = {}
+        for segment in self.LLM_HISTORY_TOKEN_BUDGETS.split(","):
+            model, _, tokens = segment.strip().partition("=")
+            try:
+                budgets[model.strip()] = int(tokens)
+            except ValueError:
+                continue
+        return {m: t for m, t in budgets.items() if m and t >= 0}
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -15,6 +15,9 @@ Changes to prompts should:
 
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
@@ -160,6 +163,13 @@ class PromptRegistry:
         # Default version
         return "1.0"
 
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop cached prompt(s) so the next ``get`` re-reads the file."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(str(getattr(key, "value", key)), None)
+
     def get_version(self, key: str) -> str:
         """Get prompt version by key."""
         return self.get(key).version
@@ -213,6 +223,196 @@ def validate_all_states_have_prompts() -> list[str]:
     return missing
 
 
+# =============================================================================
+# SNIPPET INDEX (header -> bubbles, parsed once per file version)
+# =============================================================================
+
+# Registry sources searched by get_snippet_by_header, in priority order.
+SNIPPET_SOURCES: tuple[str, ...] = (
+    SystemKeys.SNIPPETS.value,
+    SystemKeys.FALLBACKS.value,
+    SystemKeys.INTENTS.value,
+    SystemKeys.SYSTEM_MESSAGES.value,
+    SystemKeys.VISION.value,
+    SystemKeys.AUTOMATION.value,
+)
+
+# Seconds between mtime checks of the indexed files.
+SNIPPET_INDEX_CHECK_INTERVAL = 2.0
+
+# Product-name lookups remembered per snapshot (names come from user/vision input).
+PRODUCT_LOOKUP_CACHE_SIZE = 1024
+
+Bubbles = tuple[str, ...]
+
+_HEADER_METADATA = ("WHEN:", "NEVER:")
+_PRODUCT_METADATA = ("WHEN:", "NEVER:", "PRIORITY:")
+
+
+def _parse_bubbles(body_lines: list[str], skip_prefixes: tuple[str, ...]) -> Bubbles | None:
+    """Strip metadata lines and split a snippet body into bubbles by ``---``."""
+    text_lines = [bl.strip() for bl in body_lines if not bl.strip().startswith(skip_prefixes)]
+    full_text = "\n".join(text_lines).strip()
+    if not full_text:
+        return None
+    bubbles = tuple(b.strip() for b in full_text.split("---") if b.strip())
+    return bubbles or None
+
+
+def _iter_sections(content: str):
+    """Yield (header_line_text, body_lines) for every ``### `` section."""
+    header: str | None = None
+    body: list[str] = []
+    for line in content.split("\n"):
+        if line.startswith("### "):
+            if header is not None:
+                yield header, body
+            header, body = line[4:], []
+        elif header is not None:
+            body.append(line)
+    if header is not None:
+        yield header, body
+
+
+class _SnippetSnapshot:
+    """Immutable parse of all snippet sources at one point in time."""
+
+    __slots__ = ("_product_lock", "headers", "product_cache", "products", "stamps")
+
+    def __init__(
+        self,
+        headers: dict[str, Bubbles | None],
+        products: tuple[tuple[str, Bubbles | None], ...],
+        stamps: dict[str, tuple[int, int] | None],
+    ) -> None:
+        self.headers = headers
+        self.products = products
+        self.stamps = stamps
+        # LRU of product_name -> bubbles (None = no snippet)
+        self.product_cache: OrderedDict[str, Bubbles | None] = OrderedDict()
+        self._product_lock = threading.Lock()
+
+    def cached_product(self, name: str) -> tuple[bool, Bubbles | None]:
+        with self._product_lock:
+            if name not in self.product_cache:
+                return False, None
+            self.product_cache.move_to_end(name)
+            return True, self.product_cache[name]
+
+    def cache_product(self, name: str, bubbles: Bubbles | None) -> None:
+        with self._product_lock:
+            self.product_cache[name] = bubbles
+            self.product_cache.move_to_end(name)
+            while len(self.product_cache) > PRODUCT_LOOKUP_CACHE_SIZE:
+                self.product_cache.popitem(last=False)
+
+
+class SnippetIndex:
+    """Header -> bubbles index over the registry snippet sources.
+
+    Built on first use, rebuilt when any source file's mtime/size changes
+    (checked at most every ``SNIPPET_INDEX_CHECK_INTERVAL`` seconds). Readers
+    always see a complete snapshot; rebuilds swap a single reference.
+    """
+
+    def __init__(self, prompt_registry: PromptRegistry, sources: tuple[str, ...] = SNIPPET_SOURCES):
+        self._registry = prompt_registry
+        self._sources = sources
+        self._snapshot: _SnippetSnapshot | None = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def _stamp(self, key: str) -> tuple[int, int] | None:
+        try:
+            path = self._registry.get(key).path
+            st = path.stat()
+        except Exception:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _build(self) -> _SnippetSnapshot:
+        headers: dict[str, Bubbles | None] = {}
+        products: list[tuple[str, Bubbles | None]] = []
+        stamps: dict[str, tuple[int, int] | None] = {}
+        for key in self._sources:
+            stamps[key] = self._stamp(key)
+            try:
+                content = self._registry.get(key).content
+            except Exception:
+                continue
+            if not content:
+                continue
+            for header, body in _iter_sections(content):
+                # First occurrence wins (across files in source order, then within a file)
+                headers.setdefault(header.strip(), _parse_bubbles(body, _HEADER_METADATA))
+                if key == SystemKeys.SNIPPETS.value:
+                    products.append((header.lower(), _parse_bubbles(body, _PRODUCT_METADATA)))
+        return _SnippetSnapshot(headers, tuple(products), stamps)
+
+    def snapshot(self) -> _SnippetSnapshot:
+        snap = self._snapshot
+        now = time.monotonic()
+        if snap is not None and now < self._next_check:
+            return snap
+        with self._lock:
+            snap = self._snapshot
+            if snap is not None and now < self._next_check:
+                return snap
+            if snap is not None:
+                changed = [k for k in self._sources if self._stamp(k) != snap.stamps.get(k)]
+                if changed:
+                    for key in changed:
+                        self._registry.invalidate(key)
+                    logger.info("Snippet sources changed, rebuilding index: %s", changed)
+                    snap = None
+            if snap is None:
+                snap = self._build()
+                self._snapshot = snap
+            self._next_check = now + SNIPPET_INDEX_CHECK_INTERVAL
+            return snap
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._next_check = 0.0
+
+    def header(self, header_name: str) -> Bubbles | None:
+        return self.snapshot().headers.get(header_name)
+
+    def product(self, product_name: str) -> Bubbles | None:
+        pn_lower = (product_name or "").lower().strip()
+        if not pn_lower:
+            return None
+        # Extract keywords (e.g., "suknia anna" -> ["suknia", "anna"])
+        keywords = [w for w in pn_lower.split() if len(w) > 2]
+        if not keywords:
+            return None
+
+        snap = self.snapshot()
+        hit, cached = snap.cached_product(pn_lower)
+        if hit:
+            return cached
+
+        found: Bubbles | None = None
+        for header_lower, bubbles in snap.products:
+            # All keywords present + a presentation/reply section
+            if all(kw in header_lower for kw in keywords) and (
+                "presentation" in header_lower or "reply" in header_lower
+            ):
+                found = bubbles
+                break
+        snap.cache_product(pn_lower, found)
+        return found
+
+
+snippet_index = SnippetIndex(registry)
+
+
+def get_snippet_bubbles(header_name: str) -> Bubbles | None:
+    """Shared immutable bubbles for an exact ``### header`` (hot-path variant)."""
+    return snippet_index.header(header_name)
+
+
 def get_snippet_by_header(header_name: str) -> list[str] | None:
     """Get snippet by exact header name from registry tables.
 
@@ -221,62 +421,13 @@ def get_snippet_by_header(header_name: str) -> list[str] | None:
     - system.fallbacks (errors)
     - system.intents (patterns)
     - system.system_messages (bot/notifications)
+    - system.vision, system.automation
     """
-    # Registry keys to search in order
-    sources = [
-        SystemKeys.SNIPPETS.value,
-        SystemKeys.FALLBACKS.value,
-        SystemKeys.INTENTS.value,
-        SystemKeys.SYSTEM_MESSAGES.value,
-        SystemKeys.VISION.value,
-        SystemKeys.AUTOMATION.value,
-    ]
-
-    for source_key in sources:
-        try:
-            content = registry.get(source_key).content
-        except Exception:
-            continue
-
-        if not content:
-            continue
-
-        # Parse file content
-        lines = content.split("\n")
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-
-            # Look for ### header with exact match
-            if line.startswith("### ") and line[4:].strip() == header_name:
-                # Found exact match! Extract the snippet body
-                body_lines = []
-                i += 1
-                while i < len(lines) and not lines[i].startswith("### "):
-                    body_lines.append(lines[i])
-                    i += 1
-
-                # Parse body: skip metadata lines, split by ---
-                text_lines = []
-                for bl in body_lines:
-                    bl_stripped = bl.strip()
-                    if bl_stripped.startswith("WHEN:") or bl_stripped.startswith("NEVER:"):
-                        continue
-                    text_lines.append(bl_stripped)
-
-                # Join and split by ---
-                full_text = "\n".join(text_lines).strip()
-                if not full_text:
-                    return None
-
-                bubbles = [b.strip() for b in full_text.split("---") if b.strip()]
-                if bubbles:
-                    logger.debug("Found snippet '%s' in %s", header_name, source_key)
-                    return bubbles
-                return None
-            i += 1
-
-    return None
+    bubbles = snippet_index.header(header_name)
+    if bubbles is None:
+        return None
+    logger.debug("Found snippet '%s'", header_name)
+    return list(bubbles)
 
 
 def get_product_snippet(product_name: str) -> list[str] | None:
@@ -285,67 +436,8 @@ def get_product_snippet(product_name: str) -> list[str] | None:
     Returns list of bubbles (split by ---) or None if not found.
     Universal: works for ANY product that has a snippet in snippets.md.
     """
-    try:
-        content = registry.get("system.snippets").content
-    except Exception:
-        return None
-
-    if not content:
-        return None
-
-    # Normalize product name for matching
-    pn_lower = (product_name or "").lower().strip()
-    if not pn_lower:
-        return None
-
-    # Extract keywords (e.g., "suknia anna" -> ["suknia", "anna"])
-    keywords = [w for w in pn_lower.split() if len(w) > 2]
-    if not keywords:
+    bubbles = snippet_index.product(product_name)
+    if bubbles is None:
         return None
-
-    # Parse snippets.md - find sections matching product
-    lines = content.split("\n")
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        # Look for ### headers that contain product keywords
-        if line.startswith("### "):
-            header_lower = line[4:].lower()
-
-            # Check if this header matches our product (all keywords present)
-            if all(kw in header_lower for kw in keywords):
-                # Found a match! Look for "presentation" or "reply" headers
-                if "presentation" in header_lower or "reply" in header_lower:
-                    # Extract the snippet body (until next ### or EOF)
-                    body_lines = []
-                    i += 1
-                    while i < len(lines) and not lines[i].startswith("### "):
-                        body_lines.append(lines[i])
-                        i += 1
-
-                    # Parse body: skip metadata lines, split by ---
-                    text_lines = []
-                    for bl in body_lines:
-                        bl_stripped = bl.strip()
-                        if (
-                            bl_stripped.startswith("WHEN:")
-                            or bl_stripped.startswith("NEVER:")
-                            or bl_stripped.startswith("PRIORITY:")
-                        ):
-                            continue
-                        text_lines.append(bl_stripped)
-
-                    # Join and split by ---
-                    full_text = "\n".join(text_lines).strip()
-                    if not full_text:
-                        return None
-
-                    bubbles = [b.strip() for b in full_text.split("---") if b.strip()]
-                    if bubbles:
-                        logger.info("Found snippet for '%s': %d bubbles", product_name, len(bubbles))
-                        return bubbles
-                    return None
-        i += 1
-
-    return None
+    logger.debug("Found snippet for '%s': %d bubbles", product_name, len(bubbles))
+    return list(bubbles)
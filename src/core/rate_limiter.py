@@ -2,50 +2,31 @@
 
 Provides distributed rate limiting using Redis for multi-instance deployments.
 Falls back to in-memory limiter if Redis is unavailable.
+
+``AsyncTokenBucket`` paces outgoing calls from a single worker (e.g. a
+concurrent fan-out of ManyChat API requests).
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from typing import TYPE_CHECKING
 
+from src.services.infra.redis_pool import get_redis_client, redis_namespace, report_redis_error
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
 logger = logging.getLogger(__name__)
 
-# Global Redis client cache
-_redis_client: object | None = None
+_KEYS = redis_namespace("rate_limit")
 
 
 def _get_redis_client():
-    """Get or create Redis client."""
-    global _redis_client
-
-    if _redis_client is not None:
-        return _redis_client
-
-    try:
-        import os
-
-        import redis
-
-        from src.conf.config import settings
-
-        redis_url = os.getenv("REDIS_URL") or settings.REDIS_URL
-        if not redis_url:
-            return None
-
-        _redis_client = redis.from_url(redis_url, decode_responses=True)
-        # Test connection
-        _redis_client.ping()
-        logger.info("Redis rate limiter connected")
-        return _redis_client
-    except Exception as e:
-        logger.warning("Redis not available for rate limiting: %s", e)
-        _redis_client = None
-        return None
+    """Return the shared pooled Redis client (``None`` if unavailable)."""
+    return get_redis_client()
 
 
 def check_rate_limit(key: str, *, requests_per_minute: int = 60, requests_per_hour: int = 1000) -> bool:
@@ -72,8 +53,8 @@ def check_rate_limit(key: str, *, requests_per_minute: int = 60, requests_per_ho
 
     try:
         now = time.time()
-        minute_key = f"rate_limit:minute:{key}"
-        hour_key = f"rate_limit:hour:{key}"
+        minute_key = _KEYS.key("minute", key)
+        hour_key = _KEYS.key("hour", key)
 
         # Sliding window: use sorted sets
         pipe = redis_client.pipeline()
@@ -118,5 +99,38 @@ def check_rate_limit(key: str, *, requests_per_minute: int = 60, requests_per_ho
 
     except Exception as e:
         logger.error("Rate limit check failed for key=%s: %s", key, e)
+        report_redis_error(e, subsystem="rate_limit")
         # Fail open: allow request if Redis check fails
         return True
+
+
+class AsyncTokenBucket:
+    """Token bucket for pacing async calls: ``rate`` per second, bursts up to ``capacity``.
+
+    Waiters are served in order. Not shared across processes.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: asyncio.Lock | None = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until one token is available and take it."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
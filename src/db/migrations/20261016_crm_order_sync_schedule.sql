@@ -0,0 +1,16 @@
+-- Per-order check schedule for the periodic CRM status sync
+-- (src/integrations/crm/order_sync.py)
+--
+-- check_pending_orders used to queue one sync task per open order on every
+-- beat. The scanner now only reads orders whose next check is due and
+-- stores when each order was checked and when to check it again.
+
+alter table agent_sessions add column if not exists order_tracked_since timestamptz;
+alter table agent_sessions add column if not exists order_checked_at timestamptz;
+alter table agent_sessions add column if not exists order_next_check_at timestamptz;
+
+-- Due open orders, keyset-paged by session_id
+create index if not exists idx_agent_sessions_order_next_check
+    on agent_sessions(order_next_check_at, session_id)
+    where order_id is not null
+      and order_status in ('pending', 'new', 'pending_payment', 'paid', 'processing', 'shipped');
@@ -0,0 +1,27 @@
+-- Last-activity index for the periodic follow-up check
+-- (src/services/infra/followup_index.py)
+--
+-- check_all_sessions_for_followups used to scan the whole messages table and
+-- load every session's history. Instead, agent_sessions keeps the last
+-- activity time and the number of follow-ups sent, updated on each message
+-- append, and the task queries only the sessions that are due:
+--   last_activity_at <= now() - FOLLOWUP_DELAYS_HOURS[followups_sent]
+
+alter table agent_sessions add column if not exists last_activity_at timestamptz;
+alter table agent_sessions add column if not exists followups_sent integer not null default 0;
+
+-- Due-time lookups: one range scan per schedule step
+create index if not exists idx_agent_sessions_followup_due
+    on agent_sessions(followups_sent, last_activity_at)
+    where last_activity_at is not null;
+
+-- Backfill existing sessions from their messages (follow-up tags are not
+-- stored in the messages table, so followups_sent starts at 0)
+update agent_sessions s
+set last_activity_at = greatest(s.last_activity_at, m.last_created_at)
+from (
+    select session_id, max(created_at) as last_created_at
+    from messages
+    group by session_id
+) m
+where m.session_id = s.session_id;
@@ -0,0 +1,60 @@
+-- Bulk insert for batched LLM usage records
+-- (src/services/core/telemetry_writer.py, TELEMETRY_BATCH_ENABLED)
+--
+-- The telemetry writer sends buffered usage rows in one call. This inserts
+-- them into llm_usage and adds them to the llm_usage_hourly rollup
+-- (20261016_llm_usage_hourly_rollup.sql) in the same statement: both
+-- inserts are data-modifying CTEs over one jsonb_to_recordset scan, so a flush
+-- creates no temp table.
+--
+-- p_rows: [{"user_id", "model", "tokens_input", "tokens_output", "cost_usd", "created_at"}, ...]
+
+create or replace function record_llm_usage_batch(p_rows jsonb)
+returns integer
+language sql
+as $$
+    with batch as (
+        select
+            user_id,
+            model,
+            tokens_input,
+            tokens_output,
+            cost_usd,
+            coalesce(created_at, now()) as created_at
+        from jsonb_to_recordset(p_rows) as r(
+            user_id bigint,
+            model text,
+            tokens_input integer,
+            tokens_output integer,
+            cost_usd numeric,
+            created_at timestamptz
+        )
+    ),
+    inserted as (
+        insert into llm_usage (user_id, model, tokens_input, tokens_output, cost_usd, created_at)
+        select user_id, model, tokens_input, tokens_output, cost_usd, created_at
+        from batch
+        returning 1
+    ),
+    rolled_up as (
+        insert into llm_usage_hourly as h
+            (hour, user_id, model, request_count, tokens_input, tokens_output, cost_usd)
+        select
+            date_trunc('hour', created_at),
+            coalesce(user_id, 0),
+            model,
+            count(*),
+            coalesce(sum(tokens_input), 0),
+            coalesce(sum(tokens_output), 0),
+            coalesce(sum(cost_usd), 0)
+        from batch
+        group by 1, 2, 3
+        on conflict (hour, user_id, model) do update set
+            request_count = h.request_count + excluded.request_count,
+            tokens_input = h.tokens_input + excluded.tokens_input,
+            tokens_output = h.tokens_output + excluded.tokens_output,
+            cost_usd = h.cost_usd + excluded.cost_usd
+        returning 1
+    )
+    select count(*)::integer from inserted;
+$$;
@@ -0,0 +1,98 @@
+-- Hourly rollup of llm_usage for reports and per-user summaries
+-- (src/workers/tasks/llm_usage.py)
+--
+-- aggregate_daily_usage and get_user_usage_summary used to pull every
+-- llm_usage row into the worker and sum costs in Python. record_usage now
+-- also adds each call to llm_usage_hourly (one row per hour/user/model),
+-- and the reports ask llm_usage_totals for one row per model plus a total.
+
+create table if not exists llm_usage_hourly (
+    hour timestamptz not null,
+    -- 0 for calls without a user (primary key columns cannot be null)
+    user_id bigint not null default 0,
+    model text not null,
+    request_count bigint not null default 0,
+    tokens_input bigint not null default 0,
+    tokens_output bigint not null default 0,
+    cost_usd numeric(18, 6) not null default 0,
+    primary key (hour, user_id, model)
+);
+
+create index if not exists idx_llm_usage_hourly_user
+    on llm_usage_hourly(user_id, hour);
+
+-- Atomic increment for one usage record (PostgREST upsert would overwrite)
+create or replace function record_llm_usage_rollup(
+    p_created_at timestamptz,
+    p_user_id bigint,
+    p_model text,
+    p_tokens_input bigint,
+    p_tokens_output bigint,
+    p_cost_usd numeric
+) returns void
+language sql
+as $$
+    insert into llm_usage_hourly as h
+        (hour, user_id, model, request_count, tokens_input, tokens_output, cost_usd)
+    values (
+        date_trunc('hour', p_created_at),
+        coalesce(p_user_id, 0),
+        p_model,
+        1,
+        p_tokens_input,
+        p_tokens_output,
+        p_cost_usd
+    )
+    on conflict (hour, user_id, model) do update set
+        request_count = h.request_count + 1,
+        tokens_input = h.tokens_input + excluded.tokens_input,
+        tokens_output = h.tokens_output + excluded.tokens_output,
+        cost_usd = h.cost_usd + excluded.cost_usd;
+$$;
+
+-- Usage since p_since (rounded down to the hour), optionally for one user.
+-- One row per model plus a total row with model = null.
+create or replace function llm_usage_totals(
+    p_since timestamptz,
+    p_user_id bigint default null
+) returns table (
+    model text,
+    request_count bigint,
+    tokens_input bigint,
+    tokens_output bigint,
+    cost_usd numeric,
+    unique_users bigint
+)
+language sql
+stable
+as $$
+    select
+        h.model,
+        sum(h.request_count)::bigint,
+        sum(h.tokens_input)::bigint,
+        sum(h.tokens_output)::bigint,
+        sum(h.cost_usd),
+        count(distinct h.user_id) filter (where h.user_id <> 0)
+    from llm_usage_hourly h
+    where h.hour >= date_trunc('hour', p_since)
+      and (p_user_id is null or h.user_id = p_user_id)
+    group by grouping sets ((h.model), ());
+$$;
+
+-- Backfill (and repair) from the raw rows; safe to re-run
+insert into llm_usage_hourly (hour, user_id, model, request_count, tokens_input, tokens_output, cost_usd)
+select
+    date_trunc('hour', created_at),
+    coalesce(user_id, 0),
+    model,
+    count(*),
+    coalesce(sum(tokens_input), 0),
+    coalesce(sum(tokens_output), 0),
+    coalesce(sum(cost_usd), 0)
+from llm_usage
+group by 1, 2, 3
+on conflict (hour, user_id, model) do update set
+    request_count = excluded.request_count,
+    tokens_input = excluded.tokens_input,
+    tokens_output = excluded.tokens_output,
+    cost_usd = excluded.cost_usd;
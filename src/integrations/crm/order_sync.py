@@ -0,0 +1,144 @@
+"""Periodic CRM order status sync.
+
+``check_pending_orders`` used to load every session with an open order and
+queue one ``sync_order_status`` task (one CRM request) per order on each
+beat. Instead, this scanner:
+
+- pages through due orders only (``order_next_check_at`` passed or unset),
+  keyset-paged by ``session_id``;
+- fetches each page's statuses with one bulk CRM request
+  (``SnitkixCRMClient.get_order_statuses``);
+- writes the page back in one upsert, with the next check time chosen by
+  ``next_check_delay`` from the order's status and age.
+
+Orders not reached within the time budget stay due and are picked up by the
+next run. See ``src/db/migrations/20261016_crm_order_sync_schedule.sql``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from src.conf.config import settings
+from src.core.constants import DBTable
+
+
+if TYPE_CHECKING:
+    from src.integrations.crm.snitkix import SnitkixCRMClient
+
+
+logger = logging.getLogger(__name__)
+
+# Statuses that can still change ("pending" is written by older flows)
+OPEN_ORDER_STATUSES: tuple[str, ...] = ("pending", "new", "pending_payment", "paid", "processing", "shipped")
+
+# Check interval relative to CRM_SYNC_MIN_INTERVAL_MINUTES: orders early in the
+# pipeline change within hours, shipped ones within days.
+_STATUS_INTERVAL_FACTOR: dict[str, float] = {
+    "pending": 1,
+    "new": 1,
+    "pending_payment": 1,
+    "paid": 2,
+    "processing": 2,
+    "shipped": 6,
+}
+
+
+def next_check_delay(status: str, age: timedelta) -> timedelta | None:
+    """Delay until the next status check; None for closed orders.
+
+    The status interval grows by one step per day of order age, capped at
+    CRM_SYNC_MAX_INTERVAL_HOURS.
+    """
+    factor = _STATUS_INTERVAL_FACTOR.get(status)
+    if factor is None:
+        return None
+    base = timedelta(minutes=settings.CRM_SYNC_MIN_INTERVAL_MINUTES * factor)
+    days = max(age.total_seconds(), 0) / 86400
+    return min(base * (1 + days), timedelta(hours=settings.CRM_SYNC_MAX_INTERVAL_HOURS))
+
+
+def _parse_ts(value: Any) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def fetch_due_orders(client: Any, now: datetime, after: str, page_size: int) -> list[dict[str, Any]]:
+    """Next page of open orders due for a check, after session ``after``."""
+    response = (
+        client.table(DBTable.SESSIONS)
+        .select("session_id, order_id, order_status, order_tracked_since")
+        .not_.is_("order_id", "null")
+        .in_("order_status", list(OPEN_ORDER_STATUSES))
+        .or_(f"order_next_check_at.is.null,order_next_check_at.lte.{now.isoformat()}")
+        .gt("session_id", after)
+        .order("session_id")
+        .limit(page_size)
+        .execute()
+    )
+    return response.data or []
+
+
+async def sync_due_orders(
+    client: Any,
+    crm: SnitkixCRMClient,
+    *,
+    page_size: int | None = None,
+    budget_seconds: float | None = None,
+) -> dict[str, int]:
+    """Check due orders page by page until done or out of time.
+
+    Returns:
+        Counters: checked, changed, missing (not found in CRM), pages
+    """
+    page_size = page_size or settings.CRM_SYNC_PAGE_SIZE
+    deadline = time.monotonic() + (budget_seconds or settings.CRM_SYNC_BUDGET_SECONDS)
+    stats = {"checked": 0, "changed": 0, "missing": 0, "pages": 0}
+    # Keyset cursor; "" sorts before every session id
+    after = ""
+
+    while time.monotonic() < deadline:
+        now = datetime.now(UTC)
+        rows = fetch_due_orders(client, now, after, page_size)
+        if not rows:
+            break
+        stats["pages"] += 1
+
+        statuses = await crm.get_order_statuses([str(row["order_id"]) for row in rows])
+        updates = []
+        for row in rows:
+            result = statuses.get(str(row["order_id"]))
+            status = result.status if result else row["order_status"]
+            if result is None:
+                stats["missing"] += 1
+            elif status != row["order_status"]:
+                stats["changed"] += 1
+            tracked_since = _parse_ts(row.get("order_tracked_since")) or now
+            delay = next_check_delay(status, now - tracked_since)
+            updates.append(
+                {
+                    "session_id": row["session_id"],
+                    "order_id": row["order_id"],
+                    "order_status": status,
+                    "order_tracked_since": tracked_since.isoformat(),
+                    "order_checked_at": now.isoformat(),
+                    "order_next_check_at": (now + delay).isoformat() if delay else None,
+                }
+            )
+        # session_id is UNIQUE but not the primary key (id is), so name it as the conflict target
+        client.table(DBTable.SESSIONS).upsert(updates, on_conflict="session_id").execute()
+        stats["checked"] += len(rows)
+
+        if len(rows) < page_size:
+            break
+        after = rows[-1]["session_id"]
+
+    return stats
@@ -10,6 +10,7 @@ Environment variables required:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from typing import Any
@@ -63,6 +64,8 @@ class SnitkixCRMClient(BaseCRMClient):
         self.api_url = (api_url or getattr(settings, "SNITKIX_API_URL", "")).rstrip("/")
         self.api_key = api_key or getattr(settings, "SNITKIX_API_KEY", "")
         self.timeout = timeout
+        # Cleared when the list endpoint turns out not to filter by ids
+        self._bulk_status_supported = True
 
         self._client = httpx.AsyncClient(
             base_url=self.api_url,
@@ -196,16 +199,86 @@ class SnitkixCRMClient(BaseCRMClient):
         if not response.success or not response.data:
             return None
 
-        snitkix_status = response.data.get("status", "unknown")
+        return self._status_result(order_id, response.data)
+
+    @staticmethod
+    def _status_result(order_id: str, data: dict[str, Any]) -> OrderStatusResult:
+        snitkix_status = data.get("status", "unknown")
         our_status = REVERSE_STATUS_MAPPING.get(snitkix_status, OrderStatus.NEW)
 
         return OrderStatusResult(
             order_id=order_id,
             status=our_status.value,
             snitkix_status=snitkix_status,
-            updated_at=response.data.get("updated_at"),
+            updated_at=data.get("updated_at"),
         )
 
+    async def get_order_statuses(
+        self,
+        order_ids: list[str],
+        concurrency: int = 5,
+    ) -> dict[str, OrderStatusResult]:
+        """Get statuses for many orders, one list request where possible.
+
+        Asks ``/api/orders`` for all ids at once; orders missing from that
+        answer (or every order, if the endpoint does not filter by ids) are
+        fetched one by one with at most ``concurrency`` requests in flight.
+
+        Args:
+            order_ids: CRM order IDs
+
+        Returns:
+            {order_id: OrderStatusResult} for the orders that were found
+        """
+        ids = list(dict.fromkeys(str(order_id) for order_id in order_ids))
+        results: dict[str, OrderStatusResult] = {}
+        if not ids or not self.api_url or not self.api_key:
+            return results
+
+        if self._bulk_status_supported and len(ids) > 1:
+            results.update(await self._list_order_statuses(ids))
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(order_id: str) -> None:
+            async with semaphore:
+                status = await self.get_order_status(order_id)
+            if status is not None:
+                results[order_id] = status
+
+        await asyncio.gather(*(fetch_one(order_id) for order_id in ids if order_id not in results))
+        return results
+
+    async def _list_order_statuses(self, ids: list[str]) -> dict[str, OrderStatusResult]:
+        try:
+            response = await self._client.get(
+                "/api/orders",
+                params={"ids": ",".join(ids), "limit": len(ids)},
+            )
+        except Exception as e:
+            logger.warning("Snitkix bulk status error: %s", e)
+            return {}
+
+        if response.status_code != 200:
+            if response.status_code in (400, 404, 422):
+                self._bulk_status_supported = False
+            logger.warning("Snitkix bulk status request failed: HTTP %d", response.status_code)
+            return {}
+
+        data = response.json()
+        orders = (data.get("data") or data.get("orders") or []) if isinstance(data, dict) else data
+        wanted = set(ids)
+        found = {
+            str(order.get("id")): order
+            for order in orders
+            if isinstance(order, dict) and str(order.get("id")) in wanted
+        }
+        if orders and not found:
+            # Filter ignored (unrelated orders returned): stop trying
+            self._bulk_status_supported = False
+            logger.info("Snitkix /api/orders does not filter by ids, using per-order status requests")
+        return {order_id: self._status_result(order_id, order) for order_id, order in found.items()}
+
     async def search_orders(
         self,
         phone: str | None = None,
@@ -14,18 +14,30 @@ SETUP IN MANYCHAT:
 2. Add to .env: MANYCHAT_API_KEY=your_key_here
 3. Create Custom Fields: ai_state, ai_response, last_product
 4. Create Tags: ai_responded, ai_followup_pending, order_created
+
+Subscriber lookups are cached briefly (``MANYCHAT_SUBSCRIBER_CACHE_TTL_SECONDS``)
+and concurrent lookups of the same subscriber share one request; the cache
+entry is dropped whenever the client changes the subscriber's tags or fields.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+import weakref
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
 from src.conf.config import settings
 from src.core.circuit_breaker import CircuitBreakerOpenError, get_circuit_breaker
 from src.core.http_retry import http_request_with_retry
+from src.integrations.manychat.mutations import count_api_call
+from src.integrations.manychat.subscriber_cache import SubscriberCache
+
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
 
 
 logger = logging.getLogger(__name__)
@@ -33,6 +45,9 @@ logger = logging.getLogger(__name__)
 # ManyChat API endpoints
 MANYCHAT_API_BASE = "https://api.manychat.com/fb"
 
+# Fields per /subscriber/setCustomFields request
+_BULK_FIELDS_MAX = 20
+
 
 class ManyChatAPIError(Exception):
     """Raised when ManyChat API call fails."""
@@ -81,8 +96,14 @@ class ManyChatClient:
             or settings.MANYCHAT_VERIFY_TOKEN
         )
         self.base_url = MANYCHAT_API_BASE
-        self._client: httpx.AsyncClient | None = None
+        # One pooled client per event loop (FastAPI loop, Celery run_sync loops)
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
         self._circuit_breaker = get_circuit_breaker("manychat_api", failure_threshold=5, recovery_timeout=60.0)
+        self._subscribers = SubscriberCache()
+        self._inflight: dict[tuple[int, Hashable], asyncio.Future[dict[str, Any] | None]] = {}
+        self._bulk_fields_supported = True
 
     @property
     def headers(self) -> dict[str, str]:
@@ -98,20 +119,67 @@ class ManyChatClient:
         return bool(self.api_key)
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
+        """Get or create the HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
                 base_url=self.base_url,
                 headers=self.headers,
                 timeout=30.0,
             )
-        return self._client
+            self._clients[loop] = client
+        return client
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Close the HTTP client of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    # =========================================================================
+    # SUBSCRIBER CACHE
+    # =========================================================================
+
+    @property
+    def subscriber_ttl(self) -> float:
+        return float(getattr(settings, "MANYCHAT_SUBSCRIBER_CACHE_TTL_SECONDS", 30.0))
+
+    def invalidate_subscriber(self, subscriber_id: str) -> None:
+        """Drop cached data for a subscriber whose tags or fields changed."""
+        from src.integrations.manychat.tag_probe import invalidate_subscriber_tags
+
+        self._subscribers.invalidate(subscriber_id)
+        invalidate_subscriber_tags(subscriber_id)
+        # Lookups already in flight may return the old state; later callers start a new one.
+        # A field lookup may resolve to this subscriber, so those are dropped too.
+        loop_id = id(asyncio.get_running_loop())
+        for key in [k for k in self._inflight if k[0] == loop_id and isinstance(k[1], tuple)]:
+            del self._inflight[key]
+        self._inflight.pop((loop_id, subscriber_id), None)
+
+    async def _coalesced(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+    ) -> dict[str, Any] | None:
+        """Share one in-flight ``fetch()`` between concurrent callers with the same key."""
+        inflight_key = (id(asyncio.get_running_loop()), key)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[inflight_key] = task
+
+            def _forget(done: asyncio.Future[dict[str, Any] | None]) -> None:
+                if self._inflight.get(inflight_key) is done:
+                    del self._inflight[inflight_key]
+
+            task.add_done_callback(_forget)
+        # A cancelled caller must not cancel the lookup other callers wait on
+        return await asyncio.shield(task)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        return self._subscribers.get_stats()
 
     # =========================================================================
     # SENDING MESSAGES (NEW!)
@@ -455,6 +523,7 @@ class ManyChatClient:
             return False
 
         client = await self._get_client()
+        count_api_call()
         try:
             response = await client.post(
                 "/subscriber/addTagByName",
@@ -476,6 +545,9 @@ class ManyChatClient:
         except Exception as e:
             logger.error("[MANYCHAT] Error adding tag: %s", e)
             return False
+        finally:
+            # Sent or not, the cached state may no longer be right
+            self.invalidate_subscriber(subscriber_id)
 
     async def remove_tag(self, subscriber_id: str, tag_name: str) -> bool:
         """Remove a tag from subscriber.
@@ -492,6 +564,7 @@ class ManyChatClient:
             return False
 
         client = await self._get_client()
+        count_api_call()
         try:
             response = await client.post(
                 "/subscriber/removeTagByName",
@@ -513,6 +586,8 @@ class ManyChatClient:
         except Exception as e:
             logger.error("[MANYCHAT] Error removing tag: %s", e)
             return False
+        finally:
+            self.invalidate_subscriber(subscriber_id)
 
     # =========================================================================
     # CUSTOM FIELDS
@@ -539,6 +614,7 @@ class ManyChatClient:
             return False
 
         client = await self._get_client()
+        count_api_call()
         try:
             response = await client.post(
                 "/subscriber/setCustomFieldByName",
@@ -566,6 +642,8 @@ class ManyChatClient:
         except Exception as e:
             logger.error("[MANYCHAT] Error setting custom field: %s", e)
             return False
+        finally:
+            self.invalidate_subscriber(subscriber_id)
 
     async def set_custom_fields(
         self,
@@ -574,6 +652,10 @@ class ManyChatClient:
     ) -> bool:
         """Set multiple custom fields for subscriber.
 
+        Uses one ``/subscriber/setCustomFields`` request per 20 fields; a chunk
+        the bulk endpoint cannot take (unsupported, or a field it rejects) is
+        set one request per field.
+
         Args:
             subscriber_id: ManyChat subscriber ID
             fields: Dict of field_name -> field_value
@@ -584,13 +666,58 @@ class ManyChatClient:
         if not fields:
             return True
 
+        items = list(fields.items())
         results = []
-        for field_name, field_value in fields.items():
-            result = await self.set_custom_field(subscriber_id, field_name, str(field_value))
-            results.append(result)
+        for i in range(0, len(items), _BULK_FIELDS_MAX):
+            chunk = dict(items[i : i + _BULK_FIELDS_MAX])
+            result = None
+            if self._bulk_fields_supported and self.is_configured:
+                result = await self._set_custom_fields_bulk(subscriber_id, chunk)
+            if result is None:
+                for field_name, field_value in chunk.items():
+                    results.append(await self.set_custom_field(subscriber_id, field_name, str(field_value)))
+            else:
+                results.append(result)
 
         return all(results)
 
+    async def _set_custom_fields_bulk(self, subscriber_id: str, fields: dict[str, str]) -> bool | None:
+        """One ``/subscriber/setCustomFields`` request; None means "set them one by one"."""
+        client = await self._get_client()
+        count_api_call()
+        try:
+            response = await client.post(
+                "/subscriber/setCustomFields",
+                json={
+                    "subscriber_id": subscriber_id,
+                    "fields": [
+                        {"field_name": name, "field_value": str(value)} for name, value in fields.items()
+                    ],
+                },
+            )
+            response.raise_for_status()
+            logger.info("[MANYCHAT] Set %d fields for subscriber %s", len(fields), subscriber_id)
+            return True
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            text = e.response.text
+            names_field = "field" in text.lower() or any(name in text for name in fields)
+            if status in (404, 405):
+                # Endpoint not available for this account: stop trying it
+                self._bulk_fields_supported = False
+            elif status != 400 or not names_field:
+                # Rate limits, auth and server errors: one request per field would only add load
+                logger.error("[MANYCHAT] Failed to set custom fields: %s - %s", status, text)
+                return False
+            # A 400 naming a field: the other fields can still be set one by one
+            logger.warning("[MANYCHAT] Bulk field update rejected (%s), setting fields one by one", status)
+            return None
+        except Exception as e:
+            logger.error("[MANYCHAT] Error setting custom fields: %s", e)
+            return False
+        finally:
+            self.invalidate_subscriber(subscriber_id)
+
     # =========================================================================
     # SUBSCRIBER INFO
     # =========================================================================
@@ -607,6 +734,13 @@ class ManyChatClient:
         if not self.is_configured:
             return None
 
+        cached = self._subscribers.get(subscriber_id, self.subscriber_ttl)
+        if cached is not None:
+            return cached
+        return await self._coalesced(subscriber_id, lambda: self._fetch_subscriber_info(subscriber_id))
+
+    async def _fetch_subscriber_info(self, subscriber_id: str) -> dict[str, Any] | None:
+        epoch = self._subscribers.epoch(subscriber_id)
         client = await self._get_client()
         try:
             response = await client.get(
@@ -615,10 +749,13 @@ class ManyChatClient:
             )
             response.raise_for_status()
             data = response.json()
-            return data.get("data")
+            info = data.get("data")
         except Exception as e:
             logger.error("[MANYCHAT] Error getting subscriber info: %s", e)
             return None
+        if info:
+            self._subscribers.put(subscriber_id, info, epoch)
+        return info
 
     async def find_subscriber_by_custom_field(
         self,
@@ -637,6 +774,15 @@ class ManyChatClient:
         if not self.is_configured:
             return None
 
+        key = (field_name, field_value)
+        cached = self._subscribers.get_by_field(key, self.subscriber_ttl)
+        if cached is not None:
+            return cached
+        return await self._coalesced(key, lambda: self._find_subscriber_by_custom_field(key))
+
+    async def _find_subscriber_by_custom_field(self, key: tuple[str, str]) -> dict[str, Any] | None:
+        field_name, field_value = key
+        generation = self._subscribers.generation()
         client = await self._get_client()
         try:
             response = await client.post(
@@ -649,10 +795,14 @@ class ManyChatClient:
             response.raise_for_status()
             data = response.json()
             subscribers = data.get("data", [])
-            return subscribers[0] if subscribers else None
         except Exception as e:
             logger.error("[MANYCHAT] Error finding subscriber: %s", e)
             return None
+        if not subscribers:
+            return None
+        subscriber = subscribers[0]
+        self._subscribers.put_by_field(key, subscriber, generation)
+        return subscriber
 
 
 # =============================================================================
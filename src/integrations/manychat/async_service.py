@@ -29,13 +29,19 @@ from src.services.infra.debouncer import create_debouncer
 from src.services.infra.media_utils import normalize_image_url
 from src.services.infra.message_store import MessageStore, create_message_store
 
+from .mutations import (
+    SubscriberMutations,
+    apply_mutations,
+    count_turn_api_calls,
+    get_mutation_ledger,
+    split_for_send_content,
+    watch_dropped_actions,
+)
 from .pipeline import process_manychat_pipeline
 from .push_client import ManyChatPushClient, get_manychat_push_client
 from .response_builder import (
-    build_manychat_field_values,
     build_manychat_messages,
     build_manychat_response,
-    build_manychat_tags,
     build_text_response,
 )
 from .service_utils import (
@@ -258,6 +264,9 @@ class ManyChatAsyncService:
                     self._restart_inflight.discard(user_id)
                 return
 
+            # The webhook carries the subscriber's current fields/tags
+            get_mutation_ledger().observe(user_id, subscriber_data)
+
             # Build metadata including username info
             extra_metadata = build_extra_metadata(
                 user_id=user_id,
@@ -422,11 +431,11 @@ class ManyChatAsyncService:
                 messages_count=len(messages),
             )
 
-        # Build custom field values
-        field_values = build_manychat_field_values(agent_response)
-
-        # Build tags
-        add_tags, remove_tags = build_manychat_tags(agent_response)
+        # Field/tag changes of this turn, minus the ones ManyChat already has;
+        # what fits rides on the sendContent request as actions
+        ledger = get_mutation_ledger()
+        pending = ledger.diff(SubscriberMutations.from_agent_response(user_id, agent_response))
+        piggyback, overflow = split_for_send_content(pending, channel)
 
         # Build quick replies (currently disabled for Instagram sendContent API)
         quick_replies = self._build_quick_replies(agent_response)
@@ -441,17 +450,33 @@ class ManyChatAsyncService:
             messages_count=len(messages),
         )
 
-        success = await safe_send_content(
-            self.push_client,
-            subscriber_id=user_id,
-            messages=messages,
-            channel=channel,
-            quick_replies=quick_replies,
-            set_field_values=field_values,
-            add_tags=add_tags,
-            remove_tags=remove_tags,
-            trace_id=trace_id,
-        )
+        with count_turn_api_calls() as api_calls, watch_dropped_actions() as actions_dropped:
+            success = await safe_send_content(
+                self.push_client,
+                subscriber_id=user_id,
+                messages=messages,
+                channel=channel,
+                quick_replies=quick_replies,
+                set_field_values=piggyback.field_values,
+                add_tags=piggyback.add_tags,
+                remove_tags=piggyback.remove_tags,
+                trace_id=trace_id,
+            )
+            if success:
+                if actions_dropped[0]:
+                    # Delivered without the fields/tags; don't treat them as known
+                    ledger.forget(user_id)
+                else:
+                    ledger.record(piggyback)
+                if overflow and settings.MANYCHAT_FLUSH_OVERFLOW_MUTATIONS:
+                    try:
+                        ledger.record(await apply_mutations(overflow))
+                    except Exception as e:
+                        logger.warning("[MANYCHAT] Failed to apply field/tag changes: %s", e)
+
+        from src.services.core.observability import track_metric
+
+        track_metric("manychat_api_calls_per_turn", api_calls[0], {"channel": channel})
 
         if success:
             log_event(
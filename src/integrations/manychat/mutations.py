@@ -0,0 +1,357 @@
+"""Per-turn ManyChat custom-field and tag changes.
+
+A graph run ends with a handful of subscriber updates (``ai_state``,
+``ai_intent``, ``last_product``, ``order_sum``, ``ai_responded`` /
+``needs_human`` tags). Instead of sending each one on its own, the push path:
+
+- collects them in one ``SubscriberMutations`` per subscriber (later changes
+  to the same field/tag win);
+- drops changes that match the last known values (``MutationLedger``: seeded
+  from the webhook's subscriber snapshot and from our own successful writes);
+- sends what fits as ``sendContent`` actions of the reply itself
+  (``split_for_send_content``, same channel rules as ``ManyChatPushClient``);
+- optionally writes the rest with one bulk field request plus one request per
+  tag (``apply_mutations``, ``MANYCHAT_FLUSH_OVERFLOW_MUTATIONS``).
+
+ManyChat requests made during a turn are counted with ``count_turn_api_calls``;
+``watch_dropped_actions`` tells whether the push client had to resend the reply
+without its actions, in which case they were not applied.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from src.conf.config import settings
+from src.integrations.manychat.tag_probe import subscriber_tag_names
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from src.integrations.manychat.api_client import ManyChatClient
+    from src.services.client_data_parser import ClientData
+
+
+# ManyChat accepts at most 5 actions per sendContent request
+MAX_SEND_CONTENT_ACTIONS = 5
+
+_LEDGER_MAX_ENTRIES = 10_000
+
+_turn_calls: ContextVar[list[int] | None] = ContextVar("manychat_turn_calls", default=None)
+_actions_dropped: ContextVar[list[bool] | None] = ContextVar("manychat_actions_dropped", default=None)
+
+
+def count_api_call(n: int = 1) -> None:
+    """Add ``n`` ManyChat requests to the current turn's counter (if any)."""
+    counter = _turn_calls.get()
+    if counter is not None:
+        counter[0] += n
+
+
+@contextmanager
+def count_turn_api_calls() -> Iterator[list[int]]:
+    """Count ManyChat requests made inside the block (``counter[0]``)."""
+    counter = [0]
+    token = _turn_calls.set(counter)
+    try:
+        yield counter
+    finally:
+        _turn_calls.reset(token)
+
+
+def note_actions_dropped() -> None:
+    """Mark that a sendContent request inside ``watch_dropped_actions`` lost its actions."""
+    flag = _actions_dropped.get()
+    if flag is not None:
+        flag[0] = True
+
+
+@contextmanager
+def watch_dropped_actions() -> Iterator[list[bool]]:
+    """``flag[0]`` is True if the reply was resent without its actions inside the block."""
+    flag = [False]
+    token = _actions_dropped.set(flag)
+    try:
+        yield flag
+    finally:
+        _actions_dropped.reset(token)
+
+
+def _normalize(value: Any) -> str:
+    """Comparable form of a field value (ManyChat stores what we send as text)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value).strip()
+
+
+@dataclass
+class SubscriberMutations:
+    """Pending field and tag changes for one subscriber."""
+
+    subscriber_id: str
+    fields: dict[str, Any] = field(default_factory=dict)
+    # tag name -> True (add) / False (remove)
+    tags: dict[str, bool] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.fields or self.tags)
+
+    def set_field(self, name: str, value: Any) -> None:
+        self.fields[name] = value
+
+    def add_tag(self, name: str) -> None:
+        self.tags[name] = True
+
+    def remove_tag(self, name: str) -> None:
+        self.tags[name] = False
+
+    def merge(self, other: SubscriberMutations) -> None:
+        """Apply ``other`` on top of these changes."""
+        self.fields.update(other.fields)
+        self.tags.update(other.tags)
+
+    @property
+    def field_values(self) -> list[dict[str, Any]]:
+        return [{"field_name": name, "field_value": value} for name, value in self.fields.items()]
+
+    @property
+    def add_tags(self) -> list[str]:
+        return [name for name, add in self.tags.items() if add]
+
+    @property
+    def remove_tags(self) -> list[str]:
+        return [name for name, add in self.tags.items() if not add]
+
+    @property
+    def action_count(self) -> int:
+        return len(self.fields) + len(self.tags)
+
+    @classmethod
+    def from_agent_response(
+        cls,
+        subscriber_id: str,
+        agent_response: Any,
+        client_data: ClientData | None = None,
+    ) -> SubscriberMutations:
+        from src.integrations.manychat.response_builder import (
+            build_manychat_field_values,
+            build_manychat_tags,
+        )
+
+        mutations = cls(subscriber_id)
+        for item in build_manychat_field_values(agent_response, client_data):
+            mutations.set_field(item["field_name"], item["field_value"])
+        add_tags, remove_tags = build_manychat_tags(agent_response)
+        for tag in remove_tags:
+            mutations.remove_tag(tag)
+        for tag in add_tags:
+            mutations.add_tag(tag)
+        return mutations
+
+
+def _snapshot_fields(subscriber: dict[str, Any]) -> dict[str, str] | None:
+    """Custom fields of a subscriber payload (webhook dict or getInfo list)."""
+    raw = subscriber.get("custom_fields")
+    if isinstance(raw, dict):
+        return {str(name): _normalize(value) for name, value in raw.items()}
+    if isinstance(raw, list):
+        return {
+            str(item["name"]): _normalize(item.get("value"))
+            for item in raw
+            if isinstance(item, dict) and item.get("name")
+        }
+    return None
+
+
+@dataclass
+class _Known:
+    updated_at: float
+    fields: dict[str, str]
+    tags: dict[str, bool]
+    # From a full snapshot: a tag that is not listed is known to be absent
+    all_tags: bool = False
+
+    def has_tag(self, name: str) -> bool | None:
+        return self.tags.get(name, False if self.all_tags else None)
+
+
+class MutationLedger:
+    """Last known field values and tags per subscriber, for dropping no-op writes.
+
+    Entries expire after ``MANYCHAT_MUTATION_STATE_TTL_SECONDS`` so changes made
+    outside this process (operators, ManyChat flows, other workers) are not
+    masked for long; a fresh webhook snapshot replaces them right away.
+    """
+
+    def __init__(self, max_entries: int = _LEDGER_MAX_ENTRIES) -> None:
+        self._entries: OrderedDict[str, _Known] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.changes = 0
+        self.skipped = 0
+
+    @property
+    def ttl(self) -> float:
+        return float(getattr(settings, "MANYCHAT_MUTATION_STATE_TTL_SECONDS", 900.0))
+
+    def _get_locked(self, subscriber_id: str) -> _Known | None:
+        known = self._entries.get(subscriber_id)
+        if known is not None and time.monotonic() - known.updated_at > self.ttl:
+            del self._entries[subscriber_id]
+            return None
+        return known
+
+    def _put_locked(self, subscriber_id: str, known: _Known) -> None:
+        self._entries[subscriber_id] = known
+        self._entries.move_to_end(subscriber_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def observe(self, subscriber_id: str, subscriber: dict[str, Any] | None) -> None:
+        """Replace what we know with a subscriber snapshot (webhook payload or getInfo)."""
+        if not subscriber_id or not subscriber:
+            return
+        fields = _snapshot_fields(subscriber)
+        all_tags = isinstance(subscriber.get("tags"), list)
+        if fields is None and not all_tags:
+            return
+        tags = dict.fromkeys(subscriber_tag_names(subscriber), True) if all_tags else {}
+        with self._lock:
+            self._put_locked(subscriber_id, _Known(time.monotonic(), fields or {}, tags, all_tags))
+
+    def diff(self, mutations: SubscriberMutations) -> SubscriberMutations:
+        """The part of ``mutations`` that would change something."""
+        pending = SubscriberMutations(mutations.subscriber_id)
+        with self._lock:
+            known = self._get_locked(mutations.subscriber_id)
+            for name, value in mutations.fields.items():
+                if known is None or known.fields.get(name) != _normalize(value):
+                    pending.fields[name] = value
+            for name, add in mutations.tags.items():
+                if known is None or known.has_tag(name) is not add:
+                    pending.tags[name] = add
+            self.changes += pending.action_count
+            self.skipped += mutations.action_count - pending.action_count
+        return pending
+
+    def record(self, mutations: SubscriberMutations) -> None:
+        """Remember changes that were written successfully."""
+        if not mutations:
+            return
+        with self._lock:
+            known = self._get_locked(mutations.subscriber_id)
+            fields = dict(known.fields) if known else {}
+            tags = dict(known.tags) if known else {}
+            fields.update((name, _normalize(value)) for name, value in mutations.fields.items())
+            tags.update(mutations.tags)
+            all_tags = known.all_tags if known else False
+            self._put_locked(mutations.subscriber_id, _Known(time.monotonic(), fields, tags, all_tags))
+
+    def forget(self, subscriber_id: str) -> None:
+        with self._lock:
+            self._entries.pop(subscriber_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.changes = self.skipped = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        total = self.changes + self.skipped
+        return {
+            "changes": self.changes,
+            "skipped": self.skipped,
+            "skip_ratio": self.skipped / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+_ledger = MutationLedger()
+
+
+def get_mutation_ledger() -> MutationLedger:
+    return _ledger
+
+
+def split_for_send_content(
+    mutations: SubscriberMutations,
+    channel: str,
+) -> tuple[SubscriberMutations, SubscriberMutations]:
+    """Split into (actions for the reply's sendContent request, the rest).
+
+    Mirrors ``ManyChatPushClient.send_content``: Instagram actions can be
+    disabled entirely or limited to ``MANYCHAT_INSTAGRAM_ALLOWED_FIELDS``
+    (no tags), and a request carries at most 5 actions (fields first).
+    """
+    piggyback = SubscriberMutations(mutations.subscriber_id)
+    rest = SubscriberMutations(mutations.subscriber_id)
+
+    allowed_fields: set[str] | None = None
+    tags_allowed = True
+    if channel == "instagram":
+        if bool(getattr(settings, "MANYCHAT_INSTAGRAM_DISABLE_ACTIONS", True)):
+            rest.merge(mutations)
+            return piggyback, rest
+        if bool(getattr(settings, "MANYCHAT_SAFE_MODE_INSTAGRAM", True)):
+            raw = str(getattr(settings, "MANYCHAT_INSTAGRAM_ALLOWED_FIELDS", "ai_state,ai_intent"))
+            allowed_fields = {f.strip() for f in raw.split(",") if f and f.strip()}
+            tags_allowed = False
+
+    budget = MAX_SEND_CONTENT_ACTIONS
+    for name, value in mutations.fields.items():
+        if budget and (allowed_fields is None or name in allowed_fields):
+            piggyback.fields[name] = value
+            budget -= 1
+        else:
+            rest.fields[name] = value
+    # Same order as ManyChatPushClient._build_actions: adds, then removes
+    for name in [*mutations.add_tags, *mutations.remove_tags]:
+        target = piggyback if budget and tags_allowed else rest
+        target.tags[name] = mutations.tags[name]
+        if target is piggyback:
+            budget -= 1
+    return piggyback, rest
+
+
+async def apply_mutations(
+    mutations: SubscriberMutations,
+    client: ManyChatClient | None = None,
+) -> SubscriberMutations:
+    """Write changes through the subscriber API; returns the part that succeeded.
+
+    Fields go in one bulk request; tags have no bulk endpoint and are sent
+    concurrently, one request each.
+    """
+    applied = SubscriberMutations(mutations.subscriber_id)
+    if not mutations:
+        return applied
+    if client is None:
+        from src.integrations.manychat.api_client import get_manychat_client
+
+        client = get_manychat_client()
+
+    sid = mutations.subscriber_id
+
+    async def _fields() -> None:
+        if mutations.fields and await client.set_custom_fields(
+            sid, {name: _normalize(value) for name, value in mutations.fields.items()}
+        ):
+            applied.fields.update(mutations.fields)
+
+    async def _tag(name: str, add: bool) -> None:
+        ok = await (client.add_tag(sid, name) if add else client.remove_tag(sid, name))
+        if ok:
+            applied.tags[name] = add
+
+    await asyncio.gather(_fields(), *(_tag(name, add) for name, add in mutations.tags.items()))
+    return applied
@@ -8,6 +8,7 @@ eliminating webhook timeout issues while preserving all MIRT features:
 - Images (product photos)
 
 Features:
+- Persistent keep-alive (HTTP/2 when ``h2`` is installed) connection pool per event loop
 - Circuit breaker protection against cascading failures
 - Automatic retry with exponential backoff for transient errors
 - Smart field error handling: retries without actions if fields don't exist
@@ -44,6 +45,7 @@ import asyncio
 import logging
 import random
 import time
+import weakref
 from typing import Any
 from urllib.parse import quote
 
@@ -53,6 +55,7 @@ from src.conf.config import settings
 from src.core.circuit_breaker import MANYCHAT_BREAKER, CircuitOpenError
 from src.core.human_responses import calculate_typing_delay
 from src.core.logging import classify_root_cause, log_event, log_with_root_cause, safe_preview
+from src.integrations.manychat.mutations import count_api_call, note_actions_dropped
 
 
 logger = logging.getLogger(__name__)
@@ -65,6 +68,16 @@ _FIELD_ERROR_PATTERNS = (
 )
 
 
+def _http2_available() -> bool:
+    """HTTP/2 in httpx needs ``h2`` (installed with ``httpx[http2]``)."""
+    try:
+        import h2  # noqa: F401  # type: ignore[reportMissingImports]
+    except ImportError:  # pragma: no cover - h2 is a hard dependency in production
+        logger.warning("[MANYCHAT] h2 is not installed, falling back to HTTP/1.1")
+        return False
+    return True
+
+
 class ManyChatPushClient:
     """Client for pushing messages to ManyChat via their API."""
 
@@ -84,11 +97,49 @@ class ManyChatPushClient:
         else:
             self._api_key = str(api_key_setting) if api_key_setting else ""
 
+        # httpx pools are bound to the loop that opened them; Celery worker
+        # threads run their own loops, so keep one long-lived client per loop.
+        self._http_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+
     @property
     def enabled(self) -> bool:
         """Check if push mode is configured."""
         return bool(self._api_url and self._api_key)
 
+    @staticmethod
+    def _build_http_client() -> httpx.AsyncClient:
+        http2 = bool(getattr(settings, "MANYCHAT_HTTP2_ENABLED", True)) and _http2_available()
+        return httpx.AsyncClient(
+            timeout=float(getattr(settings, "MANYCHAT_HTTP_TIMEOUT_SECONDS", 15.0)),
+            limits=httpx.Limits(
+                max_connections=int(getattr(settings, "MANYCHAT_HTTP_MAX_CONNECTIONS", 50)),
+                max_keepalive_connections=int(getattr(settings, "MANYCHAT_HTTP_MAX_KEEPALIVE", 20)),
+                keepalive_expiry=float(getattr(settings, "MANYCHAT_HTTP_KEEPALIVE_EXPIRY_SECONDS", 60.0)),
+            ),
+            http2=http2,
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Long-lived client for the running event loop (created on first use)."""
+        loop = asyncio.get_running_loop()
+        client = self._http_clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._build_http_client()
+            self._http_clients[loop] = client
+        return client
+
+    async def start(self) -> None:
+        """Create the connection pool for the running loop (app startup)."""
+        self._get_http_client()
+
+    async def aclose(self) -> None:
+        """Close the connection pool of the running loop (app shutdown)."""
+        client = self._http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
     def _sanitize_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Sanitize messages for ManyChat API format.
 
@@ -329,41 +380,46 @@ class ManyChatPushClient:
             )
             raise CircuitOpenError("manychat")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
+        status_tag = "error"
+        count_api_call()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(
-                    f"{self._api_url}/fb/sending/sendContent",
-                    json=payload,
-                    headers=headers,
-                )
+            client = self._get_http_client()
+            response = await client.post(
+                f"{self._api_url}/fb/sending/sendContent",
+                json=payload,
+                headers=headers,
+            )
 
-                latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            status_tag = str(response.status_code)
 
-                if response.status_code == 200:
-                    # SUCCESS: Record for circuit breaker
-                    MANYCHAT_BREAKER.record_success()
-                    logger.debug(
-                        "[MANYCHAT] Request OK in %.0fms",
-                        latency_ms,
-                    )
-                elif response.status_code >= 500:
-                    # SERVER ERROR: Record failure for circuit breaker
-                    MANYCHAT_BREAKER.record_failure(Exception(f"HTTP {response.status_code}"))
-                # 4xx errors don't trigger circuit breaker (client errors)
-
-                return (
-                    response.status_code == 200,
-                    response.text,
-                    response.status_code,
+            if response.status_code == 200:
+                # SUCCESS: Record for circuit breaker
+                MANYCHAT_BREAKER.record_success()
+                logger.debug(
+                    "[MANYCHAT] Request OK in %.0fms (%s)",
+                    latency_ms,
+                    response.http_version,
                 )
+            elif response.status_code >= 500:
+                # SERVER ERROR: Record failure for circuit breaker
+                MANYCHAT_BREAKER.record_failure(Exception(f"HTTP {response.status_code}"))
+            # 4xx errors don't trigger circuit breaker (client errors)
+
+            return (
+                response.status_code == 200,
+                response.text,
+                response.status_code,
+            )
         except httpx.TimeoutException as e:
+            status_tag = "timeout"
             # TIMEOUT: Record failure for circuit breaker
             MANYCHAT_BREAKER.record_failure(e)
             log_with_root_cause(
                 logger,
                 "error",
-                f"[MANYCHAT] Request timeout after 15s for subscriber {subscriber_id}",
+                f"[MANYCHAT] Request timeout for subscriber {subscriber_id}",
                 error=e,
                 root_cause="MANYCHAT_TIMEOUT",
                 subscriber_id=subscriber_id,
@@ -407,6 +463,14 @@ class ManyChatPushClient:
                 subscriber_id=subscriber_id,
             )
             return False, f"{type(e).__name__}: {str(e)[:200]}", 0
+        finally:
+            from src.services.core.observability import track_metric
+
+            track_metric(
+                "manychat_push_request_ms",
+                (time.perf_counter() - start_time) * 1000,
+                {"status": status_tag},
+            )
 
     def _is_field_error(self, response_text: str) -> bool:
         """Check if error is due to missing Custom Fields."""
@@ -763,6 +827,7 @@ class ManyChatPushClient:
                         return False
 
                     if success_retry:
+                        note_actions_dropped()
                         log_event(
                             logger,
                             event="manychat_push_ok",
@@ -935,3 +1000,9 @@ def get_manychat_push_client() -> ManyChatPushClient:
     if _push_client is None:
         _push_client = ManyChatPushClient()
     return _push_client
+
+
+async def close_manychat_push_client() -> None:
+    """Close the singleton's connection pool for the running loop (app shutdown)."""
+    if _push_client is not None:
+        await _push_client.aclose()
@@ -0,0 +1,127 @@
+"""Short-lived cache of ManyChat subscriber lookups.
+
+Webhook handling, follow-ups and the summarization sweep ask
+``/subscriber/getInfo`` (and ``findByCustomField``) for the same subscribers
+over and over. ``ManyChatClient`` keeps the answers here for
+``MANYCHAT_SUBSCRIBER_CACHE_TTL_SECONDS`` and drops a subscriber as soon as
+the client changes its tags or custom fields.
+
+Every invalidation bumps the subscriber's epoch and a global generation; a
+lookup stores its (possibly stale) answer only if the value it read before
+the request is unchanged. Field lookups use the generation, since the
+subscriber they resolve to is only known from the answer.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+_MAX_ENTRIES = 10_000
+
+FieldKey = tuple[str, str]
+
+
+class SubscriberCache:
+    """TTL cache of subscriber info by id plus ``(field, value) -> id`` lookups."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES) -> None:
+        self._info: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._by_field: OrderedDict[FieldKey, tuple[float, str]] = OrderedDict()
+        self._epochs: dict[str, int] = {}
+        self._generation = 0
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def epoch(self, subscriber_id: str) -> int:
+        with self._lock:
+            return self._epochs.get(subscriber_id, 0)
+
+    def generation(self) -> int:
+        """Number of invalidations so far (of any subscriber)."""
+        with self._lock:
+            return self._generation
+
+    def get(self, subscriber_id: str, ttl: float) -> dict[str, Any] | None:
+        with self._lock:
+            return self._get_locked(subscriber_id, ttl)
+
+    def _get_locked(self, subscriber_id: str, ttl: float) -> dict[str, Any] | None:
+        entry = self._info.get(subscriber_id)
+        if entry is None or time.monotonic() - entry[0] > ttl:
+            if entry is not None:
+                del self._info[subscriber_id]
+            self.misses += 1
+            return None
+        self._info.move_to_end(subscriber_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, subscriber_id: str, info: dict[str, Any], epoch: int) -> None:
+        """Store ``info`` unless the subscriber was invalidated since ``epoch``."""
+        with self._lock:
+            if self._epochs.get(subscriber_id, 0) != epoch:
+                return
+            self._info[subscriber_id] = (time.monotonic(), info)
+            self._info.move_to_end(subscriber_id)
+            while len(self._info) > self._max_entries:
+                self._info.popitem(last=False)
+
+    def get_by_field(self, key: FieldKey, ttl: float) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._by_field.get(key)
+            if entry is None or time.monotonic() - entry[0] > ttl:
+                if entry is not None:
+                    del self._by_field[key]
+                self.misses += 1
+                return None
+            return self._get_locked(entry[1], ttl)
+
+    def put_by_field(self, key: FieldKey, info: dict[str, Any], generation: int) -> None:
+        """Store a field lookup unless any subscriber was invalidated since ``generation``."""
+        subscriber_id = str(info.get("id") or "")
+        if not subscriber_id:
+            return
+        with self._lock:
+            if self._generation != generation:
+                return
+            self._info[subscriber_id] = (time.monotonic(), info)
+            self._info.move_to_end(subscriber_id)
+            while len(self._info) > self._max_entries:
+                self._info.popitem(last=False)
+            self._by_field[key] = (time.monotonic(), subscriber_id)
+            self._by_field.move_to_end(key)
+            while len(self._by_field) > self._max_entries:
+                self._by_field.popitem(last=False)
+
+    def invalidate(self, subscriber_id: str) -> None:
+        """Forget a subscriber (and field lookups that resolved to it)."""
+        with self._lock:
+            self._info.pop(subscriber_id, None)
+            for key in [k for k, (_, sid) in self._by_field.items() if sid == subscriber_id]:
+                del self._by_field[key]
+            if len(self._epochs) >= self._max_entries:
+                self._epochs.clear()
+            self._epochs[subscriber_id] = self._epochs.get(subscriber_id, 0) + 1
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._info.clear()
+            self._by_field.clear()
+            self._epochs.clear()
+            self.hits = self.misses = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._info),
+        }
@@ -0,0 +1,158 @@
+"""Concurrent subscriber tag checks against the ManyChat API.
+
+Used by the summarization sweep to find subscribers that still carry a tag
+(e.g. ``humanNeeded-wd``). Each check is a ``/subscriber/getInfo`` round
+trip, so checks run concurrently through the shared ``ManyChatClient``:
+
+- at most ``concurrency`` requests in flight (asyncio semaphore);
+- at most ``rate_per_second`` requests started (token bucket);
+- subscriber tags cached for ``cache_ttl`` seconds, so overlapping sweeps
+  and retries do not ask again;
+- no new request starts after ``deadline`` (``time.monotonic()``), so the
+  caller can stop inside its time limit and resume later.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from src.core.rate_limiter import AsyncTokenBucket
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.integrations.manychat.api_client import ManyChatClient
+
+
+logger = logging.getLogger(__name__)
+
+_CACHE_MAX_ENTRIES = 10_000
+
+
+def subscriber_tag_names(subscriber: dict[str, Any] | None) -> frozenset[str]:
+    """Tag names of a subscriber (tags can be strings or ``{"name": ...}`` dicts)."""
+    if not subscriber:
+        return frozenset()
+    return frozenset(
+        tag if isinstance(tag, str) else str(tag.get("name", ""))
+        for tag in subscriber.get("tags") or []
+    )
+
+
+class _TagCache:
+    """Short-lived ``subscriber_id -> tag names`` cache shared by all sweeps."""
+
+    def __init__(self, max_entries: int = _CACHE_MAX_ENTRIES) -> None:
+        self._entries: OrderedDict[str, tuple[float, frozenset[str]]] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, subscriber_id: str, ttl: float) -> frozenset[str] | None:
+        with self._lock:
+            entry = self._entries.get(subscriber_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > ttl:
+                del self._entries[subscriber_id]
+                return None
+            return entry[1]
+
+    def put(self, subscriber_id: str, tags: frozenset[str]) -> None:
+        with self._lock:
+            self._entries[subscriber_id] = (time.monotonic(), tags)
+            self._entries.move_to_end(subscriber_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subscriber_id: str) -> None:
+        with self._lock:
+            self._entries.pop(subscriber_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_tag_cache = _TagCache()
+
+
+def invalidate_subscriber_tags(subscriber_id: str) -> None:
+    """Drop cached tags of a subscriber (called when its tags change)."""
+    _tag_cache.invalidate(subscriber_id)
+
+
+class SubscriberTagProbe:
+    """Check many subscribers for a tag with bounded concurrency and rate."""
+
+    def __init__(
+        self,
+        client: ManyChatClient,
+        *,
+        concurrency: int = 10,
+        rate_per_second: float = 10.0,
+        cache_ttl: float = 300.0,
+    ) -> None:
+        self._client = client
+        self._concurrency = max(1, concurrency)
+        self._bucket = AsyncTokenBucket(rate_per_second)
+        self._cache_ttl = cache_ttl
+        self.requests = 0
+
+    async def _fetch(
+        self,
+        subscriber_id: str,
+        semaphore: asyncio.Semaphore,
+        deadline: float | None,
+    ) -> frozenset[str] | bool | None:
+        """Subscriber tags; None when the lookup failed; False when past the deadline."""
+        async with semaphore:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await self._bucket.acquire()
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self.requests += 1
+            try:
+                subscriber = await self._client.get_subscriber_info(subscriber_id)
+            except Exception as e:
+                logger.warning("[MANYCHAT:TAGS] Failed to get subscriber %s: %s", subscriber_id, e)
+                return None
+        if subscriber is None:
+            # get_subscriber_info returns None on errors as well as unknown ids
+            return None
+        tags = subscriber_tag_names(subscriber)
+        _tag_cache.put(subscriber_id, tags)
+        return tags
+
+    async def probe(
+        self,
+        subscriber_ids: Iterable[str],
+        tag: str,
+        *,
+        deadline: float | None = None,
+    ) -> dict[str, bool]:
+        """Return ``{subscriber_id: has_tag}`` for every subscriber checked.
+
+        Subscribers not reached before ``deadline`` are missing from the
+        result; failed lookups count as checked without the tag.
+        """
+        semaphore = asyncio.Semaphore(self._concurrency)
+        results: dict[str, bool] = {}
+
+        async def check(subscriber_id: str) -> None:
+            tags = _tag_cache.get(subscriber_id, self._cache_ttl)
+            if tags is None:
+                fetched = await self._fetch(subscriber_id, semaphore, deadline)
+                if fetched is False:
+                    return
+                tags = fetched
+            results[subscriber_id] = tags is not None and tag in tags
+
+        await asyncio.gather(*(check(sid) for sid in dict.fromkeys(subscriber_ids)))
+        return results
@@ -10,6 +10,7 @@ All endpoint logic has been extracted to src/server/routers/ for maintainability
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -209,6 +210,33 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("Failed to start health monitoring: %s", e)
 
+    # Open the ManyChat push connection pool before the first webhook
+    try:
+        from src.integrations.manychat.push_client import get_manychat_push_client
+
+        push_client = get_manychat_push_client()
+        if push_client.enabled:
+            await push_client.start()
+    except Exception as e:
+        logger.warning("Failed to start ManyChat push client: %s", e)
+
+    # Load the catalog snapshot so the first search doesn't wait for it
+    try:
+        from src.services.data.catalog_service import warm_catalog_snapshot
+
+        await warm_catalog_snapshot()
+    except Exception as e:
+        logger.warning("Failed to load catalog snapshot: %s", e)
+
+    # Load the tokenizer encoding (may download its BPE file) off the event loop
+    try:
+        from src.services.core.token_counter import get_token_counter
+
+        counter = await asyncio.to_thread(get_token_counter)
+        logger.info("Token counter ready (encoding=%s)", counter.name)
+    except Exception as e:
+        logger.warning("Failed to warm token counter: %s", e)
+
     yield
 
     # Shutdown
@@ -228,6 +256,48 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("Failed to shutdown checkpointer pool: %s", e)
 
+    # Close keep-alive connections to ManyChat
+    try:
+        from src.integrations.manychat.push_client import close_manychat_push_client
+        await close_manychat_push_client()
+    except Exception as e:
+        logger.warning("Failed to close ManyChat push client: %s", e)
+
+    # Close the vision image download client
+    try:
+        from src.services.infra.image_fetch import close_image_fetch_service
+        await close_image_fetch_service()
+    except Exception as e:
+        logger.warning("Failed to close image fetch service: %s", e)
+
+    # Close shared Redis pools
+    try:
+        from src.services.infra.redis_pool import close_redis_pools
+        await close_redis_pools()
+    except Exception as e:
+        logger.warning("Failed to close Redis pools: %s", e)
+
+    # Flush write-behind memory access times before the process exits
+    try:
+        from src.services.domain.memory.access_batcher import shutdown_access_batchers
+        shutdown_access_batchers()
+    except Exception as e:
+        logger.warning("Failed to flush memory access batchers: %s", e)
+
+    # Write buffered LLM usage records and traces
+    try:
+        from src.services.core.telemetry_writer import shutdown_telemetry_writers
+        shutdown_telemetry_writers()
+    except Exception as e:
+        logger.warning("Failed to flush telemetry writers: %s", e)
+
+    # Drain the Supabase I/O thread pool
+    try:
+        from src.services.infra.supabase_executor import shutdown_db_executor
+        shutdown_db_executor(wait=False)
+    except Exception as e:
+        logger.warning("Failed to shut down Supabase executor: %s", e)
+
 
 # =============================================================================
 # FastAPI App
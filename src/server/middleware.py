@@ -167,21 +167,15 @@ class RedisRateLimiter:
         self._init_redis()
 
     def _init_redis(self):
-        """Initialize Redis client if available."""
+        """Attach to the shared Redis pool if available."""
         try:
-            import os
+            from src.services.infra.redis_pool import get_redis_client
 
-            import redis
-
-            from src.conf.config import settings
-
-            redis_url = os.getenv("REDIS_URL") or settings.REDIS_URL
-            if not redis_url:
-                logger.debug("No REDIS_URL configured, using in-memory fallback")
+            self._redis_client = get_redis_client()
+            if self._redis_client is None:
+                logger.debug("Redis not available, using in-memory fallback")
                 return
 
-            self._redis_client = redis.from_url(redis_url, decode_responses=True)
-            self._redis_client.ping()  # Test connection
             self._use_redis = True
             logger.info("Using Redis for distributed rate limiting")
         except Exception as e:
@@ -44,6 +44,7 @@ def _get_build_info() -> dict[str, str]:
 async def health() -> dict[str, Any]:
     """Health check endpoint with dependency status."""
     from src.services.infra.supabase_client import get_supabase_client
+    from src.services.infra.supabase_executor import execute_async, get_db_executor_metrics
 
     status = "ok"
     checks: dict[str, Any] = {}
@@ -52,8 +53,9 @@ async def health() -> dict[str, Any]:
     try:
         client = get_supabase_client()
         if client:
-            client.table(settings.SUPABASE_TABLE).select("session_id").limit(1).execute()
+            await execute_async(client.table(settings.SUPABASE_TABLE).select("session_id").limit(1))
             checks["supabase"] = "ok"
+            checks["supabase_executor"] = get_db_executor_metrics()
         else:
             checks["supabase"] = "disabled"
     except Exception as e:
@@ -64,11 +66,14 @@ async def health() -> dict[str, Any]:
     # \u041f\u0435\u0440\u0435\u0432\u0456\u0440\u043a\u0430 Redis (\u044f\u043a\u0449\u043e Celery \u0443\u0432\u0456\u043c\u043a\u043d\u0435\u043d\u043e)
     if settings.CELERY_ENABLED:
         try:
-            import redis
+            from src.services.infra.redis_pool import get_redis_client, get_redis_pool_metrics
 
-            r = redis.from_url(settings.REDIS_URL)
+            r = get_redis_client()
+            if r is None:
+                raise ConnectionError("Redis pool unavailable")
             r.ping()
             checks["redis"] = "ok"
+            checks["redis_pool"] = get_redis_pool_metrics()
         except Exception as e:
             checks["redis"] = f"error: {type(e).__name__}"
             status = "degraded"
@@ -250,6 +255,17 @@ async def health_graph() -> dict[str, Any]:
         }
 
 
+@router.get("/metrics")
+async def metrics() -> Response:
+    """Prometheus text exposition of in-process metrics (summaries with p50/p95/p99)."""
+    from src.services.core.observability import render_metrics_prometheus
+
+    return Response(
+        content=render_metrics_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @router.get("/health/ready")
 async def readiness() -> Response:
     """Readiness probe for Kubernetes/deployment systems.
@@ -15,6 +15,7 @@ from src.core.logging import log_event, safe_preview
 from src.server.dependencies import get_cached_manychat_service
 from src.server.exceptions import AuthenticationError, ExternalServiceError, ValidationError
 from src.services.client_data_parser import parse_client_data
+from src.services.infra.supabase_executor import run_db
 from src.services.infra.webhook_dedupe import WebhookDedupeStore
 
 logger = logging.getLogger(__name__)
@@ -225,7 +226,8 @@ async def manychat_webhook(
                 if db:
                     dedupe_store = WebhookDedupeStore(db, ttl_hours=24)
 
-                    is_duplicate = dedupe_store.check_and_mark(
+                    is_duplicate = await run_db(
+                        dedupe_store.check_and_mark,
                         user_id=user_id,
                         message_id=message_id,
                         text=text,
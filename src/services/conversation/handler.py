@@ -24,6 +24,7 @@ from src.services.conversation.guardrails import apply_transition_guardrails
 from src.services.conversation.models import ConversationResult, GraphRunner
 from src.services.conversation.parser import parse_llm_output
 from src.services.infra.message_store import MessageStore, StoredMessage
+from src.services.infra.supabase_executor import run_db
 
 if TYPE_CHECKING:
     from src.services.infra.session_store import SessionStore
@@ -577,7 +578,7 @@ class ConversationHandler:
 
         async def _bg() -> None:
             try:
-                await asyncio.to_thread(self.message_store.append, msg)
+                await run_db(self.message_store.append, msg)
             except Exception as e:
                 logger.warning(
                     "Failed to persist user message for session %s: %s",
@@ -614,7 +615,7 @@ class ConversationHandler:
 
         async def _bg() -> None:
             try:
-                await asyncio.to_thread(self.message_store.append, msg)
+                await run_db(self.message_store.append, msg)
             except Exception as e:
                 logger.warning(
                     "Failed to persist assistant message for session %s: %s",
@@ -2,8 +2,8 @@
 History Trimmer - Prevent LLM context overflow.
 =================================================
 
-Trims message history to a configurable maximum length,
-keeping the most recent messages and important context.
+Trims message history to a configurable maximum length and per-model token
+budget, keeping the most recent messages and important context.
 
 Why this matters:
 - LLM context windows have limits (8K-128K tokens)
@@ -16,7 +16,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from src.services.core.trim_policy import get_llm_history_limit
+from src.services.core.token_counter import get_token_counter
+from src.services.core.trim_policy import get_llm_history_limit, get_llm_history_token_budget
 
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,8 @@ def trim_message_history(
     messages: list[dict[str, Any]],
     max_messages: int | None = None,
     preserve_system: bool = True,
+    max_tokens: int | None = None,
+    model: str | None = None,
 ) -> list[dict[str, Any]]:
     """
     Trim message history to prevent context overflow.
@@ -34,6 +37,8 @@ def trim_message_history(
         messages: Full message history
         max_messages: Maximum messages to keep (uses config if None)
         preserve_system: Keep system messages at the start
+        max_tokens: Token budget for the kept messages (per-model config if None)
+        model: Model whose tokenizer/budget applies (active model if None)
 
     Returns:
         Trimmed message list with most recent messages
@@ -41,20 +46,24 @@ def trim_message_history(
     Strategy:
         1. Keep all system messages (if preserve_system=True)
         2. Keep the last N user/assistant messages
-        3. Log when trimming occurs
+        3. Drop the oldest of those until the token budget fits
+           (the latest message is always kept)
+        4. Log when trimming occurs
     """
     if max_messages is None:
         max_messages = get_llm_history_limit()
+    if max_tokens is None:
+        max_tokens = get_llm_history_token_budget(model)
 
-    # Disabled if max_messages is 0
-    if max_messages <= 0:
-        return messages
+    trimmed = _trim_to_message_count(messages, max_messages, preserve_system)
+    if max_tokens > 0:
+        trimmed = _trim_to_token_budget(trimmed, max_tokens, preserve_system, model)
+    return trimmed
 
-    # No trimming needed
-    if len(messages) <= max_messages:
-        return messages
 
-    # Separate system messages from conversation
+def _split_system(
+    messages: list[dict[str, Any]], preserve_system: bool
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     system_messages = []
     conversation_messages = []
 
@@ -65,6 +74,25 @@ def trim_message_history(
         else:
             conversation_messages.append(msg)
 
+    return system_messages, conversation_messages
+
+
+def _trim_to_message_count(
+    messages: list[dict[str, Any]],
+    max_messages: int,
+    preserve_system: bool,
+) -> list[dict[str, Any]]:
+    # Disabled if max_messages is 0
+    if max_messages <= 0:
+        return messages
+
+    # No trimming needed
+    if len(messages) <= max_messages:
+        return messages
+
+    # Separate system messages from conversation
+    system_messages, conversation_messages = _split_system(messages, preserve_system)
+
     # Calculate how many conversation messages to keep
     # Reserve space for system messages
     available_slots = max_messages - len(system_messages)
@@ -98,6 +126,59 @@ def trim_message_history(
     return system_messages + trimmed_conversation
 
 
+def _trim_to_token_budget(
+    messages: list[dict[str, Any]],
+    max_tokens: int,
+    preserve_system: bool,
+    model: str | None,
+) -> list[dict[str, Any]]:
+    counter = get_token_counter(model)
+    counts = [counter.count_message(msg) for msg in messages]
+    total = sum(counts)
+    if total <= max_tokens:
+        return messages
+
+    system_messages: list[dict[str, Any]] = []
+    system_tokens = 0
+    conversation: list[tuple[dict[str, Any], int]] = []
+    for msg, tokens in zip(messages, counts, strict=True):
+        if preserve_system and _get_message_role(msg) == "system":
+            system_messages.append(msg)
+            system_tokens += tokens
+        else:
+            conversation.append((msg, tokens))
+
+    # Newest first; the latest message stays even if it alone is over budget
+    remaining = max_tokens - system_tokens
+    kept: list[dict[str, Any]] = []
+    kept_tokens = 0
+    for msg, tokens in reversed(conversation):
+        if kept and kept_tokens + tokens > remaining:
+            break
+        kept.append(msg)
+        kept_tokens += tokens
+    kept.reverse()
+
+    trimmed_count = len(conversation) - len(kept)
+    if trimmed_count > 0:
+        kept_total = system_tokens + kept_tokens
+        logger.info(
+            "📝 Trimmed %d old messages to fit %d-token budget (%d -> %d tokens, %s)",
+            trimmed_count,
+            max_tokens,
+            total,
+            kept_total,
+            counter.name,
+        )
+
+        from src.services.core.observability import track_metric
+
+        track_metric("history_messages_trimmed", trimmed_count)
+        track_metric("history_tokens_trimmed", total - kept_total)
+
+    return system_messages + kept
+
+
 def _get_message_role(msg: Any) -> str:
     """Extract role from message (handles dict and LangChain objects)."""
     if isinstance(msg, dict):
@@ -115,45 +196,35 @@ def _get_message_role(msg: Any) -> str:
     return msg_type
 
 
-def estimate_token_count(messages: list[dict[str, Any]]) -> int:
+def estimate_token_count(messages: list[dict[str, Any]], model: str | None = None) -> int:
     """
-    Rough estimate of token count for message list.
+    Token count for a message list with the model's tokenizer.
 
-    Uses simple heuristic: ~4 characters per token.
-    Not accurate but good enough for trimming decisions.
+    Per-message counts are cached by content hash, so recounting a growing
+    history only tokenizes new messages.
     """
-    total_chars = 0
-
-    for msg in messages:
-        content = msg.get("content", "") if isinstance(msg, dict) else getattr(msg, "content", "")
-
-        if isinstance(content, str):
-            total_chars += len(content)
-        elif isinstance(content, list):
-            # Multimodal content
-            for item in content:
-                if isinstance(item, dict):
-                    total_chars += len(item.get("text", ""))
-
-    return total_chars // 4
+    return get_token_counter(model).count_messages(messages)
 
 
 def should_trim(
     messages: list[dict[str, Any]],
     max_messages: int | None = None,
-    max_tokens: int = 100000,
+    max_tokens: int | None = None,
+    model: str | None = None,
 ) -> bool:
     """
     Check if trimming is needed.
 
     Returns True if:
     - Message count exceeds max_messages
-    - Estimated tokens exceed max_tokens
+    - Token count exceeds max_tokens (per-model budget if None, 0 = no limit)
     """
     if max_messages is None:
         max_messages = get_llm_history_limit()
+    if max_tokens is None:
+        max_tokens = get_llm_history_token_budget(model)
 
     if len(messages) > max_messages:
         return True
 
-    return estimate_token_count(messages) > max_tokens
+    return max_tokens > 0 and estimate_token_count(messages, model) > max_tokens
@@ -0,0 +1,347 @@
+"""
+Fixed-memory streaming metrics.
+===============================
+Backs ``observability.track_metric``. Per metric name + tag set (a *series*):
+
+- count / sum / min / max,
+- a streaming quantile sketch (DDSketch-style log buckets, ~1% relative
+  error, bounded bucket count) for p50/p95/p99,
+- a small array-backed ring buffer of recent raw values for ``get_recent``.
+
+Memory per series is bounded regardless of how many points are recorded.
+High-cardinality tag keys (session/trace/user ids) are dropped from the series
+identity and the number of series is capped, so a stray tag cannot grow the
+store without bound.
+
+``render_prometheus()`` produces the text exposition format served by
+``GET /metrics``.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from array import array
+from typing import Any
+
+
+# Tag keys that identify a request rather than a dimension.
+HIGH_CARDINALITY_TAGS = frozenset({"session_id", "trace_id", "user_id", "message_id"})
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 1024
+DEFAULT_RING_SIZE = 128
+DEFAULT_MAX_SERIES = 2000
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_OVERFLOW_TAGS: tuple[tuple[str, str], ...] = (("series", "overflow"),)
+
+
+class RingBuffer:
+    """Fixed-capacity ring of (timestamp, value) pairs backed by ``array('d')``."""
+
+    __slots__ = ("_capacity", "_next", "_size", "_stamps", "_values")
+
+    def __init__(self, capacity: int = DEFAULT_RING_SIZE) -> None:
+        self._values = array("d", bytes(8 * capacity))
+        self._stamps = array("d", bytes(8 * capacity))
+        self._capacity = capacity
+        self._next = 0
+        self._size = 0
+
+    def append(self, value: float, timestamp: float) -> None:
+        i = self._next
+        self._values[i] = value
+        self._stamps[i] = timestamp
+        self._next = (i + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+    def items(self) -> list[tuple[float, float]]:
+        """Oldest-first list of (timestamp, value)."""
+        start = (self._next - self._size) % self._capacity
+        return [
+            (self._stamps[(start + k) % self._capacity], self._values[(start + k) % self._capacity])
+            for k in range(self._size)
+        ]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class QuantileSketch:
+    """Mergeable log-bucket quantile sketch with bounded relative error.
+
+    A value ``v > 0`` lands in bucket ``ceil(log_gamma(v))``; any value in the
+    bucket is within ``relative_accuracy`` of the bucket's representative.
+    When more than ``max_buckets`` buckets exist the lowest ones are collapsed,
+    which only costs accuracy at the bottom of the distribution - the tail
+    percentiles we care about stay exact to the accuracy bound.
+    """
+
+    __slots__ = ("_gamma", "_log_gamma", "_max_buckets", "_neg", "_pos", "_zero", "count")
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ) -> None:
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_buckets = max_buckets
+        self._pos: dict[int, int] = {}
+        self._neg: dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self._gamma**index / (self._gamma + 1)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value > 0:
+            buckets = self._pos
+            idx = self._index(value)
+        elif value < 0:
+            buckets = self._neg
+            idx = self._index(-value)
+        else:
+            self._zero += 1
+            return
+        buckets[idx] = buckets.get(idx, 0) + 1
+        if len(buckets) > self._max_buckets:
+            self._collapse(buckets)
+
+    def _collapse(self, buckets: dict[int, int]) -> None:
+        ordered = sorted(buckets)
+        excess = ordered[: len(ordered) - self._max_buckets + 1]
+        folded = sum(buckets.pop(i) for i in excess)
+        target = ordered[len(excess)]
+        buckets[target] = buckets.get(target, 0) + folded
+
+    def merge(self, other: QuantileSketch) -> None:
+        for idx, n in other._pos.items():
+            self._pos[idx] = self._pos.get(idx, 0) + n
+        for idx, n in other._neg.items():
+            self._neg[idx] = self._neg.get(idx, 0) + n
+        self._zero += other._zero
+        self.count += other.count
+        for buckets in (self._pos, self._neg):
+            if len(buckets) > self._max_buckets:
+                self._collapse(buckets)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        # Negatives: largest magnitude first
+        for idx in sorted(self._neg, reverse=True):
+            seen += self._neg[idx]
+            if seen > rank:
+                return -self._value(idx)
+        seen += self._zero
+        if seen > rank:
+            return 0.0
+        for idx in sorted(self._pos):
+            seen += self._pos[idx]
+            if seen > rank:
+                return self._value(idx)
+        return self._value(max(self._pos)) if self._pos else 0.0
+
+
+class MetricSeries:
+    """Aggregates for one (name, tags) pair."""
+
+    __slots__ = ("count", "max", "min", "name", "recent", "sketch", "tags", "total")
+
+    def __init__(self, name: str, tags: tuple[tuple[str, str], ...], ring_size: int) -> None:
+        self.name = name
+        self.tags = tags
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch()
+        self.recent = RingBuffer(ring_size)
+
+    def add(self, value: float, timestamp: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sketch.add(value)
+        self.recent.append(value, timestamp)
+
+
+def _series_tags(tags: dict[str, str] | None) -> tuple[tuple[str, str], ...]:
+    if not tags:
+        return ()
+    return tuple(
+        sorted((str(k), str(v)) for k, v in tags.items() if k not in HIGH_CARDINALITY_TAGS)
+    )
+
+
+def _summarize(
+    count: int, total: float, lo: float, hi: float, sketch: QuantileSketch
+) -> dict[str, Any]:
+    return {
+        "count": count,
+        "sum": total,
+        "min": lo,
+        "max": hi,
+        "avg": total / count if count else 0,
+        # Clamp: a bucket representative may sit just outside the observed range.
+        "p50": min(max(sketch.quantile(0.5), lo), hi),
+        "p95": min(max(sketch.quantile(0.95), lo), hi),
+        "p99": min(max(sketch.quantile(0.99), lo), hi),
+    }
+
+
+class MetricsStore:
+    """Thread-safe registry of ``MetricSeries``."""
+
+    def __init__(
+        self, *, ring_size: int = DEFAULT_RING_SIZE, max_series: int = DEFAULT_MAX_SERIES
+    ) -> None:
+        self._series: dict[tuple[str, tuple[tuple[str, str], ...]], MetricSeries] = {}
+        self._lock = threading.Lock()
+        self._ring_size = ring_size
+        self._max_series = max_series
+
+    def record(
+        self,
+        name: str,
+        value: float,
+        tags: dict[str, str] | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        value = float(value)
+        if not math.isfinite(value):
+            # inf/nan have no sketch bucket and would poison sum/min/max
+            return
+        key = (name, _series_tags(tags))
+        ts = time.time() if timestamp is None else timestamp
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= self._max_series:
+                    key = (name, _OVERFLOW_TAGS)
+                    series = self._series.get(key)
+                if series is None:
+                    series = MetricSeries(key[0], key[1], self._ring_size)
+                    self._series[key] = series
+            series.add(value, ts)
+
+    def recent(self, name: str, limit: int = 100) -> list[tuple[float, float, dict[str, str]]]:
+        """Newest ``limit`` raw points of ``name`` across tag sets, oldest first."""
+        with self._lock:
+            points = [
+                (ts, value, dict(series.tags))
+                for series in self._series.values()
+                if series.name == name
+                for ts, value in series.recent.items()
+            ]
+        points.sort(key=lambda p: p[0])
+        return points[-limit:] if limit else []
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Per-name aggregates (tag sets merged) including p50/p95/p99."""
+        with self._lock:
+            by_name: dict[str, list[MetricSeries]] = {}
+            for series in self._series.values():
+                by_name.setdefault(series.name, []).append(series)
+            result: dict[str, dict[str, Any]] = {}
+            for name, group in by_name.items():
+                sketch = QuantileSketch()
+                for series in group:
+                    sketch.merge(series.sketch)
+                result[name] = _summarize(
+                    sum(s.count for s in group),
+                    sum(s.total for s in group),
+                    min(s.min for s in group),
+                    max(s.max for s in group),
+                    sketch,
+                )
+        return result
+
+    def series(self) -> list[dict[str, Any]]:
+        """Per (name, tags) aggregates."""
+        with self._lock:
+            return [
+                {
+                    "name": s.name,
+                    "tags": dict(s.tags),
+                    **_summarize(s.count, s.total, s.min, s.max, s.sketch),
+                }
+                for s in self._series.values()
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+
+# =============================================================================
+# PROMETHEUS TEXT EXPOSITION
+# =============================================================================
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+_INVALID_LABEL_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _prom_name(name: str, prefix: str) -> str:
+    cleaned = _INVALID_NAME_CHARS.sub("_", f"{prefix}{name}")
+    return cleaned if not cleaned[0].isdigit() else f"_{cleaned}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _prom_labels(tags: dict[str, str], extra: tuple[str, str] | None = None) -> str:
+    pairs = [(_INVALID_LABEL_CHARS.sub("_", k), v) for k, v in tags.items()]
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+def _prom_float(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render_prometheus(store: MetricsStore, prefix: str = "mirt_") -> str:
+    """Render every series as a Prometheus ``summary``."""
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for row in store.series():
+        grouped.setdefault(row["name"], []).append(row)
+
+    lines: list[str] = []
+    for name in sorted(grouped):
+        metric = _prom_name(name, prefix)
+        lines.append(f"# TYPE {metric} summary")
+        for row in grouped[name]:
+            tags = row["tags"]
+            for q in QUANTILES:
+                key = f"p{int(q * 100)}"
+                lines.append(
+                    f"{metric}{_prom_labels(tags, ('quantile', str(q)))} {_prom_float(row[key])}"
+                )
+            lines.append(f"{metric}_sum{_prom_labels(tags)} {_prom_float(row['sum'])}")
+            lines.append(f"{metric}_count{_prom_labels(tags)} {row['count']}")
+    return "\n".join(lines) + "\n" if lines else ""
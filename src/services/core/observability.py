@@ -33,6 +33,12 @@ import uuid
 from typing import Any
 
 from src.conf.config import settings
+from src.services.core.metrics_store import (
+    DEFAULT_MAX_SERIES,
+    DEFAULT_RING_SIZE,
+    MetricsStore,
+    render_prometheus,
+)
 
 UTC = timezone.utc
 
@@ -136,49 +142,40 @@ class MetricPoint:
 
 
 class MetricsCollector:
-    """In-memory metrics collector."""
+    """In-memory metrics collector.
 
-    def __init__(self, max_points: int = 10000):
-        self.points: list[MetricPoint] = []
-        self.max_points = max_points
+    Backed by ``MetricsStore``: per-series ring buffers and streaming quantile
+    sketches, so memory stays fixed no matter how many points are recorded.
+    """
+
+    def __init__(
+        self, max_series: int = DEFAULT_MAX_SERIES, ring_size: int = DEFAULT_RING_SIZE
+    ) -> None:
+        self.store = MetricsStore(ring_size=ring_size, max_series=max_series)
 
     def record(self, name: str, value: float, tags: dict[str, str] | None = None) -> None:
         """Record a metric point."""
-        point = MetricPoint(
-            name=name,
-            value=value,
-            timestamp=datetime.utcnow(),
-            tags=tags or {},
-        )
-        self.points.append(point)
-
-        # Prune old points if needed
-        if len(self.points) > self.max_points:
-            self.points = self.points[-self.max_points :]
+        self.store.record(name, value, tags)
 
     def get_recent(self, name: str, limit: int = 100) -> list[MetricPoint]:
-        """Get recent points for a metric."""
-        return [p for p in self.points[-limit:] if p.name == name]
+        """Get the most recent points recorded for a metric."""
+        return [
+            MetricPoint(
+                name=name,
+                value=value,
+                timestamp=datetime.fromtimestamp(ts, UTC),
+                tags=tags,
+            )
+            for ts, value, tags in self.store.recent(name, limit)
+        ]
 
     def get_summary(self) -> dict[str, Any]:
-        """Get summary of all metrics."""
-        summary: dict[str, dict[str, Any]] = {}
-
-        for point in self.points:
-            if point.name not in summary:
-                summary[point.name] = {"count": 0, "sum": 0, "min": float("inf"), "max": 0}
-
-            s = summary[point.name]
-            s["count"] += 1
-            s["sum"] += point.value
-            s["min"] = min(s["min"], point.value)
-            s["max"] = max(s["max"], point.value)
+        """Get summary of all metrics (count/sum/min/max/avg/p50/p95/p99)."""
+        return self.store.summary()
 
-        # Calculate averages
-        for _name, s in summary.items():
-            s["avg"] = s["sum"] / s["count"] if s["count"] > 0 else 0
-
-        return summary
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition of every series."""
+        return render_prometheus(self.store)
 
 
 # Global metrics collector
@@ -196,6 +193,8 @@ def track_token_usage(
     model: str,
     session_id: str | None = None,
     cost_usd: float | None = None,
+    *,
+    tokens_history: int | None = None,
 ) -> None:
     """
     Track LLM token usage metrics.
@@ -206,6 +205,8 @@ def track_token_usage(
         model: Model name (GPT-5.1 only)
         session_id: Optional session ID for context
         cost_usd: Optional cost in USD
+        tokens_history: Optional tokenizer count of the conversation history
+            included in the prompt (the rest of tokens_input is instructions/context)
     """
     tags = {"model": model}
     if session_id:
@@ -221,17 +222,21 @@ def track_token_usage(
     # Track cost if provided
     if cost_usd is not None:
         track_metric("llm_cost_usd", cost_usd, tags)
+
+    if tokens_history is not None:
+        track_metric("llm_tokens_history", float(tokens_history), tags)
     
     # Check thresholds and alert
     _check_token_thresholds(tokens_total, tokens_input, tokens_output, model, session_id, cost_usd)
     
     # Log for monitoring
     logger.info(
-        "[TOKEN_USAGE] model=%s tokens_in=%d tokens_out=%d tokens_total=%d cost=$%.6f session=%s",
+        "[TOKEN_USAGE] model=%s tokens_in=%d tokens_out=%d tokens_total=%d tokens_history=%s cost=$%.6f session=%s",
         model,
         tokens_input,
         tokens_output,
         tokens_total,
+        tokens_history if tokens_history is not None else "-",
         cost_usd or 0.0,
         session_id or "unknown",
     )
@@ -291,6 +296,11 @@ def get_metrics_summary() -> dict[str, Any]:
     return _metrics.get_summary()
 
 
+def render_metrics_prometheus() -> str:
+    """Get all tracked metrics in Prometheus text exposition format."""
+    return _metrics.to_prometheus()
+
+
 # =============================================================================
 # TIMING CONTEXT MANAGER
 # =============================================================================
@@ -483,6 +493,7 @@ class AsyncTracingService:
     - Failure counter for monitoring
     - Optional disable via ENABLE_OBSERVABILITY env var
     - Payload validation before insertion
+    - Optional bulk writes via the telemetry writer (TELEMETRY_BATCH_ENABLED)
     """
 
     # Valid ENUM values for llm_traces table
@@ -492,6 +503,7 @@ class AsyncTracingService:
     def __init__(self):
         self._enabled = bool(getattr(settings, "ENABLE_OBSERVABILITY", True))
         self._failure_count = 0  # SAFEGUARD_3: Failure counter
+        self._batched = bool(getattr(settings, "TELEMETRY_BATCH_ENABLED", False))
 
     @staticmethod
     def _normalize_trace_id(value: str) -> str:
@@ -645,8 +657,8 @@ class AsyncTracingService:
         try:
             from src.services.infra.supabase_client import get_supabase_client
 
-            client = get_supabase_client()
-            if not client:
+            client = None if self._batched else get_supabase_client()
+            if not self._batched and not client:
                 return
 
             # Build payload according to llm_traces schema
@@ -677,6 +689,13 @@ class AsyncTracingService:
             # Remove None values to let DB defaults work or avoid null issues
             clean_payload = {k: v for k, v in validated_payload.items() if v is not None}
 
+            if self._batched:
+                from src.services.core.telemetry_writer import get_trace_writer
+
+                # Written in bulk by the flusher thread; dropped rows are counted there
+                get_trace_writer().submit(clean_payload)
+                return
+
             # Insert into llm_traces (no fallback to llm_usage - different purposes)
             # NOTE: Supabase client.execute() is synchronous, not async
             try:
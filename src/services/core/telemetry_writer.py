@@ -0,0 +1,323 @@
+"""
+Batched writes for LLM usage records and traces.
+================================================
+Every agent turn used to queue one ``record_usage`` Celery task and insert
+one ``llm_traces`` row. With ``TELEMETRY_BATCH_ENABLED`` those rows are
+buffered in-process instead and written in bulk:
+
+- as soon as ``TELEMETRY_BATCH_MAX_ROWS`` rows are buffered (size threshold),
+- at least every ``TELEMETRY_BATCH_FLUSH_MS`` (timer),
+- on shutdown (``shutdown_telemetry_writers``, also registered with atexit).
+
+Back-pressure: a failed write puts its rows back and the flusher backs off
+exponentially, so a slow or unavailable database makes the buffer grow
+rather than the request path wait. Once ``TELEMETRY_BATCH_MAX_PENDING`` rows
+are buffered, new rows are dropped (load shedding) and counted.
+
+A batch that keeps failing is not retried forever: after
+``_MAX_WRITE_ATTEMPTS`` attempts it is split in half and each half retried,
+so one row the database rejects cannot block the rows behind it. A single
+row that still fails is dropped (dead-lettered) and counted.
+
+Like the memory access batcher, the flusher is a daemon thread so it works
+the same under FastAPI and Celery.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from src.conf.config import settings
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+logger = logging.getLogger(__name__)
+
+_MAX_BACKOFF_SECONDS = 30.0
+_MAX_WRITE_ATTEMPTS = 3
+
+
+class BatchRowWriter:
+    """Bounded in-memory buffer of rows flushed by ``write(rows)`` in batches."""
+
+    def __init__(
+        self,
+        name: str,
+        write: Callable[[list[dict[str, Any]]], None],
+        *,
+        max_batch: int | None = None,
+        flush_interval: float | None = None,
+        max_pending: int | None = None,
+    ) -> None:
+        self.name = name
+        self._write = write
+        self._max_batch = max_batch or settings.TELEMETRY_BATCH_MAX_ROWS
+        self._flush_interval = (
+            flush_interval if flush_interval is not None else settings.TELEMETRY_BATCH_FLUSH_MS / 1000
+        )
+        self._max_pending = max_pending or settings.TELEMETRY_BATCH_MAX_PENDING
+        self._rows: deque[dict[str, Any]] = deque()
+        # Failed batches with their attempt count, written before new rows
+        self._retry: deque[tuple[list[dict[str, Any]], int]] = deque()
+        self._retry_rows = 0
+        self._lock = threading.Lock()
+        # Serialises flushes (timer vs. shutdown) so a row is never written twice
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._failures = 0
+        self._stats = {
+            "submitted": 0,
+            "flushed": 0,
+            "dropped": 0,
+            "dead_lettered": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def submit(self, row: dict[str, Any]) -> bool:
+        """Buffer ``row``; returns False when it was dropped (buffer full or writer closed)."""
+        with self._lock:
+            if self._stopped.is_set():
+                # Late row after close: no blocking write on the caller's thread
+                self._stats["dropped"] += 1
+                return False
+            if len(self._rows) + self._retry_rows >= self._max_pending:
+                self._stats["dropped"] += 1
+                dropped = self._stats["dropped"]
+                accepted = False
+            else:
+                self._rows.append(row)
+                self._stats["submitted"] += 1
+                pending = len(self._rows)
+                accepted = True
+        if not accepted:
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning("[TELEMETRY:%s] Buffer full, dropped %d rows so far", self.name, dropped)
+            return False
+
+        self._ensure_thread()
+        if pending >= self._max_batch:
+            self._wake.set()
+        return True
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._rows) + self._retry_rows
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f"telemetry-{self.name}-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if self._failures:
+                # Backing off: ignore the size trigger until the wait is over
+                self._stopped.wait(min(self._flush_interval * 2**self._failures, _MAX_BACKOFF_SECONDS))
+            else:
+                self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            try:
+                self.flush()
+            except Exception as e:  # keep the flusher alive
+                logger.warning("[TELEMETRY:%s] Flush loop error: %s", self.name, e)
+
+    def flush(self) -> int:
+        """Write buffered rows now, one batch at a time. Returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            # Only what is buffered now, so a busy producer cannot keep one flush going
+            with self._lock:
+                batches = len(self._retry) + -(-len(self._rows) // self._max_batch)
+            for _ in range(batches):
+                with self._lock:
+                    if self._retry:
+                        batch, attempts = self._retry.popleft()
+                        self._retry_rows -= len(batch)
+                    else:
+                        batch = [self._rows.popleft() for _ in range(min(self._max_batch, len(self._rows)))]
+                        attempts = 0
+                if not batch:
+                    break
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    self._requeue(batch, attempts + 1)
+                    self._failures += 1
+                    self._stats["failed_flushes"] += 1
+                    logger.warning(
+                        "[TELEMETRY:%s] Bulk write of %d rows failed (attempt %d): %s",
+                        self.name,
+                        len(batch),
+                        attempts + 1,
+                        str(e)[:200],
+                    )
+                    break
+                self._failures = 0
+                self._stats["flushes"] += 1
+                self._stats["flushed"] += len(batch)
+                written += len(batch)
+        if written:
+            self._track(written)
+        return written
+
+    def _requeue(self, batch: list[dict[str, Any]], attempts: int) -> None:
+        """Put a failed batch back in front, splitting it once it has used its attempts.
+
+        Rows past the pending limit are dropped oldest first.
+        """
+        if attempts >= _MAX_WRITE_ATTEMPTS:
+            if len(batch) == 1:
+                with self._lock:
+                    self._stats["dead_lettered"] += 1
+                    self._stats["dropped"] += 1
+                logger.error(
+                    "[TELEMETRY:%s] Dropping row rejected %d times: %s",
+                    self.name,
+                    attempts,
+                    str(batch[0])[:200],
+                )
+                return
+            # Each half gets one try before it is split again
+            middle = len(batch) // 2
+            parts = [(batch[:middle], attempts - 1), (batch[middle:], attempts - 1)]
+        else:
+            parts = [(batch, attempts)]
+        with self._lock:
+            for part, part_attempts in reversed(parts):
+                room = max(self._max_pending - len(self._rows) - self._retry_rows, 0)
+                keep = part[len(part) - room:] if room < len(part) else part
+                self._stats["dropped"] += len(part) - len(keep)
+                if keep:
+                    self._retry.appendleft((keep, part_attempts))
+                    self._retry_rows += len(keep)
+
+    def _track(self, written: int) -> None:
+        from src.services.core.observability import track_metric
+
+        tags = {"writer": self.name}
+        track_metric("telemetry_rows_flushed", written, tags)
+        track_metric("telemetry_rows_queued", self.pending(), tags)
+        track_metric("telemetry_rows_dropped", self._stats["dropped"], tags)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters since start plus the current number of buffered rows."""
+        with self._lock:
+            return {**self._stats, "queued": len(self._rows) + self._retry_rows}
+
+    def close(self) -> None:
+        """Stop the flusher thread and write whatever is still buffered."""
+        with self._lock:
+            self._stopped.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(self._flush_interval, 1.0) + 5.0)
+        self.flush()
+        remaining = self.pending()
+        if remaining:
+            with self._lock:
+                self._rows.clear()
+                self._retry.clear()
+                self._retry_rows = 0
+                self._stats["dropped"] += remaining
+            logger.error("[TELEMETRY:%s] Dropped %d rows that could not be written on shutdown", self.name, remaining)
+
+
+# =============================================================================
+# SINKS
+# =============================================================================
+
+
+def _write_usage(rows: list[dict[str, Any]]) -> None:
+    from src.services.infra.supabase_client import get_supabase_client
+
+    client = get_supabase_client()
+    if not client:
+        raise RuntimeError("Supabase not configured")
+    # Inserts into llm_usage and updates llm_usage_hourly in one transaction
+    client.rpc("record_llm_usage_batch", {"p_rows": rows}).execute()
+
+
+def _write_traces(rows: list[dict[str, Any]]) -> None:
+    from src.services.infra.supabase_client import get_supabase_client
+
+    client = get_supabase_client()
+    if not client:
+        raise RuntimeError("Supabase not configured")
+    # Columns a row doesn't set get their table default, not NULL
+    client.table("llm_traces").insert(rows, default_to_null=False).execute()
+
+
+_writers: dict[str, BatchRowWriter] = {}
+_registry_lock = threading.Lock()
+_atexit_registered = False
+
+
+def _get_writer(name: str, write: Callable[[list[dict[str, Any]]], None]) -> BatchRowWriter:
+    global _atexit_registered
+    writer = _writers.get(name)
+    if writer is not None:
+        return writer
+    with _registry_lock:
+        writer = _writers.get(name)
+        if writer is None:
+            writer = BatchRowWriter(name, write)
+            _writers[name] = writer
+        if not _atexit_registered:
+            atexit.register(shutdown_telemetry_writers)
+            _atexit_registered = True
+    return writer
+
+
+def get_usage_writer() -> BatchRowWriter:
+    """Shared writer for ``llm_usage`` rows."""
+    return _get_writer("usage", _write_usage)
+
+
+def get_trace_writer() -> BatchRowWriter:
+    """Shared writer for ``llm_traces`` rows."""
+    return _get_writer("traces", _write_traces)
+
+
+def get_telemetry_writer_stats() -> dict[str, dict[str, Any]]:
+    return {name: writer.get_stats() for name, writer in list(_writers.items())}
+
+
+def shutdown_telemetry_writers() -> None:
+    """Flush and stop every writer (FastAPI lifespan / process exit)."""
+    with _registry_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        try:
+            writer.close()
+        except Exception as e:
+            logger.warning("[TELEMETRY:%s] Shutdown flush failed: %s", writer.name, e)
+    if writers:
+        logger.info("[TELEMETRY] Flushed %d telemetry writers on shutdown", len(writers))
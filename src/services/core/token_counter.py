@@ -0,0 +1,189 @@
+"""
+Token counting for history budgets.
+===================================
+Counts tokens with the model's local BPE encoding (``tiktoken``) and caches
+per-message counts by content hash, so re-counting a conversation each turn
+only tokenizes the messages that are new.
+
+If the encoding can't be loaded (package missing, BPE file not cached and no
+network), counts fall back to a script-aware estimate: ~4 ASCII characters
+per token and ~2 characters per token for everything else (Cyrillic text
+tokenizes far denser than the old flat chars/4 assumed). A failed load is
+retried after ``_LOAD_RETRY_SECONDS`` rather than pinned for the process
+lifetime; the server warms the counter at startup so the BPE download never
+lands on a request.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+try:
+    import tiktoken  # type: ignore[reportMissingImports]
+except ImportError:  # pragma: no cover - tiktoken is a hard dependency in production
+    tiktoken = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+
+# Used when tiktoken doesn't know the model name (e.g. newer GPT releases)
+DEFAULT_ENCODING = "o200k_base"
+
+# Role/separator tokens the chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_CACHE_MAX_ENTRIES = 8192
+
+# A failed encoding load (offline, BPE file not cached) is retried after this long
+_LOAD_RETRY_SECONDS = 300.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Tokenizer-free estimate: ~4 chars/token for ASCII, ~2 for other scripts."""
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 2)
+
+
+def message_text(msg: Any) -> str:
+    """Text content of a dict or LangChain message (text parts of multimodal content)."""
+    content = msg.get("content", "") if isinstance(msg, dict) else getattr(msg, "content", "")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            item.get("text", "") for item in content if isinstance(item, dict) and isinstance(item.get("text"), str)
+        )
+    return ""
+
+
+class TokenCounter:
+    """Token counts for one encoding, cached by content hash."""
+
+    def __init__(self, encode: Callable[[str], list[int]] | None, name: str) -> None:
+        self.name = name
+        self.exact = encode is not None
+        self._encode = encode
+        self._cache: OrderedDict[bytes, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def count_text(self, text: str) -> int:
+        if not text:
+            return 0
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        count = len(self._encode(text)) if self._encode is not None else estimate_tokens(text)
+
+        with self._lock:
+            self._cache[key] = count
+            if len(self._cache) > _CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+        return count
+
+    def count_message(self, msg: Any) -> int:
+        return self.count_text(message_text(msg)) + MESSAGE_OVERHEAD_TOKENS
+
+    def count_messages(self, messages: list[Any]) -> int:
+        return sum(self.count_message(msg) for msg in messages)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "encoding": self.name,
+                "exact": self.exact,
+                "entries": len(self._cache),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_counters: dict[str, TokenCounter] = {}
+_counters_lock = threading.Lock()
+_load_failed_at: dict[str, float] = {}
+_estimate_counter = TokenCounter(None, "estimate")
+
+
+def _encoding_name(model: str) -> str:
+    if tiktoken is None:
+        return "estimate"
+    try:
+        return tiktoken.encoding_for_model(model).name
+    except KeyError:
+        return DEFAULT_ENCODING
+    except Exception:
+        return "estimate"
+
+
+def _shared_counter(name: str) -> TokenCounter | None:
+    # Models sharing an encoding share one cache
+    return next((c for c in _counters.values() if c.name == name), None)
+
+
+def get_token_counter(model: str | None = None) -> TokenCounter:
+    """Shared counter for ``model`` (defaults to the active LLM model).
+
+    Falls back to the estimating counter while the encoding can't be loaded;
+    the load is retried once ``_LOAD_RETRY_SECONDS`` have passed.
+    """
+    if model is None:
+        from src.conf.config import settings
+
+        model = settings.active_llm_model
+
+    counter = _counters.get(model)
+    if counter is not None:
+        return counter
+
+    name = _encoding_name(model)
+    with _counters_lock:
+        counter = _estimate_counter if name == "estimate" else _shared_counter(name)
+        if counter is not None:
+            _counters[model] = counter
+            return counter
+        failed_at = _load_failed_at.get(name)
+        if failed_at is not None and time.monotonic() - failed_at < _LOAD_RETRY_SECONDS:
+            return _estimate_counter
+
+    # Loading may download the BPE file, so it runs outside the lock
+    # (tiktoken serialises its own encoding registry)
+    try:
+        encode = tiktoken.get_encoding(name).encode_ordinary
+    except Exception as e:
+        logger.warning(
+            "[TOKENS] Failed to load %s encoding, estimating counts for %.0fs: %s",
+            name,
+            _LOAD_RETRY_SECONDS,
+            e,
+        )
+        with _counters_lock:
+            _load_failed_at[name] = time.monotonic()
+        return _estimate_counter
+
+    with _counters_lock:
+        _load_failed_at.pop(name, None)
+        counter = _shared_counter(name) or TokenCounter(encode, name)
+        _counters[model] = counter
+        return counter
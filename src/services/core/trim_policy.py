@@ -14,6 +14,16 @@ def get_llm_history_limit(settings_override=None) -> int:
     return int(getattr(settings, "LLM_MAX_HISTORY_MESSAGES", 20))
 
 
+def get_llm_history_token_budget(model: str | None = None, settings_override=None) -> int:
+    settings = _resolve_settings(settings_override)
+    if model is None:
+        model = getattr(settings, "active_llm_model", "")
+    overrides = getattr(settings, "llm_history_token_budgets", {}) or {}
+    if model in overrides:
+        return int(overrides[model])
+    return int(getattr(settings, "LLM_HISTORY_TOKEN_BUDGET", 0))
+
+
 def get_state_message_limit(settings_override=None) -> int:
     settings = _resolve_settings(settings_override)
     return int(getattr(settings, "STATE_MAX_MESSAGES", 100))
@@ -0,0 +1,352 @@
+"""
+Two-tier catalog cache.
+=======================
+L1: in-process TTL/LRU (bounded, no network).
+L2: Redis JSON (shared across instances, best-effort).
+
+Features:
+- Single-flight: concurrent misses for the same key share one loader call.
+- Early probabilistic refresh (XFetch): a hot key is reloaded shortly before
+  it expires by one caller, while everybody else keeps getting the cached
+  value, so an expiry never turns into a Supabase stampede.
+- Invalidation broadcast: ``publish_catalog_invalidation()`` (called by the
+  catalog sync scripts) drops L2 keys and publishes on a Redis channel; every
+  process listening clears its L1.
+
+Usage:
+    cache = TwoTierCache(l2_get=_cache_get_json, l2_set=_cache_set_json)
+    data = await cache.get_or_load(key, loader, ttl_seconds=300)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from src.services.core.observability import track_metric
+from src.services.infra.redis_pool import get_redis_client, redis_namespace, report_redis_error
+
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = redis_namespace("catalog").key("invalidate")
+
+# XFetch beta: >1 refreshes earlier, <1 later. 1.0 is the paper's default.
+EARLY_REFRESH_BETA = 1.0
+
+_LISTENER_RETRY_SECONDS = 60.0
+
+
+@dataclass
+class CacheStats:
+    """Lookup counters (exposed via ``get_stats``)."""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    early_refreshes: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    # Seconds the loader took - drives how early XFetch starts refreshing.
+    delta: float
+
+
+class L1Cache:
+    """Thread-safe, size-bounded TTL/LRU map."""
+
+    def __init__(self, *, max_entries: int, stats: CacheStats) -> None:
+        self._items: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._stats = stats
+
+    def get(self, key: str) -> _Entry | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= now:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, *, ttl_seconds: float, delta: float = 0.0) -> None:
+        entry = _Entry(value=value, expires_at=time.monotonic() + ttl_seconds, delta=delta)
+        with self._lock:
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_entries:
+                self._items.popitem(last=False)
+                self._stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def _should_refresh_early(entry: _Entry, now: float, beta: float = EARLY_REFRESH_BETA) -> bool:
+    """XFetch: refresh with probability rising as expiry approaches."""
+    if entry.delta <= 0:
+        return False
+    # -log(U) is Exp(1)-distributed; scaled by how long a reload takes.
+    return now - entry.delta * beta * math.log(random.random() or 1e-12) >= entry.expires_at
+
+
+class TwoTierCache:
+    """L1 (process) + L2 (Redis) cache with single-flight loading."""
+
+    def __init__(
+        self,
+        *,
+        l2_get: Callable[[str], Any | None],
+        l2_set: Callable[..., None],
+        l1_max_entries: int = 2048,
+        l1_ttl_seconds: float = 60.0,
+        metric_prefix: str = "catalog_cache",
+    ) -> None:
+        self.stats = CacheStats()
+        self._l1 = L1Cache(max_entries=l1_max_entries, stats=self.stats)
+        self._l1_ttl = l1_ttl_seconds
+        self._l2_get = l2_get
+        self._l2_set = l2_set
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+        self._background: set[asyncio.Task[Any]] = set()
+        # Bumped on invalidation so loads started before it don't repopulate L1.
+        self._generation = 0
+        self._metric_prefix = metric_prefix
+
+    def _record(self, result: str) -> None:
+        track_metric(f"{self._metric_prefix}_lookup", 1, {"result": result})
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        *,
+        ttl_seconds: int,
+        cache_if: Callable[[Any], bool] = lambda v: v is not None,
+    ) -> Any:
+        """Return cached value for ``key`` or load it exactly once.
+
+        Values are deep-copied on L1 hits so callers may mutate results the
+        same way they could with freshly decoded Redis JSON.
+        """
+        entry = self._l1.get(key)
+        if entry is not None:
+            self.stats.l1_hits += 1
+            self._record("l1_hit")
+            if _should_refresh_early(entry, time.monotonic()) and key not in self._inflight:
+                self.stats.early_refreshes += 1
+                task = asyncio.create_task(self._load(key, loader, ttl_seconds, cache_if))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            return copy.deepcopy(entry.value)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            self.stats.coalesced += 1
+            self._record("coalesced")
+            return copy.deepcopy(await asyncio.shield(inflight))
+
+        cached = self._l2_get(key)
+        if cached is not None and cache_if(cached):
+            self.stats.l2_hits += 1
+            self._record("l2_hit")
+            self._l1.set(key, cached, ttl_seconds=min(self._l1_ttl, ttl_seconds))
+            return copy.deepcopy(cached)
+
+        self.stats.misses += 1
+        self._record("miss")
+        return copy.deepcopy(await self._load(key, loader, ttl_seconds, cache_if))
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_seconds: int,
+        cache_if: Callable[[Any], bool],
+    ) -> Any:
+        # The load runs as its own task so a cancelled caller (the first one
+        # included) does not cancel it for everyone else waiting on the key.
+        inflight = self._inflight.get(key)
+        if inflight is None or inflight.get_loop() is not asyncio.get_running_loop():
+            inflight = asyncio.create_task(
+                self._run_loader(key, loader, ttl_seconds, cache_if, self._generation)
+            )
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda task: self._load_done(key, task))
+        return await asyncio.shield(inflight)
+
+    async def _run_loader(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_seconds: int,
+        cache_if: Callable[[Any], bool],
+        generation: int,
+    ) -> Any:
+        started = time.monotonic()
+        value = await loader()
+        if cache_if(value) and generation == self._generation:
+            delta = time.monotonic() - started
+            self._l1.set(key, value, ttl_seconds=min(self._l1_ttl, ttl_seconds), delta=delta)
+            self._l2_set(key, value, ttl_seconds=ttl_seconds)
+        return value
+
+    def _load_done(self, key: str, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark a failure retrieved even if every waiter was cancelled, so it
+            # doesn't log "exception never retrieved".
+            task.exception()
+
+    def peek(self, key: str) -> Any | None:
+        """L1-only lookup (no loader, no Redis)."""
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        self.stats.l1_hits += 1
+        self._record("l1_hit")
+        return copy.deepcopy(entry.value)
+
+    def put(self, key: str, value: Any, *, ttl_seconds: int) -> None:
+        """Store in L1 only (L2 writes stay with the caller)."""
+        self._l1.set(key, value, ttl_seconds=min(self._l1_ttl, ttl_seconds))
+
+    def invalidate_local(self) -> None:
+        """Drop every L1 entry in this process."""
+        self._generation += 1
+        self._l1.clear()
+        self.stats.invalidations += 1
+        track_metric(f"{self._metric_prefix}_invalidations", 1)
+        logger.info("[CATALOG:CACHE] L1 invalidated (generation=%d)", self._generation)
+
+    def get_stats(self) -> dict[str, Any]:
+        stats = asdict(self.stats)
+        lookups = stats["l1_hits"] + stats["l2_hits"] + stats["misses"] + stats["coalesced"]
+        stats["l1_size"] = len(self._l1)
+        stats["hit_ratio"] = (
+            (stats["l1_hits"] + stats["l2_hits"] + stats["coalesced"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+
+# =============================================================================
+# INVALIDATION BROADCAST (Redis pub/sub)
+# =============================================================================
+
+
+class InvalidationListener:
+    """Background pub/sub subscriber that clears a cache's L1 on broadcast.
+
+    ``on_invalidate`` callbacks run after the L1 is cleared (e.g. to mark the
+    catalog snapshot stale).
+    """
+
+    def __init__(self, cache: TwoTierCache, *, on_invalidate: Iterable[Callable[[], None]] = ()) -> None:
+        self._cache = cache
+        self._callbacks = list(on_invalidate)
+        self._thread: Any = None
+        self._last_attempt = 0.0
+        self._lock = threading.Lock()
+
+    def ensure_started(self) -> bool:
+        """Start the subscriber thread if Redis is reachable (retried lazily)."""
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        now = time.monotonic()
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            if now - self._last_attempt < _LISTENER_RETRY_SECONDS:
+                return False
+            self._last_attempt = now
+
+            client = get_redis_client()
+            if client is None:
+                return False
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_message})
+                self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            except Exception as e:
+                report_redis_error(e, subsystem="catalog")
+                logger.warning("[CATALOG:CACHE] Invalidation listener not started: %s", e)
+                return False
+            logger.info("[CATALOG:CACHE] Listening for invalidations on %s", INVALIDATION_CHANNEL)
+            return True
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        self._cache.invalidate_local()
+        for callback in self._callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("[CATALOG:CACHE] Invalidation callback failed: %s", e)
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            try:
+                thread.stop()
+            except Exception as e:
+                logger.debug("[CATALOG:CACHE] Listener stop failed: %s", e)
+
+
+def publish_catalog_invalidation(reason: str = "catalog_sync") -> int:
+    """Drop shared catalog cache keys and tell every process to clear L1.
+
+    Returns the number of subscribers that received the broadcast (0 when
+    Redis is unavailable - L1 entries then age out via their TTL).
+    """
+    client = get_redis_client()
+    if client is None:
+        logger.warning("[CATALOG:CACHE] Redis unavailable, invalidation not broadcast")
+        return 0
+    try:
+        pattern = redis_namespace("catalog").key("*")
+        batch: list[str] = []
+        for key in client.scan_iter(match=pattern, count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                client.delete(*batch)
+                batch.clear()
+        if batch:
+            client.delete(*batch)
+        receivers = int(client.publish(INVALIDATION_CHANNEL, reason))
+    except Exception as e:
+        report_redis_error(e, subsystem="catalog")
+        logger.warning("[CATALOG:CACHE] Invalidation broadcast failed: %s", e)
+        return 0
+    logger.info("[CATALOG:CACHE] Invalidation broadcast to %d subscribers", receivers)
+    return receivers
@@ -8,46 +8,43 @@ from __future__ import annotations
 
 import json
 import logging
+import random
 from typing import Any
 
+import redis
+
 from src.services.core.exceptions import CatalogUnavailableError
 from src.services.core.observability import log_tool_execution, track_metric
+from src.services.data.catalog_cache import InvalidationListener, TwoTierCache
+from src.services.data.catalog_snapshot import CatalogSnapshot, CatalogSnapshotStore
+from src.services.infra.redis_pool import get_redis_client, redis_namespace, report_redis_error
 from src.services.infra.supabase_client import get_supabase_client
+from src.services.infra.supabase_executor import execute_async
 from src.conf.config import settings
 
 logger = logging.getLogger(__name__)
 
 CACHE_TTL_SECONDS = 300  # 5 minutes
+CACHE_TTL_JITTER = 0.1  # batch writes: +0-10% per key
+
+
+_CACHE_KEYS = redis_namespace("catalog")
 
 
 def _safe_cache_key(prefix: str, parts: list[str]) -> str:
     import hashlib
 
     raw = "|".join([prefix, *parts]).encode("utf-8", errors="ignore")
-    return f"mirt:catalog:{prefix}:{hashlib.sha256(raw).hexdigest()[:24]}"
+    return _CACHE_KEYS.key(prefix, hashlib.sha256(raw).hexdigest()[:24])
 
 
 def _get_redis_client():
     """Best-effort Redis client for caching (fails open).
-    
-    Returns None if Redis is unavailable (expected in dev environments).
-    All errors are logged for observability.
-    """
-    try:
-        import redis
 
-        redis_url = settings.REDIS_URL
-        if not redis_url:
-            return None
-        client = redis.from_url(redis_url, decode_responses=True)
-        client.ping()
-        return client
-    except (redis.ConnectionError, redis.TimeoutError, redis.RedisError) as e:
-        logger.debug("[CATALOG:CACHE] Redis unavailable (expected in dev): %s", type(e).__name__)
-        return None
-    except Exception as e:
-        logger.warning("[CATALOG:CACHE] Unexpected error connecting to Redis: %s", type(e).__name__)
-        return None
+    Returns the shared pooled client, or None if Redis is unavailable
+    (expected in dev environments). No per-call connect/ping.
+    """
+    return get_redis_client()
 
 
 def _cache_get_json(key: str) -> Any | None:
@@ -66,8 +63,9 @@ def _cache_get_json(key: str) -> Any | None:
     except (json.JSONDecodeError, TypeError) as e:
         logger.warning("[CATALOG:CACHE] Failed to decode cached JSON for key '%s': %s", key, type(e).__name__)
         return None
-    except (redis.ConnectionError, redis.TimeoutError, redis.RedisError) as e:
+    except redis.RedisError as e:
         logger.debug("[CATALOG:CACHE] Redis error getting key '%s': %s", key, type(e).__name__)
+        report_redis_error(e, subsystem="catalog")
         return None
     except Exception as e:
         logger.warning("[CATALOG:CACHE] Unexpected error getting cached key '%s': %s", key, type(e).__name__)
@@ -86,12 +84,111 @@ def _cache_set_json(key: str, value: Any, *, ttl_seconds: int = CACHE_TTL_SECOND
         r.setex(key, int(ttl_seconds), json.dumps(value, ensure_ascii=False, default=str))
     except (TypeError, ValueError) as e:
         logger.warning("[CATALOG:CACHE] Failed to serialize value for key '%s': %s", key, type(e).__name__)
-    except (redis.ConnectionError, redis.TimeoutError, redis.RedisError) as e:
+    except redis.RedisError as e:
         logger.debug("[CATALOG:CACHE] Redis error setting key '%s': %s", key, type(e).__name__)
+        report_redis_error(e, subsystem="catalog")
     except Exception as e:
         logger.warning("[CATALOG:CACHE] Unexpected error setting cached key '%s': %s", key, type(e).__name__)
 
 
+def _cache_get_many_json(keys: list[str]) -> list[Any | None]:
+    """MGET several JSON values in one round trip (None per missing/undecodable key)."""
+    r = _get_redis_client()
+    if not r or not keys:
+        return [None] * len(keys)
+    try:
+        raws = r.mget(keys)
+    except redis.RedisError as e:
+        logger.debug("[CATALOG:CACHE] Redis error getting %d keys: %s", len(keys), type(e).__name__)
+        report_redis_error(e, subsystem="catalog")
+        return [None] * len(keys)
+    except Exception as e:
+        logger.warning("[CATALOG:CACHE] Unexpected error getting %d cached keys: %s", len(keys), type(e).__name__)
+        return [None] * len(keys)
+    values: list[Any | None] = []
+    for key, raw in zip(keys, raws, strict=False):
+        try:
+            values.append(json.loads(raw) if raw else None)
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning("[CATALOG:CACHE] Failed to decode cached JSON for key '%s': %s", key, type(e).__name__)
+            values.append(None)
+    return values
+
+
+def _jittered_ttl(ttl_seconds: int) -> int:
+    """TTL spread by up to CACHE_TTL_JITTER so keys written together don't expire together."""
+    return int(ttl_seconds) + random.randint(0, int(ttl_seconds * CACHE_TTL_JITTER))
+
+
+def _cache_set_many_json(items: dict[str, Any], *, ttl_seconds: int = CACHE_TTL_SECONDS) -> None:
+    """SETEX several JSON values in one pipelined round trip (non-critical)."""
+    r = _get_redis_client()
+    if not r or not items:
+        return
+    try:
+        pipe = r.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.setex(key, _jittered_ttl(ttl_seconds), json.dumps(value, ensure_ascii=False, default=str))
+        pipe.execute()
+    except (TypeError, ValueError) as e:
+        logger.warning("[CATALOG:CACHE] Failed to serialize %d values: %s", len(items), type(e).__name__)
+    except redis.RedisError as e:
+        logger.debug("[CATALOG:CACHE] Redis error setting %d keys: %s", len(items), type(e).__name__)
+        report_redis_error(e, subsystem="catalog")
+    except Exception as e:
+        logger.warning("[CATALOG:CACHE] Unexpected error setting %d cached keys: %s", len(items), type(e).__name__)
+
+
+_catalog_cache = TwoTierCache(
+    l2_get=_cache_get_json,
+    l2_set=_cache_set_json,
+    l1_max_entries=settings.CATALOG_L1_MAX_ENTRIES,
+    l1_ttl_seconds=settings.CATALOG_L1_TTL_SECONDS,
+)
+
+
+async def _load_snapshot_rows() -> list[dict[str, Any]]:
+    client = get_supabase_client()
+    if not client:
+        raise CatalogUnavailableError("Supabase client not available")
+    max_rows = settings.CATALOG_SNAPSHOT_MAX_ROWS
+    response = await execute_async(
+        client.table("products").select("*").order("id").limit(max_rows + 1)
+    )
+    rows = response.data or []
+    if len(rows) > max_rows:
+        raise CatalogUnavailableError(f"catalog has more than {max_rows} products")
+    for row in rows:
+        # Product embeddings are not used by the bot and dominate row size
+        row.pop("embedding", None)
+    return rows
+
+
+_snapshots = CatalogSnapshotStore(
+    _load_snapshot_rows,
+    ttl_seconds=lambda: settings.CATALOG_SNAPSHOT_TTL_SECONDS,
+)
+_invalidation_listener = InvalidationListener(_catalog_cache, on_invalidate=[_snapshots.invalidate])
+
+
+def get_catalog_cache() -> TwoTierCache:
+    """Shared two-tier catalog cache (stats, manual invalidation)."""
+    return _catalog_cache
+
+
+def get_catalog_snapshots() -> CatalogSnapshotStore:
+    """Shared in-process catalog snapshot (stats, manual refresh)."""
+    return _snapshots
+
+
+async def warm_catalog_snapshot() -> CatalogSnapshot | None:
+    """Load the catalog snapshot ahead of the first request (app startup)."""
+    if not settings.CATALOG_SNAPSHOT_ENABLED or not get_supabase_client():
+        return None
+    _invalidation_listener.ensure_started()
+    return await _snapshots.refresh()
+
+
 class CatalogService:
     """
     Product catalog service backed by Supabase.
@@ -99,6 +196,45 @@ class CatalogService:
 
     def __init__(self) -> None:
         self.client = get_supabase_client()
+        if self.client:
+            _invalidation_listener.ensure_started()
+
+    async def _snapshot(self) -> CatalogSnapshot | None:
+        """Catalog snapshot, or None to query Supabase directly."""
+        if not self.client or not settings.CATALOG_SNAPSHOT_ENABLED:
+            return None
+        return await _snapshots.get()
+
+    async def get_products_for_vision(self) -> list[dict[str, Any]]:
+        """Every catalog product (for the vision guide and name matching)."""
+        snapshot = await self._snapshot()
+        if snapshot is not None:
+            return snapshot.all()
+        if not self.client:
+            return []
+        try:
+            return await _load_snapshot_rows()
+        except Exception as e:
+            logger.error("Catalog load for vision failed: %s", e)
+            return []
+
+    async def match_products(
+        self,
+        product_name: str,
+        color: str | None = None,
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        """Catalog rows best matching a vision-recognized name (and color)."""
+        snapshot = await self._snapshot()
+        if snapshot is None:
+            rows = await self.get_products_for_vision()
+            snapshot = CatalogSnapshot(rows) if rows else None
+        return snapshot.match(product_name, color, limit) if snapshot is not None else []
+
+    async def get_products_by_color(self, color: str) -> list[dict[str, Any]]:
+        """Products available in ``color`` (``colors`` column or name suffix)."""
+        snapshot = await self._snapshot()
+        return snapshot.with_color(color) if snapshot is not None else []
 
     async def search_products(
         self,
@@ -109,7 +245,8 @@ class CatalogService:
         """
         Search products in catalog.
         
-        Uses simple text search on name/description.
+        Uses simple text search on name/description. Served from the
+        in-process catalog snapshot when it is loaded.
         Note: Vector search was considered but not implemented as we use embedded catalog (products stored in DB with full metadata).
         """
         if not self.client:
@@ -117,6 +254,10 @@ class CatalogService:
             return []
 
         try:
+            snapshot = await self._snapshot()
+            if snapshot is not None:
+                return snapshot.search(query, category, limit)
+
             cache_key = _safe_cache_key(
                 "search",
                 [
@@ -125,28 +266,31 @@ class CatalogService:
                     str(int(limit)),
                 ],
             )
-            cached = _cache_get_json(cache_key)
-            if isinstance(cached, list):
-                return cached
 
-            # Start building query
-            db_query = self.client.table("products").select("*")
-            
-            # Text search filter (ilike is case-insensitive)
-            # We search in name OR description OR category
-            if query:
-                # Supabase doesn't support generic OR across columns easily in simple client
-                # So we'll prioritize name search for now
-                db_query = db_query.ilike("name", f"%{query}%")
-            
-            if category:
-                db_query = db_query.eq("category", category)
-                
-            # Execute
-            response = db_query.limit(limit).execute()
-            data = response.data or []
-            _cache_set_json(cache_key, data)
-            return data
+            async def _load() -> list[dict[str, Any]]:
+                # Start building query
+                db_query = self.client.table("products").select("*")
+
+                # Text search filter (ilike is case-insensitive)
+                # We search in name OR description OR category
+                if query:
+                    # Supabase doesn't support generic OR across columns easily in simple client
+                    # So we'll prioritize name search for now
+                    db_query = db_query.ilike("name", f"%{query}%")
+
+                if category:
+                    db_query = db_query.eq("category", category)
+
+                # Execute
+                response = await execute_async(db_query.limit(limit))
+                return response.data or []
+
+            return await _catalog_cache.get_or_load(
+                cache_key,
+                _load,
+                ttl_seconds=CACHE_TTL_SECONDS,
+                cache_if=lambda v: isinstance(v, list),
+            )
 
         except Exception as e:
             logger.error("Catalog search failed: %s", e)
@@ -158,22 +302,27 @@ class CatalogService:
             return None
 
         try:
+            snapshot = await self._snapshot()
+            if snapshot is not None and (row := snapshot.get(product_id)) is not None:
+                return row
+
             cache_key = _safe_cache_key("product", [str(int(product_id))])
-            cached = _cache_get_json(cache_key)
-            if isinstance(cached, dict) and cached.get("id"):
-                return cached
 
-            response = (
-                self.client.table("products")
-                .select("*")
-                .eq("id", product_id)
-                .single()
-                .execute()
+            async def _load() -> dict[str, Any] | None:
+                response = await execute_async(
+                    self.client.table("products")
+                    .select("*")
+                    .eq("id", product_id)
+                    .single()
+                )
+                return response.data
+
+            return await _catalog_cache.get_or_load(
+                cache_key,
+                _load,
+                ttl_seconds=CACHE_TTL_SECONDS,
+                cache_if=lambda v: isinstance(v, dict) and bool(v.get("id")),
             )
-            data = response.data
-            if data:
-                _cache_set_json(cache_key, data)
-            return data
         except Exception as e:
             logger.error("Get product failed: %s", e)
             return None
@@ -189,13 +338,28 @@ class CatalogService:
             if not ids:
                 return []
 
-            # Try per-item cache first
+            snapshot = await self._snapshot()
+            if snapshot is not None:
+                found = snapshot.get_many(ids)
+                if len(found) == len(ids):
+                    return found
+
+            # L1 first, then one MGET for the rest, then one DB query
             cached_items: list[dict[str, Any]] = []
+            keys = {pid: _safe_cache_key("product", [str(pid)]) for pid in dict.fromkeys(ids)}
+            l2_lookup: list[int] = []
+            for pid, cache_key in keys.items():
+                cached = _catalog_cache.peek(cache_key)
+                if isinstance(cached, dict) and cached.get("id"):
+                    cached_items.append(cached)
+                else:
+                    l2_lookup.append(pid)
+
             missing: list[int] = []
-            for pid in ids:
-                cache_key = _safe_cache_key("product", [str(pid)])
-                cached = _cache_get_json(cache_key)
+            l2_values = _cache_get_many_json([keys[pid] for pid in l2_lookup])
+            for pid, cached in zip(l2_lookup, l2_values, strict=True):
                 if isinstance(cached, dict) and cached.get("id"):
+                    _catalog_cache.put(keys[pid], cached, ttl_seconds=CACHE_TTL_SECONDS)
                     cached_items.append(cached)
                 else:
                     missing.append(pid)
@@ -205,20 +369,23 @@ class CatalogService:
                 by_id = {int(it["id"]): it for it in cached_items if isinstance(it, dict) and it.get("id")}
                 return [by_id[i] for i in ids if i in by_id]
 
-            response = (
+            response = await execute_async(
                 self.client.table("products")
                 .select("*")
                 .in_("id", missing)
-                .execute()
             )
             fresh = response.data or []
+            to_cache: dict[str, Any] = {}
             for item in fresh:
                 try:
                     pid = int(item.get("id"))
                 except (ValueError, TypeError) as e:
                     logger.warning("[CATALOG] Invalid product ID in batch response: %s (type: %s)", item.get("id"), type(item.get("id")).__name__)
                     continue
-                _cache_set_json(_safe_cache_key("product", [str(pid)]), item)
+                item_key = _safe_cache_key("product", [str(pid)])
+                _catalog_cache.put(item_key, item, ttl_seconds=CACHE_TTL_SECONDS)
+                to_cache[item_key] = item
+            _cache_set_many_json(to_cache)
 
             combined = cached_items + fresh
             by_id = {int(it["id"]): it for it in combined if isinstance(it, dict) and it.get("id")}
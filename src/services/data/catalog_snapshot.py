@@ -0,0 +1,345 @@
+"""
+In-process catalog snapshot.
+============================
+The catalog is a few hundred rows, so instead of one Supabase ``ilike`` query
+per search (and a Python scan over every row for vision enrichment), each
+process keeps an immutable snapshot of the ``products`` table with lookup
+indexes built once per load:
+
+- product id -> row;
+- normalized name and base name (name without the "(color)" suffix) -> rows;
+- normalized color (``colors`` column and the name's "(color)" suffix) -> rows;
+- category -> rows;
+- an inverted index of name tokens -> rows, used to narrow every substring
+  search to a handful of candidates.
+
+``CatalogSnapshotStore`` loads the snapshot on first use (or at startup),
+reloads it in the background after ``CATALOG_SNAPSHOT_TTL_SECONDS`` or a
+catalog invalidation broadcast, and keeps serving the previous snapshot while
+reloading. Each snapshot carries a ``version`` (hash of its rows), so a reload
+that finds no changes keeps the existing indexes.
+
+Rows handed out are deep copies; the snapshot itself is never mutated.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import re
+import time
+import weakref
+from typing import TYPE_CHECKING, Any
+
+from src.services.core.observability import track_metric
+
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+
+logger = logging.getLogger(__name__)
+
+# After a failed load, serve what we have (or nothing) for this long
+_RETRY_SECONDS = 30.0
+
+# Distinct query tokens whose vocabulary matches are memoized per snapshot
+_TOKEN_MEMO_MAX = 4096
+
+_WORD_RE = re.compile(r"\w+")
+
+Row = dict[str, Any]
+
+
+def normalize_name(text: str | None) -> str:
+    """Lower-case and collapse whitespace."""
+    return " ".join((text or "").lower().strip().split())
+
+
+def base_name(text: str | None) -> str:
+    """Name without the "(color)" suffix."""
+    text = (text or "").strip()
+    return text.split("(")[0].strip() if "(" in text else text
+
+
+def _tokens(text: str) -> list[str]:
+    return _WORD_RE.findall(text)
+
+
+def _row_colors(row: Row) -> list[str]:
+    raw = row.get("colors") or row.get("color") or []
+    if isinstance(raw, str):
+        raw = [raw]
+    colors = [normalize_name(str(c)) for c in raw if str(c).strip()] if isinstance(raw, list) else []
+    name = str(row.get("name") or "")
+    if "(" in name:
+        suffix = normalize_name(name.split("(", 1)[1].rstrip(")"))
+        if suffix:
+            colors.append(suffix)
+    return colors
+
+
+def match_score(row: Row, target: str, target_base: str, color: str) -> int:
+    """Relevance of a catalog row for a vision-recognized name (0 = no match).
+
+    ``target``/``target_base``/``color`` are already normalized.
+    """
+    name = str(row.get("name") or "")
+    n = normalize_name(name)
+    nb = normalize_name(base_name(name))
+    score = 0
+    if n == target or nb == target_base:
+        score += 50
+    if target and (target in n or n in target):
+        score += 15
+    if target_base and (target_base in nb or nb in target_base):
+        score += 10
+    if color and color in n:
+        score += 5
+    return score
+
+
+def catalog_version(rows: Iterable[Row]) -> str:
+    payload = json.dumps(list(rows), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class CatalogSnapshot:
+    """Immutable catalog rows plus lookup indexes."""
+
+    def __init__(self, rows: Iterable[Row], *, version: str | None = None) -> None:
+        self._rows: tuple[Row, ...] = tuple(copy.deepcopy(list(rows)))
+        self.version = version or catalog_version(self._rows)
+        self.loaded_at = time.time()
+
+        self._by_id: dict[str, int] = {}
+        self._by_name: dict[str, list[int]] = {}
+        self._by_base_name: dict[str, list[int]] = {}
+        self._by_color: dict[str, list[int]] = {}
+        self._by_category: dict[str, list[int]] = {}
+        self._by_token: dict[str, list[int]] = {}
+        self._names: list[str] = []
+        for pos, row in enumerate(self._rows):
+            name = str(row.get("name") or "")
+            norm = normalize_name(name)
+            self._names.append(norm)
+            if row.get("id") is not None:
+                self._by_id.setdefault(str(row["id"]), pos)
+            self._by_name.setdefault(norm, []).append(pos)
+            self._by_base_name.setdefault(normalize_name(base_name(name)), []).append(pos)
+            for color in dict.fromkeys(_row_colors(row)):
+                self._by_color.setdefault(color, []).append(pos)
+            if row.get("category") is not None:
+                self._by_category.setdefault(str(row["category"]), []).append(pos)
+            for token in dict.fromkeys(_tokens(norm)):
+                self._by_token.setdefault(token, []).append(pos)
+        self._token_memo: dict[tuple[str, bool], frozenset[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _copy(self, positions: Iterable[int]) -> list[Row]:
+        return [copy.deepcopy(self._rows[pos]) for pos in positions]
+
+    # ------------------------------------------------------------------
+    # Token index
+    # ------------------------------------------------------------------
+
+    def _rows_with_token(self, token: str, *, either_way: bool = False) -> frozenset[int]:
+        """Rows with a name token containing ``token`` (or, with ``either_way``,
+        contained in it)."""
+        key = (token, either_way)
+        hit = self._token_memo.get(key)
+        if hit is not None:
+            return hit
+        positions: set[int] = set(self._by_token.get(token, ()))
+        for word, rows in self._by_token.items():
+            if token in word or (either_way and word in token):
+                positions.update(rows)
+        hit = frozenset(positions)
+        if len(self._token_memo) >= _TOKEN_MEMO_MAX:
+            self._token_memo.clear()
+        self._token_memo[key] = hit
+        return hit
+
+    def _substring_candidates(self, text: str) -> Iterable[int]:
+        """Rows whose normalized name may contain ``text``: every word of
+        ``text`` must be part of a word of the name."""
+        tokens = _tokens(text)
+        if not tokens:
+            return range(len(self._rows))
+        candidates = self._rows_with_token(tokens[0])
+        for token in tokens[1:]:
+            candidates = candidates & self._rows_with_token(token)
+        return sorted(candidates)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def all(self) -> list[Row]:
+        return self._copy(range(len(self._rows)))
+
+    def get(self, product_id: Any) -> Row | None:
+        pos = self._by_id.get(str(product_id))
+        return copy.deepcopy(self._rows[pos]) if pos is not None else None
+
+    def get_many(self, product_ids: Iterable[Any]) -> list[Row]:
+        positions = [self._by_id.get(str(pid)) for pid in product_ids]
+        return self._copy(pos for pos in positions if pos is not None)
+
+    def by_name(self, name: str) -> list[Row]:
+        return self._copy(self._by_name.get(normalize_name(name), ()))
+
+    def with_color(self, color: str) -> list[Row]:
+        return self._copy(self._by_color.get(normalize_name(color), ()))
+
+    def search(self, query: str | None, category: str | None = None, limit: int = 5) -> list[Row]:
+        """Case-insensitive substring match on the name (like ``ilike '%q%'``)."""
+        q = normalize_name(query)
+        if category:
+            allowed = set(self._by_category.get(category, ()))
+            if not allowed:
+                return []
+        else:
+            allowed = None
+        found: list[int] = []
+        for pos in self._substring_candidates(q):
+            if allowed is not None and pos not in allowed:
+                continue
+            if q in self._names[pos]:
+                found.append(pos)
+                if len(found) >= limit:
+                    break
+        return self._copy(found)
+
+    def match(self, product_name: str, color: str | None = None, limit: int = 5) -> list[Row]:
+        """Best rows for a vision-recognized name, ranked by ``match_score``."""
+        target = normalize_name(product_name)
+        target_base = normalize_name(base_name(product_name))
+        color_norm = normalize_name(color)
+
+        # Only rows sharing a word (fragment) with the name or the color can score
+        positions: set[int] = set(self._by_name.get(target, ()))
+        positions.update(self._by_base_name.get(target_base, ()))
+        for token in _tokens(target):
+            positions |= self._rows_with_token(token, either_way=True)
+        for token in _tokens(color_norm):
+            positions |= self._rows_with_token(token)
+
+        scored: list[tuple[int, int]] = []
+        for pos in sorted(positions):
+            score = match_score(self._rows[pos], target, target_base, color_norm)
+            if score > 0:
+                scored.append((score, pos))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return self._copy(pos for _score, pos in scored[:limit])
+
+
+class CatalogSnapshotStore:
+    """Holds the current snapshot and reloads it when stale."""
+
+    def __init__(
+        self,
+        load: Callable[[], Awaitable[list[Row]]],
+        *,
+        ttl_seconds: Callable[[], float] | float = 300.0,
+    ) -> None:
+        self._load = load
+        self._ttl = ttl_seconds
+        self._snapshot: CatalogSnapshot | None = None
+        self._refreshed_at = 0.0
+        self._failed_at = 0.0
+        self._stale = False
+        self._inflight: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Future[Any]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._background: set[asyncio.Future[Any]] = set()
+        self.loads = 0
+        self.changes = 0
+        self.failures = 0
+
+    @property
+    def current(self) -> CatalogSnapshot | None:
+        return self._snapshot
+
+    def _ttl_seconds(self) -> float:
+        return float(self._ttl() if callable(self._ttl) else self._ttl)
+
+    def _is_fresh(self, now: float) -> bool:
+        return not self._stale and now - self._refreshed_at < self._ttl_seconds()
+
+    async def get(self) -> CatalogSnapshot | None:
+        """Current snapshot; loads it if there is none, refreshes in background if stale."""
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh(now):
+            return snapshot
+        if now - self._failed_at < _RETRY_SECONDS:
+            return snapshot
+        if snapshot is None:
+            return await self.refresh()
+        task = self._start_refresh()
+        if task not in self._background:
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return snapshot
+
+    def _start_refresh(self) -> asyncio.Future[Any]:
+        loop = asyncio.get_running_loop()
+        future = self._inflight.get(loop)
+        if future is None:
+            future = asyncio.ensure_future(self._reload())
+            self._inflight[loop] = future
+            future.add_done_callback(lambda _f: self._inflight.pop(loop, None))
+        return future
+
+    async def refresh(self) -> CatalogSnapshot | None:
+        """Reload now (concurrent callers share one load)."""
+        return await asyncio.shield(self._start_refresh())
+
+    async def _reload(self) -> CatalogSnapshot | None:
+        started = time.monotonic()
+        # Invalidations arriving during the load mark the result stale again
+        self._stale = False
+        self.loads += 1
+        try:
+            rows = await self._load()
+        except Exception as e:
+            self.failures += 1
+            self._failed_at = time.monotonic()
+            logger.warning("[CATALOG:SNAPSHOT] Load failed: %s", e)
+            track_metric("catalog_snapshot_load", 1, {"result": "error"})
+            return self._snapshot
+
+        version = catalog_version(rows)
+        changed = self._snapshot is None or self._snapshot.version != version
+        if changed:
+            self._snapshot = CatalogSnapshot(rows, version=version)
+            self.changes += 1
+            logger.info("[CATALOG:SNAPSHOT] Loaded %d products (version=%s)", len(rows), version)
+        self._refreshed_at = time.monotonic()
+        self._failed_at = 0.0
+        track_metric("catalog_snapshot_load", 1, {"result": "changed" if changed else "unchanged"})
+        track_metric("catalog_snapshot_load_ms", (time.monotonic() - started) * 1000)
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """Reload on next use (catalog changed)."""
+        self._stale = True
+        self._failed_at = 0.0
+
+    def get_stats(self) -> dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "products": len(snapshot) if snapshot else 0,
+            "age_seconds": time.monotonic() - self._refreshed_at if snapshot else None,
+            "stale": self._stale,
+            "loads": self.loads,
+            "changes": self.changes,
+            "failures": self.failures,
+        }
@@ -0,0 +1,164 @@
+"""
+Product Name Index
+==================
+
+Precompiled lookup structures for ``normalize_product_name``.
+
+Built once from ``canonical_names.json`` (alias -> canonical name):
+
+- exact dict lookup,
+- a word trie for the longest leading-word match ("лагуна рожевий" -> "лагуна"),
+- an Aho-Corasick automaton for aliases contained anywhere in the input,
+- a prefix trie over every word start of every alias, for inputs that are a
+  partial alias ("тренч ек" -> "тренч екошкіра").
+
+Each stage returns a deterministic result: the longest alias wins, ties go to
+the alias listed first in ``canonical_names.json``.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class _AhoNode:
+    __slots__ = ("best", "children", "fail")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _AhoNode] = {}
+        self.fail: _AhoNode | None = None
+        # (length, -order, alias) of the best alias ending here (incl. via fail links)
+        self.best: tuple[int, int, str] | None = None
+
+
+class _TrieNode:
+    __slots__ = ("best", "children", "terminal")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        # (length, order, alias) of the shortest alias passing through this node
+        self.best: tuple[int, int, str] | None = None
+        self.terminal: str | None = None
+
+
+class ProductNameIndex:
+    """Immutable index over alias -> canonical name pairs."""
+
+    def __init__(self, aliases: Iterable[tuple[str, str]]) -> None:
+        self._canonical: dict[str, str] = {}
+        for alias, canonical in aliases:
+            key = alias.strip().lower()
+            if key and key not in self._canonical:
+                self._canonical[key] = canonical
+        order = {alias: i for i, alias in enumerate(self._canonical)}
+
+        self._words = _TrieNode()
+        self._prefixes = _TrieNode()
+        self._aho = _AhoNode()
+        for alias, i in order.items():
+            self._add_words(alias)
+            self._add_prefixes(alias, i)
+            self._add_aho(alias, i)
+        self._build_fail_links()
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def _add_words(self, alias: str) -> None:
+        node = self._words
+        for word in alias.split():
+            node = node.children.setdefault(word, _TrieNode())
+        node.terminal = alias
+
+    def _add_prefixes(self, alias: str, order: int) -> None:
+        candidate = (len(alias), order, alias)
+        starts = [0] + [i + 1 for i, ch in enumerate(alias) if ch == " "]
+        for start in starts:
+            node = self._prefixes
+            for ch in alias[start:]:
+                node = node.children.setdefault(ch, _TrieNode())
+                if node.best is None or candidate < node.best:
+                    node.best = candidate
+
+    def _add_aho(self, alias: str, order: int) -> None:
+        node = self._aho
+        for ch in alias:
+            node = node.children.setdefault(ch, _AhoNode())
+        node.best = (len(alias), -order, alias)
+
+    def _build_fail_links(self) -> None:
+        root = self._aho
+        queue: deque[_AhoNode] = deque()
+        for child in root.children.values():
+            child.fail = root
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in node.children.items():
+                fail = node.fail
+                while fail is not None and ch not in fail.children:
+                    fail = fail.fail
+                child.fail = fail.children[ch] if fail is not None else root
+                inherited = child.fail.best
+                if inherited is not None and (child.best is None or inherited > child.best):
+                    child.best = inherited
+                queue.append(child)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def exact(self, text: str) -> str | None:
+        return self._canonical.get(text)
+
+    def longest_word_prefix(self, text: str) -> str | None:
+        """Longest alias equal to the first N words of ``text``."""
+        node = self._words
+        found: str | None = None
+        for word in text.split():
+            node = node.children.get(word)
+            if node is None:
+                break
+            if node.terminal is not None:
+                found = node.terminal
+        return self._canonical[found] if found is not None else None
+
+    def longest_contained(self, text: str) -> str | None:
+        """Longest alias occurring as a substring of ``text``."""
+        root = self._aho
+        node = root
+        best: tuple[int, int, str] | None = None
+        for ch in text:
+            while node is not root and ch not in node.children:
+                node = node.fail  # type: ignore[assignment]
+            node = node.children.get(ch, root)
+            if node.best is not None and (best is None or node.best > best):
+                best = node.best
+        return self._canonical[best[2]] if best is not None else None
+
+    def partial(self, text: str) -> str | None:
+        """Shortest alias that contains ``text`` starting at a word boundary."""
+        node = self._prefixes
+        for ch in text:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return self._canonical[node.best[2]] if node.best is not None else None
+
+    def normalize(self, text: str) -> str | None:
+        """Resolve lower-cased, stripped ``text`` to a canonical name."""
+        return (
+            self.exact(text)
+            or self.longest_word_prefix(text)
+            or self.longest_contained(text)
+            or self.partial(text)
+        )
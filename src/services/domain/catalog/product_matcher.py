@@ -8,10 +8,12 @@ Normalizes product names from LLM to canonical catalog names.
 import json
 import logging
 import re
+import threading
 from functools import lru_cache
 from pathlib import Path
 
-from src.core.prompt_registry import get_snippet_by_header
+from src.core.prompt_registry import get_snippet_bubbles
+from src.services.domain.catalog.name_index import ProductNameIndex
 
 
 logger = logging.getLogger(__name__)
@@ -43,6 +45,29 @@ def _get_valid_product_names() -> set:
         return set()
 
 
+_name_index: ProductNameIndex | None = None
+_name_index_lock = threading.Lock()
+
+
+def _build_name_index() -> ProductNameIndex:
+    aliases = list(_load_canonical_names().items())
+    # Canonical names resolve to themselves (after the explicit aliases).
+    aliases.extend((name, name) for name in sorted(_get_valid_product_names()))
+    return ProductNameIndex(aliases)
+
+
+def _get_name_index() -> ProductNameIndex:
+    """Index built once from canonical_names.json (lock only on first build)."""
+    global _name_index
+    index = _name_index
+    if index is not None:
+        return index
+    with _name_index_lock:
+        if _name_index is None:
+            _name_index = _build_name_index()
+        return _name_index
+
+
 def normalize_product_name(raw_name: str) -> str | None:
     """Normalize product name from LLM to canonical name."""
     if not raw_name:
@@ -52,24 +77,9 @@ def normalize_product_name(raw_name: str) -> str | None:
     if not normalized:
         return None
 
-    canonical_map = _load_canonical_names()
-    if normalized in canonical_map:
-        return canonical_map[normalized]
-
-    words = normalized.split()
-    for i in range(len(words), 0, -1):
-        partial = " ".join(words[:i])
-        if partial in canonical_map:
-            return canonical_map[partial]
-
-    for key, value in canonical_map.items():
-        if key in normalized or normalized in key:
-            return value
-
-    valid_names = _get_valid_product_names()
-    for valid_name in valid_names:
-        if valid_name.lower() in normalized or normalized in valid_name.lower():
-            return valid_name
+    canonical = _get_name_index().normalize(normalized)
+    if canonical is not None:
+        return canonical
 
     logger.warning(f"Could not normalize product name: {raw_name}")
     return None
@@ -77,7 +87,7 @@ def normalize_product_name(raw_name: str) -> str | None:
 
 def _get_color_patterns() -> list[tuple[str, str]]:
     """Get color patterns from registry."""
-    lines = get_snippet_by_header("COLOR_KEYS_MAPPING")
+    lines = get_snippet_bubbles("COLOR_KEYS_MAPPING")
     patterns = []
     if not lines:
         return []
@@ -159,7 +169,12 @@ def parse_product_response(raw_name: str) -> dict:
 
 
 def reload_canonical_names():
-    """Force reload canonical names (clears cache)."""
+    """Force reload canonical names and rebuild the name index."""
+    global _name_index
     _load_canonical_names.cache_clear()
     _get_valid_product_names.cache_clear()
-    logger.info("Canonical names cache cleared")
+    index = _build_name_index()
+    # Single reference swap: concurrent lookups see either the old or the new index.
+    with _name_index_lock:
+        _name_index = index
+    logger.info("Canonical names reloaded (%d aliases indexed)", len(index))
@@ -0,0 +1,224 @@
+"""
+Write-behind batching for memory access timestamps.
+===================================================
+``load_memory_context`` used to issue one UPDATE per retrieved fact plus one
+for the profile on every agent turn. Touches are now only recorded in memory
+and flushed as bulk ``in_()`` updates:
+
+- every ``MEMORY_TOUCH_FLUSH_INTERVAL_SECONDS`` (timer), or
+- as soon as ``MEMORY_TOUCH_MAX_BATCH`` ids are pending (size threshold), or
+- on shutdown (``shutdown_access_batchers``, also registered with atexit).
+
+Touches that arrive after shutdown are dropped and counted (``dropped``)
+rather than written inline on the caller's thread, which may be an event loop.
+
+The flusher is a daemon thread rather than an asyncio task so it works the same
+under FastAPI and under Celery workers (which run a fresh event loop per task).
+Timestamps are best-effort: a flushed id gets the flush time, at most one
+interval after the real access.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from src.conf.config import settings
+
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+logger = logging.getLogger(__name__)
+
+# Keep the IN (...) list well below PostgREST URL length limits.
+_CHUNK_SIZE = 200
+
+
+class AccessTimeBatcher:
+    """Accumulates touched fact/profile ids and bulk-updates them."""
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        facts_table: str,
+        profiles_table: str,
+        flush_interval: float | None = None,
+        max_batch: int | None = None,
+    ) -> None:
+        self._client = client
+        self._facts_table = facts_table
+        self._profiles_table = profiles_table
+        self._flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else settings.MEMORY_TOUCH_FLUSH_INTERVAL_SECONDS
+        )
+        self._max_batch = max_batch if max_batch is not None else settings.MEMORY_TOUCH_MAX_BATCH
+        self._fact_ids: set[str] = set()
+        self._user_ids: set[str] = set()
+        self._lock = threading.Lock()
+        # Serialises flushes (timer vs. shutdown) so an id is never written twice concurrently.
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.flushes = 0
+        self.writes = 0
+        self.dropped = 0
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def touch_facts(self, fact_ids: list[str]) -> None:
+        with self._lock:
+            if self._stopped.is_set():
+                self.dropped += len(fact_ids)
+                return
+            self._fact_ids.update(str(fid) for fid in fact_ids)
+            pending = len(self._fact_ids) + len(self._user_ids)
+        self._after_touch(pending)
+
+    def touch_profile(self, user_id: str) -> None:
+        with self._lock:
+            if self._stopped.is_set():
+                self.dropped += 1
+                return
+            self._user_ids.add(user_id)
+            pending = len(self._fact_ids) + len(self._user_ids)
+        self._after_touch(pending)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._fact_ids) + len(self._user_ids)
+
+    def _after_touch(self, pending: int) -> None:
+        self._ensure_thread()
+        if pending >= self._max_batch:
+            self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="memory-touch-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:  # keep the flusher alive
+                logger.warning("[MEMORY:TOUCH] Flush loop error: %s", e)
+
+    def flush(self) -> int:
+        """Write all pending touches now. Returns the number of ids written."""
+        with self._flush_lock:
+            with self._lock:
+                fact_ids, self._fact_ids = sorted(self._fact_ids), set()
+                user_ids, self._user_ids = sorted(self._user_ids), set()
+            if not fact_ids and not user_ids:
+                return 0
+
+            now = datetime.now(UTC).isoformat()
+            written = self._bulk_update(
+                self._facts_table, "id", fact_ids, {"last_accessed_at": now}
+            ) + self._bulk_update(
+                self._profiles_table, "user_id", user_ids, {"last_seen_at": now}
+            )
+            self.flushes += 1
+            self.writes += written
+            logger.debug(
+                "[MEMORY:TOUCH] Flushed %d facts, %d profiles", len(fact_ids), len(user_ids)
+            )
+            return written
+
+    def _bulk_update(
+        self, table: str, column: str, ids: list[str], values: dict[str, Any]
+    ) -> int:
+        written = 0
+        for start in range(0, len(ids), _CHUNK_SIZE):
+            chunk = ids[start : start + _CHUNK_SIZE]
+            try:
+                self._client.table(table).update(values).in_(column, chunk).execute()
+                written += len(chunk)
+            except Exception as e:
+                # Access times are advisory; dropping a batch is preferable to retry storms.
+                logger.warning(
+                    "[MEMORY:TOUCH] Bulk update of %s failed (%d ids dropped): %s",
+                    table,
+                    len(chunk),
+                    e,
+                )
+        return written
+
+    def close(self) -> None:
+        """Stop the flusher thread and write whatever is still pending."""
+        with self._lock:
+            self._stopped.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(self._flush_interval, 1.0) + 5.0)
+        self.flush()
+
+
+# =============================================================================
+# REGISTRY (one batcher per Supabase client)
+# =============================================================================
+
+_batchers: dict[int, AccessTimeBatcher] = {}
+_registry_lock = threading.Lock()
+_atexit_registered = False
+
+
+def get_access_batcher(
+    client: Client, *, facts_table: str, profiles_table: str
+) -> AccessTimeBatcher:
+    """Shared batcher for ``client`` (MemoryService is instantiated per call site)."""
+    global _atexit_registered
+    key = id(client)
+    batcher = _batchers.get(key)
+    if batcher is not None and batcher._client is client:
+        return batcher
+    with _registry_lock:
+        batcher = _batchers.get(key)
+        if batcher is None or batcher._client is not client:
+            batcher = AccessTimeBatcher(
+                client, facts_table=facts_table, profiles_table=profiles_table
+            )
+            _batchers[key] = batcher
+        if not _atexit_registered:
+            atexit.register(shutdown_access_batchers)
+            _atexit_registered = True
+    return batcher
+
+
+def shutdown_access_batchers() -> None:
+    """Flush and stop every batcher (FastAPI lifespan / process exit)."""
+    with _registry_lock:
+        batchers = list(_batchers.values())
+        _batchers.clear()
+    for batcher in batchers:
+        try:
+            batcher.close()
+        except Exception as e:
+            logger.warning("[MEMORY:TOUCH] Shutdown flush failed: %s", e)
+    if batchers:
+        logger.info("[MEMORY:TOUCH] Flushed %d access batchers on shutdown", len(batchers))
@@ -0,0 +1,149 @@
+"""
+Per-user MemoryContext cache.
+=============================
+A conversation burst (several messages within seconds) loads the same memory
+context each turn. ``MemoryService.load_memory_context`` keeps the assembled
+context here for ``MEMORY_CONTEXT_CACHE_TTL_SECONDS``.
+
+Invalidation is per user via a generation counter: writes
+(``store_fact``, ``update_profile``, ``save_summary``, ``apply_decision``)
+bump the user's generation, so both cached entries and loads that were
+already in flight under the old generation become unreachable.
+
+Generations come from one process-wide counter and are kept for the most
+recently invalidated users only. Users without a kept generation share a
+floor (the highest generation dropped so far), so forgetting a user can
+only make their entries unreachable, never bring back stale ones.
+
+The cache is per process; writes made in another process (e.g. a Celery
+memory task) are picked up when the short TTL expires.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Any
+
+from src.conf.config import settings
+from src.services.core.observability import track_metric
+from src.services.data.catalog_cache import CacheStats, L1Cache
+
+
+if TYPE_CHECKING:
+    from src.services.domain.memory.memory_models import MemoryContext
+
+
+# Latency samples kept for percentile gauges, and how often they are emitted.
+_LATENCY_WINDOW = 256
+_REPORT_EVERY = 20
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+class MemoryContextCache:
+    """Short-TTL per-user cache of assembled ``MemoryContext`` objects."""
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self.stats = CacheStats()
+        self._entries = L1Cache(max_entries=max_entries, stats=self.stats)
+        self._ttl = ttl_seconds
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._max_generations = max_entries
+        self._counter = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+        self._load_ms: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._lookups = 0
+
+    def _key(self, user_id: str, variant: str) -> str:
+        return f"{user_id}:{self.generation(user_id)}:{variant}"
+
+    def generation(self, user_id: str) -> int:
+        with self._lock:
+            return self._generations.get(user_id, self._floor)
+
+    def get(self, user_id: str, variant: str) -> MemoryContext | None:
+        if self._ttl <= 0:
+            return None
+        entry = self._entries.get(self._key(user_id, variant))
+        with self._lock:
+            self._lookups += 1
+            if entry is not None:
+                self.stats.l1_hits += 1
+            else:
+                self.stats.misses += 1
+        track_metric("memory_context_cache_lookup", 1, {"result": "hit" if entry else "miss"})
+        self._maybe_report()
+        return entry.value.model_copy(deep=True) if entry is not None else None
+
+    def set(self, user_id: str, variant: str, context: MemoryContext, *, generation: int) -> None:
+        """Store ``context`` unless the user was invalidated since ``generation``."""
+        if self._ttl <= 0 or generation != self.generation(user_id):
+            return
+        self._entries.set(
+            self._key(user_id, variant), context.model_copy(deep=True), ttl_seconds=self._ttl
+        )
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._counter += 1
+            self._generations[user_id] = self._counter
+            self._generations.move_to_end(user_id)
+            while len(self._generations) > self._max_generations:
+                _, dropped = self._generations.popitem(last=False)
+                self._floor = max(self._floor, dropped)
+            self.stats.invalidations += 1
+
+    def record_load(self, elapsed_ms: float) -> None:
+        track_metric("memory_context_fetch_ms", elapsed_ms)
+        with self._lock:
+            self._load_ms.append(elapsed_ms)
+
+    def _maybe_report(self) -> None:
+        if self._lookups % _REPORT_EVERY:
+            return
+        stats = self.get_stats()
+        track_metric("memory_context_cache_hit_ratio", stats["hit_ratio"])
+        for pct in ("p50", "p95", "p99"):
+            track_metric(f"memory_context_fetch_{pct}_ms", stats[f"fetch_{pct}_ms"])
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._load_ms)
+            hits, misses = self.stats.l1_hits, self.stats.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "invalidations": self.stats.invalidations,
+            "size": len(self._entries),
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "fetch_p50_ms": _percentile(samples, 50),
+            "fetch_p95_ms": _percentile(samples, 95),
+            "fetch_p99_ms": _percentile(samples, 99),
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        with self._lock:
+            self._generations.clear()
+
+
+_context_cache: MemoryContextCache | None = None
+
+
+def get_memory_context_cache() -> MemoryContextCache:
+    """Process-wide cache (MemoryService itself is instantiated per call site)."""
+    global _context_cache
+    if _context_cache is None:
+        _context_cache = MemoryContextCache(
+            max_entries=settings.MEMORY_CONTEXT_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.MEMORY_CONTEXT_CACHE_TTL_SECONDS,
+        )
+    return _context_cache
@@ -12,17 +12,27 @@ from typing import Any
 import yaml
 
 from src.core.prompt_registry import registry
+from src.core.registry_keys import SystemKeys
 
 logger = logging.getLogger(__name__)
 
 
-def _load_memory_parser_config() -> dict[str, Any]:
+def memory_parser_source() -> str:
+    """Raw registry content of the memory parser config ("" if missing).
+
+    The registry caches loaded prompts, so the same string object is returned
+    until the prompt is invalidated; callers can use it as a version key.
+    """
     try:
-        content = registry.get("system.memory_parser").content
+        return registry.get(SystemKeys.MEMORY_PARSER.value).content
     except Exception as exc:
         logger.warning("Memory parser config not found: %s", exc)
-        return {}
+        return ""
+
 
+def parse_memory_parser_config(content: str) -> dict[str, Any]:
+    if not content:
+        return {}
     try:
         data = yaml.safe_load(content) or {}
     except Exception as exc:
@@ -32,6 +42,10 @@ def _load_memory_parser_config() -> dict[str, Any]:
     return data if isinstance(data, dict) else {}
 
 
+def _load_memory_parser_config() -> dict[str, Any]:
+    return parse_memory_parser_config(memory_parser_source())
+
+
 def get_memory_parser_section(name: str) -> dict[str, Any]:
     data = _load_memory_parser_config()
     section = data.get(name, {})
@@ -6,12 +6,17 @@ Key logic: gating, semantic search, JSONB merges.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from src.core.logging import log_with_root_cause
+from src.services.domain.memory.access_batcher import AccessTimeBatcher, get_access_batcher
+from src.services.domain.memory.context_cache import get_memory_context_cache
 from src.services.infra.supabase_client import get_supabase_client
+from src.services.infra.supabase_executor import execute_async
 
 
 if TYPE_CHECKING:
@@ -132,12 +137,11 @@ class MemoryService:
             return None
 
         try:
-            response = (
+            response = await execute_async(
                 self.client.table(TABLE_PROFILES)
                 .select("*")
                 .eq("user_id", user_id)
                 .single()
-                .execute()
             )
 
             if not response.data:
@@ -202,7 +206,7 @@ class MemoryService:
                 "last_seen_at": now,
             }
 
-            response = self.client.table(TABLE_PROFILES).insert(data).execute()
+            response = await execute_async(self.client.table(TABLE_PROFILES).insert(data))
 
             if response.data:
                 logger.info("Created profile for user %s", user_id)
@@ -279,9 +283,10 @@ class MemoryService:
                 updates["commerce"] = merged
 
             # Apply update
-            response = (
-                self.client.table(TABLE_PROFILES).update(updates).eq("user_id", user_id).execute()
+            response = await execute_async(
+                self.client.table(TABLE_PROFILES).update(updates).eq("user_id", user_id)
             )
+            get_memory_context_cache().invalidate(user_id)
 
             if response.data:
                 logger.info("Updated profile for user %s", user_id)
@@ -293,17 +298,18 @@ class MemoryService:
             logger.error("Failed to update profile for user %s: %s", user_id, e)
             return None
 
+    def _access_batcher(self) -> AccessTimeBatcher:
+        return get_access_batcher(
+            self.client, facts_table=TABLE_MEMORIES, profiles_table=TABLE_PROFILES
+        )
+
     async def touch_profile(self, user_id: str) -> None:
         """ last_seen_at  ."""
         if not self._enabled:
             return
 
-        try:
-            self.client.table(TABLE_PROFILES).update(
-                {"last_seen_at": datetime.now(UTC).isoformat()}
-            ).eq("user_id", user_id).execute()
-        except Exception as e:
-            logger.warning("Failed to touch profile for user %s: %s", user_id, e)
+        # Write-behind: flushed in bulk by AccessTimeBatcher
+        self._access_batcher().touch_profile(user_id)
 
     def _row_to_profile(self, row: dict) -> UserProfile:
         """Convert DB row to UserProfile.
@@ -397,7 +403,8 @@ class MemoryService:
             if embedding:
                 data["embedding"] = embedding
 
-            response = self.client.table(TABLE_MEMORIES).insert(data).execute()
+            response = await execute_async(self.client.table(TABLE_MEMORIES).insert(data))
+            get_memory_context_cache().invalidate(user_id)
 
             if response.data:
                 logger.info(
@@ -447,21 +454,18 @@ class MemoryService:
                 data["embedding"] = embedding
 
             # Increment version
-            data["version"] = (
+            current_version = await execute_async(
                 self.client.table(TABLE_MEMORIES)
                 .select("version")
                 .eq("id", str(update.fact_id))
                 .single()
-                .execute()
-                .data.get("version", 0)
-                + 1
             )
+            data["version"] = current_version.data.get("version", 0) + 1
 
-            response = (
+            response = await execute_async(
                 self.client.table(TABLE_MEMORIES)
                 .update(data)
                 .eq("id", str(update.fact_id))
-                .execute()
             )
 
             if response.data:
@@ -510,7 +514,7 @@ class MemoryService:
             if categories:
                 query = query.in_("category", categories)
 
-            response = query.execute()
+            response = await execute_async(query)
 
             if response.data:
                 # Update last_accessed_at for retrieved facts
@@ -559,7 +563,7 @@ class MemoryService:
                 "p_categories": categories,
             }
 
-            response = self.client.rpc("search_memories", params).execute()
+            response = await execute_async(self.client.rpc("search_memories", params))
 
             if response.data:
                 results = []
@@ -589,12 +593,16 @@ class MemoryService:
             return False
 
         try:
-            self.client.table(TABLE_MEMORIES).update(
-                {
-                    "is_active": False,
-                    "updated_at": datetime.now(UTC).isoformat(),
-                }
-            ).eq("id", str(fact_id)).execute()
+            await execute_async(
+                self.client.table(TABLE_MEMORIES)
+                .update(
+                    {
+                        "is_active": False,
+                        "updated_at": datetime.now(UTC).isoformat(),
+                    }
+                )
+                .eq("id", str(fact_id))
+            )
 
             logger.info("Deactivated fact %s: %s", fact_id, reason)
             return True
@@ -608,14 +616,8 @@ class MemoryService:
         if not self._enabled or not fact_ids:
             return
 
-        try:
-            now = datetime.now(UTC).isoformat()
-            for fact_id in fact_ids:
-                self.client.table(TABLE_MEMORIES).update({"last_accessed_at": now}).eq(
-                    "id", fact_id
-                ).execute()
-        except Exception as e:
-            logger.warning("Failed to touch facts: %s", e)
+        # Write-behind: one bulk in_() update per flush instead of one per fact
+        self._access_batcher().touch_facts(fact_ids)
 
     def _row_to_fact(self, row: dict) -> Fact:
         """Convert DB row to Fact."""
@@ -645,14 +647,13 @@ class MemoryService:
             return None
 
         try:
-            response = (
+            response = await execute_async(
                 self.client.table(TABLE_SUMMARIES)
                 .select("*")
                 .eq("user_id", user_id)
                 .eq("summary_type", "user")
                 .eq("is_current", True)
                 .single()
-                .execute()
             )
 
             if response.data:
@@ -689,12 +690,17 @@ class MemoryService:
 
         try:
             # Deactivate old summaries
-            self.client.table(TABLE_SUMMARIES).update(
-                {
-                    "is_current": False,
-                    "updated_at": datetime.now(UTC).isoformat(),
-                }
-            ).eq("user_id", user_id).eq("summary_type", "user").execute()
+            await execute_async(
+                self.client.table(TABLE_SUMMARIES)
+                .update(
+                    {
+                        "is_current": False,
+                        "updated_at": datetime.now(UTC).isoformat(),
+                    }
+                )
+                .eq("user_id", user_id)
+                .eq("summary_type", "user")
+            )
 
             # Create new summary
             now = datetime.now(UTC).isoformat()
@@ -709,7 +715,8 @@ class MemoryService:
                 "is_current": True,
             }
 
-            response = self.client.table(TABLE_SUMMARIES).insert(data).execute()
+            response = await execute_async(self.client.table(TABLE_SUMMARIES).insert(data))
+            get_memory_context_cache().invalidate(user_id)
 
             if response.data:
                 logger.info("Saved summary for user %s", user_id)
@@ -744,32 +751,54 @@ class MemoryService:
     ) -> MemoryContext:
         """
         Load full memory context for an agent.
+
+        Profile, facts and summary are fetched concurrently. Without a query
+        embedding the result is served from the per-user context cache, so
+        follow-up messages in the same burst skip Supabase entirely.
         """
-        # Load profile
-        profile = await self.get_profile(user_id)
-        if profile is None and ensure_profile:
-            profile = await self.create_profile(user_id)
+        cache = get_memory_context_cache()
+        variant = f"{facts_limit}:{int(ensure_profile)}"
+        use_cache = query_embedding is None
 
-        # Load facts (semantic search if embedding provided)
-        facts: list[Fact] = []
-        if query_embedding:
-            search_results = await self.search_facts(user_id, query_embedding, limit=facts_limit)
-            facts = [f for f, _ in search_results]
-        else:
-            facts = await self.get_facts(user_id, limit=facts_limit)
+        if use_cache:
+            cached = cache.get(user_id, variant)
+            if cached is not None:
+                if cached.profile:
+                    await self.touch_profile(user_id)
+                return cached
 
-        # Load summary
-        summary = await self.get_user_summary(user_id)
+        generation = cache.generation(user_id)
+        start = time.perf_counter()
+
+        # Load facts (semantic search if embedding provided)
+        async def _load_facts() -> list[Fact]:
+            if query_embedding:
+                search_results = await self.search_facts(user_id, query_embedding, limit=facts_limit)
+                return [f for f, _ in search_results]
+            return await self.get_facts(user_id, limit=facts_limit)
+
+        # Independent reads: run concurrently
+        profile, facts, summary = await asyncio.gather(
+            self.get_profile(user_id),
+            _load_facts(),
+            self.get_user_summary(user_id),
+        )
+        if profile is None and ensure_profile:
+            profile = await self.create_profile(user_id)
 
         # Touch profile (update last_seen_at)
         if profile:
             await self.touch_profile(user_id)
 
-        return self.models["MemoryContext"](
+        context = self.models["MemoryContext"](
             profile=profile,
             facts=facts,
             summary=summary,
         )
+        cache.record_load((time.perf_counter() - start) * 1000)
+        if use_cache:
+            cache.set(user_id, variant, context, generation=generation)
+        return context
 
     # =========================================================================
     # APPLY MEMORY DECISION
@@ -828,6 +857,9 @@ class MemoryService:
                 commerce=decision.profile_updates.get("commerce"),
             )
 
+        # update_fact/deactivate_fact only know fact ids - drop the user's context here
+        get_memory_context_cache().invalidate(user_id)
+
         logger.info(
             "Applied memory decision for user %s: stored=%d, updated=%d, deleted=%d, rejected=%d",
             user_id,
@@ -854,7 +886,7 @@ class MemoryService:
             return 0
 
         try:
-            response = self.client.rpc("apply_memory_decay").execute()
+            response = await execute_async(self.client.rpc("apply_memory_decay"))
             affected = response.data if isinstance(response.data, int) else 0
             logger.info("Applied time decay to %d memories", affected)
             return affected
@@ -875,12 +907,11 @@ class MemoryService:
         try:
             now = datetime.now(UTC).isoformat()
 
-            response = (
+            response = await execute_async(
                 self.client.table(TABLE_MEMORIES)
                 .update({"is_active": False})
                 .lt("expires_at", now)
                 .eq("is_active", True)
-                .execute()
             )
 
             count = len(response.data) if response.data else 0
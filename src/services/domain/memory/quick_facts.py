@@ -0,0 +1,240 @@
+"""
+Compiled quick-fact extractor.
+==============================
+``extract_quick_facts`` runs on the last user messages of every turn. The
+memory parser config (height/age regexes, gender words, city variations,
+templates and labels) is compiled once into a ``QuickFactExtractor`` and
+rebuilt only when the registry hands out a different config text.
+
+Height and age keep their per-pattern order: the first pattern whose leftmost
+match is in range wins. Gender words and city variations are folded into one
+overlapping alternation, so a single scan of the message finds every literal.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from src.services.domain.memory.memory_config import (
+    memory_parser_source,
+    parse_memory_parser_config,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+logger = logging.getLogger(__name__)
+
+
+HEIGHT_RANGE = (70, 180)
+AGE_RANGE = (0, 18)
+
+_NO_CITY = -1
+
+
+@dataclass(frozen=True, slots=True)
+class _LiteralHit:
+    """Facts implied by a literal (and every shorter literal it starts with)."""
+
+    girl: bool = False
+    boy: bool = False
+    city: int = _NO_CITY  # lowest index into the cities list
+
+
+def _compile_numeric(kind: str, patterns: Any) -> tuple[re.Pattern[str], ...]:
+    compiled: list[re.Pattern[str]] = []
+    for pattern in patterns if isinstance(patterns, list) else []:
+        try:
+            rx = re.compile(pattern)
+        except (re.error, TypeError) as exc:
+            logger.warning("[MEMORY:QUICK] Skipping invalid %s pattern %r: %s", kind, pattern, exc)
+            continue
+        if rx.groups < 1:
+            logger.warning("[MEMORY:QUICK] Skipping %s pattern without a group: %r", kind, pattern)
+            continue
+        compiled.append(rx)
+    return tuple(compiled)
+
+
+def _words(values: Any) -> list[str]:
+    return [v for v in values if isinstance(v, str) and v] if isinstance(values, list) else []
+
+
+def _config_text(config: Mapping[str, Any], section: str, key: str, default: str) -> str:
+    values = config.get(section)
+    value = values.get(key) if isinstance(values, dict) else None
+    return value if isinstance(value, str) and value else default
+
+
+class QuickFactExtractor:
+    """Regex/keyword fact extraction compiled from one memory parser config."""
+
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        patterns = config.get("patterns")
+        patterns = patterns if isinstance(patterns, dict) else {}
+
+        self._height = _compile_numeric("height", patterns.get("height", []))
+        self._age = _compile_numeric("age", patterns.get("age", []))
+
+        self._height_template = _config_text(config, "templates", "height", "Child height: {height} cm")
+        self._age_template = _config_text(config, "templates", "age", "Child age: {age}")
+        self._girl_template = _config_text(config, "templates", "gender_girl", "Gender: girl")
+        self._boy_template = _config_text(config, "templates", "gender_boy", "Gender: boy")
+        self._city_template = _config_text(config, "templates", "city", "City: {city}")
+        self._girl_value = _config_text(config, "labels", "gender_girl", "girl")
+        self._boy_value = _config_text(config, "labels", "gender_boy", "boy")
+
+        gender = patterns.get("gender")
+        gender = gender if isinstance(gender, dict) else {}
+        direct: dict[str, _LiteralHit] = {}
+
+        def _add(word: str, **hit: Any) -> None:
+            prev = direct.get(word, _LiteralHit())
+            direct[word] = _merge(prev, _LiteralHit(**hit))
+
+        for word in _words(gender.get("girl", [])):
+            _add(word, girl=True)
+        for word in _words(gender.get("boy", [])):
+            _add(word, boy=True)
+
+        self._cities: list[str] = []
+        for item in patterns.get("cities", []) or []:
+            if not isinstance(item, dict):
+                continue
+            canonical = item.get("canonical")
+            variations = item.get("variations", [])
+            if not isinstance(canonical, str) or not isinstance(variations, list):
+                continue
+            index = len(self._cities)
+            self._cities.append(canonical)
+            for var in _words(variations):
+                _add(var, city=index)
+
+        # Longest first: at each position the regex reports the longest
+        # literal, and every other literal matching there is a prefix of it.
+        literals = sorted(direct, key=len, reverse=True)
+        self._literal_hits: dict[str, _LiteralHit] = {}
+        for literal in literals:
+            hit = _LiteralHit()
+            for other in literals:
+                if literal.startswith(other):
+                    hit = _merge(hit, direct[other])
+            self._literal_hits[literal] = hit
+        self._literals = (
+            re.compile("(?=(" + "|".join(map(re.escape, literals)) + "))") if literals else None
+        )
+
+    def extract(self, message: str) -> list[dict[str, Any]]:
+        msg_lower = message.lower()
+        facts: list[dict[str, Any]] = []
+
+        height = _first_in_range(self._height, msg_lower, HEIGHT_RANGE)
+        if height is not None:
+            facts.append(
+                {
+                    "content": self._height_template.format(height=height),
+                    "fact_type": "child_info",
+                    "category": "child",
+                    "extracted_value": height,
+                    "field": "height_cm",
+                }
+            )
+
+        age = _first_in_range(self._age, msg_lower, AGE_RANGE)
+        if age is not None:
+            facts.append(
+                {
+                    "content": self._age_template.format(age=age),
+                    "fact_type": "child_info",
+                    "category": "child",
+                    "extracted_value": age,
+                    "field": "age",
+                }
+            )
+
+        found = _LiteralHit()
+        if self._literals is not None:
+            for match in self._literals.finditer(msg_lower):
+                found = _merge(found, self._literal_hits[match.group(1)])
+
+        if found.girl:
+            facts.append(
+                {
+                    "content": self._girl_template,
+                    "fact_type": "child_info",
+                    "category": "child",
+                    "extracted_value": self._girl_value,
+                    "field": "gender",
+                }
+            )
+        elif found.boy:
+            facts.append(
+                {
+                    "content": self._boy_template,
+                    "fact_type": "child_info",
+                    "category": "child",
+                    "extracted_value": self._boy_value,
+                    "field": "gender",
+                }
+            )
+
+        if found.city != _NO_CITY:
+            canonical = self._cities[found.city]
+            facts.append(
+                {
+                    "content": self._city_template.format(city=canonical),
+                    "fact_type": "logistics",
+                    "category": "delivery",
+                    "extracted_value": canonical,
+                    "field": "city",
+                }
+            )
+
+        return facts
+
+
+def _merge(a: _LiteralHit, b: _LiteralHit) -> _LiteralHit:
+    if a.city == _NO_CITY:
+        city = b.city
+    elif b.city == _NO_CITY:
+        city = a.city
+    else:
+        city = min(a.city, b.city)
+    return _LiteralHit(girl=a.girl or b.girl, boy=a.boy or b.boy, city=city)
+
+
+def _first_in_range(patterns: tuple[re.Pattern[str], ...], text: str, bounds: tuple[int, int]) -> int | None:
+    """Value of the first pattern whose leftmost match is within ``bounds``."""
+    low, high = bounds
+    for rx in patterns:
+        match = rx.search(text)
+        if match:
+            value = int(match.group(1))
+            if low <= value <= high:
+                return value
+    return None
+
+
+_extractor: tuple[str, QuickFactExtractor] | None = None
+_extractor_lock = threading.Lock()
+
+
+def get_quick_fact_extractor() -> QuickFactExtractor:
+    """Extractor for the current memory parser config (rebuilt when it changes)."""
+    global _extractor
+    source = memory_parser_source()
+    cached = _extractor
+    if cached is not None and (cached[0] is source or cached[0] == source):
+        return cached[1]
+    with _extractor_lock:
+        cached = _extractor
+        if cached is None or cached[0] != source:
+            cached = (source, QuickFactExtractor(parse_memory_parser_config(source)))
+            _extractor = cached
+        return cached[1]
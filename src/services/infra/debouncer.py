@@ -6,9 +6,13 @@ from collections.abc import Callable, Coroutine
 from dataclasses import dataclass, field
 from typing import Any
 
+from src.services.infra.redis_pool import get_redis_client, redis_namespace
+
 
 logger = logging.getLogger(__name__)
 
+_KEYS = redis_namespace("debouncer")
+
 
 @dataclass
 class BufferedMessage:
@@ -235,23 +239,14 @@ class RedisDebouncer:
         self._initialize_redis()
 
     def _initialize_redis(self):
-        """Initialize Redis client if available."""
+        """Attach to the shared Redis pool if available."""
         try:
-            import os
-
-            import redis
-
-            from src.conf.config import settings
-
-            redis_url = os.getenv("REDIS_URL") or settings.REDIS_URL
-            if not redis_url:
-                logger.debug("[REDIS_DEBOUNCER] Redis URL not configured, using fallback")
+            self._redis_client = get_redis_client()
+            if self._redis_client is None:
+                logger.debug("[REDIS_DEBOUNCER] Redis not available, using fallback")
                 self._fallback_debouncer = MessageDebouncer(delay=self.delay)
                 return
 
-            self._redis_client = redis.from_url(redis_url, decode_responses=True)
-            # Test connection
-            self._redis_client.ping()
             self._redis_available = True
             logger.info("[REDIS_DEBOUNCER] Redis connected, using distributed debouncing")
         except Exception as e:
@@ -263,7 +258,7 @@ class RedisDebouncer:
 
     def _get_redis_key(self, session_id: str, key_type: str) -> str:
         """Generate Redis key for session data."""
-        return f"debouncer:{key_type}:{session_id}"
+        return _KEYS.key(key_type, session_id)
 
     def _serialize_message(self, message: BufferedMessage) -> str:
         """Serialize BufferedMessage to JSON string."""
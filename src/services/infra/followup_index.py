@@ -0,0 +1,143 @@
+"""Last-activity index for follow-up scheduling.
+
+``agent_sessions`` keeps two columns per session (see
+``src/db/migrations/20261016_followup_due_index.sql``):
+
+- ``last_activity_at``: ``created_at`` of the newest message;
+- ``followups_sent``: follow-up messages appended so far.
+
+They are updated as messages are appended, so the periodic follow-up check
+asks for due sessions directly instead of scanning the messages table.
+Appends only update existing session rows (the row is created with the
+session state) and never move ``last_activity_at`` backward.
+The schedule itself (``FOLLOWUP_DELAYS_HOURS``) stays in settings and is
+applied at query time, so changing it needs no backfill: a session is due
+when ``last_activity_at <= now - schedule[followups_sent]``.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from src.core.constants import DBTable, MessageTag
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_COLUMNS = "session_id, last_activity_at, followups_sent"
+
+
+@dataclass(frozen=True)
+class DueSession:
+    session_id: str
+    last_activity_at: datetime
+    followups_sent: int
+
+
+def due_filter(now: datetime, schedule_hours: Iterable[float]) -> str:
+    """PostgREST ``or`` filter matching sessions whose next follow-up is due."""
+    clauses = [
+        f"and(followups_sent.eq.{sent},last_activity_at.lte.{(now - timedelta(hours=hours)).isoformat()})"
+        for sent, hours in enumerate(schedule_hours)
+    ]
+    return ",".join(clauses)
+
+
+def record_activity(
+    client: Any,
+    session_id: str,
+    created_at: datetime,
+    tags: Iterable[str] = (),
+    table: str = DBTable.SESSIONS,
+) -> None:
+    """Move the session's last activity forward after a message append.
+
+    Regular messages are a single conditional update (skipped when the stored
+    activity is newer). Follow-up messages also bump ``followups_sent``, which
+    needs the current value (follow-ups are rare).
+    """
+    activity_at = created_at.isoformat()
+    (
+        client.table(table)
+        .update({"last_activity_at": activity_at})
+        .eq("session_id", session_id)
+        .or_(f"last_activity_at.is.null,last_activity_at.lt.{activity_at}")
+        .execute()
+    )
+    if any(MessageTag.is_followup_tag(tag) for tag in tags):
+        response = (
+            client.table(table)
+            .select("followups_sent")
+            .eq("session_id", session_id)
+            .limit(1)
+            .execute()
+        )
+        rows = getattr(response, "data", None) or []
+        if rows:
+            sent = int(rows[0].get("followups_sent") or 0)
+            (
+                client.table(table)
+                .update({"followups_sent": sent + 1})
+                .eq("session_id", session_id)
+                .execute()
+            )
+
+
+def _after_filter(flt: str, last_activity_at: str, session_id: str) -> str:
+    """``flt`` restricted to rows after the keyset cursor ``(last_activity_at, session_id)``."""
+    return (
+        f'and(or({flt}),or(last_activity_at.gt."{last_activity_at}",'
+        f'and(last_activity_at.eq."{last_activity_at}",session_id.gt."{session_id}")))'
+    )
+
+
+def iter_due_sessions(
+    client: Any,
+    now: datetime,
+    schedule_hours: Iterable[float],
+    *,
+    page_size: int = 500,
+    table: str = DBTable.SESSIONS,
+) -> Iterator[DueSession]:
+    """Yield sessions whose next follow-up is due, oldest activity first, in pages.
+
+    Pages continue after the last row seen (keyset on ``last_activity_at,
+    session_id``), so sessions that stop being due while the caller works
+    through a page do not shift later ones out of the next page.
+    """
+    flt = due_filter(now, schedule_hours)
+    if not flt:
+        return
+    page_filter = flt
+    while True:
+        response = (
+            client.table(table)
+            .select(INDEX_COLUMNS)
+            .or_(page_filter)
+            .order("last_activity_at")
+            .order("session_id")
+            .limit(page_size)
+            .execute()
+        )
+        rows = getattr(response, "data", None) or []
+        for row in rows:
+            try:
+                last = datetime.fromisoformat(row["last_activity_at"])
+            except (KeyError, TypeError, ValueError):
+                logger.warning("[FOLLOWUP:INDEX] Bad last_activity_at for session %s", row.get("session_id"))
+                continue
+            yield DueSession(
+                session_id=row["session_id"],
+                last_activity_at=last,
+                followups_sent=int(row.get("followups_sent") or 0),
+            )
+        if len(rows) < page_size:
+            return
+        page_filter = _after_filter(flt, rows[-1]["last_activity_at"], rows[-1]["session_id"])
@@ -0,0 +1,376 @@
+"""Shared image fetching for vision with a content-addressed cache.
+
+Instagram/Facebook CDN images cannot be passed to the LLM by URL, so they
+are downloaded and inlined as data URLs. ``ImageFetchService``:
+
+- keeps one pooled ``httpx.AsyncClient`` per event loop;
+- streams downloads and aborts past ``IMAGE_FETCH_MAX_BYTES``;
+- identifies an image by the SHA-256 of its bytes and keeps recent images in
+  a byte-bounded LRU keyed by that hash, plus a ``url -> hash`` map, so a URL
+  seen again (or the same photo under a new URL) is not downloaded twice;
+- keeps the data URLs derived from an image (the original, downscaled
+  variants) with it and counts them against the same byte budget;
+- shares one download between concurrent requests for the same URL.
+
+The content hash lets callers deduplicate by photo rather than by URL
+(see ``vision_node``), which also skips the LLM call for a repeated photo.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+
+from src.conf.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Private CDN hosts that require image download to bypass access restrictions.
+PRIVATE_CDN_HOSTS: tuple[str, ...] = ("scontent", "fbcdn", "cdninstagram")
+
+_CDN_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,uk;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Referer": "https://www.instagram.com/",
+    "Sec-Ch-Ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"Windows"',
+    "Sec-Fetch-Dest": "image",
+    "Sec-Fetch-Mode": "no-cors",
+    "Sec-Fetch-Site": "cross-site",
+}
+
+
+_REPORT_EVERY = 50
+
+# ``FetchedImage.derived`` key of the data URL of the original bytes
+_ORIGINAL = "original"
+
+
+def is_private_cdn_url(url: str) -> bool:
+    try:
+        parsed = urlparse(url)
+        return any(host in parsed.netloc for host in PRIVATE_CDN_HOSTS)
+    except Exception:
+        return False
+
+
+def normalize_url(url: str) -> str:
+    return url.rstrip(";").strip()
+
+
+class ImageTooLargeError(Exception):
+    """Raised when a download exceeds the configured size cap."""
+
+
+def to_data_url(data: bytes, content_type: str) -> str:
+    """``data:`` URL for inlining ``data`` into an LLM request."""
+    return f"data:{content_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+class FetchedImage:
+    """Downloaded image bytes identified by the SHA-256 of the original bytes."""
+
+    def __init__(self, content_hash: str, content_type: str, data: bytes, source_size: int) -> None:
+        self.content_hash = content_hash
+        self.content_type = content_type
+        self.data = data
+        self.source_size = source_size
+        # Data URLs derived from the bytes (the original, downscaled variants);
+        # added through the cache so they count against its byte budget
+        self.derived: dict[Any, str] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def footprint(self) -> int:
+        """Bytes held for this image: the raw bytes plus every distinct derived data URL."""
+        # A variant that fell back to the original shares its string
+        unique = {id(value): value for value in self.derived.values()}
+        return len(self.data) + sum(len(value) for value in unique.values())
+
+
+class _ImageCache:
+    """LRU of images by content hash (bounded in bytes) plus a ``url -> hash`` map."""
+
+    def __init__(self, max_bytes: int, max_urls: int) -> None:
+        self._images: OrderedDict[str, FetchedImage] = OrderedDict()
+        self._urls: OrderedDict[str, str] = OrderedDict()
+        self._bytes = 0
+        self._max_bytes = max_bytes
+        self._max_urls = max_urls
+        self._lock = threading.Lock()
+
+    def by_url(self, url: str) -> FetchedImage | None:
+        with self._lock:
+            content_hash = self._urls.get(url)
+            if content_hash is None:
+                return None
+            image = self._images.get(content_hash)
+            if image is None:
+                del self._urls[url]
+                return None
+            self._urls.move_to_end(url)
+            self._images.move_to_end(content_hash)
+            return image
+
+    def put(self, url: str, image: FetchedImage) -> tuple[FetchedImage, bool]:
+        """Store ``image`` for ``url``; returns the cached image and whether its hash was known."""
+        with self._lock:
+            existing = self._images.get(image.content_hash)
+            if existing is not None:
+                self._images.move_to_end(image.content_hash)
+                image = existing
+            elif image.footprint <= self._max_bytes:
+                self._images[image.content_hash] = image
+                self._bytes += image.footprint
+                self._evict()
+            self._urls[url] = image.content_hash
+            self._urls.move_to_end(url)
+            while len(self._urls) > self._max_urls:
+                self._urls.popitem(last=False)
+            return image, existing is not None
+
+    def derived(self, image: FetchedImage, key: Any) -> str | None:
+        with self._lock:
+            return image.derived.get(key)
+
+    def add_derived(self, image: FetchedImage, key: Any, value: str) -> str:
+        """Keep ``value`` with ``image`` and charge it to the budget while the image is cached."""
+        with self._lock:
+            current = image.derived.get(key)
+            if current is not None:
+                return current
+            before = image.footprint
+            image.derived[key] = value
+            # An evicted (or never cached) image is only held by its callers
+            if self._images.get(image.content_hash) is image:
+                self._images.move_to_end(image.content_hash)
+                self._bytes += image.footprint - before
+                self._evict()
+            return value
+
+    def _evict(self) -> None:
+        while self._bytes > self._max_bytes and self._images:
+            _, evicted = self._images.popitem(last=False)
+            self._bytes -= evicted.footprint
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+            self._urls.clear()
+            self._bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+
+class ImageFetchService:
+    """Pooled, size-capped image downloads with a content-addressed cache."""
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int | None = None,
+        cache_max_bytes: int | None = None,
+        cache_max_urls: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self._max_bytes = max_bytes or settings.IMAGE_FETCH_MAX_BYTES
+        self._timeout = timeout or settings.IMAGE_FETCH_TIMEOUT_SECONDS
+        self._cache = _ImageCache(
+            cache_max_bytes or settings.IMAGE_CACHE_MAX_BYTES,
+            cache_max_urls or settings.IMAGE_CACHE_MAX_URLS,
+        )
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._inflight: dict[tuple[int, str], asyncio.Future[FetchedImage | None]] = {}
+        self._stats = {"requests": 0, "url_hits": 0, "content_hits": 0, "downloads": 0, "bytes_fetched": 0}
+
+    # ------------------------------------------------------------------
+    # HTTP client lifecycle
+    # ------------------------------------------------------------------
+
+    def _build_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self._timeout, follow_redirects=True, headers=_CDN_HEADERS)
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._build_http_client()
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def cached(self, url: str) -> FetchedImage | None:
+        """Cached image for ``url`` without any network access."""
+        return self._cache.by_url(normalize_url(url))
+
+    def data_url(self, image: FetchedImage) -> str:
+        """``data:`` URL of the original bytes (encoded once per cached image)."""
+        cached = self._cache.derived(image, _ORIGINAL)
+        if cached is not None:
+            return cached
+        return self._cache.add_derived(image, _ORIGINAL, to_data_url(image.data, image.content_type))
+
+    def variant(self, image: FetchedImage, key: Any) -> str | None:
+        """Previously stored derived data URL of ``image`` (e.g. downscaled for a model)."""
+        return self._cache.derived(image, key)
+
+    def put_variant(self, image: FetchedImage, key: Any, data_url: str) -> str:
+        """Keep a derived data URL with ``image``, counted against the cache budget."""
+        return self._cache.add_derived(image, key, data_url)
+
+    async def fetch(self, url: str, max_retries: int = 2) -> FetchedImage | None:
+        """Return the image at ``url`` (from cache when possible), or None on failure."""
+        url = normalize_url(url)
+        self._stats["requests"] += 1
+        image = self._cache.by_url(url)
+        if image is not None:
+            self._stats["url_hits"] += 1
+            self._track(hit="url", fetched=0)
+            return image
+
+        key = (id(asyncio.get_running_loop()), url)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._download(url, max_retries))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _task: self._inflight.pop(key, None))
+        else:
+            self._stats["url_hits"] += 1
+            self._track(hit="inflight", fetched=0)
+        # A cancelled caller must not cancel a download other callers wait on
+        return await asyncio.shield(task)
+
+    async def _download(self, url: str, max_retries: int) -> FetchedImage | None:
+        client = self._get_http_client()
+        for attempt in range(max_retries + 1):
+            try:
+                data, content_type = await self._stream(client, url)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 403 and attempt < max_retries:
+                    logger.warning("[IMAGE_FETCH] HTTP 403, retrying (%d/%d)...", attempt + 1, max_retries)
+                    await asyncio.sleep(0.5)
+                    continue
+                logger.error("[IMAGE_FETCH] Failed to download image (HTTP %d): %s", e.response.status_code, url[:80])
+                return None
+            except ImageTooLargeError as e:
+                logger.error("[IMAGE_FETCH] %s: %s", e, url[:80])
+                return None
+            except Exception as e:
+                if attempt < max_retries:
+                    logger.warning(
+                        "[IMAGE_FETCH] Download error, retrying (%d/%d): %s", attempt + 1, max_retries, str(e)[:50]
+                    )
+                    await asyncio.sleep(0.5)
+                    continue
+                logger.error("[IMAGE_FETCH] Failed to download image: %s - %s", type(e).__name__, str(e)[:100])
+                return None
+
+            self._stats["downloads"] += 1
+            self._stats["bytes_fetched"] += len(data)
+            content_hash = hashlib.sha256(data).hexdigest()
+            image, known = self._cache.put(url, FetchedImage(content_hash, content_type, data, len(data)))
+            if known:
+                self._stats["content_hits"] += 1
+            self._track(hit="content" if known else "miss", fetched=len(data))
+            logger.info(
+                "[IMAGE_FETCH] Downloaded image: %d bytes, type=%s, hash=%s%s",
+                len(data),
+                image.content_type,
+                content_hash[:12],
+                " (seen before)" if known else "",
+            )
+            return image
+        return None
+
+    async def _stream(self, client: httpx.AsyncClient, url: str) -> tuple[bytes, str]:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            declared = response.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > self._max_bytes:
+                raise ImageTooLargeError(f"Image too large ({declared} bytes > {self._max_bytes})")
+            chunks: list[bytes] = []
+            total = 0
+            async for chunk in response.aiter_bytes():
+                total += len(chunk)
+                if total > self._max_bytes:
+                    raise ImageTooLargeError(f"Image too large (> {self._max_bytes} bytes)")
+                chunks.append(chunk)
+            content_type = response.headers.get("content-type", "image/jpeg").split(";")[0].strip()
+            return b"".join(chunks), content_type or "image/jpeg"
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def _track(self, *, hit: str, fetched: int) -> None:
+        from src.services.core.observability import track_metric
+
+        track_metric("image_fetch_lookup", 1, {"result": hit})
+        if fetched:
+            track_metric("image_fetch_bytes", fetched)
+        if self._stats["requests"] % _REPORT_EVERY == 0:
+            track_metric("image_fetch_cache_hit_ratio", self.get_stats()["hit_ratio"])
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters since start; ``hit_ratio`` is the share of requests served without a download."""
+        requests = self._stats["requests"]
+        return {
+            **self._stats,
+            "hit_ratio": self._stats["url_hits"] / requests if requests else 0.0,
+            "cached_images": len(self._cache),
+            "cached_bytes": self._cache.total_bytes,
+        }
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+_service: ImageFetchService | None = None
+_service_lock = threading.Lock()
+
+
+def get_image_fetch_service() -> ImageFetchService:
+    """Process-wide image fetch service (lazy singleton)."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ImageFetchService()
+    return _service
+
+
+async def close_image_fetch_service() -> None:
+    """Close the singleton's HTTP client for the running loop (app shutdown)."""
+    if _service is not None:
+        await _service.aclose()
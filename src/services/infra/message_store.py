@@ -7,6 +7,7 @@ from typing import Any, Protocol
 from supabase import Client
 
 from src.core.constants import DBTable
+from src.services.infra.followup_index import record_activity
 from src.services.infra.supabase_client import get_supabase_client
 
 
@@ -49,9 +50,15 @@ class InMemoryMessageStore:
 class SupabaseMessageStore:
     """Message store using mirt_messages table schema."""
 
-    def __init__(self, client: Client, table: str = DBTable.MESSAGES) -> None:
+    def __init__(
+        self,
+        client: Client,
+        table: str = DBTable.MESSAGES,
+        sessions_table: str = DBTable.SESSIONS,
+    ) -> None:
         self.client = client
         self.table = table
+        self.sessions_table = sessions_table
 
     def append(self, message: StoredMessage) -> None:
         """Insert message and update interaction timestamp."""
@@ -78,6 +85,22 @@ class SupabaseMessageStore:
                 e,
             )
             # Don't raise - allow processing to continue
+            return
+
+        self._update_session_activity(message)
+
+    def _update_session_activity(self, message: StoredMessage) -> None:
+        """Keep the follow-up due-time index in sync with the appended message."""
+        try:
+            record_activity(
+                self.client,
+                message.session_id,
+                message.created_at,
+                message.tags,
+                table=self.sessions_table,
+            )
+        except Exception as e:
+            logger.warning("Failed to update follow-up index for session %s: %s", message.session_id, e)
 
     def _update_user_interaction(self, user_id: int) -> None:
         """Update last_interaction_at for user."""
@@ -163,5 +186,9 @@ def create_message_store() -> MessageStore:
 
     client = get_supabase_client()
     if client:
-        return SupabaseMessageStore(client, table=settings.SUPABASE_MESSAGES_TABLE)
+        return SupabaseMessageStore(
+            client,
+            table=settings.SUPABASE_MESSAGES_TABLE,
+            sessions_table=settings.SUPABASE_TABLE,
+        )
     return InMemoryMessageStore()
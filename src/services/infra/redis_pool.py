@@ -0,0 +1,257 @@
+"""Process-wide Redis connection pool.
+
+Catalog cache, rate limiter and debouncer used to call ``redis.from_url()``
+(and often ``ping()``) on every operation, paying a TCP connect plus a round
+trip per cache lookup. This module owns one pooled client and hands it out
+to every subsystem.
+
+Health model:
+- First use creates the pool and pings once.
+- A failure (reported by the pool itself or by callers via
+  ``report_redis_error``) marks Redis unhealthy for a short backoff window.
+  During that window ``get_redis_client()`` returns ``None`` so callers fail
+  open without hammering a dead server.
+- After the window the next caller re-probes lazily (one ping) and the pool
+  is reused if Redis came back.
+
+Usage:
+    from src.services.infra.redis_pool import get_redis_client, redis_namespace
+
+    r = get_redis_client()
+    if r:
+        r.get(redis_namespace("catalog").key("product", "42"))
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import redis
+
+
+logger = logging.getLogger(__name__)
+
+
+# Key prefixes per subsystem. Existing prefixes are kept verbatim so that
+# switching to the shared pool does not orphan keys written by older builds.
+REDIS_NAMESPACES: dict[str, str] = {
+    "catalog": "mirt:catalog",
+    "rate_limit": "rate_limit",
+    "debouncer": "debouncer",
+}
+
+
+@dataclass(frozen=True)
+class RedisNamespace:
+    """Key builder for one subsystem (``<prefix>:<part>:<part>``)."""
+
+    prefix: str
+
+    def key(self, *parts: object) -> str:
+        return ":".join([self.prefix, *(str(p) for p in parts)])
+
+
+def redis_namespace(name: str) -> RedisNamespace:
+    """Return the key namespace for a subsystem (unknown names get ``mirt:<name>``)."""
+    return RedisNamespace(prefix=REDIS_NAMESPACES.get(name, f"mirt:{name}"))
+
+
+# =============================================================================
+# INSTRUMENTED POOLS
+# =============================================================================
+
+
+@dataclass
+class RedisPoolStats:
+    """Counters for one pool (exposed via ``get_redis_pool_metrics``)."""
+
+    checkouts: int = 0
+    waits: int = 0
+    errors: int = 0
+    connections_created: int = 0
+    reconnects: int = 0
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """Blocking pool that counts checkouts, waits and checkout errors."""
+
+    def __init__(self, *args: Any, stats: RedisPoolStats | None = None, **kwargs: Any) -> None:
+        self.stats = stats or RedisPoolStats()
+        super().__init__(*args, **kwargs)
+
+    def get_connection(self, command_name: Any = None, *keys: Any, **options: Any) -> Any:
+        self.stats.checkouts += 1
+        if self.pool.empty():
+            # Every slot is checked out - this call will block up to ``timeout``.
+            self.stats.waits += 1
+        try:
+            return super().get_connection(command_name, *keys, **options)
+        except Exception:
+            self.stats.errors += 1
+            raise
+
+    def make_connection(self) -> Any:
+        self.stats.connections_created += 1
+        return super().make_connection()
+
+
+# =============================================================================
+# POOL MANAGER
+# =============================================================================
+
+
+def _redis_url() -> str:
+    from src.conf.config import settings
+
+    return os.getenv("REDIS_URL") or settings.REDIS_URL
+
+
+def _pool_kwargs() -> dict[str, Any]:
+    from src.conf.config import settings
+
+    return {
+        "decode_responses": True,
+        "max_connections": settings.REDIS_POOL_MAX_CONNECTIONS,
+        "timeout": settings.REDIS_POOL_TIMEOUT_SECONDS,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+    }
+
+
+def _create_sync_client(url: str, stats: RedisPoolStats) -> redis.Redis:
+    pool = InstrumentedConnectionPool.from_url(url, stats=stats, **_pool_kwargs())
+    return redis.Redis(connection_pool=pool)
+
+
+class RedisPoolManager:
+    """Owns the shared client and its health state."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sync_client: redis.Redis | None = None
+        self._sync_stats = RedisPoolStats()
+        self._healthy = False
+        self._unhealthy_until = 0.0
+        self._last_error: str | None = None
+
+    # --- health -------------------------------------------------------------
+
+    def _backoff_seconds(self) -> float:
+        from src.conf.config import settings
+
+        return float(settings.REDIS_RECONNECT_BACKOFF_SECONDS)
+
+    def _in_backoff(self) -> bool:
+        return not self._healthy and time.monotonic() < self._unhealthy_until
+
+    def _needs_probe(self) -> bool:
+        # Healthy implies a client; unhealthy probes again once the backoff ends
+        return not self._healthy and not self._in_backoff()
+
+    def report_error(self, error: BaseException, *, subsystem: str = "unknown") -> None:
+        """Mark Redis unhealthy after a caller-observed connection failure.
+
+        Only connection-level failures flip health; command errors (wrong type,
+        script errors) are counted but leave the pool usable.
+        """
+        self._sync_stats.errors += 1
+        self._last_error = f"{subsystem}: {type(error).__name__}"
+        if isinstance(error, redis.ConnectionError | redis.TimeoutError | OSError):
+            self._mark_unhealthy(error)
+
+    def _mark_unhealthy(self, error: BaseException) -> None:
+        if self._healthy:
+            logger.warning("[REDIS:POOL] Marked unhealthy: %s", type(error).__name__)
+        self._healthy = False
+        self._unhealthy_until = time.monotonic() + self._backoff_seconds()
+        self._last_error = type(error).__name__
+
+    # --- sync ---------------------------------------------------------------
+
+    def get_client(self) -> redis.Redis | None:
+        """Return the shared sync client, or ``None`` if Redis is unavailable."""
+        if not self._needs_probe():
+            return self._sync_client if self._healthy else None
+
+        with self._lock:
+            if not self._needs_probe():
+                return self._sync_client if self._healthy else None
+
+            url = _redis_url()
+            if not url:
+                return None
+
+            try:
+                client = self._sync_client or _create_sync_client(url, self._sync_stats)
+                client.ping()
+            except Exception as e:
+                self._sync_stats.errors += 1
+                self._mark_unhealthy(e)
+                logger.debug("[REDIS:POOL] Redis unavailable: %s", type(e).__name__)
+                return None
+
+            if self._sync_client is not None:
+                self._sync_stats.reconnects += 1
+                logger.info("[REDIS:POOL] Redis reachable again, reusing pool")
+            else:
+                logger.info("[REDIS:POOL] Shared Redis pool initialized")
+            self._sync_client = client
+            self._healthy = True
+            return client
+
+    # --- lifecycle / metrics -------------------------------------------------
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "healthy": self._healthy,
+            "last_error": self._last_error,
+            "sync": asdict(self._sync_stats),
+        }
+
+    def close(self) -> None:
+        """Close the pool (called from the FastAPI lifespan)."""
+        with self._lock:
+            client, self._sync_client = self._sync_client, None
+            self._healthy = False
+            self._unhealthy_until = 0.0
+        if client is not None:
+            try:
+                client.connection_pool.disconnect()
+            except Exception as e:
+                logger.debug("[REDIS:POOL] Close failed: %s", e)
+
+
+_manager = RedisPoolManager()
+
+
+def get_redis_client() -> redis.Redis | None:
+    """Shared sync Redis client (``None`` when Redis is not reachable)."""
+    return _manager.get_client()
+
+
+def report_redis_error(error: BaseException, *, subsystem: str = "unknown") -> None:
+    """Tell the pool a command failed so it can back off on connection errors."""
+    _manager.report_error(error, subsystem=subsystem)
+
+
+def get_redis_pool_metrics() -> dict[str, Any]:
+    """Pool health and counters (checkouts, waits, errors, ...)."""
+    return _manager.get_metrics()
+
+
+async def close_redis_pools() -> None:
+    """Close the shared pool on shutdown."""
+    _manager.close()
+
+
+def reset_redis_pools() -> None:
+    """Drop pooled clients and health state (tests / forked workers)."""
+    global _manager
+    _manager.close()
+    _manager = RedisPoolManager()
@@ -0,0 +1,139 @@
+"""Bounded thread-pool offload for synchronous Supabase calls.
+
+The supabase/postgrest client is synchronous: ``query.execute()`` performs a
+blocking HTTP round trip. Called directly from ``async def`` code it stalls
+the whole FastAPI event loop for that round trip. ``run_db`` moves the call
+onto a dedicated, bounded thread pool so the loop keeps serving webhooks.
+
+Back-pressure: at most ``SUPABASE_EXECUTOR_MAX_WORKERS + SUPABASE_EXECUTOR_MAX_PENDING``
+calls may be submitted at once per event loop; further callers wait on a
+semaphore instead of piling unbounded work into the executor queue.
+
+Usage:
+    from src.services.infra.supabase_executor import execute_async, run_db
+
+    response = await execute_async(client.table("products").select("*").eq("id", 1))
+    record = await run_db(ledger.get_by_hash, image_hash)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from src.conf.config import settings
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExecutorStats:
+    """Offload counters (exposed via ``get_db_executor_metrics``)."""
+
+    submitted: int = 0
+    completed: int = 0
+    errors: int = 0
+    waits: int = 0
+    in_flight: int = 0
+    inline: int = 0
+
+
+_stats = ExecutorStats()
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+# asyncio.Semaphore binds to one loop; Celery tasks run their own loops.
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.SUPABASE_EXECUTOR_MAX_WORKERS,
+                    thread_name_prefix="supabase-io",
+                )
+    return _executor
+
+
+def _get_semaphore(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    sem = _semaphores.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(
+            settings.SUPABASE_EXECUTOR_MAX_WORKERS + settings.SUPABASE_EXECUTOR_MAX_PENDING
+        )
+        _semaphores[loop] = sem
+    return sem
+
+
+async def run_db(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Supabase call on the bounded DB thread pool."""
+    if not settings.SUPABASE_OFFLOAD_ENABLED:
+        _stats.inline += 1
+        return fn(*args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    sem = _get_semaphore(loop)
+    if sem.locked():
+        _stats.waits += 1
+        wait_start = time.perf_counter()
+        await sem.acquire()
+        from src.services.core.observability import track_metric
+
+        track_metric("supabase_offload_wait_ms", (time.perf_counter() - wait_start) * 1000)
+    else:
+        await sem.acquire()
+
+    _stats.submitted += 1
+    _stats.in_flight += 1
+    try:
+        return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+    except Exception:
+        _stats.errors += 1
+        raise
+    finally:
+        _stats.in_flight -= 1
+        _stats.completed += 1
+        sem.release()
+
+
+async def execute_async(query: Any) -> Any:
+    """``await``-able ``query.execute()`` for postgrest request builders."""
+    return await run_db(query.execute)
+
+
+def get_db_executor_metrics() -> dict[str, Any]:
+    """Offload counters plus configured limits."""
+    return {
+        **asdict(_stats),
+        "max_workers": settings.SUPABASE_EXECUTOR_MAX_WORKERS,
+        "max_pending": settings.SUPABASE_EXECUTOR_MAX_PENDING,
+        "enabled": settings.SUPABASE_OFFLOAD_ENABLED,
+    }
+
+
+def shutdown_db_executor(wait: bool = True) -> None:
+    """Stop the DB thread pool (called from the FastAPI lifespan)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+        logger.info("[SUPABASE] DB executor shut down")
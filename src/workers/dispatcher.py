@@ -417,6 +417,35 @@ def dispatch_llm_usage(
     Returns:
         Task result or async task info
     """
+    if settings.TELEMETRY_BATCH_ENABLED:
+        from datetime import UTC, datetime
+
+        from src.services.core.telemetry_writer import get_usage_writer
+        from src.workers.tasks.llm_usage import calculate_cost
+
+        # Same checks as record_usage: a bad row would fail the whole bulk write
+        if tokens_input < 0 or tokens_output < 0 or not model:
+            logger.warning(
+                "[DISPATCH] Invalid LLM usage not recorded: model=%r in=%s out=%s",
+                model,
+                tokens_input,
+                tokens_output,
+            )
+            return {"queued": False, "batched": True, "error": "INVALID_INPUT"}
+
+        cost = calculate_cost(model, tokens_input, tokens_output)
+        accepted = get_usage_writer().submit(
+            {
+                "user_id": user_id,
+                "model": model,
+                "tokens_input": tokens_input,
+                "tokens_output": tokens_output,
+                "cost_usd": float(cost),
+                "created_at": datetime.now(UTC).isoformat(),
+            }
+        )
+        return {"queued": accepted, "batched": True, "model": model, "cost_usd": float(cost)}
+
     if settings.CELERY_ENABLED:
         from src.workers.tasks.llm_usage import record_usage
 
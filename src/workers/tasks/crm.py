@@ -293,16 +293,23 @@ def sync_order_status(
 @shared_task(
     bind=True,
     name="src.workers.tasks.crm.check_pending_orders",
+    # Above CRM_SYNC_BUDGET_SECONDS plus one page (CRM request timeout is 30s)
+    soft_time_limit=300,
+    time_limit=360,
 )
 def check_pending_orders(self) -> dict:
-    """Check all pending orders for status updates.
+    """Check open orders that are due for a status update.
 
     Periodic task to sync order statuses from CRM.
-    Runs via Celery Beat.
+    Runs via Celery Beat. Due orders are paged and their statuses fetched
+    in bulk (see src/integrations/crm/order_sync.py); each order's next
+    check time depends on its status and age.
 
     Returns:
         dict with check results
     """
+    from src.integrations.crm.order_sync import sync_due_orders
+    from src.integrations.crm.snitkix import get_snitkix_client
     from src.services.infra.supabase_client import get_supabase_client
 
     logger.info("[WORKER:CRM] Checking pending orders for status updates")
@@ -315,29 +322,16 @@ def check_pending_orders(self) -> dict:
         return {"status": "skipped", "reason": "no_supabase"}
 
     try:
-        # Get sessions with pending orders
-        response = (
-            client.table("agent_sessions")
-            .select("session_id, order_id, order_status")
-            .not_.is_("order_id", "null")
-            .in_("order_status", ["pending", "processing", "new"])
-            .execute()
+        stats = run_sync(sync_due_orders(client, get_snitkix_client()))
+
+        logger.info(
+            "[WORKER:CRM] Checked %d orders in %d pages (%d changed, %d not found)",
+            stats["checked"],
+            stats["pages"],
+            stats["changed"],
+            stats["missing"],
         )
-
-        if not response.data:
-            return {"status": "ok", "checked": 0}
-
-        queued = 0
-        for row in response.data:
-            # Queue status sync for each pending order
-            sync_order_status.delay(
-                order_id=row["order_id"],
-                session_id=row["session_id"],
-            )
-            queued += 1
-
-        logger.info("[WORKER:CRM] Queued %d order status checks", queued)
-        return {"status": "ok", "queued": queued}
+        return {"status": "ok", **stats}
 
     except Exception as e:
         logger.exception("[WORKER:CRM] Error checking pending orders: %s", e)
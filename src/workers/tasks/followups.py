@@ -14,7 +14,8 @@ from datetime import UTC, datetime
 from celery import shared_task
 
 from src.conf.config import settings
-from src.services.domain.engagement.followups import next_followup_due_at, run_followups
+from src.services.domain.engagement.followups import run_followups
+from src.services.infra.followup_index import iter_due_sessions
 from src.services.infra.message_store import create_message_store
 from src.services.infra.supabase_client import get_supabase_client
 
@@ -150,8 +151,9 @@ def check_all_sessions_for_followups(self) -> dict:
     """Check all sessions and queue follow-up tasks for eligible ones.
 
     This is a periodic task that runs via Celery Beat.
-    It finds sessions where follow-up is due based on last activity
-    and the configured FOLLOWUP_DELAYS_HOURS schedule.
+    It pages through sessions whose follow-up is due based on last activity
+    and the configured FOLLOWUP_DELAYS_HOURS schedule, using the
+    last-activity index on agent_sessions (see followup_index).
 
     Returns:
         dict with count of queued tasks
@@ -164,40 +166,26 @@ def check_all_sessions_for_followups(self) -> dict:
         return {"status": "skipped", "reason": "no_supabase"}
 
     try:
-        # Get sessions with their chat info
-        # We need session_id and the channel info to send follow-ups
-        response = (
-            client.table(settings.SUPABASE_MESSAGES_TABLE).select("session_id, user_id").execute()
-        )
-
-        if not response.data:
-            return {"status": "ok", "queued": 0}
-
-        # Get unique sessions with user mapping
-        sessions: dict[str, int | None] = {}
-        for row in response.data:
-            sid = row["session_id"]
-            if sid not in sessions:
-                sessions[sid] = row.get("user_id")
-
-        message_store = create_message_store()
+        # Only sessions whose next follow-up is due, from the last-activity
+        # index on agent_sessions (maintained on every message append).
         now = datetime.now(UTC)
         queued = 0
 
-        for session_id, _user_id in sessions.items():
-            # Check if followup is due
-            messages = message_store.list(session_id)
-            due_at = next_followup_due_at(messages)
-
-            if due_at and now >= due_at:
-                # Queue follow-up task
-                # Default to telegram, chat_id is session_id for telegram
-                send_followup.delay(
-                    session_id=session_id,
-                    channel="telegram",
-                    chat_id=session_id,
-                )
-                queued += 1
+        for due in iter_due_sessions(
+            client,
+            now,
+            settings.followup_schedule_hours,
+            page_size=settings.FOLLOWUP_SCAN_PAGE_SIZE,
+            table=settings.SUPABASE_TABLE,
+        ):
+            # Default to telegram, chat_id is session_id for telegram.
+            # send_followup re-checks the message history before sending.
+            send_followup.delay(
+                session_id=due.session_id,
+                channel="telegram",
+                chat_id=due.session_id,
+            )
+            queued += 1
 
         logger.info(
             "[WORKER:FOLLOWUP] Queued %d followup tasks",
@@ -13,12 +13,17 @@ Integrates with Supabase llm_usage table:
     - tokens_output (int4)
     - cost_usd (numeric)
     - created_at (timestamptz)
+
+Each recorded call is also added to the llm_usage_hourly rollup
+(hour, user_id, model), and summaries are computed in the database by the
+llm_usage_totals RPC, so reports cost O(models) rather than O(rows).
+See src/db/migrations/20261016_llm_usage_hourly_rollup.sql.
 """
 
 from __future__ import annotations
 
 import logging
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
@@ -40,6 +45,71 @@ MODEL_PRICING: dict[str, dict[str, Decimal]] = {
 }
 
 
+def _record_rollup(
+    client: Any,
+    user_id: int | None,
+    model: str,
+    tokens_input: int,
+    tokens_output: int,
+    cost_usd: Decimal,
+    created_at: datetime,
+) -> None:
+    """Add one call to the hourly rollup (best effort: llm_usage stays the source of truth)."""
+    try:
+        client.rpc(
+            "record_llm_usage_rollup",
+            {
+                "p_created_at": created_at.isoformat(),
+                "p_user_id": user_id,
+                "p_model": model,
+                "p_tokens_input": tokens_input,
+                "p_tokens_output": tokens_output,
+                "p_cost_usd": str(cost_usd),
+            },
+        ).execute()
+    except Exception as e:
+        logger.warning("[WORKER:LLM_USAGE] Failed to update hourly rollup: %s", e)
+
+
+def _usage_totals(
+    client: Any,
+    since: datetime,
+    user_id: int | None = None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, Any]]:
+    """Per-model and overall usage since ``since`` from the hourly rollup.
+
+    Returns:
+        (by_model, total); costs are Decimal
+    """
+    params: dict[str, Any] = {"p_since": since.isoformat()}
+    if user_id is not None:
+        params["p_user_id"] = user_id
+    response = client.rpc("llm_usage_totals", params).execute()
+
+    by_model: dict[str, dict[str, Any]] = {}
+    total: dict[str, Any] = {
+        "cost_usd": Decimal("0"),
+        "tokens_input": 0,
+        "tokens_output": 0,
+        "count": 0,
+        "unique_users": 0,
+    }
+    for row in response.data or []:
+        entry = {
+            "cost_usd": Decimal(str(row.get("cost_usd") or 0)),
+            "tokens_input": int(row.get("tokens_input") or 0),
+            "tokens_output": int(row.get("tokens_output") or 0),
+            "count": int(row.get("request_count") or 0),
+            "unique_users": int(row.get("unique_users") or 0),
+        }
+        # The grouping-sets total row has no model
+        if row.get("model") is None:
+            total = entry
+        else:
+            by_model[row["model"]] = entry
+    return by_model, total
+
+
 def calculate_cost(
     model: str,
     tokens_input: int,
@@ -120,6 +190,7 @@ def record_usage(
     try:
         # Calculate cost
         cost_usd = calculate_cost(model, tokens_input, tokens_output)
+        created_at = datetime.now(UTC)
 
         # Insert record
         record = {
@@ -128,12 +199,13 @@ def record_usage(
             "tokens_input": tokens_input,
             "tokens_output": tokens_output,
             "cost_usd": float(cost_usd),
-            "created_at": datetime.now(UTC).isoformat(),
+            "created_at": created_at.isoformat(),
         }
 
         response = client.table(DBTable.LLM_USAGE).insert(record).execute()
 
         if response.data:
+            _record_rollup(client, user_id, model, tokens_input, tokens_output, cost_usd, created_at)
             record_id = response.data[0].get("id")
             logger.info(
                 "[WORKER:LLM_USAGE] Recorded usage id=%s cost=$%.6f",
@@ -187,66 +259,29 @@ def get_user_usage_summary(
 
     try:
         # Calculate date cutoff
-        cutoff = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
-        cutoff = cutoff.replace(day=cutoff.day - days) if cutoff.day > days else cutoff
-
-        # Query usage records
-        response = (
-            client.table(DBTable.LLM_USAGE)
-            .select("model, tokens_input, tokens_output, cost_usd")
-            .eq("user_id", user_id)
-            .gte("created_at", cutoff.isoformat())
-            .execute()
-        )
-
-        if not response.data:
-            return {
-                "status": "ok",
-                "user_id": user_id,
-                "total_cost_usd": 0,
-                "total_tokens_input": 0,
-                "total_tokens_output": 0,
-                "request_count": 0,
-                "by_model": {},
-            }
+        today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff = today - timedelta(days=days)
 
-        # Aggregate
-        total_cost = Decimal("0")
-        total_input = 0
-        total_output = 0
-        by_model: dict[str, dict[str, Any]] = {}
-
-        for row in response.data:
-            model = row["model"]
-            total_cost += Decimal(str(row["cost_usd"]))
-            total_input += row["tokens_input"]
-            total_output += row["tokens_output"]
-
-            if model not in by_model:
-                by_model[model] = {
-                    "cost_usd": Decimal("0"),
-                    "tokens_input": 0,
-                    "tokens_output": 0,
-                    "count": 0,
-                }
-            by_model[model]["cost_usd"] += Decimal(str(row["cost_usd"]))
-            by_model[model]["tokens_input"] += row["tokens_input"]
-            by_model[model]["tokens_output"] += row["tokens_output"]
-            by_model[model]["count"] += 1
+        by_model, total = _usage_totals(client, cutoff, user_id=user_id)
 
         # Convert Decimal to float for JSON serialization
-        for model in by_model:
-            by_model[model]["cost_usd"] = float(by_model[model]["cost_usd"])
-
         return {
             "status": "ok",
             "user_id": user_id,
             "days": days,
-            "total_cost_usd": float(total_cost),
-            "total_tokens_input": total_input,
-            "total_tokens_output": total_output,
-            "request_count": len(response.data),
-            "by_model": by_model,
+            "total_cost_usd": float(total["cost_usd"]),
+            "total_tokens_input": total["tokens_input"],
+            "total_tokens_output": total["tokens_output"],
+            "request_count": total["count"],
+            "by_model": {
+                model: {
+                    "cost_usd": float(entry["cost_usd"]),
+                    "tokens_input": entry["tokens_input"],
+                    "tokens_output": entry["tokens_output"],
+                    "count": entry["count"],
+                }
+                for model, entry in by_model.items()
+            },
         }
 
     except Exception as e:
@@ -277,38 +312,25 @@ def aggregate_daily_usage(self) -> dict:
         # Get today's usage
         today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
 
-        response = (
-            client.table(DBTable.LLM_USAGE)
-            .select("model, tokens_input, tokens_output, cost_usd, user_id")
-            .gte("created_at", today.isoformat())
-            .execute()
-        )
-
-        if not response.data:
-            return {
-                "status": "ok",
-                "date": today.date().isoformat(),
-                "total_cost_usd": 0,
-                "request_count": 0,
-                "unique_users": 0,
-            }
-
-        total_cost = sum(Decimal(str(row["cost_usd"])) for row in response.data)
-        unique_users = len({row["user_id"] for row in response.data if row["user_id"]})
+        by_model, total = _usage_totals(client, today)
 
         logger.info(
             "[WORKER:LLM_USAGE] Daily aggregate: $%.4f, %d requests, %d users",
-            total_cost,
-            len(response.data),
-            unique_users,
+            total["cost_usd"],
+            total["count"],
+            total["unique_users"],
         )
 
         return {
             "status": "ok",
             "date": today.date().isoformat(),
-            "total_cost_usd": float(total_cost),
-            "request_count": len(response.data),
-            "unique_users": unique_users,
+            "total_cost_usd": float(total["cost_usd"]),
+            "request_count": total["count"],
+            "unique_users": total["unique_users"],
+            "by_model": {
+                model: {"cost_usd": float(entry["cost_usd"]), "count": entry["count"]}
+                for model, entry in by_model.items()
+            },
         }
 
     except Exception as e:
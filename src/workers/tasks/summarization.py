@@ -9,7 +9,9 @@ These tasks handle:
 from __future__ import annotations
 
 import logging
-from datetime import UTC, datetime
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
 
 from celery import shared_task
 
@@ -21,6 +23,7 @@ from src.services.domain.memory.summarization import (
     mark_user_summarized,
     run_retention,
 )
+from src.services.infra.redis_pool import get_redis_client, redis_namespace, report_redis_error
 from src.services.infra.supabase_client import get_supabase_client
 from src.workers.exceptions import DatabaseError, PermanentError, RetryableError
 from src.workers.sync_utils import run_sync
@@ -147,6 +150,8 @@ def summarize_session(
 @shared_task(
     bind=True,
     name="src.workers.tasks.summarization.check_all_sessions_for_summarization",
+    soft_time_limit=110,
+    time_limit=120,
 )
 def check_all_sessions_for_summarization(self) -> dict:
     """Check all sessions and queue summarization tasks for eligible ones.
@@ -173,68 +178,22 @@ def check_all_sessions_for_summarization(self) -> dict:
             len(marked_users),
         )
 
-        # Step 1.5: Check for users with humanNeeded-wd tag that need summarization (3+ days after escalation)
-        from src.integrations.manychat.api_client import get_manychat_client
-        from datetime import timedelta
-        
-        manychat_client = get_manychat_client()
-        escalation_users = []
-        
-        if manychat_client.is_configured:
-            # Get users with humanNeeded-wd tag from ManyChat
-            # We'll check sessions with last_interaction_at 3+ days ago
-            cutoff_date = (datetime.now(UTC) - timedelta(days=3)).isoformat()
-            
-            escalation_sessions = (
-                client.table("agent_sessions")
-                .select("session_id, user_id, last_interaction_at, manychat_subscriber_id")
-                .lt("last_interaction_at", cutoff_date)
-                .not_.is_("manychat_subscriber_id", "null")
-                .execute()
-            )
-            
-            if escalation_sessions.data:
-                # Check which subscribers have humanNeeded-wd tag
-                async def _check_tag(subscriber_id: str) -> bool:
-                    try:
-                        subscriber = await manychat_client.get_subscriber_info(subscriber_id)
-                        if subscriber:
-                            tags = subscriber.get("tags", [])
-                            # Tags can be list of strings or list of dicts
-                            if tags:
-                                tag_names = [
-                                    tag if isinstance(tag, str) else tag.get("name", "")
-                                    for tag in tags
-                                ]
-                                return "humanNeeded-wd" in tag_names
-                        return False
-                    except Exception:
-                        return False
-                
-                for session in escalation_sessions.data:
-                    subscriber_id = session.get("manychat_subscriber_id")
-                    if subscriber_id:
-                        has_tag = run_sync(_check_tag(subscriber_id))
-                        if has_tag:
-                            escalation_users.append({
-                                "user_id": session.get("user_id"),
-                                "session_id": session.get("session_id"),
-                                "manychat_subscriber_id": subscriber_id,
-                            })
-                
-                if escalation_users:
-                    logger.info(
-                        "[WORKER:SUMMARIZATION] Found %d users with humanNeeded-wd tag needing summarization",
-                        len(escalation_users),
-                    )
+        # Step 1.5: Users with humanNeeded-wd tag that need summarization (3+ days after escalation).
+        # The sweep runs in scan_escalated_sessions, which has its own time budget and queues
+        # those summaries itself. Only one sweep runs at a time: a chain still going from an
+        # earlier beat keeps the lock.
+        run_id = uuid.uuid4().hex
+        if _acquire_sweep(run_id):
+            try:
+                scan_escalated_sessions.delay(cursor=None, run_id=run_id)
+            except Exception:
+                _release_sweep(run_id)
+                raise
+        else:
+            logger.info("[WORKER:SUMMARIZATION] Previous escalation sweep still running, not starting another")
 
         # Step 2: Get all users with 'needs_summary' tag
         users_to_summarize = get_users_needing_summary()
-        
-        # Add escalation users to the list
-        for esc_user in escalation_users:
-            if esc_user["user_id"] not in [u.get("user_id") for u in users_to_summarize]:
-                users_to_summarize.append(esc_user)
 
         if not users_to_summarize:
             return {"status": "ok", "queued": 0, "marked": len(marked_users)}
@@ -249,6 +208,8 @@ def check_all_sessions_for_summarization(self) -> dict:
                 # Queue summarization task for this user's session
                 if session_id:
                     # Use session-specific summarization if we have session_id
+                    if not _claim_summary(session_id):
+                        continue
                     summarize_session.delay(
                         session_id=session_id,
                         user_id=user_id,
@@ -274,6 +235,201 @@ def check_all_sessions_for_summarization(self) -> dict:
         return {"status": "error", "error": str(e)}
 
 
+ESCALATION_TAG = "humanNeeded-wd"
+ESCALATION_INACTIVE_DAYS = 3
+
+# The sweep lock outlives a few continuation hops (120s each plus queue wait);
+# a chain that died releases it by expiry, before the next hourly beat.
+SWEEP_LOCK_TTL_SECONDS = 900
+# A session queued for summarization is not queued again for this long
+SUMMARY_DEDUPE_TTL_SECONDS = 3600
+
+_KEYS = redis_namespace("summarization")
+
+
+def _acquire_sweep(run_id: str) -> bool:
+    """Take the escalation sweep lock for ``run_id`` (always granted without Redis)."""
+    client = get_redis_client()
+    if client is None:
+        return True
+    try:
+        return bool(client.set(_KEYS.key("sweep"), run_id, nx=True, ex=SWEEP_LOCK_TTL_SECONDS))
+    except Exception as e:
+        report_redis_error(e, subsystem="summarization")
+        return True
+
+
+def _sweep_holder(client) -> str | None:
+    holder = client.get(_KEYS.key("sweep"))
+    return holder.decode() if isinstance(holder, bytes) else holder
+
+
+def _renew_sweep(run_id: str) -> bool:
+    """Extend the lock if ``run_id`` still holds it; False when the chain was superseded."""
+    client = get_redis_client()
+    if client is None:
+        return True
+    try:
+        if _sweep_holder(client) != run_id:
+            return False
+        client.expire(_KEYS.key("sweep"), SWEEP_LOCK_TTL_SECONDS)
+        return True
+    except Exception as e:
+        report_redis_error(e, subsystem="summarization")
+        return True
+
+
+def _release_sweep(run_id: str) -> None:
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        if _sweep_holder(client) == run_id:
+            client.delete(_KEYS.key("sweep"))
+    except Exception as e:
+        report_redis_error(e, subsystem="summarization")
+
+
+def _claim_summary(session_id: str) -> bool:
+    """True if ``session_id`` was not queued for summarization in the last hour."""
+    client = get_redis_client()
+    if client is None:
+        return True
+    try:
+        key = _KEYS.key("queued", session_id)
+        return bool(client.set(key, 1, nx=True, ex=SUMMARY_DEDUPE_TTL_SECONDS))
+    except Exception as e:
+        report_redis_error(e, subsystem="summarization")
+        return True
+
+
+def _scan_escalations(client, cursor: str | None) -> tuple[list[dict], str | None]:
+    """Find inactive sessions whose ManyChat subscriber still has the escalation tag.
+
+    Sessions are read in ``session_id`` order starting after ``cursor`` and
+    probed concurrently (see ``SubscriberTagProbe``) until
+    SUMMARIZATION_SWEEP_BUDGET_SECONDS runs out.
+
+    Returns:
+        (users to summarize, cursor to resume from or None when the sweep is done)
+    """
+    from src.integrations.manychat.api_client import get_manychat_client
+    from src.integrations.manychat.tag_probe import SubscriberTagProbe
+
+    manychat_client = get_manychat_client()
+    if not manychat_client.is_configured:
+        return [], None
+
+    cursor = cursor or ""
+    deadline = time.monotonic() + settings.SUMMARIZATION_SWEEP_BUDGET_SECONDS
+    probe = SubscriberTagProbe(
+        manychat_client,
+        concurrency=settings.MANYCHAT_TAG_PROBE_CONCURRENCY,
+        rate_per_second=settings.MANYCHAT_API_RATE_PER_SECOND,
+        cache_ttl=settings.MANYCHAT_TAG_CACHE_TTL_SECONDS,
+    )
+    cutoff_date = (datetime.now(UTC) - timedelta(days=ESCALATION_INACTIVE_DAYS)).isoformat()
+    page_size = settings.SUMMARIZATION_SWEEP_PAGE_SIZE
+    users: list[dict] = []
+
+    while time.monotonic() < deadline:
+        query = (
+            client.table("agent_sessions")
+            .select("session_id, user_id, last_interaction_at, manychat_subscriber_id")
+            .lt("last_interaction_at", cutoff_date)
+            .not_.is_("manychat_subscriber_id", "null")
+        )
+        rows = query.gt("session_id", cursor).order("session_id").limit(page_size).execute().data or []
+        if not rows:
+            return users, None
+
+        has_tag = run_sync(
+            probe.probe(
+                (row["manychat_subscriber_id"] for row in rows if row.get("manychat_subscriber_id")),
+                ESCALATION_TAG,
+                deadline=deadline,
+            )
+        )
+        for row in rows:
+            subscriber_id = row.get("manychat_subscriber_id")
+            if subscriber_id and subscriber_id not in has_tag:
+                # Out of time: resume from the last fully checked session
+                logger.info(
+                    "[WORKER:SUMMARIZATION] Escalation sweep paused after %d ManyChat requests",
+                    probe.requests,
+                )
+                return users, cursor
+            if subscriber_id and has_tag[subscriber_id]:
+                users.append({
+                    "user_id": row.get("user_id"),
+                    "session_id": row.get("session_id"),
+                    "manychat_subscriber_id": subscriber_id,
+                })
+            cursor = row["session_id"]
+
+        if len(rows) < page_size:
+            return users, None
+
+    return users, cursor
+
+
+@shared_task(
+    bind=True,
+    name="src.workers.tasks.summarization.scan_escalated_sessions",
+    soft_time_limit=110,
+    time_limit=120,
+)
+def scan_escalated_sessions(
+    self,
+    cursor: str | None = None,
+    run_id: str | None = None,
+) -> dict:
+    """Continue the escalation-tag sweep from ``cursor`` (queued by the periodic check).
+
+    Queues summarization for matching sessions and re-queues itself with the
+    next cursor until all inactive sessions are checked. The chain stops if
+    ``run_id`` no longer holds the sweep lock.
+    """
+    if run_id and not _renew_sweep(run_id):
+        logger.info("[WORKER:SUMMARIZATION] Escalation sweep %s superseded, stopping", run_id[:8])
+        return {"status": "skipped", "reason": "superseded"}
+
+    client = get_supabase_client()
+    if not client:
+        return {"status": "skipped", "reason": "no_supabase"}
+
+    try:
+        users, next_cursor = _scan_escalations(client, cursor=cursor)
+    except Exception as e:
+        logger.exception("[WORKER:SUMMARIZATION] Error in escalation sweep: %s", e)
+        if run_id:
+            _release_sweep(run_id)
+        return {"status": "error", "error": str(e)}
+
+    queued = 0
+    for user in users:
+        if not user.get("user_id") or not _claim_summary(user["session_id"]):
+            continue
+        summarize_session.delay(
+            session_id=user["session_id"],
+            user_id=user["user_id"],
+            manychat_subscriber_id=user["manychat_subscriber_id"],
+        )
+        queued += 1
+
+    if next_cursor is not None:
+        scan_escalated_sessions.delay(cursor=next_cursor, run_id=run_id)
+    elif run_id:
+        _release_sweep(run_id)
+
+    logger.info(
+        "[WORKER:SUMMARIZATION] Escalation sweep queued %d tasks (done=%s)",
+        queued,
+        next_cursor is None,
+    )
+    return {"status": "ok", "queued": queued, "next_cursor": next_cursor}
+
+
 @shared_task(
     bind=True,
     autoretry_for=(RetryableError,),
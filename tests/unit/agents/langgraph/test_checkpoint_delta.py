@@ -0,0 +1,190 @@
+"""Unit tests for delta storage of the checkpoint messages channel."""
+
+from __future__ import annotations
+
+from typing import Annotated, Any, TypedDict
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from src.agents.langgraph.checkpoint_delta import DELTA_MARKER, MessageDeltaCodec, is_delta
+from src.agents.langgraph.checkpointer import InstrumentedAsyncPostgresSaver
+from src.agents.langgraph.time_travel import get_state_history
+
+
+THREAD = ("t1", "")
+
+
+def _cp(messages: list, version: str) -> dict:
+    return {
+        "id": f"cp-{version}",
+        "channel_values": {"messages": messages},
+        "channel_versions": {"messages": version},
+    }
+
+
+class _Store:
+    """Stored messages values by version, standing in for checkpoint_blobs."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+        self.fetches: list[list[str]] = []
+
+    def write(self, codec: MessageDeltaCodec, messages: list, version: str) -> Any:
+        stored, pending = codec.encode(THREAD, _cp(messages, version), {"messages": version})
+        self.values[version] = stored["channel_values"]["messages"]
+        codec.commit(pending)
+        return self.values[version]
+
+    async def fetch(self, versions: list[str]) -> dict[str, Any]:
+        self.fetches.append(versions)
+        return {v: self.values[v] for v in versions if v in self.values}
+
+
+def _msgs(n: int) -> list[dict]:
+    return [{"role": "user", "content": f"m{i}"} for i in range(n)]
+
+
+def test_appends_are_stored_as_deltas_with_periodic_snapshots():
+    codec = MessageDeltaCodec(snapshot_every=3)
+    store = _Store()
+    kinds = [is_delta(store.write(codec, _msgs(n), f"v{n}")) for n in range(1, 8)]
+
+    assert kinds == [False, True, True, False, True, True, False]
+    delta = store.values["v3"]
+    assert delta["chain"] == ["v1", "v2"]
+    assert delta["append"] == [{"role": "user", "content": "m2"}]
+
+
+@pytest.mark.asyncio
+async def test_fresh_codec_resolves_chain_in_one_fetch():
+    store = _Store()
+    writer = MessageDeltaCodec(snapshot_every=10)
+    for n in range(1, 6):
+        store.write(writer, _msgs(n), f"v{n}")
+
+    reader = MessageDeltaCodec(snapshot_every=10)
+    resolved = await reader.resolve(THREAD, _cp(store.values["v5"], "v5"), store.fetch)
+
+    assert resolved["channel_values"]["messages"] == _msgs(5)
+    assert store.fetches == [["v1", "v2", "v3", "v4"]]
+
+
+@pytest.mark.asyncio
+async def test_trimmed_window_is_encoded_against_shifted_base():
+    codec = MessageDeltaCodec()
+    store = _Store()
+    history = _msgs(12)
+    store.write(codec, history[:10], "v1")
+    delta = store.write(codec, history[2:12], "v2")
+
+    assert (delta["start"], delta["stop"]) == (2, 10)
+    resolved = await MessageDeltaCodec().resolve(THREAD, _cp(delta, "v2"), store.fetch)
+    assert resolved["channel_values"]["messages"] == history[2:12]
+
+
+@pytest.mark.asyncio
+async def test_missing_delta_recovers_snapshot_and_forces_full_write(caplog):
+    store = _Store()
+    writer = MessageDeltaCodec(snapshot_every=10)
+    for n in range(1, 6):
+        store.write(writer, _msgs(n), f"v{n}")
+    del store.values["v4"]  # a lost intermediate delta
+
+    reader = MessageDeltaCodec(snapshot_every=10)
+    resolved = await reader.resolve(THREAD, _cp(store.values["v5"], "v5"), store.fetch, remember=True)
+
+    # Everything up to the gap survives, not just the last appended message
+    assert resolved["channel_values"]["messages"] == _msgs(3)
+    assert "Cannot resolve messages" in caplog.text
+
+    # The next write stores the full list instead of a delta on the broken chain
+    history = [*resolved["channel_values"]["messages"], *_msgs(6)[5:]]
+    stored = store.write(reader, history, "v6")
+    assert not is_delta(stored)
+    assert stored == history
+
+
+@pytest.mark.asyncio
+async def test_missing_snapshot_raises_instead_of_truncating():
+    codec = MessageDeltaCodec()
+    stored = {DELTA_MARKER: 1, "chain": ["gone"], "start": 0, "stop": 3, "append": _msgs(1)}
+
+    with pytest.raises(LookupError):
+        await codec.resolve(THREAD, _cp(stored, "v2"), _Store().fetch)
+
+
+def test_uncommitted_write_is_not_used_as_base():
+    codec = MessageDeltaCodec()
+    store = _Store()
+    store.write(codec, _msgs(2), "v1")
+    codec.encode(THREAD, _cp(_msgs(3), "v2"), {"messages": "v2"})  # write failed: no commit
+
+    stored, _ = codec.encode(THREAD, _cp(_msgs(4), "v3"), {"messages": "v3"})
+    assert stored["channel_values"]["messages"]["chain"] == ["v1"]
+
+
+class _State(TypedDict):
+    messages: Annotated[list, add_messages]
+    step_number: int
+
+
+def _reply(state: _State) -> dict:
+    return {
+        "messages": [AIMessage(content=f"reply {len(state['messages'])}")],
+        "step_number": state.get("step_number", 0) + 1,
+    }
+
+
+class _InMemoryDeltaSaver(InstrumentedAsyncPostgresSaver):
+    """Reads stored blobs from InMemorySaver instead of Postgres."""
+
+    async def _fetch_message_versions(self, thread_key, versions):
+        return {
+            version: self._base.serde.loads_typed(blob)
+            for (thread_id, ns, channel, version), blob in self._base.blobs.items()
+            if (thread_id, ns) == thread_key and channel == "messages" and version in versions
+        }
+
+
+def _graph(base: InMemorySaver, snapshot_every: int = 3):
+    saver = _InMemoryDeltaSaver(
+        base=base,
+        pool=None,
+        slow_threshold_s=1.0,
+        max_messages=200,
+        max_chars=4000,
+        drop_base64=True,
+        delta_codec=MessageDeltaCodec(snapshot_every=snapshot_every),
+    )
+    builder = StateGraph(_State)
+    builder.add_node("reply", _reply)
+    builder.add_edge(START, "reply")
+    builder.add_edge("reply", END)
+    return builder.compile(checkpointer=saver)
+
+
+@pytest.mark.asyncio
+async def test_graph_state_and_history_reconstruct_from_deltas():
+    base = InMemorySaver()
+    graph = _graph(base)
+    config = {"configurable": {"thread_id": "session-1"}}
+    for i in range(5):
+        await graph.ainvoke({"messages": [{"role": "user", "content": f"u{i}"}]}, config)
+
+    stored = [base.serde.loads_typed(b) for k, b in base.blobs.items() if k[2] == "messages"]
+    assert any(is_delta(v) for v in stored)
+
+    # A new process (empty caches) reads the same storage
+    restarted = _graph(base)
+    state = await restarted.aget_state(config)
+    # Stored (compacted) messages are dicts
+    assert [m["content"] for m in state.values["messages"]][-2:] == ["u4", "reply 9"]
+
+    history = await get_state_history(restarted, "session-1", limit=20)
+    counts = [len(entry["_values"].get("messages", [])) for entry in history]
+    assert counts[0] == 10
+    assert counts == sorted(counts, reverse=True)
@@ -0,0 +1,172 @@
+"""Unit tests for incremental checkpoint compaction."""
+
+from __future__ import annotations
+
+import copy
+
+import orjson
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.langgraph.checkpointer import (
+    CheckpointCompactor,
+    _compact_payload,
+    _serialize_for_json,
+)
+
+
+THREAD = ("thread-1", "")
+
+
+def _conversation(n: int) -> list:
+    messages = []
+    for i in range(n):
+        if i % 2 == 0:
+            content = f"Питання {i}" if i % 10 else "data:image/png;base64,AAAA"
+            messages.append(HumanMessage(content=content))
+        else:
+            messages.append(AIMessage(content=f"Відповідь {i} " + "x" * (i % 7) * 1000))
+    return messages
+
+
+def _checkpoint(messages: list, **channels) -> dict:
+    return {
+        "v": 1,
+        "id": "cp",
+        "channel_values": {"messages": list(messages), **channels},
+        "channel_versions": {"messages": str(len(messages))},
+    }
+
+
+def _full(checkpoint: dict, **kwargs) -> dict:
+    return _compact_payload(copy.deepcopy(checkpoint), **kwargs)
+
+
+def test_incremental_output_matches_full_pass_as_history_grows():
+    compactor = CheckpointCompactor()
+    history = _conversation(60)
+
+    for turn in range(1, len(history) + 1):
+        checkpoint = _checkpoint(history[:turn], current_state="STATE_1")
+        incremental, stats = compactor.compact(
+            checkpoint, thread_key=THREAD, max_messages=40, max_chars=3000
+        )
+        assert incremental == _full(checkpoint, max_messages=40, max_chars=3000)
+        assert stats.reused_messages == turn - 1
+
+
+def test_estimated_size_matches_serialized_payload():
+    compactor = CheckpointCompactor()
+    checkpoint = _checkpoint(_conversation(30), metadata={"step_history": list(range(20))})
+
+    compacted, stats = compactor.compact(checkpoint, thread_key=THREAD)
+
+    assert stats.size_after == len(orjson.dumps(_serialize_for_json(compacted)))
+    assert stats.size_before == len(orjson.dumps(_serialize_for_json(checkpoint)))
+
+
+def test_only_new_messages_are_compacted(monkeypatch):
+    from src.agents.langgraph import checkpointer
+
+    compactor = CheckpointCompactor()
+    history = _conversation(50)
+    compactor.compact(_checkpoint(history), thread_key=THREAD)
+
+    calls = []
+    original = checkpointer._compact_message
+    monkeypatch.setattr(
+        checkpointer, "_compact_message", lambda *a: calls.append(a) or original(*a)
+    )
+    history.append(HumanMessage(content="Нове"))
+    _, stats = compactor.compact(_checkpoint(history), thread_key=THREAD)
+
+    assert len(calls) == 1
+    assert stats.reused_messages == 50
+
+
+def test_reloaded_compacted_history_is_reused():
+    compactor = CheckpointCompactor()
+    compacted, _ = compactor.compact(_checkpoint(_conversation(20)), thread_key=THREAD)
+
+    # Next run: LangGraph loads the stored (compacted) messages and appends a turn
+    reloaded = copy.deepcopy(compacted["channel_values"]["messages"])
+    reloaded.append({"role": "user", "content": "ще"})
+    result, stats = compactor.compact(_checkpoint(reloaded), thread_key=THREAD)
+
+    assert stats.reused_messages == 20
+    assert result == _full(_checkpoint(reloaded))
+
+
+def test_reloaded_trimmed_history_aligns_with_kept_window():
+    compactor = CheckpointCompactor()
+    compacted, _ = compactor.compact(
+        _checkpoint(_conversation(60)), thread_key=THREAD, max_messages=40
+    )
+
+    reloaded = copy.deepcopy(compacted["channel_values"]["messages"])
+    reloaded.append({"role": "user", "content": "ще"})
+    result, stats = compactor.compact(_checkpoint(reloaded), thread_key=THREAD, max_messages=40)
+
+    assert stats.reused_messages == 40
+    assert result == _full(_checkpoint(reloaded), max_messages=40)
+
+
+def test_replaced_or_mutated_message_is_recompacted():
+    compactor = CheckpointCompactor()
+    history = _conversation(10)
+    compactor.compact(_checkpoint(history), thread_key=THREAD)
+
+    history[3] = AIMessage(content="замінено")
+    history[7].content = "змінено на місці"
+    result, stats = compactor.compact(_checkpoint(history), thread_key=THREAD)
+
+    contents = [m["content"] for m in result["channel_values"]["messages"]]
+    assert contents[3] == "замінено"
+    assert contents[7] == "змінено на місці"
+    assert stats.reused_messages == 3
+
+
+def test_unchanged_channel_versions_are_reused_and_inputs_not_mutated():
+    compactor = CheckpointCompactor()
+    response = {"response_text": "r" * 5000, "image": "data:image/png;base64,AAAA"}
+    checkpoint = _checkpoint([], agent_response=response)
+    checkpoint["channel_versions"]["agent_response"] = "1"
+    snapshot = copy.deepcopy(checkpoint)
+
+    first, _ = compactor.compact(checkpoint, thread_key=THREAD)
+    second, _ = compactor.compact(checkpoint, thread_key=THREAD)
+
+    assert checkpoint == snapshot
+    out = first["channel_values"]["agent_response"]
+    assert out["image"] == "[IMAGE DATA REMOVED]"
+    assert out["response_text"].endswith("... [TRUNCATED]")
+    assert second["channel_values"]["agent_response"] is out
+
+
+def test_thread_states_are_bounded():
+    compactor = CheckpointCompactor(max_threads=2)
+    for thread in ("a", "b", "c"):
+        compactor.compact(_checkpoint(_conversation(3)), thread_key=(thread, ""))
+    assert len(compactor) == 2
+
+
+@pytest.mark.parametrize("config", [None, {}, {"configurable": {}}])
+def test_process_payload_without_thread_still_compacts(config):
+    from unittest.mock import MagicMock
+
+    from src.agents.langgraph.checkpointer import InstrumentedAsyncPostgresSaver
+
+    compactor = CheckpointCompactor()
+    saver = InstrumentedAsyncPostgresSaver(
+        base=MagicMock(),
+        pool=MagicMock(),
+        slow_threshold_s=1.0,
+        max_messages=5,
+        max_chars=4000,
+        drop_base64=True,
+        compactor=compactor,
+    )
+    result = saver._process_payload(_checkpoint(_conversation(8)), config)
+
+    assert len(result["channel_values"]["messages"]) == 5
+    assert len(compactor) == 0
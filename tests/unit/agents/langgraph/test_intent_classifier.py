@@ -0,0 +1,129 @@
+"""Regression tests: compiled intent classifier vs. the per-keyword scan."""
+
+from __future__ import annotations
+
+from itertools import islice, product
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+import yaml
+
+from src.agents.langgraph.nodes.intent import detect_intent_from_text
+from src.agents.langgraph.nodes.intent_classifier import (
+    GREETING_MAX_LEN,
+    PRIORITY_INTENTS,
+    IntentClassifier,
+    KeywordAutomaton,
+    get_intent_classifier,
+    load_intent_patterns,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+
+GOLDEN_DATA_PATH = Path(__file__).resolve().parents[3] / "golden_data.yaml"
+
+STATES = ("STATE_0_INIT", "STATE_2_VISION", "STATE_4_OFFER", "STATE_5_PAYMENT_DELIVERY")
+
+EXTRA_MESSAGES = [
+    "",
+    "   ",
+    "Привіт!",
+    "Добрий день, скільки коштує доставка новою поштою?",
+    "Беру, оформлюємо",
+    "Яку розмір взяти на зріст 128?",
+    "а є інші кольори?",
+    "Скиньте фото будь ласка",
+    "Це жахливо, хочу повернення",
+    "дякую",
+    "Привіт, а можна подивитися всі сукні та костюми які у вас є в наявності?",
+]
+
+
+def _classify_by_scan(
+    patterns: Mapping[str, Sequence[str]],
+    text: str,
+    has_image: bool,
+    current_state: str,
+) -> str:
+    """The previous implementation: test every keyword list in priority order."""
+    text_lower = text.lower().strip()
+
+    def _any(group: str) -> bool:
+        return any(keyword in text_lower for keyword in patterns.get(group, []))
+
+    if not text_lower and has_image:
+        return "PHOTO_IDENT"
+    in_payment = current_state == "STATE_5_PAYMENT_DELIVERY"
+    if (
+        current_state == "STATE_4_OFFER"
+        and (_any("PAYMENT_DELIVERY") or _any("CONFIRMATION") or _any("PRODUCT_NAMES"))
+    ) or (in_payment and not _any("COMPLAINT")):
+        return "PAYMENT_DELIVERY"
+    if has_image and not in_payment and not _any("PAYMENT_DELIVERY"):
+        return "PHOTO_IDENT"
+    for intent in PRIORITY_INTENTS:
+        if _any(intent):
+            return intent
+    if len(text) < GREETING_MAX_LEN and _any("GREETING_ONLY"):
+        return "GREETING_ONLY"
+    return "DISCOVERY_OR_QUESTION"
+
+
+def _golden_corpus() -> list[tuple[str, str | None]]:
+    if not GOLDEN_DATA_PATH.exists():
+        return []
+    data = yaml.safe_load(GOLDEN_DATA_PATH.read_text(encoding="utf-8")) or {}
+    return [
+        (case.get("input") or "", case.get("context_state"))
+        for suite in data.get("suites", [])
+        for case in suite.get("cases", [])
+    ]
+
+
+def _corpus(patterns: dict[str, list[str]]) -> list[str]:
+    keywords = [kw for group in patterns.values() for kw in group]
+    texts = [text for text, _state in _golden_corpus()] + EXTRA_MESSAGES
+    texts += keywords
+    texts += [f"  {kw.upper()}  " for kw in keywords]
+    texts += [f"ну {kw}, ок" for kw in keywords]
+    # Keyword pairs exercise priority between groups
+    texts += [f"{a} {b}" for a, b in islice(product(keywords, keywords[::7]), 4000)]
+    return texts
+
+
+@pytest.fixture(scope="module")
+def patterns():
+    return load_intent_patterns()
+
+
+def test_compiled_classifier_matches_scan_on_corpus(patterns):
+    classifier = IntentClassifier(patterns)
+    mismatches = [
+        (text, state, has_image)
+        for text in _corpus(patterns)
+        for state in STATES
+        for has_image in (False, True)
+        if classifier.classify(text, has_image, state) != _classify_by_scan(patterns, text, has_image, state)
+    ]
+    assert mismatches == []
+
+
+def test_golden_cases_route_like_scan(patterns):
+    for text, state in _golden_corpus():
+        state = state or "STATE_0_INIT"
+        assert detect_intent_from_text(text, False, state) == _classify_by_scan(patterns, text, False, state)
+
+
+def test_automaton_reports_overlapping_keywords():
+    automaton = KeywordAutomaton([("he", 1), ("she", 2), ("hers", 4), ("s", 8)])
+    assert automaton.scan("ushers") == 1 | 2 | 4 | 8
+    assert automaton.scan("h") == 0
+    assert automaton.scan("") == 0
+
+
+def test_classifier_is_built_once_per_registry_snapshot():
+    assert get_intent_classifier() is get_intent_classifier()
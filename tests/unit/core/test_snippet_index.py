@@ -0,0 +1,122 @@
+"""Tests for the prompt registry snippet index."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from src.core import prompt_registry
+from src.core.prompt_registry import PromptConfig, SnippetIndex, get_snippet_by_header
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+SNIPPETS_MD = """# Snippets
+
+### Привітання
+WHEN: greeting
+Вітаю!
+---
+Чим допомогти?
+
+### Сукня Анна — presentation
+PRIORITY: high
+Сукня Анна — хіт сезону
+
+### Порожній
+NEVER: always
+"""
+
+FALLBACKS_MD = """### Привітання
+Не має перекрити snippets.md
+
+### FALLBACK_X
+Щось пішло не так
+"""
+
+
+class _FakeRegistry:
+    def __init__(self, files: dict[str, Path]):
+        self.files = files
+        self.reads = 0
+        self.invalidated: list[str] = []
+
+    def get(self, key):
+        path = self.files.get(key)
+        if path is None:
+            raise FileNotFoundError(key)
+        self.reads += 1
+        return PromptConfig(key=key, content=path.read_text(encoding="utf-8"), path=path)
+
+    def invalidate(self, key=None):
+        self.invalidated.append(key)
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(prompt_registry, "SNIPPET_INDEX_CHECK_INTERVAL", 0.0)
+    snippets = tmp_path / "snippets.md"
+    fallbacks = tmp_path / "fallbacks.md"
+    snippets.write_text(SNIPPETS_MD, encoding="utf-8")
+    fallbacks.write_text(FALLBACKS_MD, encoding="utf-8")
+    fake = _FakeRegistry({"system.snippets": snippets, "system.fallbacks": fallbacks})
+    return SnippetIndex(fake, sources=("system.snippets", "system.fallbacks")), fake, snippets
+
+
+def test_header_lookup_parses_bubbles_and_respects_source_order(index):
+    idx, _, _ = index
+    assert idx.header("Привітання") == ("Вітаю!", "Чим допомогти?")
+    assert idx.header("FALLBACK_X") == ("Щось пішло не так",)
+    assert idx.header("Порожній") is None
+    assert idx.header("missing") is None
+
+
+def test_bubbles_are_shared_immutable_tuples(index):
+    idx, _, _ = index
+    first = idx.header("Привітання")
+    assert isinstance(first, tuple)
+    assert idx.header("Привітання") is first
+    # Unchanged files: same snapshot, no re-parse
+    assert idx.snapshot() is idx.snapshot()
+
+
+def test_product_lookup_skips_priority_metadata(index):
+    idx, _, _ = index
+    assert idx.product("Сукня Анна") == ("Сукня Анна — хіт сезону",)
+    assert idx.product("Костюм Лагуна") is None
+
+
+def test_product_lookup_cache_is_bounded(index, monkeypatch):
+    idx, _, _ = index
+    monkeypatch.setattr(prompt_registry, "PRODUCT_LOOKUP_CACHE_SIZE", 3)
+
+    assert idx.product("Сукня Анна") is not None
+    for i in range(5):
+        assert idx.product(f"Костюм номер{i}") is None
+
+    cache = idx.snapshot().product_cache
+    assert list(cache) == ["костюм номер2", "костюм номер3", "костюм номер4"]
+    assert idx.product("Сукня Анна") == ("Сукня Анна — хіт сезону",)
+
+
+def test_file_change_rebuilds_index(index):
+    idx, fake, snippets = index
+    assert idx.header("Привітання")[0] == "Вітаю!"
+
+    snippets.write_text(SNIPPETS_MD.replace("Вітаю!", "Добрий день!"), encoding="utf-8")
+    stat = snippets.stat()
+    os.utime(snippets, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert idx.header("Привітання")[0] == "Добрий день!"
+    assert fake.invalidated == ["system.snippets"]
+
+
+def test_public_helpers_return_lists_from_real_registry():
+    bubbles = get_snippet_by_header("COLOR_KEYS_MAPPING")
+    assert isinstance(bubbles, list) and bubbles
+    bubbles.append("caller mutation")
+    assert "caller mutation" not in get_snippet_by_header("COLOR_KEYS_MAPPING")
@@ -26,7 +26,7 @@ class TestRedisDebouncer:
 
     def test_redis_available(self, mock_redis_client):
         """RedisDebouncer should use Redis when available."""
-        with patch("redis.from_url", return_value=mock_redis_client):
+        with patch("src.services.infra.debouncer.get_redis_client", return_value=mock_redis_client):
             debouncer = RedisDebouncer(delay=1.0)
             
             assert debouncer._redis_available is True
@@ -34,7 +34,7 @@ class TestRedisDebouncer:
 
     def test_redis_unavailable_fallback(self):
         """RedisDebouncer should fallback to in-memory when Redis unavailable."""
-        with patch("redis.from_url", side_effect=Exception("Connection failed")):
+        with patch("src.services.infra.debouncer.get_redis_client", side_effect=Exception("Connection failed")):
             debouncer = RedisDebouncer(delay=1.0)
             
             assert debouncer._redis_available is False
@@ -44,7 +44,7 @@ class TestRedisDebouncer:
     @pytest.mark.asyncio
     async def test_add_message_with_redis(self, mock_redis_client):
         """add_message should work with Redis backend."""
-        with patch("redis.from_url", return_value=mock_redis_client):
+        with patch("src.services.infra.debouncer.get_redis_client", return_value=mock_redis_client):
             debouncer = RedisDebouncer(delay=0.1)
             
             callback = AsyncMock()
@@ -59,7 +59,7 @@ class TestRedisDebouncer:
     @pytest.mark.asyncio
     async def test_add_message_fallback(self):
         """add_message should use fallback when Redis unavailable."""
-        with patch("redis.from_url", side_effect=Exception("Connection failed")):
+        with patch("src.services.infra.debouncer.get_redis_client", side_effect=Exception("Connection failed")):
             debouncer = RedisDebouncer(delay=0.1)
             
             callback = AsyncMock()
@@ -74,7 +74,7 @@ class TestRedisDebouncer:
     @pytest.mark.asyncio
     async def test_wait_for_debounce_with_redis(self, mock_redis_client):
         """wait_for_debounce should work with Redis backend."""
-        with patch("redis.from_url", return_value=mock_redis_client):
+        with patch("src.services.infra.debouncer.get_redis_client", return_value=mock_redis_client):
             debouncer = RedisDebouncer(delay=0.1)
             
             message = BufferedMessage(text="Hello", has_image=False)
@@ -93,7 +93,7 @@ class TestRedisDebouncer:
     @pytest.mark.asyncio
     async def test_wait_for_debounce_fallback(self):
         """wait_for_debounce should use fallback when Redis unavailable."""
-        with patch("redis.from_url", side_effect=Exception("Connection failed")):
+        with patch("src.services.infra.debouncer.get_redis_client", side_effect=Exception("Connection failed")):
             debouncer = RedisDebouncer(delay=0.1)
             
             message = BufferedMessage(text="Hello", has_image=False)
@@ -109,7 +109,7 @@ class TestRedisDebouncer:
 
     def test_clear_session_with_redis(self, mock_redis_client):
         """clear_session should clean up Redis keys."""
-        with patch("redis.from_url", return_value=mock_redis_client):
+        with patch("src.services.infra.debouncer.get_redis_client", return_value=mock_redis_client):
             debouncer = RedisDebouncer(delay=1.0)
             
             debouncer.clear_session("test_session")
@@ -119,7 +119,7 @@ class TestRedisDebouncer:
 
     def test_clear_session_fallback(self):
         """clear_session should work with fallback."""
-        with patch("redis.from_url", side_effect=Exception("Connection failed")):
+        with patch("src.services.infra.debouncer.get_redis_client", side_effect=Exception("Connection failed")):
             debouncer = RedisDebouncer(delay=1.0)
             
             # Should not raise exception
@@ -134,7 +134,7 @@ class TestCreateDebouncer:
         mock_redis_client = MagicMock()
         mock_redis_client.ping.return_value = True
         
-        with patch("redis.from_url", return_value=mock_redis_client):
+        with patch("src.services.infra.debouncer.get_redis_client", return_value=mock_redis_client):
             debouncer = create_debouncer(delay=1.0)
             
             assert isinstance(debouncer, RedisDebouncer)
@@ -142,7 +142,7 @@ class TestCreateDebouncer:
 
     def test_create_with_redis_unavailable(self):
         """create_debouncer should return MessageDebouncer when Redis unavailable."""
-        with patch("redis.from_url", side_effect=Exception("Connection failed")):
+        with patch("src.services.infra.debouncer.get_redis_client", side_effect=Exception("Connection failed")):
             debouncer = create_debouncer(delay=1.0)
             
             assert isinstance(debouncer, MessageDebouncer)
@@ -158,7 +158,7 @@ class TestCreateDebouncer:
 
     def test_create_fallback_on_error(self):
         """create_debouncer should handle errors gracefully."""
-        with patch("redis.from_url", side_effect=Exception("Unexpected error")):
+        with patch("src.services.infra.debouncer.get_redis_client", side_effect=Exception("Unexpected error")):
             debouncer = create_debouncer(delay=1.0)
             
             # Should return MessageDebouncer on any error
@@ -0,0 +1,191 @@
+"""Tests for the paged CRM order status sync."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.integrations.crm.order_sync import next_check_delay, sync_due_orders
+from src.integrations.crm.snitkix import OrderStatusResult, SnitkixCRMClient
+
+
+class _Sessions:
+    """agent_sessions query chain used by the scanner."""
+
+    def __init__(self, rows):
+        self.rows = {r["session_id"]: dict(r) for r in rows}
+        self.not_ = self
+        self.pages = 0
+        self._reset()
+
+    def _reset(self):
+        self.after, self.size, self.now, self.statuses = "", None, None, ()
+
+    def table(self, _name):
+        return self
+
+    def select(self, _columns):
+        return self
+
+    def is_(self, *_args):
+        return self
+
+    def in_(self, _column, values):
+        self.statuses = values
+        return self
+
+    def or_(self, flt):
+        self.now = datetime.fromisoformat(flt.rsplit("lte.", 1)[1])
+        return self
+
+    def gt(self, _column, value):
+        self.after = value
+        return self
+
+    def order(self, _column):
+        return self
+
+    def limit(self, n):
+        self.size = n
+        return self
+
+    def upsert(self, rows, on_conflict=""):
+        # Like PostgREST: without a conflict target the primary key (id) is used,
+        # and rows carrying no id would be inserted as duplicates of session_id
+        assert on_conflict == "session_id"
+        for row in rows:
+            self.rows[row["session_id"]].update(row)
+        return SimpleNamespace(execute=lambda: None)
+
+    def execute(self):
+        due = [
+            dict(r)
+            for sid, r in sorted(self.rows.items())
+            if sid > self.after
+            and r["order_status"] in self.statuses
+            and (not r.get("order_next_check_at") or datetime.fromisoformat(r["order_next_check_at"]) <= self.now)
+        ][: self.size]
+        self.pages += 1
+        self._reset()
+        return SimpleNamespace(data=due)
+
+
+class _CRM:
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.requests: list[list[str]] = []
+
+    async def get_order_statuses(self, order_ids):
+        self.requests.append(order_ids)
+        return {
+            oid: OrderStatusResult(order_id=oid, status=self.statuses[oid], snitkix_status=self.statuses[oid])
+            for oid in order_ids
+            if oid in self.statuses
+        }
+
+
+def _orders(n):
+    return [{"session_id": f"s{i:03d}", "order_id": str(i), "order_status": "new"} for i in range(n)]
+
+
+def test_next_check_delay_grows_with_status_and_age(monkeypatch):
+    from src.integrations.crm import order_sync
+
+    monkeypatch.setattr(order_sync.settings, "CRM_SYNC_MIN_INTERVAL_MINUTES", 30)
+    monkeypatch.setattr(order_sync.settings, "CRM_SYNC_MAX_INTERVAL_HOURS", 24)
+
+    assert next_check_delay("new", timedelta(0)) == timedelta(minutes=30)
+    assert next_check_delay("new", timedelta(days=1)) == timedelta(hours=1)
+    assert next_check_delay("shipped", timedelta(0)) == timedelta(hours=3)
+    assert next_check_delay("shipped", timedelta(days=30)) == timedelta(hours=24)
+    assert next_check_delay("delivered", timedelta(0)) is None
+
+
+async def test_due_orders_are_paged_and_fetched_in_bulk():
+    sessions = _Sessions(_orders(7))
+    crm = _CRM({str(i): "new" for i in range(7)} | {"2": "shipped", "5": "delivered"})
+
+    stats = await sync_due_orders(sessions, crm, page_size=3, budget_seconds=5)
+
+    assert stats == {"checked": 7, "changed": 2, "missing": 0, "pages": 3}
+    assert crm.requests == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+    assert sessions.rows["s005"]["order_status"] == "delivered"
+    assert sessions.rows["s005"]["order_next_check_at"] is None
+
+    # Everything was just checked: the next run finds nothing due
+    again = await sync_due_orders(sessions, crm, page_size=3, budget_seconds=5)
+    assert again["checked"] == 0
+    assert len(crm.requests) == 3
+
+
+async def test_order_missing_in_crm_is_rescheduled_not_retried_every_run():
+    sessions = _Sessions(_orders(1))
+
+    stats = await sync_due_orders(sessions, _CRM({}), budget_seconds=5)
+
+    row = sessions.rows["s000"]
+    assert stats["missing"] == 1
+    assert row["order_status"] == "new"
+    assert datetime.fromisoformat(row["order_next_check_at"]) > datetime.now(UTC)
+
+
+def _snitkix(handler) -> SnitkixCRMClient:
+    client = SnitkixCRMClient(api_url="https://crm.test", api_key="key")
+    client._client = httpx.AsyncClient(base_url="https://crm.test", transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_snitkix_bulk_status_with_per_order_fallback():
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.url.path)
+        if request.url.path == "/api/orders":
+            assert request.url.params["ids"] == "1,2,3"
+            return httpx.Response(200, json={"data": [{"id": 1, "status": "paid"}, {"id": 2, "status": "new"}]})
+        return httpx.Response(200, json={"id": 3, "status": "shipped"})
+
+    crm = _snitkix(handler)
+    statuses = await crm.get_order_statuses(["1", "2", "3"])
+
+    assert {k: v.snitkix_status for k, v in statuses.items()} == {"1": "paid", "2": "new", "3": "shipped"}
+    assert calls == ["/api/orders", "/api/orders/3"]
+
+
+@pytest.mark.asyncio
+async def test_snitkix_stops_bulk_requests_when_ids_are_ignored():
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.url.path)
+        if request.url.path == "/api/orders":
+            return httpx.Response(200, json={"data": [{"id": 99, "status": "new"}]})
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[1], "status": "new"})
+
+    crm = _snitkix(handler)
+    await crm.get_order_statuses(["1", "2"])
+    await crm.get_order_statuses(["3", "4"])
+
+    assert calls.count("/api/orders") == 1
+    assert len(calls) == 5
+
+
+def test_sync_budget_fits_inside_task_time_limits():
+    import inspect
+
+    from annotated_types import Le
+
+    from src.conf.config import Settings
+    from src.workers.tasks.crm import check_pending_orders
+
+    field = Settings.model_fields["CRM_SYNC_BUDGET_SECONDS"]
+    max_budget = next(m.le for m in field.metadata if isinstance(m, Le))
+    request_timeout = inspect.signature(SnitkixCRMClient).parameters["timeout"].default
+
+    # The last page can start right before the deadline and wait out one CRM request
+    assert field.default <= max_budget
+    assert max_budget + request_timeout < check_pending_orders.soft_time_limit < check_pending_orders.time_limit
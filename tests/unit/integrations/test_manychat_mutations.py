@@ -0,0 +1,198 @@
+"""Tests for per-turn ManyChat field/tag mutation batching."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.integrations.manychat import mutations as mutations_module
+from src.integrations.manychat import push_client as push_module
+from src.integrations.manychat.api_client import ManyChatClient
+from src.integrations.manychat.mutations import (
+    MutationLedger,
+    SubscriberMutations,
+    apply_mutations,
+    count_turn_api_calls,
+    split_for_send_content,
+    watch_dropped_actions,
+)
+from src.integrations.manychat.push_client import ManyChatPushClient
+
+
+def _turn(**fields) -> SubscriberMutations:
+    mutations = SubscriberMutations("1")
+    for name, value in fields.items():
+        mutations.set_field(name, value)
+    mutations.add_tag("ai_responded")
+    mutations.remove_tag("needs_human")
+    return mutations
+
+
+def test_later_changes_win_and_unchanged_values_are_dropped():
+    turn = _turn(ai_state="STATE_1", ai_intent="greeting")
+    turn.merge(_turn(ai_state="STATE_2"))
+    assert turn.fields == {"ai_state": "STATE_2", "ai_intent": "greeting"}
+
+    ledger = MutationLedger()
+    assert ledger.diff(turn) == turn
+    ledger.record(turn)
+
+    pending = ledger.diff(_turn(ai_state="STATE_2", ai_intent="size", order_sum=1200))
+    assert pending.fields == {"ai_intent": "size", "order_sum": 1200}
+    assert pending.tags == {}
+    assert ledger.get_stats()["skipped"] == 3
+
+
+def test_webhook_snapshot_is_the_known_state():
+    ledger = MutationLedger()
+    ledger.observe(
+        "1",
+        {
+            "custom_fields": {"ai_state": "STATE_1", "order_sum": 1200},
+            "tags": [{"name": "ai_responded"}],
+        },
+    )
+
+    pending = ledger.diff(_turn(ai_state="STATE_1", order_sum="1200", ai_intent="x"))
+
+    # needs_human is not in the snapshot, so removing it is a no-op too
+    assert pending.fields == {"ai_intent": "x"}
+    assert pending.tags == {}
+
+
+def test_split_respects_action_limit_and_instagram_rules(monkeypatch):
+    turn = _turn(ai_state="S", ai_intent="I", last_product="P", order_sum="10")
+
+    piggyback, rest = split_for_send_content(turn, "facebook")
+    assert piggyback.action_count == 5
+    assert piggyback.tags == {"ai_responded": True}
+    assert rest.tags == {"needs_human": False}
+
+    monkeypatch.setattr(mutations_module, "settings", SimpleNamespace(MANYCHAT_INSTAGRAM_DISABLE_ACTIONS=False))
+    piggyback, rest = split_for_send_content(turn, "instagram")
+    assert list(piggyback.fields) == ["ai_state", "ai_intent"]
+    assert not piggyback.tags
+    assert rest.action_count == 4
+
+    monkeypatch.setattr(mutations_module, "settings", SimpleNamespace(MANYCHAT_INSTAGRAM_DISABLE_ACTIONS=True))
+    piggyback, rest = split_for_send_content(turn, "instagram")
+    assert not piggyback
+    assert rest == turn
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("field_error", [False, True])
+async def test_push_reports_actions_dropped_by_field_error_retry(monkeypatch, field_error):
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request):
+        body = json.loads(request.content)
+        bodies.append(body)
+        if field_error and body["data"]["content"]["actions"]:
+            return httpx.Response(400, text="Field with same name not found")
+        return httpx.Response(200, json={"status": "success"})
+
+    monkeypatch.setattr(push_module, "calculate_typing_delay", lambda _length: 0.0)
+    monkeypatch.setattr(
+        ManyChatPushClient,
+        "_build_http_client",
+        staticmethod(lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))),
+    )
+    client = ManyChatPushClient(api_url="https://manychat.test", api_key="key")
+
+    with watch_dropped_actions() as dropped:
+        ok = await client.send_content(
+            "1",
+            [{"type": "text", "text": "hi"}],
+            channel="facebook",
+            set_field_values=[{"field_name": "ai_state", "field_value": "S"}],
+        )
+    await client.aclose()
+
+    assert ok
+    assert dropped[0] is field_error
+    assert len(bodies) == (2 if field_error else 1)
+
+
+def _client(handler) -> ManyChatClient:
+    client = ManyChatClient(api_key="key")
+    http = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+
+    async def _get_client():
+        return http
+
+    client._get_client = _get_client  # type: ignore[method-assign]
+    return client
+
+
+@pytest.mark.asyncio
+async def test_apply_sends_fields_in_one_request_and_counts_calls():
+    requests: list[tuple[str, dict]] = []
+
+    def handler(request: httpx.Request):
+        requests.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={"status": "success"})
+
+    with count_turn_api_calls() as calls:
+        applied = await apply_mutations(_turn(ai_state="S", ai_intent="I", order_sum=10), _client(handler))
+
+    assert applied == _turn(ai_state="S", ai_intent="I", order_sum=10)
+    assert calls[0] == 3
+    paths = sorted(path for path, _ in requests)
+    assert paths == ["/fb/subscriber/addTagByName", "/fb/subscriber/removeTagByName", "/fb/subscriber/setCustomFields"]
+    bulk = next(body for path, body in requests if path.endswith("setCustomFields"))
+    assert bulk["fields"][2] == {"field_name": "order_sum", "field_value": "10"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_fields_fall_back_to_single_requests():
+    paths: list[str] = []
+
+    def handler(request: httpx.Request):
+        paths.append(request.url.path)
+        if request.url.path.endswith("/subscriber/setCustomFields"):
+            return httpx.Response(404, json={"status": "error"})
+        return httpx.Response(200, json={"status": "success"})
+
+    client = _client(handler)
+    assert await client.set_custom_fields("1", {"a": "1", "b": "2"})
+    assert await client.set_custom_fields("1", {"c": "3"})
+
+    assert paths.count("/fb/subscriber/setCustomFields") == 1
+    assert paths.count("/fb/subscriber/setCustomFieldByName") == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_fields_rate_limited_does_not_fan_out():
+    paths: list[str] = []
+
+    def handler(request: httpx.Request):
+        paths.append(request.url.path)
+        return httpx.Response(429, json={"status": "error", "message": "Too Many Requests"})
+
+    assert not await _client(handler).set_custom_fields("1", {"a": "1", "b": "2"})
+    assert paths == ["/fb/subscriber/setCustomFields"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_field_error_falls_back_for_that_chunk_only():
+    requests: list[tuple[str, dict]] = []
+
+    def handler(request: httpx.Request):
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        if request.url.path.endswith("/setCustomFields") and any(
+            f["field_name"] == "bad" for f in body["fields"]
+        ):
+            return httpx.Response(400, json={"status": "error", "message": "Field 'bad' not found"})
+        return httpx.Response(200, json={"status": "success"})
+
+    fields = {f"f{i}": str(i) for i in range(20)} | {"bad": "x", "c": "3"}
+    await _client(handler).set_custom_fields("1", fields)
+
+    singles = [body["field_name"] for path, body in requests if path.endswith("setCustomFieldByName")]
+    assert singles == ["bad", "c"]
+    assert [path for path, _ in requests].count("/fb/subscriber/setCustomFields") == 2
@@ -0,0 +1,103 @@
+"""Tests for the persistent ManyChat push connection pool."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.circuit_breaker import MANYCHAT_BREAKER, CircuitState
+from src.integrations.manychat import push_client as push_module
+from src.integrations.manychat.push_client import ManyChatPushClient
+
+
+@pytest.fixture(autouse=True)
+def _closed_breaker():
+    MANYCHAT_BREAKER.state = CircuitState.CLOSED
+    MANYCHAT_BREAKER.failure_count = 0
+    yield
+    MANYCHAT_BREAKER.state = CircuitState.CLOSED
+    MANYCHAT_BREAKER.failure_count = 0
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Count client builds and requests going through a mock transport."""
+    built: list[httpx.AsyncClient] = []
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"status": "success"})
+
+    def build() -> httpx.AsyncClient:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(ManyChatPushClient, "_build_http_client", staticmethod(build))
+    return built, requests
+
+
+def _client() -> ManyChatPushClient:
+    return ManyChatPushClient(api_url="https://manychat.test", api_key="key")
+
+
+async def test_requests_reuse_one_client_until_closed(transport):
+    built, requests = transport
+    client = _client()
+
+    for i in range(3):
+        ok, _, status = await client._do_send(f"sub-{i}", {"subscriber_id": i}, {})
+        assert ok and status == 200
+
+    assert len(built) == 1 and len(requests) == 3
+    assert str(requests[0].url) == "https://manychat.test/fb/sending/sendContent"
+
+    await client.aclose()
+    assert built[0].is_closed
+    await client._do_send("sub", {}, {})
+    assert len(built) == 2
+    await client.aclose()
+
+
+def test_each_event_loop_gets_its_own_client(transport):
+    built, _ = transport
+    client = _client()
+
+    async def send() -> httpx.AsyncClient:
+        await client._do_send("sub", {}, {})
+        return client._get_http_client()
+
+    first = asyncio.run(send())
+    second = asyncio.run(send())
+
+    assert len(built) == 2
+    assert first is not second
+
+
+async def test_request_latency_is_recorded(transport, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(
+        "src.services.core.observability.track_metric",
+        lambda name, value, tags=None: recorded.append((name, value, tags)),
+    )
+
+    await _client()._do_send("sub", {}, {})
+
+    assert [(name, tags) for name, _, tags in recorded] == [
+        ("manychat_push_request_ms", {"status": "200"})
+    ]
+    assert recorded[0][1] >= 0
+
+
+def test_pool_limits_come_from_settings(monkeypatch):
+    monkeypatch.setattr(push_module.settings, "MANYCHAT_HTTP_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(push_module.settings, "MANYCHAT_HTTP2_ENABLED", False)
+
+    client = ManyChatPushClient._build_http_client()
+
+    pool = client._transport._pool
+    assert pool._max_connections == 7
+    assert pool._http2 is False
@@ -0,0 +1,147 @@
+"""Tests for ManyChatClient subscriber caching and request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.integrations.manychat import tag_probe
+from src.integrations.manychat.api_client import ManyChatClient
+from src.integrations.manychat.subscriber_cache import SubscriberCache
+
+
+class _API:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: list[str] = []
+        self.tags: dict[str, list[str]] = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path)
+        await asyncio.sleep(self.delay)
+        if request.url.path.endswith("/subscriber/getInfo"):
+            sid = request.url.params["subscriber_id"]
+            return httpx.Response(200, json={"data": {"id": sid, "tags": self.tags.get(sid, [])}})
+        if request.url.path.endswith("/subscriber/findByCustomField"):
+            return httpx.Response(200, json={"data": [{"id": "42", "tags": []}]})
+        return httpx.Response(200, json={"status": "success"})
+
+
+def _client(api: _API) -> ManyChatClient:
+    client = ManyChatClient(api_key="key")
+    http = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(api))
+
+    async def _get_client():
+        return http
+
+    client._get_client = _get_client  # type: ignore[method-assign]
+    return client
+
+
+def _info_calls(api: _API) -> int:
+    return sum(path.endswith("/subscriber/getInfo") for path in api.calls)
+
+
+@pytest.mark.asyncio
+async def test_repeated_lookups_are_served_from_cache():
+    api = _API()
+    client = _client(api)
+
+    first = await client.get_subscriber_info("1")
+    second = await client.get_subscriber_info("1")
+
+    assert first == second == {"id": "1", "tags": []}
+    assert _info_calls(api) == 1
+    assert client.get_cache_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_request():
+    api = _API(delay=0.02)
+    client = _client(api)
+
+    results = await asyncio.gather(*(client.get_subscriber_info("1") for _ in range(10)))
+
+    assert all(r == {"id": "1", "tags": []} for r in results)
+    assert _info_calls(api) == 1
+
+
+@pytest.mark.asyncio
+async def test_tag_and_field_changes_invalidate_cache():
+    api = _API()
+    client = _client(api)
+    tag_probe._tag_cache.put("1", frozenset({"old"}))
+
+    await client.get_subscriber_info("1")
+    api.tags["1"] = ["ai_responded"]
+    await client.add_tag("1", "ai_responded")
+    assert (await client.get_subscriber_info("1"))["tags"] == ["ai_responded"]
+    assert tag_probe._tag_cache.get("1", ttl=300) is None
+
+    await client.set_custom_fields("1", {"ai_state": "STATE_1"})
+    await client.get_subscriber_info("1")
+    assert _info_calls(api) == 3
+
+
+@pytest.mark.asyncio
+async def test_lookup_in_flight_during_a_change_is_not_cached():
+    api = _API(delay=0.05)
+    client = _client(api)
+
+    lookup = asyncio.create_task(client.get_subscriber_info("1"))
+    await asyncio.sleep(0.01)
+    client.invalidate_subscriber("1")
+    await lookup
+
+    await client.get_subscriber_info("1")
+    assert _info_calls(api) == 2
+
+
+@pytest.mark.asyncio
+async def test_field_lookup_is_cached_and_dropped_with_the_subscriber():
+    api = _API()
+    client = _client(api)
+
+    assert (await client.find_subscriber_by_custom_field("phone", "380"))["id"] == "42"
+    await client.find_subscriber_by_custom_field("phone", "380")
+    await client.get_subscriber_info("42")
+    assert api.calls.count("/fb/subscriber/findByCustomField") == 1
+    assert _info_calls(api) == 0
+
+    await client.remove_tag("42", "x")
+    await client.find_subscriber_by_custom_field("phone", "380")
+    assert api.calls.count("/fb/subscriber/findByCustomField") == 2
+
+
+@pytest.mark.asyncio
+async def test_field_lookup_in_flight_during_a_change_is_not_cached_or_shared():
+    api = _API(delay=0.05)
+    client = _client(api)
+
+    lookup = asyncio.create_task(client.find_subscriber_by_custom_field("phone", "380"))
+    await asyncio.sleep(0.01)
+    client.invalidate_subscriber("42")
+    # Started after the change: must not join the old lookup
+    fresh = asyncio.create_task(client.find_subscriber_by_custom_field("phone", "380"))
+    await asyncio.gather(lookup, fresh)
+    assert api.calls.count("/fb/subscriber/findByCustomField") == 2
+
+    # Only the lookup that started after the change was cached
+    await client.find_subscriber_by_custom_field("phone", "380")
+    await client.get_subscriber_info("42")
+    assert api.calls.count("/fb/subscriber/findByCustomField") == 2
+    assert _info_calls(api) == 0
+
+
+def test_field_answer_from_before_an_invalidation_is_dropped():
+    cache = SubscriberCache()
+    generation = cache.generation()
+    cache.invalidate("42")
+
+    cache.put_by_field(("phone", "380"), {"id": "42"}, generation)
+    assert cache.get_by_field(("phone", "380"), ttl=30) is None
+
+    cache.put_by_field(("phone", "380"), {"id": "42"}, cache.generation())
+    assert cache.get_by_field(("phone", "380"), ttl=30) == {"id": "42"}
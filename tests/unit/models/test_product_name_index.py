@@ -0,0 +1,112 @@
+"""
+Product Name Index Tests
+========================
+
+Індекс назв продуктів: детермінованість, атомарний reload і мікробенчмарк
+проти попередньої лінійної реалізації.
+"""
+
+import time
+
+import pytest
+
+from src.services.domain.catalog import product_matcher
+from src.services.domain.catalog.name_index import ProductNameIndex
+from src.services.domain.catalog.product_matcher import (
+    _get_valid_product_names,
+    _load_canonical_names,
+    normalize_product_name,
+    reload_canonical_names,
+)
+
+
+def _linear_normalize(raw_name: str) -> str | None:
+    """Previous implementation (linear scan), kept as the benchmark baseline."""
+    normalized = raw_name.strip().lower()
+    if not normalized:
+        return None
+    canonical_map = _load_canonical_names()
+    if normalized in canonical_map:
+        return canonical_map[normalized]
+    words = normalized.split()
+    for i in range(len(words), 0, -1):
+        partial = " ".join(words[:i])
+        if partial in canonical_map:
+            return canonical_map[partial]
+    for key, value in canonical_map.items():
+        if key in normalized or normalized in key:
+            return value
+    for valid_name in _get_valid_product_names():
+        if valid_name.lower() in normalized or normalized in valid_name.lower():
+            return valid_name
+    return None
+
+
+MENTIONS = [
+    "Костюм Лагуна рожевий",
+    "лагуна",
+    "Сукня Анна голубий",
+    "тренч еко",
+    "Тренч екошкіра капучіно",
+    "Ось наш костюм мрія жовтий для дівчинки",
+    "Гарна сукня анна малина, розмір 128",
+    "Костюм Неіснуючий",
+    "Nike костюм",
+    "каприз бордовий",
+]
+
+
+class TestProductNameIndex:
+    def test_longest_contained_alias_wins(self):
+        index = ProductNameIndex([("ритм", "Костюм Ритм"), ("ритм рожевий", "Ритм Рожевий")])
+        assert index.longest_contained("новий ритм рожевий тут") == "Ритм Рожевий"
+
+    def test_ties_follow_source_order(self):
+        index = ProductNameIndex([("анна", "A"), ("ритм", "B")])
+        assert index.longest_contained("ритм і анна") == "A"
+
+    def test_partial_alias_from_word_start(self):
+        index = ProductNameIndex([("тренч екошкіра", "Тренч екошкіра"), ("тренч", "Тренч")])
+        assert index.partial("екошк") == "Тренч екошкіра"
+        assert index.partial("шкіра") is None
+
+    def test_overlapping_aliases_found_via_fail_links(self):
+        index = ProductNameIndex([("abcd", "X"), ("bc", "Y")])
+        assert index.longest_contained("zabcz") == "Y"
+        assert index.longest_contained("zabcdz") == "X"
+
+
+class TestIndexedNormalizer:
+    def setup_method(self):
+        reload_canonical_names()
+
+    @pytest.mark.parametrize("mention", MENTIONS)
+    def test_matches_linear_implementation(self, mention):
+        assert normalize_product_name(mention) == _linear_normalize(mention)
+
+    def test_reload_swaps_index_atomically(self):
+        before = product_matcher._get_name_index()
+        reload_canonical_names()
+        after = product_matcher._get_name_index()
+        assert after is not before
+        assert len(after) == len(before)
+
+    @pytest.mark.slow
+    def test_micro_benchmark_against_linear_scan(self):
+        rounds = 2000
+        normalize_product_name("warmup")
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for mention in MENTIONS:
+                _linear_normalize(mention)
+        linear = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for mention in MENTIONS:
+                product_matcher._get_name_index().normalize(mention.strip().lower())
+        indexed = time.perf_counter() - start
+
+        # Generous bound: guards against regressions, not machine-specific speedups.
+        assert indexed < linear * 3
@@ -0,0 +1,214 @@
+"""Tests for the follow-up last-activity index."""
+
+from __future__ import annotations
+
+import re
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.core.constants import MessageTag
+from src.services.infra.followup_index import due_filter, iter_due_sessions, record_activity
+from src.services.infra.message_store import StoredMessage, SupabaseMessageStore
+
+
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=UTC)
+CLAUSE = re.compile(r"and\(followups_sent\.eq\.(\d+),last_activity_at\.lte\.([^)]+)\)")
+AFTER = re.compile(r'last_activity_at\.gt\."([^"]+)",and\(last_activity_at\.eq\."[^"]+",session_id\.gt\."([^"]+)"\)')
+
+
+class _Query:
+    def __init__(self, table: _Table):
+        self.table = table
+        self.filters: list = []
+        self.window: tuple[int, int] | None = None
+        self.changes: dict | None = None
+        self.ordered = False
+
+    def select(self, _columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def limit(self, n):
+        self.window = (0, n - 1)
+        return self
+
+    def or_(self, flt):
+        if flt.startswith("last_activity_at.is.null,last_activity_at.lt."):
+            bound = datetime.fromisoformat(flt.rsplit(".lt.", 1)[1])
+            self.filters.append(
+                lambda row: row.get("last_activity_at") is None
+                or datetime.fromisoformat(row["last_activity_at"]) < bound
+            )
+            return self
+        after = AFTER.search(flt)
+        if after:
+            cursor = (datetime.fromisoformat(after.group(1)), after.group(2))
+            self.filters.append(
+                lambda row: (datetime.fromisoformat(row["last_activity_at"]), row["session_id"]) > cursor
+            )
+        clauses = [(int(s), datetime.fromisoformat(t)) for s, t in CLAUSE.findall(flt)]
+        self.filters.append(
+            lambda row: row.get("last_activity_at") is not None
+            and any(
+                row.get("followups_sent", 0) == sent
+                and datetime.fromisoformat(row["last_activity_at"]) <= cutoff
+                for sent, cutoff in clauses
+            )
+        )
+        return self
+
+    def order(self, _column):
+        self.ordered = True
+        return self
+
+    def update(self, changes):
+        self.changes = changes
+        return self
+
+    def execute(self):
+        matched = [r for r in self.table.rows.values() if all(f(r) for f in self.filters)]
+        if self.changes is not None:
+            for row in matched:
+                row.update(self.changes)
+            return SimpleNamespace(data=[dict(r) for r in matched])
+        self.table.pages += self.ordered
+        rows = sorted(matched, key=lambda r: (r["last_activity_at"] or "", r["session_id"]))
+        if self.window:
+            rows = rows[self.window[0]:self.window[1] + 1]
+        return SimpleNamespace(data=[dict(r) for r in rows])
+
+
+class _Table:
+    def __init__(self):
+        self.rows: dict[str, dict] = {}
+        self.pages = 0
+
+    def select(self, columns):
+        return _Query(self).select(columns)
+
+    def update(self, changes):
+        return _Query(self).update(changes)
+
+    def add(self, *session_ids):
+        """Session rows as created by the first state save."""
+        for session_id in session_ids:
+            self.rows[session_id] = {
+                "session_id": session_id,
+                "state": {},
+                "last_activity_at": None,
+                "followups_sent": 0,
+            }
+
+
+class _Client:
+    def __init__(self):
+        self.sessions = _Table()
+        self.other = MagicMock()
+
+    def table(self, name):
+        return self.sessions if name == "agent_sessions" else self.other
+
+
+def test_due_filter_has_one_clause_per_schedule_step():
+    flt = due_filter(NOW, [4, 23])
+    assert CLAUSE.findall(flt) == [
+        ("0", (NOW - timedelta(hours=4)).isoformat()),
+        ("1", (NOW - timedelta(hours=23)).isoformat()),
+    ]
+    assert due_filter(NOW, []) == ""
+
+
+def test_followup_messages_advance_the_schedule():
+    client = _Client()
+    client.sessions.add("s1")
+    record_activity(client, "s1", NOW - timedelta(hours=5))
+    assert [d.session_id for d in iter_due_sessions(client, NOW, [4, 23])] == ["s1"]
+
+    record_activity(client, "s1", NOW - timedelta(hours=5), [MessageTag.followup_tag(1)])
+    assert client.sessions.rows["s1"]["followups_sent"] == 1
+    assert list(iter_due_sessions(client, NOW, [4, 23])) == []
+
+    record_activity(client, "s1", NOW - timedelta(hours=30), [MessageTag.followup_tag(2)])
+    # All follow-ups in the schedule were sent
+    assert list(iter_due_sessions(client, NOW, [4, 23])) == []
+
+
+def test_out_of_order_append_does_not_move_activity_back():
+    client = _Client()
+    client.sessions.add("s1")
+
+    record_activity(client, "s1", NOW - timedelta(hours=1))
+    record_activity(client, "s1", NOW - timedelta(hours=5))
+
+    assert client.sessions.rows["s1"]["last_activity_at"] == (NOW - timedelta(hours=1)).isoformat()
+    assert list(iter_due_sessions(client, NOW, [4])) == []
+
+
+def test_append_without_a_session_row_creates_nothing():
+    client = _Client()
+
+    record_activity(client, "s1", NOW, [MessageTag.followup_tag(1)])
+
+    assert client.sessions.rows == {}
+
+
+def test_due_sessions_are_paged_oldest_first():
+    client = _Client()
+    client.sessions.add(*(f"s{i}" for i in range(7)), "recent")
+    for i in range(7):
+        record_activity(client, f"s{i}", NOW - timedelta(hours=10 + i))
+    record_activity(client, "recent", NOW - timedelta(hours=1))
+
+    due = list(iter_due_sessions(client, NOW, [4], page_size=3))
+
+    assert [d.session_id for d in due] == [f"s{i}" for i in reversed(range(7))]
+    assert client.sessions.pages == 3
+
+
+def test_sessions_updated_between_pages_are_not_skipped():
+    client = _Client()
+    client.sessions.add(*(f"s{i}" for i in range(7)))
+    for i in range(7):
+        record_activity(client, f"s{i}", NOW - timedelta(hours=10 + i))
+
+    seen = []
+    for due in iter_due_sessions(client, NOW, [4, 23], page_size=3):
+        seen.append(due.session_id)
+        # The worker sends the follow-up, which takes the session out of the due set
+        record_activity(client, due.session_id, NOW - timedelta(hours=10), [MessageTag.followup_tag(1)])
+
+    assert seen == [f"s{i}" for i in reversed(range(7))]
+
+
+def test_supabase_store_append_updates_index():
+    client = _Client()
+    client.sessions.add("s1")
+    store = SupabaseMessageStore(client)
+
+    store.append(StoredMessage(session_id="s1", role="user", content="hi", created_at=NOW))
+
+    client.other.insert.assert_called_once()
+    assert client.sessions.rows["s1"]["last_activity_at"] == NOW.isoformat()
+
+
+def test_periodic_check_queues_only_due_sessions():
+    from src.workers.tasks import followups
+
+    client = _Client()
+    client.sessions.add("due", "active")
+    record_activity(client, "due", datetime.now(UTC) - timedelta(hours=30))
+    record_activity(client, "active", datetime.now(UTC))
+
+    with (
+        patch.object(followups, "get_supabase_client", return_value=client),
+        patch.object(followups.send_followup, "delay") as delay,
+    ):
+        result = followups.check_all_sessions_for_followups.run()
+
+    assert result == {"status": "ok", "queued": 1}
+    delay.assert_called_once_with(session_id="due", channel="telegram", chat_id="due")
+    client.other.select.assert_not_called()
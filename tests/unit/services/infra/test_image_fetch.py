@@ -0,0 +1,123 @@
+"""Tests for the shared vision image fetch service."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+
+import httpx
+import pytest
+
+from src.services.infra.image_fetch import ImageFetchService, is_private_cdn_url
+
+
+def _service(handler, **kwargs) -> ImageFetchService:
+    service = ImageFetchService(**kwargs)
+    service._build_http_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+def _photo_handler(calls: list[str], body: bytes = b"\xff\xd8photo"):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        return httpx.Response(200, content=body, headers={"content-type": "image/jpeg; charset=binary"})
+
+    return handler
+
+
+async def test_repeated_url_is_served_from_cache():
+    calls: list[str] = []
+    service = _service(_photo_handler(calls))
+
+    first = await service.fetch("https://scontent.cdninstagram.com/a.jpg;")
+    second = await service.fetch("https://scontent.cdninstagram.com/a.jpg")
+
+    assert second is first
+    assert service.data_url(first) == "data:image/jpeg;base64," + base64.b64encode(b"\xff\xd8photo").decode()
+    assert len(calls) == 1
+    stats = service.get_stats()
+    assert stats["bytes_fetched"] == len(b"\xff\xd8photo")
+    assert stats["hit_ratio"] == 0.5
+
+
+async def test_same_bytes_under_new_url_share_one_cache_entry():
+    calls: list[str] = []
+    service = _service(_photo_handler(calls))
+
+    a = await service.fetch("https://fbcdn.net/a.jpg?sig=1")
+    b = await service.fetch("https://fbcdn.net/a.jpg?sig=2")
+
+    assert a is b
+    assert service.get_stats()["content_hits"] == 1
+    assert service.get_stats()["cached_images"] == 1
+
+
+async def test_concurrent_requests_share_one_download():
+    calls: list[str] = []
+    service = _service(_photo_handler(calls))
+
+    results = await asyncio.gather(*(service.fetch("https://fbcdn.net/x.jpg") for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+@pytest.mark.parametrize("declare_length", [True, False])
+async def test_oversized_download_is_aborted(declare_length):
+    body = b"x" * 2048
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if declare_length:
+            return httpx.Response(200, content=body)
+        return httpx.Response(200, stream=httpx.ByteStream(body), headers={})
+
+    service = _service(handler, max_bytes=1024)
+
+    assert await service.fetch("https://fbcdn.net/big.jpg", max_retries=0) is None
+    assert service.get_stats()["cached_images"] == 0
+
+
+async def test_cache_is_bounded_in_bytes():
+    bodies = iter([b"a" * 600, b"b" * 600])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=next(bodies))
+
+    service = _service(handler, cache_max_bytes=1000)
+    await service.fetch("https://fbcdn.net/1.jpg")
+    await service.fetch("https://fbcdn.net/2.jpg")
+
+    stats = service.get_stats()
+    assert stats["cached_images"] == 1
+    assert stats["cached_bytes"] == 600
+    assert service.cached("https://fbcdn.net/1.jpg") is None
+
+
+async def test_derived_data_urls_count_against_the_byte_budget():
+    bodies = iter([b"a" * 300, b"b" * 300])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=next(bodies))
+
+    service = _service(handler, cache_max_bytes=1000)
+    first = await service.fetch("https://fbcdn.net/1.jpg")
+    data_url = service.data_url(first)
+
+    assert service.data_url(first) is data_url
+    assert service.get_stats()["cached_bytes"] == 300 + len(data_url)
+
+    # A variant reusing the original string is not charged twice
+    service.put_variant(first, "small", data_url)
+    assert service.get_stats()["cached_bytes"] == 300 + len(data_url)
+
+    # The second image plus the first one's data URL no longer fit
+    second = await service.fetch("https://fbcdn.net/2.jpg")
+    stats = service.get_stats()
+    assert stats["cached_images"] == 1
+    assert stats["cached_bytes"] == second.footprint == 300
+    assert service.cached("https://fbcdn.net/1.jpg") is None
+
+
+def test_private_cdn_detection():
+    assert is_private_cdn_url("https://scontent-waw1-1.cdninstagram.com/v/t51.jpg")
+    assert not is_private_cdn_url("https://example.com/photo.jpg")
@@ -0,0 +1,99 @@
+"""Unit tests for the shared Redis pool layer."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from src.services.infra import redis_pool
+from src.services.infra.redis_pool import (
+    InstrumentedConnectionPool,
+    RedisPoolStats,
+    get_redis_client,
+    get_redis_pool_metrics,
+    redis_namespace,
+    report_redis_error,
+    reset_redis_pools,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools(monkeypatch):
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    reset_redis_pools()
+    yield
+    reset_redis_pools()
+
+
+class TestNamespaces:
+    def test_known_prefixes_are_stable(self):
+        assert redis_namespace("catalog").key("product", "abc") == "mirt:catalog:product:abc"
+        assert redis_namespace("rate_limit").key("minute", "u1") == "rate_limit:minute:u1"
+        assert redis_namespace("debouncer").key("buffer", "s1") == "debouncer:buffer:s1"
+
+    def test_unknown_namespace_gets_mirt_prefix(self):
+        assert redis_namespace("vision").key("x") == "mirt:vision:x"
+
+
+class TestSharedClient:
+    def test_client_is_created_once_and_reused(self):
+        client = MagicMock()
+        with patch.object(redis_pool, "_create_sync_client", return_value=client) as create:
+            assert get_redis_client() is client
+            assert get_redis_client() is client
+        create.assert_called_once()
+        # Healthy client is not re-pinged per call
+        client.ping.assert_called_once()
+
+    def test_failure_backs_off_then_reprobes(self, monkeypatch):
+        client = MagicMock()
+        client.ping.side_effect = redis.ConnectionError("down")
+        now = [1000.0]
+        monkeypatch.setattr(redis_pool.time, "monotonic", lambda: now[0])
+
+        with patch.object(redis_pool, "_create_sync_client", return_value=client) as create:
+            assert get_redis_client() is None
+            # Inside backoff window: no new connection attempts
+            assert get_redis_client() is None
+            assert create.call_count == 1
+
+            now[0] += 60
+            client.ping.side_effect = None
+            assert get_redis_client() is client
+
+        metrics = get_redis_pool_metrics()
+        assert metrics["healthy"] is True
+        assert metrics["sync"]["errors"] >= 1
+
+    def test_reported_connection_error_marks_unhealthy(self):
+        client = MagicMock()
+        with patch.object(redis_pool, "_create_sync_client", return_value=client):
+            assert get_redis_client() is client
+            report_redis_error(redis.ConnectionError("reset"), subsystem="catalog")
+            assert get_redis_client() is None
+        assert get_redis_pool_metrics()["last_error"] == "ConnectionError"
+
+    def test_no_url_returns_none(self, monkeypatch):
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        monkeypatch.setattr("src.conf.config.settings.REDIS_URL", "")
+        assert get_redis_client() is None
+
+
+class TestInstrumentedPool:
+    def test_counts_checkouts_and_waits(self):
+        stats = RedisPoolStats()
+        pool = InstrumentedConnectionPool(max_connections=1, timeout=0.01, stats=stats)
+        fake_conn = MagicMock()
+        fake_conn.can_read.return_value = False
+        pool.make_connection = MagicMock(return_value=fake_conn)
+
+        conn = pool.get_connection()
+        with pytest.raises(redis.ConnectionError):
+            pool.get_connection()
+        pool.release(conn)
+
+        assert stats.checkouts == 2
+        assert stats.waits == 1
+        assert stats.errors == 1
@@ -0,0 +1,99 @@
+"""Unit tests for the bounded Supabase offload executor."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.infra import supabase_executor
+from src.services.infra.supabase_executor import (
+    execute_async,
+    get_db_executor_metrics,
+    run_db,
+    shutdown_db_executor,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_executor(monkeypatch):
+    monkeypatch.setattr("src.conf.config.settings.SUPABASE_OFFLOAD_ENABLED", True)
+    monkeypatch.setattr("src.conf.config.settings.SUPABASE_EXECUTOR_MAX_WORKERS", 2)
+    monkeypatch.setattr("src.conf.config.settings.SUPABASE_EXECUTOR_MAX_PENDING", 0)
+    monkeypatch.setattr(supabase_executor, "_stats", supabase_executor.ExecutorStats())
+    shutdown_db_executor()
+    yield
+    shutdown_db_executor()
+
+
+@pytest.mark.asyncio
+async def test_runs_off_the_event_loop_thread():
+    loop_thread = threading.get_ident()
+    worker_thread = await run_db(threading.get_ident)
+    assert worker_thread != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_execute_async_calls_query_execute():
+    query = MagicMock()
+    query.execute.return_value = "response"
+    assert await execute_async(query) == "response"
+    query.execute.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_blocking_calls_do_not_stall_the_loop():
+    ticks = 0
+
+    async def _ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    await asyncio.gather(run_db(time.sleep, 0.1), _ticker())
+    assert ticks == 5
+
+
+@pytest.mark.asyncio
+async def test_back_pressure_caps_in_flight_calls():
+    peak = 0
+    current = 0
+    lock = threading.Lock()
+
+    def _work():
+        nonlocal peak, current
+        with lock:
+            current += 1
+            peak = max(peak, current)
+        time.sleep(0.02)
+        with lock:
+            current -= 1
+
+    await asyncio.gather(*(run_db(_work) for _ in range(6)))
+
+    metrics = get_db_executor_metrics()
+    assert peak <= 2
+    assert metrics["waits"] >= 1
+    assert metrics["completed"] == 6
+    assert metrics["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_and_are_counted():
+    def _boom():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError, match="db down"):
+        await run_db(_boom)
+    assert get_db_executor_metrics()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_offload_runs_inline(monkeypatch):
+    monkeypatch.setattr("src.conf.config.settings.SUPABASE_OFFLOAD_ENABLED", False)
+    assert await run_db(threading.get_ident) == threading.get_ident()
+    assert get_db_executor_metrics()["inline"] == 1
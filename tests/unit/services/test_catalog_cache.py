@@ -0,0 +1,196 @@
+"""Unit tests for the two-tier catalog cache."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.data import catalog_cache
+from src.services.data.catalog_cache import CacheStats, L1Cache, TwoTierCache
+
+
+def _make_cache(**kwargs) -> tuple[TwoTierCache, dict]:
+    l2: dict = {}
+
+    def l2_set(key, value, *, ttl_seconds):
+        l2[key] = value
+
+    cache = TwoTierCache(l2_get=l2.get, l2_set=l2_set, **kwargs)
+    return cache, l2
+
+
+class TestL1Cache:
+    def test_lru_eviction_is_bounded(self):
+        stats = CacheStats()
+        l1 = L1Cache(max_entries=2, stats=stats)
+        l1.set("a", 1, ttl_seconds=60)
+        l1.set("b", 2, ttl_seconds=60)
+        l1.get("a")  # a becomes most recent
+        l1.set("c", 3, ttl_seconds=60)
+
+        assert l1.get("b") is None
+        assert l1.get("a").value == 1
+        assert stats.evictions == 1
+
+    def test_expired_entries_are_misses(self):
+        l1 = L1Cache(max_entries=10, stats=CacheStats())
+        l1.set("a", 1, ttl_seconds=-1)
+        assert l1.get("a") is None
+
+
+class TestTwoTierCache:
+    @pytest.mark.asyncio
+    async def test_l1_hit_skips_loader_and_redis(self):
+        cache, l2 = _make_cache()
+        loader = MagicMock()
+
+        async def _load():
+            loader()
+            return {"id": 1}
+
+        assert await cache.get_or_load("k", _load, ttl_seconds=300) == {"id": 1}
+        l2.clear()
+        assert await cache.get_or_load("k", _load, ttl_seconds=300) == {"id": 1}
+
+        assert loader.call_count == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.l1_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_l2_hit_populates_l1(self):
+        cache, l2 = _make_cache()
+        l2["k"] = [1, 2]
+
+        async def _load():
+            raise AssertionError("loader must not run")
+
+        assert await cache.get_or_load("k", _load, ttl_seconds=300) == [1, 2]
+        assert cache.peek("k") == [1, 2]
+        assert cache.stats.l2_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_coalesced(self):
+        cache, _ = _make_cache()
+        calls = 0
+
+        async def _load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"id": 7}
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("k", _load, ttl_seconds=300) for _ in range(10))
+        )
+
+        assert calls == 1
+        assert all(r == {"id": 7} for r in results)
+        assert cache.stats.coalesced == 9
+
+    @pytest.mark.asyncio
+    async def test_loader_error_propagates_to_all_waiters(self):
+        cache, _ = _make_cache()
+
+        async def _load():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("k", _load, ttl_seconds=300) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert cache.peek("k") is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_first_caller_does_not_fail_waiters(self):
+        cache, _ = _make_cache()
+        gate = asyncio.Event()
+        calls = 0
+
+        async def _load():
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            return {"id": 3}
+
+        leader = asyncio.create_task(cache.get_or_load("k", _load, ttl_seconds=300))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_load("k", _load, ttl_seconds=300))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await waiter == {"id": 3}
+        assert leader.cancelled()
+        assert calls == 1
+        assert cache.peek("k") == {"id": 3}
+
+    @pytest.mark.asyncio
+    async def test_hits_return_copies(self):
+        cache, _ = _make_cache()
+
+        async def _load():
+            return {"id": 1, "colors": ["red"]}
+
+        first = await cache.get_or_load("k", _load, ttl_seconds=300)
+        first["colors"].append("blue")
+        second = await cache.get_or_load("k", _load, ttl_seconds=300)
+        assert second["colors"] == ["red"]
+
+    @pytest.mark.asyncio
+    async def test_early_refresh_reloads_in_background(self, monkeypatch):
+        cache, _ = _make_cache()
+        version = 0
+
+        async def _load():
+            nonlocal version
+            version += 1
+            return {"v": version}
+
+        await cache.get_or_load("k", _load, ttl_seconds=300)
+        monkeypatch.setattr(catalog_cache, "_should_refresh_early", lambda *a, **k: True)
+
+        # Stale value is served while one refresh runs in the background
+        assert await cache.get_or_load("k", _load, ttl_seconds=300) == {"v": 1}
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert cache.peek("k") == {"v": 2}
+        assert cache.stats.early_refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_drops_l1_and_ignores_inflight_result(self):
+        cache, _ = _make_cache()
+        gate = asyncio.Event()
+
+        async def _load():
+            await gate.wait()
+            return {"id": 1}
+
+        task = asyncio.create_task(cache.get_or_load("k", _load, ttl_seconds=300))
+        await asyncio.sleep(0)
+        cache.invalidate_local()
+        gate.set()
+        await task
+
+        assert cache.peek("k") is None
+        assert cache.stats.invalidations == 1
+
+
+def test_publish_invalidation_without_redis_is_noop(monkeypatch):
+    monkeypatch.setattr(catalog_cache, "get_redis_client", lambda: None)
+    assert catalog_cache.publish_catalog_invalidation() == 0
+
+
+def test_publish_invalidation_deletes_keys_and_publishes(monkeypatch):
+    client = MagicMock()
+    client.scan_iter.return_value = iter(["mirt:catalog:product:a", "mirt:catalog:search:b"])
+    client.publish.return_value = 3
+    monkeypatch.setattr(catalog_cache, "get_redis_client", lambda: client)
+
+    assert catalog_cache.publish_catalog_invalidation() == 3
+    client.delete.assert_called_once_with("mirt:catalog:product:a", "mirt:catalog:search:b")
+    client.publish.assert_called_once_with(catalog_cache.INVALIDATION_CHANNEL, "catalog_sync")
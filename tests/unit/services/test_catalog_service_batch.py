@@ -0,0 +1,109 @@
+"""Tests for batched cache reads/writes in CatalogService.get_products_by_ids."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.data import catalog_service as cs
+
+
+class _Redis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+        self.commands: list[str] = []
+
+    def get(self, key):
+        self.commands.append("get")
+        return self.data.get(key)
+
+    def mget(self, keys):
+        self.commands.append("mget")
+        return [self.data.get(k) for k in keys]
+
+    def setex(self, key, ttl, value):
+        self.commands.append("setex")
+        self.data[key], self.ttls[key] = value, ttl
+
+    def pipeline(self, transaction=True):
+        redis = self
+        queued = []
+
+        class _Pipe:
+            def setex(self, key, ttl, value):
+                queued.append((key, ttl, value))
+
+            def execute(self):
+                redis.commands.append("pipeline")
+                for key, ttl, value in queued:
+                    redis.data[key], redis.ttls[key] = value, ttl
+
+        return _Pipe()
+
+
+class _Products:
+    def __init__(self, ids):
+        self.rows = {i: {"id": i, "name": f"P{i}"} for i in ids}
+        self.requested: list[list[int]] = []
+
+    def table(self, _name):
+        return self
+
+    def select(self, _columns):
+        return self
+
+    def in_(self, _column, ids):
+        self._ids = list(ids)
+        return self
+
+    def execute(self):
+        self.requested.append(self._ids)
+        return SimpleNamespace(data=[self.rows[i] for i in self._ids if i in self.rows])
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    redis, products = _Redis(), _Products(range(1, 6))
+    monkeypatch.setattr(cs.settings, "CATALOG_SNAPSHOT_ENABLED", False)
+    monkeypatch.setattr(cs, "_get_redis_client", lambda: redis)
+    monkeypatch.setattr(cs, "get_supabase_client", lambda: products)
+    monkeypatch.setattr(cs._invalidation_listener, "ensure_started", lambda: False)
+    cs._catalog_cache.invalidate_local()
+    yield cs.CatalogService(), redis, products
+    cs._catalog_cache.invalidate_local()
+
+
+@pytest.mark.asyncio
+async def test_cold_batch_is_one_mget_and_one_pipeline(catalog):
+    service, redis, products = catalog
+
+    items = await service.get_products_by_ids([3, 1, 2, 3])
+
+    assert [it["id"] for it in items] == [3, 1, 2, 3]
+    assert redis.commands == ["mget", "pipeline"]
+    assert products.requested == [[3, 1, 2]]
+    ttl = cs.CACHE_TTL_SECONDS
+    assert all(ttl <= t <= ttl * (1 + cs.CACHE_TTL_JITTER) for t in redis.ttls.values())
+
+
+@pytest.mark.asyncio
+async def test_redis_hits_skip_the_database(catalog):
+    service, redis, products = catalog
+    await service.get_products_by_ids([1, 2])
+    cs._catalog_cache.invalidate_local()
+    redis.commands.clear()
+
+    items = await service.get_products_by_ids([2, 1, 4])
+
+    assert [it["id"] for it in items] == [2, 1, 4]
+    assert redis.commands == ["mget", "pipeline"]
+    assert products.requested[-1] == [4]
+    assert json.loads(redis.data[cs._safe_cache_key("product", ["4"])])["name"] == "P4"
+
+    # Everything is in L1 now: no Redis at all
+    redis.commands.clear()
+    await service.get_products_by_ids([1, 2, 4])
+    assert redis.commands == []
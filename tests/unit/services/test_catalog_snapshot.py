@@ -0,0 +1,129 @@
+"""Unit tests for the in-process catalog snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.services.data.catalog_snapshot import (
+    CatalogSnapshot,
+    CatalogSnapshotStore,
+    base_name,
+    match_score,
+    normalize_name,
+)
+
+
+ROWS = [
+    {"id": 1, "name": "Сукня Анна (голубий)", "category": "сукні", "colors": ["голубий"]},
+    {"id": 2, "name": "Сукня Анна (чорний)", "category": "сукні", "colors": ["чорний"]},
+    {"id": 3, "name": "Костюм Лагуна", "category": "костюми", "colors": ["рожевий", "сірий"]},
+    {"id": 4, "name": "Тренч екошкіра", "category": "верхній одяг", "colors": "чорний"},
+    {"id": 5, "name": "Костюм  Мрія", "category": "костюми", "colors": []},
+]
+
+
+def _ilike(rows, query, category=None, limit=5):
+    q = normalize_name(query)
+    return [
+        r for r in rows if q in normalize_name(r["name"]) and (not category or r["category"] == category)
+    ][:limit]
+
+
+def _scan_match(rows, name, color, limit=5):
+    target, target_base, c = normalize_name(name), normalize_name(base_name(name)), normalize_name(color)
+    scored = [(match_score(r, target, target_base, c), r) for r in rows]
+    scored = [item for item in scored if item[0] > 0]
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [r for _s, r in scored[:limit]]
+
+
+@pytest.mark.parametrize(
+    ("query", "category"),
+    [
+        ("анна", None),
+        ("Сукня Анна (чорний)", None),
+        ("ня ан", None),
+        ("костюм", "костюми"),
+        ("костюм мрія", None),
+        ("тренч", "сукні"),
+        ("", "костюми"),
+        ("нема", None),
+    ],
+)
+def test_search_matches_substring_query(query, category):
+    snapshot = CatalogSnapshot(ROWS)
+    assert snapshot.search(query, category) == _ilike(ROWS, query, category)
+
+
+@pytest.mark.parametrize(
+    ("name", "color"),
+    [
+        ("Сукня Анна", "чорний"),
+        ("анна", None),
+        ("Костюм Лагуна (рожевий)", None),
+        ("Лагуна костюм", "сірий"),
+        ("щось інше", "чорний"),
+        ("тренч еко", None),
+    ],
+)
+def test_match_ranks_like_a_full_scan(name, color):
+    snapshot = CatalogSnapshot(ROWS)
+    assert snapshot.match(name, color) == _scan_match(ROWS, name, color)
+
+
+def test_lookups_by_id_and_color_return_copies():
+    snapshot = CatalogSnapshot(ROWS)
+
+    assert [r["id"] for r in snapshot.with_color("Чорний")] == [2, 4]
+    assert [r["id"] for r in snapshot.get_many([3, 99, 1])] == [3, 1]
+
+    row = snapshot.get(1)
+    row["name"] = "changed"
+    assert snapshot.get(1)["name"] == "Сукня Анна (голубий)"
+
+
+@pytest.mark.asyncio
+async def test_store_loads_once_and_refreshes_in_background_after_invalidation():
+    rows = [dict(r) for r in ROWS]
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return [dict(r) for r in rows]
+
+    store = CatalogSnapshotStore(load, ttl_seconds=300)
+    first, second = await asyncio.gather(store.get(), store.get())
+    assert first is second and loads == 1
+
+    # Unchanged catalog: the reload keeps the same snapshot
+    store.invalidate()
+    assert await store.get() is first
+    await asyncio.sleep(0.05)
+    assert loads == 2 and store.current is first
+
+    rows.append({"id": 6, "name": "Костюм Ритм", "category": "костюми"})
+    store.invalidate()
+    await store.get()
+    await asyncio.sleep(0.05)
+    assert store.current is not first
+    assert store.current.get(6)["name"] == "Костюм Ритм"
+    assert store.get_stats()["changes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_store_failure_returns_none_and_backs_off():
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("db down")
+
+    store = CatalogSnapshotStore(load)
+    assert await store.get() is None
+    assert await store.get() is None
+    assert calls == 1
@@ -0,0 +1,122 @@
+"""Tests for token-budget history trimming and cached token counts."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.core import history_trimmer, token_counter
+from src.services.core.token_counter import MESSAGE_OVERHEAD_TOKENS, TokenCounter, estimate_tokens
+from src.services.core.trim_policy import get_llm_history_token_budget
+
+
+class _WordEncoder:
+    """One token per whitespace-separated word; records what was encoded."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def __call__(self, text: str) -> list[int]:
+        self.calls.append(text)
+        return list(range(len(text.split())))
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    encode = _WordEncoder()
+    counter = TokenCounter(encode, "words")
+    monkeypatch.setattr(history_trimmer, "get_token_counter", lambda model=None: counter)
+    return encode
+
+
+def _msg(role: str, words: int, tag: str = "w") -> dict:
+    return {"role": role, "content": " ".join(f"{tag}{i}" for i in range(words))}
+
+
+def test_estimate_counts_cyrillic_denser_than_ascii():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * 40) == 10
+    assert estimate_tokens("я" * 40) == 20
+
+
+def test_counts_are_cached_by_content(encoder):
+    history = [_msg("user", 3, "a"), _msg("assistant", 5, "b")]
+    assert history_trimmer.estimate_token_count(history) == 8 + 2 * MESSAGE_OVERHEAD_TOKENS
+
+    history.append(_msg("user", 2, "c"))
+    assert history_trimmer.estimate_token_count(history) == 10 + 3 * MESSAGE_OVERHEAD_TOKENS
+    assert len(encoder.calls) == 3  # only the new message was tokenized
+
+
+def test_trims_oldest_conversation_to_budget_and_keeps_system(encoder):
+    system = _msg("system", 6, "s")
+    history = [system] + [_msg("user" if i % 2 else "assistant", 6, f"m{i}") for i in range(6)]
+    per_message = 6 + MESSAGE_OVERHEAD_TOKENS
+
+    trimmed = history_trimmer.trim_message_history(history, max_messages=50, max_tokens=per_message * 3)
+
+    assert trimmed == [system, history[-2], history[-1]]
+
+
+def test_latest_message_is_kept_even_over_budget(encoder):
+    history = [_msg("user", 3, "old"), _msg("user", 100, "new")]
+
+    assert history_trimmer.trim_message_history(history, max_messages=50, max_tokens=20) == [history[-1]]
+
+
+def test_within_budget_returns_input_unchanged(encoder):
+    history = [_msg("user", 2), _msg("assistant", 2)]
+
+    assert history_trimmer.trim_message_history(history, max_messages=50, max_tokens=1000) is history
+    assert history_trimmer.should_trim(history, max_messages=50, max_tokens=1000) is False
+    assert history_trimmer.should_trim(history, max_messages=50, max_tokens=5) is True
+
+
+def test_message_limit_applies_before_token_budget(encoder):
+    history = [_msg("user", 1, f"m{i}") for i in range(10)]
+
+    trimmed = history_trimmer.trim_message_history(history, max_messages=4, max_tokens=0)
+
+    assert trimmed == history[-4:]
+    assert encoder.calls == []
+
+
+def test_budget_uses_per_model_override():
+    settings = SimpleNamespace(
+        LLM_HISTORY_TOKEN_BUDGET=6000,
+        llm_history_token_budgets={"gpt-4o-mini": 2000},
+        active_llm_model="gpt-5.1",
+    )
+
+    assert get_llm_history_token_budget(settings_override=settings) == 6000
+    assert get_llm_history_token_budget("gpt-4o-mini", settings_override=settings) == 2000
+
+
+def test_failed_encoding_load_is_retried_after_backoff(monkeypatch):
+    if token_counter.tiktoken is None:
+        pytest.skip("tiktoken not installed")
+    now = [1000.0]
+    loads: list[str] = []
+
+    def get_encoding(name):
+        loads.append(name)
+        if len(loads) == 1:
+            raise OSError("offline")
+        return SimpleNamespace(encode_ordinary=_WordEncoder())
+
+    monkeypatch.setattr(token_counter, "_counters", {})
+    monkeypatch.setattr(token_counter, "_load_failed_at", {})
+    monkeypatch.setattr(token_counter, "_encoding_name", lambda model: "words")
+    monkeypatch.setattr(token_counter.tiktoken, "get_encoding", get_encoding)
+    monkeypatch.setattr(token_counter.time, "monotonic", lambda: now[0])
+
+    assert token_counter.get_token_counter("m").exact is False
+    assert token_counter.get_token_counter("m").exact is False
+    assert loads == ["words"]  # no reload inside the backoff window
+
+    now[0] += token_counter._LOAD_RETRY_SECONDS
+    counter = token_counter.get_token_counter("m")
+    assert counter.exact is True
+    assert token_counter.get_token_counter("other-model") is counter
+    assert loads == ["words", "words"]
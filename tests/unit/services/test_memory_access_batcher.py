@@ -0,0 +1,116 @@
+"""Unit tests for write-behind memory access-time batching."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.domain.memory import access_batcher
+from src.services.domain.memory.access_batcher import AccessTimeBatcher, get_access_batcher
+from src.services.domain.memory.memory_service import MemoryService
+
+
+def _make_batcher(client: MagicMock, **kwargs) -> AccessTimeBatcher:
+    return AccessTimeBatcher(
+        client,
+        facts_table="mirt_memories",
+        profiles_table="mirt_profiles",
+        flush_interval=kwargs.pop("flush_interval", 3600),
+        **kwargs,
+    )
+
+
+def _update_calls(client: MagicMock) -> list[tuple[str, str, list[str]]]:
+    calls = []
+    for table_call in client.table.call_args_list:
+        calls.append(table_call.args[0])
+    in_calls = client.table.return_value.update.return_value.in_.call_args_list
+    return [(t, c.args[0], c.args[1]) for t, c in zip(calls, in_calls, strict=True)]
+
+
+@pytest.fixture(autouse=True)
+def _clear_registry():
+    access_batcher.shutdown_access_batchers()
+    yield
+    access_batcher.shutdown_access_batchers()
+
+
+def test_touches_are_deduplicated_and_written_in_bulk():
+    client = MagicMock()
+    batcher = _make_batcher(client)
+
+    batcher.touch_facts(["f2", "f1"])
+    batcher.touch_facts(["f1", "f3"])
+    batcher.touch_profile("u1")
+    batcher.touch_profile("u1")
+
+    assert client.table.call_count == 0  # nothing written on the request path
+    assert batcher.flush() == 4
+    assert _update_calls(client) == [
+        ("mirt_memories", "id", ["f1", "f2", "f3"]),
+        ("mirt_profiles", "user_id", ["u1"]),
+    ]
+    assert batcher.pending() == 0
+    batcher.close()
+
+
+def test_size_threshold_triggers_background_flush():
+    client = MagicMock()
+    batcher = _make_batcher(client, max_batch=3)
+
+    batcher.touch_facts(["a", "b", "c"])
+    assert batcher._thread is not None
+    for _ in range(100):
+        if batcher.flushes:
+            break
+        batcher._stopped.wait(0.01)
+
+    assert batcher.flushes == 1
+    assert batcher.pending() == 0
+    batcher.close()
+
+
+def test_close_flushes_pending_and_later_touches_are_dropped():
+    client = MagicMock()
+    batcher = _make_batcher(client)
+    batcher.touch_profile("u1")
+
+    batcher.close()
+    assert batcher.writes == 1
+    calls = client.table.call_count
+
+    batcher.touch_facts(["f9", "f10"])
+    batcher.touch_profile("u2")
+
+    assert client.table.call_count == calls
+    assert (batcher.writes, batcher.dropped, batcher.pending()) == (1, 3, 0)
+
+
+def test_failed_bulk_update_is_dropped_not_raised():
+    client = MagicMock()
+    client.table.return_value.update.return_value.in_.return_value.execute.side_effect = (
+        RuntimeError("db down")
+    )
+    batcher = _make_batcher(client)
+    batcher.touch_facts(["f1"])
+
+    assert batcher.flush() == 0
+    assert batcher.pending() == 0
+    batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_service_touches_go_through_shared_batcher():
+    client = MagicMock()
+    service = MemoryService(client=client)
+
+    await service._touch_facts(["f1", "f2"])
+    await service.touch_profile("u1")
+
+    batcher = get_access_batcher(
+        client, facts_table="mirt_memories", profiles_table="mirt_profiles"
+    )
+    assert batcher is service._access_batcher()
+    assert batcher.pending() == 3
+    client.table.assert_not_called()
@@ -0,0 +1,124 @@
+"""Unit tests for parallel memory context loading and the per-user cache."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.domain.memory import context_cache
+from src.services.domain.memory.access_batcher import shutdown_access_batchers
+from src.services.domain.memory.context_cache import MemoryContextCache
+from src.services.domain.memory.memory_models import MemorySummary, NewFact, UserProfile
+from src.services.domain.memory.memory_service import MemoryService
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setattr(
+        context_cache, "_context_cache", MemoryContextCache(max_entries=16, ttl_seconds=60)
+    )
+    yield
+    shutdown_access_batchers()
+
+
+def _service_with_slow_reads(delay: float = 0.05) -> MemoryService:
+    service = MemoryService(client=MagicMock())
+
+    async def _profile(user_id):
+        await asyncio.sleep(delay)
+        return UserProfile(user_id=user_id)
+
+    async def _facts(user_id, limit=10):
+        await asyncio.sleep(delay)
+        return []
+
+    async def _summary(user_id):
+        await asyncio.sleep(delay)
+        return MemorySummary(summary_text="likes dresses")
+
+    service.get_profile = AsyncMock(side_effect=_profile)
+    service.get_facts = AsyncMock(side_effect=_facts)
+    service.get_user_summary = AsyncMock(side_effect=_summary)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_reads_run_concurrently():
+    service = _service_with_slow_reads(delay=0.05)
+
+    start = time.perf_counter()
+    context = await service.load_memory_context("u1", ensure_profile=False)
+    elapsed = time.perf_counter() - start
+
+    assert context.profile.user_id == "u1"
+    assert context.summary.summary_text == "likes dresses"
+    assert elapsed < 0.12  # sequential would be >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_second_load_is_served_from_cache():
+    service = _service_with_slow_reads(delay=0)
+
+    first = await service.load_memory_context("u1", ensure_profile=False)
+    first.summary.summary_text = "mutated by caller"
+    second = await service.load_memory_context("u1", ensure_profile=False)
+
+    assert service.get_profile.await_count == 1
+    assert second.summary.summary_text == "likes dresses"
+    assert context_cache.get_memory_context_cache().get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_query_embedding_bypasses_cache():
+    service = _service_with_slow_reads(delay=0)
+    service.search_facts = AsyncMock(return_value=[])
+
+    await service.load_memory_context("u1", query_embedding=[0.1], ensure_profile=False)
+    await service.load_memory_context("u1", query_embedding=[0.1], ensure_profile=False)
+
+    assert service.get_profile.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_store_fact_invalidates_user_context():
+    service = _service_with_slow_reads(delay=0)
+    service.client.table.return_value.insert.return_value.execute.return_value = MagicMock(
+        data=None
+    )
+
+    await service.load_memory_context("u1", ensure_profile=False)
+    await service.store_fact(
+        "u1", NewFact(content="Зріст 128", importance=0.9, surprise=0.9, category="child")
+    )
+    await service.load_memory_context("u1", ensure_profile=False)
+
+    assert service.get_profile.await_count == 2
+
+
+def test_load_started_before_invalidation_is_not_cached():
+    cache = MemoryContextCache(max_entries=4, ttl_seconds=60)
+    generation = cache.generation("u1")
+    cache.invalidate("u1")
+
+    cache.set("u1", "10:0", MagicMock(), generation=generation)
+    assert cache.get("u1", "10:0") is None
+
+
+def test_generations_are_bounded_without_reviving_stale_entries():
+    cache = MemoryContextCache(max_entries=2, ttl_seconds=60)
+    context = MagicMock()
+    context.model_copy.return_value = context
+    cache.set("u1", "v", context, generation=cache.generation("u1"))
+
+    for user in ("u2", "u3", "u4"):
+        cache.invalidate(user)
+
+    assert len(cache._generations) == 2
+    # u1's entry was stored before the floor moved up: a miss, not a stale hit
+    assert cache.get("u1", "v") is None
+    cache.invalidate("u1")
+    cache.invalidate("u5")
+    assert cache.generation("u1") > cache.generation("u2")
@@ -0,0 +1,141 @@
+"""Tests for the compiled quick-fact extractor."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+import yaml
+
+from src.services.domain.memory import quick_facts
+from src.services.domain.memory.quick_facts import QuickFactExtractor
+
+
+CONFIG_YAML = """
+patterns:
+  height:
+  - (\\d{2,3})\\s*см
+  - зріст\\s*(\\d{2,3})
+  age:
+  - (\\d{1,2})\\s*рок
+  - доньці\\s*(\\d{1,2})
+  gender:
+    girl: [донька, доньці, дівчинка, дівчинку]
+    boy: [син, сина, синові, хлопчик]
+  cities:
+  - canonical: Київ
+    variations: [київ, києва, києві]
+  - canonical: Суми
+    variations: [суми, сум]
+  - canonical: Одеса
+    variations: [одеса, одесу]
+templates:
+  height: "Зріст: {height} см"
+  city: "Місто: {city}"
+labels:
+  gender_girl: дівчинка
+"""
+
+MESSAGES = [
+    "",
+    "Зріст 128 см, доньці 7 років",
+    "зріст 200 см, а по факту 120 см",
+    "синові 5 рокiв, доставка в Одесу",
+    "Донька і син, обидва 10 років",
+    "Сумка є? Доставка до Києва",
+    "хлопчик 95см, живемо в Сумах, але відправте в Київ",
+    "Доброго дня! Скільки коштує доставка?",
+    "дитині 25 років",
+]
+
+
+def _scan_extract(config: dict, message: str) -> list[dict]:
+    """The previous per-pattern implementation, used as the reference."""
+    patterns = config.get("patterns", {})
+    templates = config.get("templates", {})
+    labels = config.get("labels", {})
+    facts: list[dict] = []
+    msg_lower = message.lower()
+
+    for kind, field, low, high, default in (
+        ("height", "height_cm", 70, 180, "Child height: {height} cm"),
+        ("age", "age", 0, 18, "Child age: {age}"),
+    ):
+        for pattern in patterns.get(kind, []):
+            match = re.search(pattern, msg_lower)
+            if match and low <= int(match.group(1)) <= high:
+                value = int(match.group(1))
+                content = templates.get(kind, default).format(**{kind: value})
+                facts.append(
+                    {
+                        "content": content,
+                        "fact_type": "child_info",
+                        "category": "child",
+                        "extracted_value": value,
+                        "field": field,
+                    }
+                )
+                break
+
+    gender = patterns.get("gender", {})
+    for key in ("girl", "boy"):
+        if any(word in msg_lower for word in gender.get(key, [])):
+            facts.append(
+                {
+                    "content": templates.get(f"gender_{key}", f"Gender: {key}"),
+                    "fact_type": "child_info",
+                    "category": "child",
+                    "extracted_value": labels.get(f"gender_{key}", key),
+                    "field": "gender",
+                }
+            )
+            break
+
+    for item in patterns.get("cities", []):
+        if any(var in msg_lower for var in item["variations"]):
+            facts.append(
+                {
+                    "content": templates.get("city", "City: {city}").format(city=item["canonical"]),
+                    "fact_type": "logistics",
+                    "category": "delivery",
+                    "extracted_value": item["canonical"],
+                    "field": "city",
+                }
+            )
+            break
+
+    return facts
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_extractor_matches_per_pattern_scan(message):
+    config = yaml.safe_load(CONFIG_YAML)
+    assert QuickFactExtractor(config).extract(message) == _scan_extract(config, message)
+
+
+def test_literal_prefixes_and_list_order_are_respected():
+    extractor = QuickFactExtractor(yaml.safe_load(CONFIG_YAML))
+
+    # "синові" also contains "син"; "сумка" contains "сум"; Київ is listed first
+    facts = {f["field"]: f["extracted_value"] for f in extractor.extract("Синові, сумка, Київ")}
+    assert facts == {"gender": "boy", "city": "Київ"}
+
+
+def test_invalid_patterns_are_skipped():
+    config = {"patterns": {"height": ["(", "без групи \\d+", "(\\d+)\\s*см"]}}
+    facts = QuickFactExtractor(config).extract("100 см")
+    assert [f["extracted_value"] for f in facts] == [100]
+
+
+def test_extractor_is_rebuilt_only_when_config_changes(monkeypatch):
+    source = CONFIG_YAML
+    monkeypatch.setattr(quick_facts, "memory_parser_source", lambda: source)
+    monkeypatch.setattr(quick_facts, "_extractor", None)
+
+    first = quick_facts.get_quick_fact_extractor()
+    assert quick_facts.get_quick_fact_extractor() is first
+
+    source = CONFIG_YAML.replace("Київ", "Kyiv")
+    second = quick_facts.get_quick_fact_extractor()
+    assert second is not first
+    assert second.extract("києві")[0]["extracted_value"] == "Kyiv"
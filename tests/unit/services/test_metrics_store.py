@@ -0,0 +1,111 @@
+"""Unit tests for the fixed-memory streaming metrics store."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.services.core.metrics_store import (
+    MetricsStore,
+    QuantileSketch,
+    RingBuffer,
+    render_prometheus,
+)
+from src.services.core.observability import MetricsCollector
+
+
+def test_ring_buffer_keeps_newest_in_order():
+    ring = RingBuffer(capacity=3)
+    for i in range(5):
+        ring.append(float(i), timestamp=float(i))
+    assert [v for _, v in ring.items()] == [2.0, 3.0, 4.0]
+    assert len(ring) == 3
+
+
+@pytest.mark.parametrize("q", [0.5, 0.95, 0.99])
+def test_sketch_quantiles_within_relative_accuracy(q):
+    rng = random.Random(42)
+    values = [rng.lognormvariate(3, 1) for _ in range(20000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+
+    exact = sorted(values)[int(q * (len(values) - 1))]
+    assert sketch.quantile(q) == pytest.approx(exact, rel=0.03)
+
+
+def test_sketch_bucket_count_is_bounded():
+    sketch = QuantileSketch(max_buckets=64)
+    for exp in range(-20, 20):
+        sketch.add(10.0**exp)
+    assert len(sketch._pos) <= 64
+    assert sketch.count == 40
+
+
+def test_high_cardinality_tags_do_not_create_series():
+    store = MetricsStore()
+    for i in range(500):
+        store.record("agent_ms", 10, {"node": "agent", "session_id": f"s{i}"})
+    assert len(store) == 1
+    assert store.series()[0]["tags"] == {"node": "agent"}
+
+
+def test_series_cap_folds_into_overflow():
+    store = MetricsStore(max_series=2)
+    for i in range(5):
+        store.record("m", 1, {"tool": str(i)})
+    assert len(store) == 3  # 2 regular + overflow
+    assert store.summary()["m"]["count"] == 5
+
+
+def test_non_finite_values_are_ignored():
+    store = MetricsStore()
+    store.record("m", 2.0)
+    for value in (float("inf"), float("-inf"), float("nan")):
+        store.record("m", value)
+
+    summary = store.summary()["m"]
+    assert (summary["count"], summary["sum"], summary["max"]) == (1, 2.0, 2.0)
+    assert [value for _, value, _ in store.recent("m")] == [2.0]
+
+
+def test_collector_summary_and_recent_are_per_metric():
+    collector = MetricsCollector()
+    for i in range(1, 101):
+        collector.record("latency_ms", float(i))
+    collector.record("other", 1.0)
+
+    summary = collector.get_summary()["latency_ms"]
+    assert summary["count"] == 100
+    assert summary["avg"] == pytest.approx(50.5)
+    assert summary["p95"] == pytest.approx(95, rel=0.03)
+
+    recent = collector.get_recent("latency_ms", limit=3)
+    assert [p.value for p in recent] == [98.0, 99.0, 100.0]
+
+
+def test_prometheus_exposition_format():
+    store = MetricsStore()
+    store.record("tool latency.ms", 5, {"tool": 'se"arch'})
+    text = render_prometheus(store)
+
+    assert "# TYPE mirt_tool_latency_ms summary" in text
+    assert 'mirt_tool_latency_ms{tool="se\\"arch",quantile="0.5"} 5.0' in text
+    assert 'mirt_tool_latency_ms_count{tool="se\\"arch"} 1' in text
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    from src.server.routers.health import router
+    from src.services.core.observability import track_metric
+
+    track_metric("endpoint_probe_ms", 12.5)
+    app = FastAPI()
+    app.include_router(router)
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "mirt_endpoint_probe_ms_count 1" in response.text
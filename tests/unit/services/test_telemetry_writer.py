@@ -0,0 +1,176 @@
+"""Unit tests for batched LLM usage / trace writes."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.core import telemetry_writer
+from src.services.core.observability import AsyncTracingService
+from src.services.core.telemetry_writer import BatchRowWriter
+
+
+class _Sink:
+    def __init__(self, fail: int = 0):
+        self.batches: list[list[dict]] = []
+        self.fail = fail
+        self.written = threading.Event()
+
+    def __call__(self, rows):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("db timeout")
+        self.batches.append(list(rows))
+        self.written.set()
+
+
+@pytest.fixture(autouse=True)
+def _clear_registry():
+    telemetry_writer.shutdown_telemetry_writers()
+    yield
+    telemetry_writer.shutdown_telemetry_writers()
+
+
+def test_rows_are_written_in_batches_of_max_batch():
+    sink = _Sink()
+    writer = BatchRowWriter("t", sink, max_batch=3, flush_interval=3600)
+
+    for i in range(7):
+        writer.submit({"i": i})
+
+    sink.written.wait(2)
+    writer.close()
+    # How rows split depends on when the flusher wakes; only the cap is fixed
+    assert all(0 < len(b) <= 3 for b in sink.batches)
+    assert [r["i"] for b in sink.batches for r in b] == list(range(7))
+    stats = writer.get_stats()
+    assert stats["flushes"] == len(sink.batches)
+    assert (stats["submitted"], stats["flushed"], stats["dropped"], stats["queued"]) == (7, 7, 0, 0)
+
+
+def test_timer_flushes_partial_batch():
+    sink = _Sink()
+    writer = BatchRowWriter("t", sink, max_batch=100, flush_interval=0.05)
+
+    writer.submit({"i": 1})
+
+    assert sink.written.wait(2)
+    assert sink.batches == [[{"i": 1}]]
+    writer.close()
+
+
+def test_failed_write_keeps_rows_and_full_buffer_sheds():
+    sink = _Sink(fail=1)
+    writer = BatchRowWriter("t", sink, max_batch=10, flush_interval=3600, max_pending=3)
+
+    assert all(writer.submit({"i": i}) for i in range(3))
+    assert writer.submit({"i": 3}) is False
+
+    assert writer.flush() == 0  # DB down: rows stay buffered, in order
+    assert writer.pending() == 3
+    assert writer.flush() == 3
+    assert sink.batches == [[{"i": 0}, {"i": 1}, {"i": 2}]]
+    stats = writer.get_stats()
+    assert (stats["dropped"], stats["failed_flushes"], stats["queued"]) == (1, 1, 0)
+    writer.close()
+
+
+def test_rejected_row_is_isolated_and_dead_lettered():
+    batches = []
+
+    def sink(rows):
+        if any(r["i"] == 2 for r in rows):
+            raise RuntimeError("null value in column model")
+        batches.append([r["i"] for r in rows])
+
+    writer = BatchRowWriter("t", sink, max_batch=4, flush_interval=3600)
+    for i in range(4):
+        writer.submit({"i": i})
+
+    for _ in range(10):
+        writer.flush()
+    writer.submit({"i": 4})
+    writer.flush()
+
+    assert sorted(i for b in batches for i in b) == [0, 1, 3, 4]
+    stats = writer.get_stats()
+    assert (stats["dead_lettered"], stats["dropped"], stats["queued"]) == (1, 1, 0)
+    writer.close()
+
+
+def test_close_drops_and_counts_rows_it_cannot_write():
+    writer = BatchRowWriter("t", _Sink(fail=10), max_batch=10, flush_interval=3600)
+    writer.submit({"i": 1})
+
+    writer.close()
+
+    assert writer.get_stats()["dropped"] == 1
+    assert writer.pending() == 0
+
+
+def test_rows_after_close_are_dropped_not_written_inline():
+    sink = _Sink()
+    writer = BatchRowWriter("t", sink, max_batch=10, flush_interval=3600)
+    writer.close()
+
+    assert writer.submit({"i": 1}) is False
+    assert sink.batches == []
+    assert (writer.get_stats()["dropped"], writer.pending()) == (1, 0)
+
+
+def test_usage_dispatch_is_buffered_when_enabled(monkeypatch):
+    from src.workers import dispatcher
+
+    monkeypatch.setattr(dispatcher.settings, "TELEMETRY_BATCH_ENABLED", True)
+    client = MagicMock()
+    with patch("src.services.infra.supabase_client.get_supabase_client", return_value=client):
+        result = dispatcher.dispatch_llm_usage(user_id=1, model="gpt-5.1", tokens_input=10, tokens_output=5)
+        assert result["queued"] and result["batched"]
+        client.rpc.assert_not_called()
+
+        telemetry_writer.shutdown_telemetry_writers()
+
+    name, params = client.rpc.call_args.args
+    assert name == "record_llm_usage_batch"
+    assert params["p_rows"][0]["tokens_input"] == 10
+
+
+def test_invalid_usage_is_not_buffered(monkeypatch):
+    from src.workers import dispatcher
+
+    monkeypatch.setattr(dispatcher.settings, "TELEMETRY_BATCH_ENABLED", True)
+
+    for model, tokens_input in (("", 10), ("gpt-5.1", -1)):
+        result = dispatcher.dispatch_llm_usage(
+            user_id=1, model=model, tokens_input=tokens_input, tokens_output=5
+        )
+        assert result == {"queued": False, "batched": True, "error": "INVALID_INPUT"}
+
+    assert telemetry_writer.get_telemetry_writer_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_traces_are_buffered_when_enabled(monkeypatch):
+    from src.services.core import observability
+
+    monkeypatch.setattr(observability.settings, "TELEMETRY_BATCH_ENABLED", True)
+    service = AsyncTracingService()
+    client = MagicMock()
+    with patch("src.services.infra.supabase_client.get_supabase_client", return_value=client):
+        await service.log_trace(session_id="s", trace_id="t1", node_name="agent", status="SUCCESS")
+        await service.log_trace(
+            session_id="s", trace_id="t2", node_name="agent", status="ERROR", error_message="boom"
+        )
+        client.table.assert_not_called()
+
+        telemetry_writer.shutdown_telemetry_writers()
+
+    insert = client.table.return_value.insert
+    [rows] = insert.call_args.args
+    assert [r["status"] for r in rows] == ["SUCCESS", "ERROR"]
+    # Columns a row leaves out get their table default instead of NULL
+    assert insert.call_args.kwargs == {"default_to_null": False}
+    assert "error_message" not in rows[0]
+    assert rows[1]["error_message"] == "boom"
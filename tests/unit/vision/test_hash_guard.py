@@ -59,3 +59,48 @@ async def test_vision_duplicate_hash_guard(monkeypatch):
 
     assert second["metadata"].get("vision_duplicate_detected") is True
     assert run_vision_mock.call_count == 1  # Should still be 1, not 2
+
+
+@pytest.mark.asyncio
+async def test_same_photo_under_new_cdn_url_skips_download_and_llm(monkeypatch):
+    """A re-sent photo with a new CDN URL is matched by content hash."""
+    import httpx
+
+    from src.services.domain.vision.vision_ledger import reset_in_memory_vision_ledger
+    from src.services.infra import image_fetch
+
+    reset_in_memory_vision_ledger()
+    downloads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        downloads.append(str(request.url))
+        return httpx.Response(200, content=b"same-photo-bytes", headers={"content-type": "image/jpeg"})
+
+    service = image_fetch.ImageFetchService()
+    monkeypatch.setattr(
+        service, "_build_http_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    monkeypatch.setattr(image_fetch, "get_image_fetch_service", lambda: service)
+
+    response_mock = AsyncMock()
+    response_mock.identified_product = None
+    response_mock.needs_clarification = False
+    response_mock.confidence = 0.9
+    response_mock.reply_to_user = "ok"
+    run_vision_mock = AsyncMock(return_value=response_mock)
+    monkeypatch.setattr("src.agents.langgraph.nodes.vision.node.run_vision", run_vision_mock)
+    monkeypatch.setattr("src.agents.langgraph.nodes.vision.node.build_vision_messages", lambda **kwargs: [{"type": "text", "text": "hi"}])
+
+    url = "https://scontent.cdninstagram.com/v/photo.jpg?sig={}"
+    state = create_initial_state(session_id="s1", user_message="Ось фото", metadata={"image_url": url.format(1)})
+    first = await vision_node(state)
+    assert run_vision_mock.call_count == 1
+
+    state.update(first)
+    state["metadata"] = {**state["metadata"], "image_url": url.format(2)}
+    second = await vision_node(state)
+
+    assert second["metadata"].get("vision_duplicate_detected") is True
+    assert run_vision_mock.call_count == 1
+    assert len(downloads) == 2
+    assert service.get_stats()["content_hits"] == 1
@@ -0,0 +1,134 @@
+"""Tests for downscaling photos before the vision LLM call."""
+
+from __future__ import annotations
+
+import base64
+import io
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from src.agents.langgraph.nodes.vision import preprocess
+from src.agents.langgraph.nodes.vision.preprocess import (
+    ImageTarget,
+    downscale_image,
+    prepare_image_url,
+    target_for_model,
+)
+from src.services.infra.image_fetch import FetchedImage, ImageFetchService, to_data_url
+
+
+def _photo(size: tuple[int, int], *, orientation: int | None = None, mode: str = "RGB") -> bytes:
+    image = Image.new(mode, size, (200, 30, 30) if mode == "RGB" else (200, 30, 30, 128))
+    out = io.BytesIO()
+    if mode == "RGBA":
+        image.save(out, format="PNG")
+        return out.getvalue()
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"
+    if orientation:
+        exif[0x0112] = orientation
+    image.save(out, format="JPEG", quality=95, exif=exif)
+    return out.getvalue()
+
+
+def _decode(data_url: str) -> Image.Image:
+    return Image.open(io.BytesIO(base64.b64decode(data_url.split(",", 1)[1])))
+
+
+def test_large_photo_is_shrunk_rotated_and_stripped():
+    # Orientation 6: stored landscape, displayed portrait
+    data = _photo((4000, 3000), orientation=6)
+
+    encoded, content_type = downscale_image(data, ImageTarget(max_edge=1024, quality=80))
+
+    image = Image.open(io.BytesIO(encoded))
+    assert content_type == "image/jpeg"
+    assert image.size == (768, 1024)
+    assert not image.getexif()
+    assert len(encoded) < len(data)
+
+
+def test_small_photo_keeps_original_when_reencode_is_not_smaller():
+    image = Image.effect_noise((256, 256), 80).convert("RGB")
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=20)
+
+    assert downscale_image(out.getvalue(), ImageTarget(max_edge=1024, quality=95)) is None
+
+
+def test_small_photo_with_metadata_is_always_stripped():
+    image = Image.effect_noise((256, 256), 80).convert("RGB")
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"
+    exif[0x8825] = {2: (50.0, 27.0, 0.0)}  # GPS latitude
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=20, exif=exif)
+
+    encoded, _ = downscale_image(out.getvalue(), ImageTarget(max_edge=1024, quality=95))
+
+    assert len(encoded) >= len(out.getvalue())
+    assert not Image.open(io.BytesIO(encoded)).getexif()
+
+
+def test_transparent_png_is_flattened_to_photo():
+    encoded, content_type = downscale_image(_photo((2000, 1000), mode="RGBA"), ImageTarget(512, 80))
+
+    image = Image.open(io.BytesIO(encoded))
+    assert (content_type, image.mode, image.size) == ("image/jpeg", "RGB", (512, 256))
+
+
+def test_model_targets_override_defaults(monkeypatch):
+    monkeypatch.setattr(preprocess.settings, "VISION_IMAGE_TARGETS", "gpt-4o-mini=1024:70, bad=x:1")
+
+    assert target_for_model("gpt-4o-mini") == ImageTarget(1024, 70)
+    assert target_for_model("bad") == ImageTarget(
+        preprocess.settings.VISION_IMAGE_MAX_EDGE, preprocess.settings.VISION_IMAGE_QUALITY
+    )
+
+
+@pytest.mark.asyncio
+async def test_prepare_caches_variant_and_reports_metrics(monkeypatch):
+    monkeypatch.setattr(preprocess.settings, "VISION_IMAGE_TARGETS", "m=800:80")
+    data = _photo((3000, 2000))
+    image = FetchedImage("abc", "image/jpeg", data, len(data))
+
+    with (
+        patch.object(preprocess, "track_metric") as track,
+        patch.object(preprocess, "downscale_image", wraps=downscale_image) as encode,
+    ):
+        first = await prepare_image_url(image, "m")
+        second = await prepare_image_url(image, "m")
+
+    assert first is second
+    assert encode.call_count == 1
+    assert _decode(first).size == (800, 533)
+    metrics = {call.args[0]: call.args[1] for call in track.call_args_list}
+    assert metrics["vision_image_bytes_saved"] > 0
+    assert "vision_image_preprocess_ms" in metrics
+
+
+@pytest.mark.asyncio
+async def test_variant_is_charged_to_the_image_cache(monkeypatch):
+    monkeypatch.setattr(preprocess.settings, "VISION_IMAGE_TARGETS", "m=800:80")
+    data = _photo((3000, 2000))
+    service = ImageFetchService(cache_max_bytes=10_000_000)
+    image, _ = service._cache.put("https://fbcdn.net/p.jpg", FetchedImage("abc", "image/jpeg", data, len(data)))
+
+    variant = await prepare_image_url(image, "m", service)
+
+    assert service.variant(image, ImageTarget(800, 80)) is variant
+    assert service.get_stats()["cached_bytes"] == len(data) + len(variant)
+
+
+@pytest.mark.asyncio
+async def test_prepare_falls_back_to_original(monkeypatch):
+    data = b"not an image"
+    image = FetchedImage("abc", "image/jpeg", data, len(data))
+
+    assert await prepare_image_url(image, "m") == to_data_url(data, "image/jpeg")
+
+    monkeypatch.setattr(preprocess.settings, "VISION_IMAGE_PREPROCESS_ENABLED", False)
+    fresh = FetchedImage("def", "image/jpeg", _photo((3000, 2000)), 0)
+    assert await prepare_image_url(fresh, "m") == to_data_url(fresh.data, "image/jpeg")
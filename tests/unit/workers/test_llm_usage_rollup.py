@@ -0,0 +1,90 @@
+"""Tests for LLM usage reporting from the hourly rollup."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.workers.tasks import llm_usage
+
+
+TOTALS = [
+    {"model": "gpt-5.1", "request_count": 3, "tokens_input": 300, "tokens_output": 90,
+     "cost_usd": "0.001650", "unique_users": 2},
+    {"model": "gpt-4o-mini", "request_count": 1, "tokens_input": 10, "tokens_output": 5,
+     "cost_usd": 0.00005, "unique_users": 1},
+    {"model": None, "request_count": 4, "tokens_input": 310, "tokens_output": 95,
+     "cost_usd": "0.001700", "unique_users": 2},
+]
+
+
+def _client(totals=None, rollup_error: Exception | None = None):
+    client = MagicMock()
+    client.table.return_value.insert.return_value.execute.return_value = SimpleNamespace(data=[{"id": 7}])
+
+    def rpc(name, params):
+        client.rpc_calls.append((name, params))
+        if name == "record_llm_usage_rollup" and rollup_error:
+            raise rollup_error
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=totals or []))
+
+    client.rpc_calls = []
+    client.rpc.side_effect = rpc
+    return client
+
+
+def test_record_usage_adds_call_to_hourly_rollup():
+    client = _client()
+    with patch.object(llm_usage, "get_supabase_client", return_value=client):
+        result = llm_usage.record_usage(user_id=5, model="gpt-5.1", tokens_input=100, tokens_output=30)
+
+    assert result["status"] == "recorded"
+    [(name, params)] = client.rpc_calls
+    assert name == "record_llm_usage_rollup"
+    assert params["p_user_id"] == 5
+    assert (params["p_tokens_input"], params["p_tokens_output"]) == (100, 30)
+    assert params["p_cost_usd"] == str(llm_usage.calculate_cost("gpt-5.1", 100, 30))
+
+
+def test_rollup_failure_does_not_fail_recording():
+    client = _client(rollup_error=RuntimeError("function does not exist"))
+    with patch.object(llm_usage, "get_supabase_client", return_value=client):
+        result = llm_usage.record_usage(user_id=None, model="gpt-5.1", tokens_input=1, tokens_output=1)
+
+    assert result["status"] == "recorded"
+
+
+def test_daily_aggregate_reads_totals_from_rpc():
+    client = _client(TOTALS)
+    with patch.object(llm_usage, "get_supabase_client", return_value=client):
+        result = llm_usage.aggregate_daily_usage()
+
+    assert result["total_cost_usd"] == 0.0017
+    assert (result["request_count"], result["unique_users"]) == (4, 2)
+    assert result["by_model"]["gpt-4o-mini"] == {"cost_usd": 0.00005, "count": 1}
+    client.table.assert_not_called()
+    [(name, params)] = client.rpc_calls
+    assert name == "llm_usage_totals" and "p_user_id" not in params
+
+
+def test_user_summary_filters_by_user_and_window():
+    client = _client(TOTALS)
+    with patch.object(llm_usage, "get_supabase_client", return_value=client):
+        result = llm_usage.get_user_usage_summary(user_id=5, days=45)
+
+    assert result["total_tokens_input"] == 310
+    assert result["by_model"]["gpt-5.1"]["count"] == 3
+    [(_, params)] = client.rpc_calls
+    assert params["p_user_id"] == 5
+    # A window longer than the current month still reaches back `days` days
+    today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    assert params["p_since"] == (today - timedelta(days=45)).isoformat()
+
+
+def test_user_summary_without_usage_is_zero():
+    client = _client([])
+    with patch.object(llm_usage, "get_supabase_client", return_value=client):
+        result = llm_usage.get_user_usage_summary(user_id=5)
+
+    assert (result["total_cost_usd"], result["request_count"], result["by_model"]) == (0.0, 0, {})
@@ -0,0 +1,255 @@
+"""Tests for the concurrent escalation-tag sweep in summarization tasks."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.core.rate_limiter import AsyncTokenBucket
+from src.integrations.manychat import tag_probe
+from src.integrations.manychat.tag_probe import SubscriberTagProbe
+
+
+class _ManyChat:
+    is_configured = True
+
+    def __init__(self, tagged: set[str], delay: float = 0.0):
+        self.tagged = tagged
+        self.delay = delay
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_subscriber_info(self, subscriber_id):
+        self.calls.append(subscriber_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        tags = [{"name": "humanNeeded-wd"}] if subscriber_id in self.tagged else ["other"]
+        return {"id": subscriber_id, "tags": tags}
+
+
+class _Sessions:
+    """agent_sessions query chain used by the sweep (keyset paging by session_id)."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.after = ""
+        self.size = None
+        self.not_ = self
+
+    def table(self, _name):
+        return self
+
+    def select(self, _columns):
+        return self
+
+    def lt(self, *_args):
+        return self
+
+    def is_(self, *_args):
+        return self
+
+    def order(self, _column):
+        return self
+
+    def gt(self, _column, value):
+        self.after = value
+        return self
+
+    def limit(self, n):
+        self.size = n
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows if r["session_id"] > self.after][: self.size]
+        return SimpleNamespace(data=rows)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_tag_cache():
+    tag_probe._tag_cache.clear()
+    yield
+    tag_probe._tag_cache.clear()
+
+
+def _rows(n):
+    return [
+        {"session_id": f"s{i:03d}", "user_id": i, "manychat_subscriber_id": f"sub{i}"}
+        for i in range(n)
+    ]
+
+
+async def test_probe_bounds_concurrency_and_caches_tags():
+    manychat = _ManyChat({"sub1", "sub3"}, delay=0.01)
+    probe = SubscriberTagProbe(manychat, concurrency=3, rate_per_second=1000)
+
+    result = await probe.probe([f"sub{i}" for i in range(10)], "humanNeeded-wd")
+
+    assert {sid for sid, has in result.items() if has} == {"sub1", "sub3"}
+    assert manychat.max_in_flight == 3
+
+    again = await SubscriberTagProbe(manychat).probe(["sub1", "sub2"], "humanNeeded-wd")
+    assert again == {"sub1": True, "sub2": False}
+    assert len(manychat.calls) == 10
+
+
+async def test_probe_stops_starting_requests_after_deadline():
+    manychat = _ManyChat(set(), delay=0.05)
+    probe = SubscriberTagProbe(manychat, concurrency=2, rate_per_second=1000)
+
+    result = await probe.probe(
+        [f"sub{i}" for i in range(20)], "humanNeeded-wd", deadline=time.monotonic() + 0.08
+    )
+
+    assert 2 <= len(result) < 20
+    assert len(manychat.calls) == len(result)
+
+
+async def test_token_bucket_paces_after_burst():
+    bucket = AsyncTokenBucket(rate=100, capacity=5)
+    start = time.monotonic()
+    for _ in range(10):
+        await bucket.acquire()
+    # 5 from the burst, 5 more at 100/s
+    assert time.monotonic() - start >= 0.04
+
+
+def test_sweep_pauses_and_resumes_from_cursor(monkeypatch):
+    from src.workers.tasks import summarization
+
+    manychat = _ManyChat({"sub2", "sub7"}, delay=0.01)
+    sessions = _Sessions(_rows(10))
+    monkeypatch.setattr(summarization.settings, "SUMMARIZATION_SWEEP_BUDGET_SECONDS", 0.03)
+    monkeypatch.setattr(summarization.settings, "SUMMARIZATION_SWEEP_PAGE_SIZE", 4)
+    monkeypatch.setattr(summarization.settings, "MANYCHAT_TAG_PROBE_CONCURRENCY", 1)
+
+    found, cursor, passes = [], None, 0
+    with patch("src.integrations.manychat.api_client.get_manychat_client", return_value=manychat):
+        while True:
+            users, cursor = summarization._scan_escalations(sessions, cursor=cursor)
+            found += users
+            passes += 1
+            if cursor is None:
+                break
+
+    assert passes > 1
+    assert [u["session_id"] for u in found] == ["s002", "s007"]
+    # Every subscriber is checked exactly once across passes
+    assert sorted(manychat.calls) == sorted(f"sub{i}" for i in range(10))
+
+
+class _Redis:
+    """SET NX/EX, GET, EXPIRE and DELETE on a dict (expiry is not simulated)."""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    def get(self, key):
+        value = self.data.get(key)
+        return value.encode() if value is not None else None
+
+    def expire(self, key, _seconds):
+        return key in self.data
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_continuation_task_requeues_itself_and_dedupes_sessions(monkeypatch):
+    from src.workers.tasks import summarization
+
+    redis = _Redis()
+    monkeypatch.setattr(summarization, "get_redis_client", lambda: redis)
+    assert summarization._acquire_sweep("run1")
+    # Queued by an earlier pass within the dedupe window
+    assert summarization._claim_summary("s001")
+
+    users = [
+        {"user_id": 1, "session_id": "s001", "manychat_subscriber_id": "sub1"},
+        {"user_id": 2, "session_id": "s002", "manychat_subscriber_id": "sub2"},
+    ]
+    with (
+        patch.object(summarization, "get_supabase_client", return_value=object()),
+        patch.object(summarization, "_scan_escalations", return_value=(users, "s002")),
+        patch.object(summarization.summarize_session, "delay") as summarize,
+        patch.object(summarization.scan_escalated_sessions, "delay") as requeue,
+    ):
+        result = summarization.scan_escalated_sessions.run(cursor="s000", run_id="run1")
+
+    assert result == {"status": "ok", "queued": 1, "next_cursor": "s002"}
+    summarize.assert_called_once_with(session_id="s002", user_id=2, manychat_subscriber_id="sub2")
+    requeue.assert_called_once_with(cursor="s002", run_id="run1")
+
+
+def test_overlapping_beat_does_not_start_a_second_sweep(monkeypatch):
+    from src.workers.tasks import summarization
+
+    redis = _Redis()
+    monkeypatch.setattr(summarization, "get_redis_client", lambda: redis)
+    users = [{"user_id": 1, "session_id": "s001", "manychat_subscriber_id": "sub1"}]
+    with (
+        patch.object(summarization, "get_supabase_client", return_value=object()),
+        patch.object(summarization, "call_summarize_inactive_users", return_value=[]),
+        patch.object(summarization, "get_users_needing_summary", return_value=[]),
+        patch.object(summarization, "_scan_escalations", return_value=(users, None)) as scan,
+        patch.object(summarization.summarize_session, "delay") as summarize,
+        patch.object(summarization.scan_escalated_sessions, "delay") as continuation,
+    ):
+        first = summarization.check_all_sessions_for_summarization.run()
+        second = summarization.check_all_sessions_for_summarization.run()
+
+        # The beat only hands the sweep off; the chain finishes and releases the lock
+        run_id = continuation.call_args.kwargs["run_id"]
+        summarization.scan_escalated_sessions.run(cursor=None, run_id=run_id)
+
+    assert first["queued"] == 0
+    assert second["queued"] == 0
+    assert scan.call_count == 1  # only the chain scans
+    continuation.assert_called_once_with(cursor=None, run_id=run_id)
+    summarize.assert_called_once()
+    assert summarization._acquire_sweep("next-beat")
+
+
+def test_sweep_budget_fits_inside_task_time_limits():
+    from annotated_types import Le
+
+    from src.conf.config import Settings
+    from src.workers.tasks import summarization
+
+    field = Settings.model_fields["SUMMARIZATION_SWEEP_BUDGET_SECONDS"]
+    max_budget = next(m.le for m in field.metadata if isinstance(m, Le))
+    manychat_timeout = 30.0  # ManyChatClient request timeout
+
+    # The last probe can start right before the deadline and wait out one ManyChat request
+    assert field.default <= max_budget
+    task = summarization.scan_escalated_sessions
+    assert max_budget + manychat_timeout < task.soft_time_limit < task.time_limit
+    beat = summarization.check_all_sessions_for_summarization
+    assert beat.soft_time_limit is not None
+    assert beat.soft_time_limit < beat.time_limit
+
+
+def test_superseded_chain_stops(monkeypatch):
+    from src.workers.tasks import summarization
+
+    redis = _Redis()
+    monkeypatch.setattr(summarization, "get_redis_client", lambda: redis)
+    assert summarization._acquire_sweep("new")
+
+    with patch.object(summarization, "_scan_escalations") as scan:
+        result = summarization.scan_escalated_sessions.run(cursor="s010", run_id="old")
+
+    assert result == {"status": "skipped", "reason": "superseded"}
+    scan.assert_not_called()